@@ -85,8 +85,9 @@ aws dynamodb create-table \
 echo "Creating OsyleFigmaRelay-${ENV}..."
 aws dynamodb create-table \
     --table-name OsyleFigmaRelay-${ENV} \
-    --attribute-definitions AttributeName=token,AttributeType=S \
+    --attribute-definitions AttributeName=token,AttributeType=S AttributeName=queue,AttributeType=S AttributeName=created_at,AttributeType=N \
     --key-schema AttributeName=token,KeyType=HASH \
+    --global-secondary-indexes "[{\"IndexName\":\"queue-created_at-index\",\"KeySchema\":[{\"AttributeName\":\"queue\",\"KeyType\":\"HASH\"},{\"AttributeName\":\"created_at\",\"KeyType\":\"RANGE\"}],\"Projection\":{\"ProjectionType\":\"ALL\"}}]" \
     --billing-mode PAY_PER_REQUEST \
     --region $REGION \
     --tags Key=Project,Value=Osyle Key=Environment,Value=Production \
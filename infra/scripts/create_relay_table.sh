@@ -12,10 +12,13 @@ ACCOUNT_ID=$(aws sts get-caller-identity --query Account --output text)
 
 echo "Creating DynamoDB relay table: $TABLE"
 
+# queue-created_at-index is sparse: only pending items carry `queue`, so the
+# plugin's "latest payload" poll is a Query with Limit=1 (see relay.py)
 aws dynamodb create-table \
     --table-name "$TABLE" \
-    --attribute-definitions AttributeName=token,AttributeType=S \
+    --attribute-definitions AttributeName=token,AttributeType=S AttributeName=queue,AttributeType=S AttributeName=created_at,AttributeType=N \
     --key-schema AttributeName=token,KeyType=HASH \
+    --global-secondary-indexes "[{\"IndexName\":\"queue-created_at-index\",\"KeySchema\":[{\"AttributeName\":\"queue\",\"KeyType\":\"HASH\"},{\"AttributeName\":\"created_at\",\"KeyType\":\"RANGE\"}],\"Projection\":{\"ProjectionType\":\"ALL\"}}]" \
     --billing-mode PAY_PER_REQUEST \
     --region "$REGION" \
     --tags Key=Project,Value=Osyle Key=Environment,Value=Production \
@@ -24,6 +27,17 @@ aws dynamodb create-table \
 echo "Waiting for table to be active..."
 aws dynamodb wait table-exists --table-name "$TABLE" --region "$REGION"
 
+# Tables created before the queue index existed: add it in place
+if ! aws dynamodb describe-table --table-name "$TABLE" --region "$REGION" \
+        --query 'Table.GlobalSecondaryIndexes[].IndexName' --output text 2>/dev/null | grep -q "queue-created_at-index"; then
+    echo "Adding queue-created_at-index to $TABLE..."
+    aws dynamodb update-table \
+        --table-name "$TABLE" \
+        --attribute-definitions AttributeName=queue,AttributeType=S AttributeName=created_at,AttributeType=N \
+        --global-secondary-index-updates "[{\"Create\":{\"IndexName\":\"queue-created_at-index\",\"KeySchema\":[{\"AttributeName\":\"queue\",\"KeyType\":\"HASH\"},{\"AttributeName\":\"created_at\",\"KeyType\":\"RANGE\"}],\"Projection\":{\"ProjectionType\":\"ALL\"}}}]" \
+        --region "$REGION" > /dev/null
+fi
+
 echo "Enabling TTL (auto-delete after 10 min)..."
 aws dynamodb update-time-to-live \
     --table-name "$TABLE" \
@@ -49,7 +63,8 @@ aws iam put-role-policy \
         \"arn:aws:dynamodb:${REGION}:${ACCOUNT_ID}:table/OsyleFigmaRelay-Prod\",
         \"arn:aws:dynamodb:${REGION}:${ACCOUNT_ID}:table/OsyleTastes-Prod/index/*\",
         \"arn:aws:dynamodb:${REGION}:${ACCOUNT_ID}:table/OsyleResources-Prod/index/*\",
-        \"arn:aws:dynamodb:${REGION}:${ACCOUNT_ID}:table/OsyleProjects-Prod/index/*\"
+        \"arn:aws:dynamodb:${REGION}:${ACCOUNT_ID}:table/OsyleProjects-Prod/index/*\",
+        \"arn:aws:dynamodb:${REGION}:${ACCOUNT_ID}:table/OsyleFigmaRelay-Prod/index/*\"
       ]
     }]
   }"
@@ -0,0 +1,104 @@
+"""
+Executor for CPU-bound image work (clustering, decoding, resizing)
+Keeps NumPy/PIL/sklearn work off the event loop so it overlaps LLM calls
+"""
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+# ============================================================================
+# EXECUTOR SETUP
+# ============================================================================
+
+# "process" runs work in a warm process pool (true parallelism, no GIL).
+# "thread" is the fallback for runtimes without multiprocessing support
+# (AWS Lambda has no /dev/shm), and is the default there.
+CPU_EXECUTOR_MODE = os.getenv(
+    "CPU_EXECUTOR_MODE",
+    "thread" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "process"
+).lower()
+CPU_MAX_WORKERS = int(os.getenv("CPU_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def _warm_worker() -> None:
+    """Import heavy libraries once per worker instead of once per task"""
+    try:
+        import numpy  # noqa: F401
+        import PIL.Image  # noqa: F401
+    except ImportError:
+        pass
+
+
+def _create_executor() -> Executor:
+    if CPU_EXECUTOR_MODE == "process":
+        try:
+            import multiprocessing
+
+            # spawn avoids forking a process that already holds boto3/asyncio threads
+            return ProcessPoolExecutor(
+                max_workers=CPU_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker
+            )
+        except (OSError, NotImplementedError, ValueError) as e:
+            print(f"⚠️  Process pool unavailable ({e}), using threads for CPU work")
+
+    return ThreadPoolExecutor(
+        max_workers=CPU_MAX_WORKERS,
+        thread_name_prefix="osyle-cpu",
+        initializer=_warm_worker
+    )
+
+
+def get_cpu_executor() -> Executor:
+    """Get (or lazily create) the shared CPU executor"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _create_executor()
+    return _executor
+
+
+def shutdown_cpu_executor(wait: bool = True) -> None:
+    """Shut down the shared CPU executor (called on app shutdown)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+async def run_cpu_bound(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a CPU-bound function on the shared CPU executor and await its result
+
+    fn and its arguments must be picklable in process mode, so pass
+    module-level functions and plain data (bytes, str, numbers).
+
+    Args:
+        fn: Module-level callable (e.g. k_means_color_clustering)
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        Whatever fn returns (exceptions propagate unchanged)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_cpu_executor(), functools.partial(fn, *args, **kwargs)
+    )
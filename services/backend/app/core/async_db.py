@@ -0,0 +1,92 @@
+"""
+Async DynamoDB facade for Osyle
+Awaitable versions of the CRUD functions in app.core.db
+
+Each function runs its app.core.db counterpart on the bounded I/O pool from
+app.core.async_io, so DynamoDB round trips never block the event loop.
+Pure helpers (convert_decimals, get_timestamp, generate_uuid, cursor
+encoding) stay on app.core.db.
+"""
+from app.core import db as _db
+from app.core.async_io import make_async
+
+
+# ============================================================================
+# USER OPERATIONS
+# ============================================================================
+
+ensure_user = make_async(_db.ensure_user)
+get_user = make_async(_db.get_user)
+list_all_users = make_async(_db.list_all_users)
+list_users_page = make_async(_db.list_users_page)
+get_users = make_async(_db.get_users)
+
+
+# ============================================================================
+# TASTE OPERATIONS
+# ============================================================================
+
+create_taste = make_async(_db.create_taste)
+get_taste = make_async(_db.get_taste)
+list_tastes_for_owner = make_async(_db.list_tastes_for_owner)
+update_taste = make_async(_db.update_taste)
+delete_taste = make_async(_db.delete_taste)
+
+
+# ============================================================================
+# RESOURCE OPERATIONS
+# ============================================================================
+
+create_resource = make_async(_db.create_resource)
+get_resource = make_async(_db.get_resource)
+list_resources_for_taste = make_async(_db.list_resources_for_taste)
+list_resources_for_taste_page = make_async(_db.list_resources_for_taste_page)
+count_resources_for_taste = make_async(_db.count_resources_for_taste)
+get_resources = make_async(_db.get_resources)
+update_resource = make_async(_db.update_resource)
+delete_resource = make_async(_db.delete_resource)
+delete_resources = make_async(_db.delete_resources)
+
+
+# ============================================================================
+# PROJECT OPERATIONS
+# ============================================================================
+
+create_project = make_async(_db.create_project)
+get_project = make_async(_db.get_project)
+list_projects_for_owner = make_async(_db.list_projects_for_owner)
+list_projects_for_owner_page = make_async(_db.list_projects_for_owner_page)
+get_projects = make_async(_db.get_projects)
+update_project = make_async(_db.update_project)
+add_project_output = make_async(_db.add_project_output)
+delete_project = make_async(_db.delete_project)
+update_project_flow_graph = make_async(_db.update_project_flow_graph)
+update_project_flow_ref = make_async(_db.update_project_flow_ref)
+get_next_flow_version = make_async(_db.get_next_flow_version)
+update_project_flow_version = make_async(_db.update_project_flow_version)
+
+
+# ============================================================================
+# DESIGN MUTATIONS OPERATIONS
+# ============================================================================
+
+create_design_mutation = make_async(_db.create_design_mutation)
+create_design_mutations = make_async(_db.create_design_mutations)
+get_design_mutations_for_screen = make_async(_db.get_design_mutations_for_screen)
+get_design_mutations_for_screen_page = make_async(_db.get_design_mutations_for_screen_page)
+delete_design_mutations_for_screen = make_async(_db.delete_design_mutations_for_screen)
+delete_design_mutation = make_async(_db.delete_design_mutation)
+
+
+# ============================================================================
+# PROJECT SHARES OPERATIONS
+# ============================================================================
+
+create_project_share = make_async(_db.create_project_share)
+list_shares_for_recipient = make_async(_db.list_shares_for_recipient)
+list_shares_for_recipient_page = make_async(_db.list_shares_for_recipient_page)
+list_shares_sent_by = make_async(_db.list_shares_sent_by)
+list_shares_sent_by_page = make_async(_db.list_shares_sent_by_page)
+get_share = make_async(_db.get_share)
+delete_share = make_async(_db.delete_share)
+delete_shares_for_project = make_async(_db.delete_shares_for_project)
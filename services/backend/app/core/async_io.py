@@ -0,0 +1,83 @@
+"""
+Bounded thread pool for blocking AWS calls
+Lets async handlers await boto3 without stalling the event loop
+"""
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+# ============================================================================
+# EXECUTOR SETUP
+# ============================================================================
+
+# Upper bound on concurrent blocking S3/DynamoDB calls per worker process.
+# Keep this at or below AWS_MAX_POOL_CONNECTIONS so threads never queue on
+# botocore's HTTP connection pool.
+IO_MAX_WORKERS = int(os.getenv("IO_MAX_WORKERS", "32"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get (or lazily create) the shared I/O thread pool"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=IO_MAX_WORKERS,
+                    thread_name_prefix="osyle-io"
+                )
+    return _executor
+
+
+def shutdown_io_executor(wait: bool = True) -> None:
+    """Shut down the shared I/O thread pool (called on app shutdown)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking function on the shared I/O pool and await its result
+    
+    Args:
+        fn: Blocking callable (boto3 call, storage/db helper, ...)
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+    
+    Returns:
+        Whatever fn returns (exceptions propagate unchanged)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_io_executor(), functools.partial(fn, *args, **kwargs)
+    )
+
+
+def make_async(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap a blocking function so calls run on the shared I/O pool
+    
+    The wrapper keeps the wrapped function's name, signature and docstring.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await run_blocking(fn, *args, **kwargs)
+    
+    return wrapper
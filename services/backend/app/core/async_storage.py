@@ -0,0 +1,78 @@
+"""
+Async S3 storage facade for Osyle
+Awaitable versions of the network-bound functions in app.core.storage
+
+Each function runs its app.core.storage counterpart on the bounded I/O pool
+from app.core.async_io, so a slow S3 request only occupies a worker thread
+instead of the event loop. Key builders and presigned URL helpers do no
+network I/O and stay on app.core.storage.
+"""
+from app.core import storage as _storage
+from app.core.async_io import make_async
+
+
+# ============================================================================
+# FILE OPERATIONS
+# ============================================================================
+
+check_object_exists = make_async(_storage.check_object_exists)
+delete_object = make_async(_storage.delete_object)
+get_object_bytes = make_async(_storage.get_object_bytes)
+get_objects_bytes = make_async(_storage.get_objects_bytes)
+put_object_bytes = make_async(_storage.put_object_bytes)
+delete_resource_files = make_async(_storage.delete_resource_files)
+delete_project_outputs = make_async(_storage.delete_project_outputs)
+
+
+# ============================================================================
+# LLM-RELATED FUNCTIONS
+# ============================================================================
+
+get_resource_figma = make_async(_storage.get_resource_figma)
+get_resource_image = make_async(_storage.get_resource_image)
+get_inspiration_image = make_async(_storage.get_inspiration_image)
+get_resource_dtr = make_async(_storage.get_resource_dtr)
+put_resource_dtr = make_async(_storage.put_resource_dtr)
+resource_dtr_exists = make_async(_storage.resource_dtr_exists)
+get_project_ui = make_async(_storage.get_project_ui)
+put_project_ui = make_async(_storage.put_project_ui)
+list_project_ui_versions = make_async(_storage.list_project_ui_versions)
+get_inspiration_images = make_async(_storage.get_inspiration_images)
+get_screen_reference_files = make_async(_storage.get_screen_reference_files)
+get_screens_reference_files = make_async(_storage.get_screens_reference_files)
+
+
+# ============================================================================
+# FLOW / CONVERSATION VERSIONING
+# ============================================================================
+
+get_project_flow = make_async(_storage.get_project_flow)
+put_project_flow = make_async(_storage.put_project_flow)
+list_project_flow_versions = make_async(_storage.list_project_flow_versions)
+delete_project_flow_version = make_async(_storage.delete_project_flow_version)
+copy_project_flow_version = make_async(_storage.copy_project_flow_version)
+save_flow_version = make_async(_storage.save_flow_version)
+resolve_project_flow_graph = make_async(_storage.resolve_project_flow_graph)
+resolve_projects_flow_graphs = make_async(_storage.resolve_projects_flow_graphs)
+pack_flow_graph = make_async(_storage.pack_flow_graph)
+get_project_conversation = make_async(_storage.get_project_conversation)
+put_project_conversation = make_async(_storage.put_project_conversation)
+
+
+# ============================================================================
+# DTM / JSON HELPERS
+# ============================================================================
+
+get_taste_dtm = make_async(_storage.get_taste_dtm)
+put_taste_dtm = make_async(_storage.put_taste_dtm)
+delete_taste_dtm = make_async(_storage.delete_taste_dtm)
+taste_dtm_exists = make_async(_storage.taste_dtm_exists)
+save_json_to_s3 = make_async(_storage.save_json_to_s3)
+load_json_from_s3 = make_async(_storage.load_json_from_s3)
+
+
+# ============================================================================
+# SHARES
+# ============================================================================
+
+copy_project_flow_for_recipient = make_async(_storage.copy_project_flow_for_recipient)
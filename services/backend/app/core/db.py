@@ -3,14 +3,20 @@ DynamoDB database operations for Osyle
 Provides CRUD functions for Users, Tastes, Resources, and Projects
 """
 import os
+import json
+import base64
+import time
 import boto3
 import uuid
 from decimal import Decimal
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from app.core.lazy import LazyObject
+
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -40,16 +46,22 @@ def convert_decimals(obj):
 
 DYNAMO_REGION = os.getenv("AWS_REGION", "us-east-1")
 DYNAMO_ENDPOINT = os.getenv("DYNAMODB_ENDPOINT_URL")  # For local development
+# HTTP connection pool size; sized for concurrent calls from app.core.async_io
+DYNAMO_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50"))
+
+
+def _create_dynamodb_resource():
+    kwargs = {
+        "region_name": DYNAMO_REGION,
+        "config": Config(max_pool_connections=DYNAMO_MAX_POOL_CONNECTIONS),
+    }
+    if DYNAMO_ENDPOINT:
+        kwargs["endpoint_url"] = DYNAMO_ENDPOINT
+    return boto3.resource('dynamodb', **kwargs)
 
-# Initialize DynamoDB resource
-if DYNAMO_ENDPOINT:
-    dynamodb = boto3.resource(
-        'dynamodb',
-        region_name=DYNAMO_REGION,
-        endpoint_url=DYNAMO_ENDPOINT
-    )
-else:
-    dynamodb = boto3.resource('dynamodb', region_name=DYNAMO_REGION)
+
+# DynamoDB resource and table handles are created on first use (see app.core.lazy)
+dynamodb = LazyObject(_create_dynamodb_resource, "dynamodb")
 
 # Table names from environment
 USERS_TABLE_NAME = os.getenv("USERS_TABLE", "OsyleUsers")
@@ -58,12 +70,17 @@ RESOURCES_TABLE_NAME = os.getenv("RESOURCES_TABLE", "OsyleResources")
 PROJECTS_TABLE_NAME = os.getenv("PROJECTS_TABLE", "OsyleProjects")
 DESIGN_MUTATIONS_TABLE_NAME = os.getenv("DESIGN_MUTATIONS_TABLE", "OsyleDesignMutations")
 
+
+def _lazy_table(table_name: str) -> LazyObject:
+    return LazyObject(lambda: dynamodb.Table(table_name), f"table:{table_name}")
+
+
 # Table references
-users_table = dynamodb.Table(USERS_TABLE_NAME)
-tastes_table = dynamodb.Table(TASTES_TABLE_NAME)
-resources_table = dynamodb.Table(RESOURCES_TABLE_NAME)
-projects_table = dynamodb.Table(PROJECTS_TABLE_NAME)
-design_mutations_table = dynamodb.Table(DESIGN_MUTATIONS_TABLE_NAME)
+users_table = _lazy_table(USERS_TABLE_NAME)
+tastes_table = _lazy_table(TASTES_TABLE_NAME)
+resources_table = _lazy_table(RESOURCES_TABLE_NAME)
+projects_table = _lazy_table(PROJECTS_TABLE_NAME)
+design_mutations_table = _lazy_table(DESIGN_MUTATIONS_TABLE_NAME)
 
 
 # ============================================================================
@@ -80,6 +97,199 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+# ============================================================================
+# PAGINATION AND BATCH HELPERS
+# ============================================================================
+
+# DynamoDB hard limits for a single BatchGetItem call
+BATCH_GET_MAX_KEYS = 100
+BATCH_MAX_RETRIES = 8
+
+# Upper bound for client-supplied page sizes
+MAX_PAGE_SIZE = 1000
+
+# Response header carrying the cursor for the next page of a list endpoint
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Encode a LastEvaluatedKey as an opaque, URL-safe cursor string
+
+    Args:
+        last_evaluated_key: LastEvaluatedKey from a query/scan response
+
+    Returns:
+        Cursor string, or None when there are no more pages
+    """
+    if not last_evaluated_key:
+        return None
+    payload = json.dumps(convert_decimals(last_evaluated_key), sort_keys=True, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a cursor from encode_cursor back into an ExclusiveStartKey
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {e}")
+    if not isinstance(key, dict):
+        raise ValueError("Invalid pagination cursor")
+    return key
+
+
+def _iter_items(operation, page_size: Optional[int] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every item from a query/scan, following LastEvaluatedKey
+
+    Args:
+        operation: Bound table.query or table.scan
+        page_size: Optional Limit per underlying request
+        **kwargs: Query/scan parameters
+
+    Yields:
+        Raw DynamoDB items, in response order
+    """
+    if page_size:
+        kwargs["Limit"] = page_size
+    while True:
+        response = operation(**kwargs)
+        yield from response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def _read_page(
+    operation,
+    limit: int,
+    cursor: Optional[str] = None,
+    **kwargs
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read a single page from a query/scan
+
+    Note that with a FilterExpression DynamoDB may return fewer than `limit`
+    items (even zero) while still having more pages - callers should keep
+    following next_cursor until it is None.
+
+    Args:
+        operation: Bound table.query or table.scan
+        limit: Maximum items to evaluate (clamped to MAX_PAGE_SIZE)
+        cursor: Cursor from a previous page
+        **kwargs: Query/scan parameters
+
+    Returns:
+        (items, next_cursor)
+    """
+    kwargs["Limit"] = max(1, min(int(limit), MAX_PAGE_SIZE))
+    start_key = decode_cursor(cursor)
+    if start_key:
+        kwargs["ExclusiveStartKey"] = start_key
+    response = operation(**kwargs)
+    return response.get("Items", []), encode_cursor(response.get("LastEvaluatedKey"))
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def batch_get_items(
+    table,
+    keys: List[Dict[str, Any]],
+    projection: Optional[str] = None,
+    expression_attribute_names: Optional[Dict[str, str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch many items by primary key with BatchGetItem
+
+    Splits into 100-key requests and retries UnprocessedKeys with
+    exponential backoff. Duplicate keys are fetched once.
+
+    Args:
+        table: DynamoDB Table resource
+        keys: Primary keys, e.g. [{"user_id": "..."}]
+        projection: Optional ProjectionExpression
+        expression_attribute_names: Names referenced by the projection
+
+    Returns:
+        Found items (order is not guaranteed; missing keys are omitted)
+    """
+    unique_keys = list({json.dumps(k, sort_keys=True, default=str): k for k in keys}.values())
+    items: List[Dict[str, Any]] = []
+
+    for chunk in _chunks(unique_keys, BATCH_GET_MAX_KEYS):
+        request: Dict[str, Any] = {"Keys": chunk}
+        if projection:
+            request["ProjectionExpression"] = projection
+        if expression_attribute_names:
+            request["ExpressionAttributeNames"] = expression_attribute_names
+
+        pending = {table.name: request}
+        attempt = 0
+        while pending:
+            response = dynamodb.batch_get_item(RequestItems=pending)
+            items.extend(response.get("Responses", {}).get(table.name, []))
+            pending = response.get("UnprocessedKeys") or {}
+            if pending:
+                attempt += 1
+                if attempt > BATCH_MAX_RETRIES:
+                    unprocessed = len(pending.get(table.name, {}).get("Keys", []))
+                    print(f"⚠️  Warning: batch_get_item gave up on {unprocessed} keys from {table.name}")
+                    break
+                time.sleep(min(0.05 * (2 ** attempt), 2.0))
+
+    return items
+
+
+def batch_delete_items(table, keys: List[Dict[str, Any]]) -> int:
+    """
+    Delete many items with BatchWriteItem (25 per request, unprocessed retried)
+
+    Args:
+        table: DynamoDB Table resource
+        keys: Primary keys to delete
+
+    Returns:
+        Number of delete requests issued
+    """
+    if not keys:
+        return 0
+    # Dedupe within the write buffer; duplicate keys in one request are rejected
+    with table.batch_writer(overwrite_by_pkeys=list(keys[0].keys())) as writer:
+        for key in keys:
+            writer.delete_item(Key=key)
+    return len(keys)
+
+
+def batch_put_items(table, items: List[Dict[str, Any]]) -> int:
+    """
+    Write many items with BatchWriteItem (25 per request, unprocessed retried)
+
+    Args:
+        table: DynamoDB Table resource
+        items: Full items to put
+
+    Returns:
+        Number of items written
+    """
+    with table.batch_writer() as writer:
+        for item in items:
+            writer.put_item(Item=item)
+    return len(items)
+
+
 # ============================================================================
 # USER OPERATIONS
 # ============================================================================
@@ -154,13 +364,13 @@ def get_taste(taste_id: str) -> Optional[Dict[str, Any]]:
 
 
 def list_tastes_for_owner(owner_id: str) -> List[Dict[str, Any]]:
-    """List all tastes for a specific owner"""
+    """List all tastes for a specific owner (follows every page)"""
     try:
-        response = tastes_table.query(
+        return list(_iter_items(
+            tastes_table.query,
             IndexName="owner_id-index",
             KeyConditionExpression=Key('owner_id').eq(owner_id)
-        )
-        return response.get("Items", [])
+        ))
     except ClientError as e:
         print(f"Error querying tastes: {e}")
         return []
@@ -257,31 +467,116 @@ def get_resource(resource_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _valid_resources(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Filter out corrupt/incomplete resource records (missing required fields)"""
+    valid_items = []
+    for item in items:
+        # Check if item has required fields
+        if "resource_id" in item and "name" in item:
+            valid_items.append(item)
+        else:
+            # Log corrupt record for cleanup
+            print(f"⚠️  Warning: Found corrupt resource record: {item.get('resource_id', 'unknown')}")
+            # Could optionally delete it here
+            # resources_table.delete_item(Key={"resource_id": item.get("resource_id")})
+    return valid_items
+
+
+def iter_resources_for_taste(taste_id: str, page_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream all resources for a taste, one DynamoDB page at a time
+
+    Args:
+        taste_id: Taste ID
+        page_size: Optional Limit per underlying query
+
+    Yields:
+        Valid resource records
+    """
+    pages = _iter_items(
+        resources_table.query,
+        page_size=page_size,
+        IndexName="taste_id-index",
+        KeyConditionExpression=Key('taste_id').eq(taste_id)
+    )
+    for item in pages:
+        yield from _valid_resources([item])
+
+
 def list_resources_for_taste(taste_id: str) -> List[Dict[str, Any]]:
-    """List all resources for a specific taste"""
+    """List all resources for a specific taste (follows every page)"""
     try:
-        response = resources_table.query(
+        return list(iter_resources_for_taste(taste_id))
+    except ClientError as e:
+        print(f"Error querying resources: {e}")
+        return []
+
+
+def list_resources_for_taste_page(
+    taste_id: str,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    List one page of resources for a taste
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        items, next_cursor = _read_page(
+            resources_table.query,
+            limit,
+            cursor,
             IndexName="taste_id-index",
             KeyConditionExpression=Key('taste_id').eq(taste_id)
         )
-        items = response.get("Items", [])
-        
-        # Filter out corrupt/incomplete records (missing required fields)
-        valid_items = []
-        for item in items:
-            # Check if item has required fields
-            if "resource_id" in item and "name" in item:
-                valid_items.append(item)
-            else:
-                # Log corrupt record for cleanup
-                print(f"⚠️  Warning: Found corrupt resource record: {item.get('resource_id', 'unknown')}")
-                # Could optionally delete it here
-                # resources_table.delete_item(Key={"resource_id": item.get("resource_id")})
-        
-        return valid_items
+        return {"items": _valid_resources(items), "next_cursor": next_cursor}
     except ClientError as e:
         print(f"Error querying resources: {e}")
-        return []
+        return {"items": [], "next_cursor": None}
+
+
+def count_resources_for_taste(taste_id: str) -> int:
+    """
+    Count resources for a taste
+
+    Counts the same records list_resources_for_taste returns (corrupt
+    records are skipped), but only transfers the fields that check reads.
+    """
+    try:
+        pages = _iter_items(
+            resources_table.query,
+            IndexName="taste_id-index",
+            KeyConditionExpression=Key('taste_id').eq(taste_id),
+            ProjectionExpression="resource_id, #n",
+            ExpressionAttributeNames={"#n": "name"}
+        )
+        return len(_valid_resources(list(pages)))
+    except ClientError as e:
+        print(f"Error counting resources: {e}")
+        return 0
+
+
+def get_resources(resource_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch many resources by ID with BatchGetItem
+
+    Returns:
+        Mapping of resource_id -> resource (missing IDs are absent)
+    """
+    ids = [rid for rid in resource_ids if rid]
+    if not ids:
+        return {}
+    try:
+        items = batch_get_items(resources_table, [{"resource_id": rid} for rid in ids])
+    except ClientError as e:
+        print(f"Error batch-reading resources: {e}")
+        return {}
+    return {item["resource_id"]: item for item in items}
 
 
 def update_resource(
@@ -363,6 +658,36 @@ def delete_resource(resource_id: str) -> bool:
         return False
 
 
+def delete_resources(taste_id: str, resource_ids: List[str]) -> int:
+    """
+    Delete many resources of one taste with batched writes
+
+    DTMs are invalidated once for the whole batch instead of once per resource.
+
+    Returns:
+        Number of resources deleted
+    """
+    if not resource_ids:
+        return 0
+    try:
+        deleted = batch_delete_items(
+            resources_table, [{"resource_id": rid} for rid in dict.fromkeys(resource_ids)]
+        )
+    except ClientError as e:
+        print(f"Error batch-deleting resources: {e}")
+        return 0
+
+    try:
+        from app.dtm import storage as dtm_storage
+        dtm_storage.invalidate_global_dtm(taste_id)
+        for resource_id in resource_ids:
+            dtm_storage.delete_subsets_containing_resource(taste_id, resource_id)
+    except Exception as e:
+        print(f"⚠️  Warning: Failed to invalidate DTMs: {e}")
+
+    return deleted
+
+
 # ============================================================================
 # PROJECT OPERATIONS
 # ============================================================================
@@ -423,18 +748,79 @@ def get_project(project_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def iter_projects_for_owner(owner_id: str, page_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream all projects for an owner, one DynamoDB page at a time
+
+    Args:
+        owner_id: Owner user ID
+        page_size: Optional Limit per underlying query
+
+    Yields:
+        Project records (Decimals converted)
+    """
+    for item in _iter_items(
+        projects_table.query,
+        page_size=page_size,
+        IndexName="owner_id-index",
+        KeyConditionExpression=Key('owner_id').eq(owner_id)
+    ):
+        yield convert_decimals(item)
+
+
 def list_projects_for_owner(owner_id: str) -> List[Dict[str, Any]]:
-    """List all projects for a specific owner"""
+    """List all projects for a specific owner (follows every page)"""
+    try:
+        return list(iter_projects_for_owner(owner_id))
+    except ClientError as e:
+        print(f"Error querying projects: {e}")
+        return []
+
+
+def list_projects_for_owner_page(
+    owner_id: str,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    List one page of projects for an owner
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
     try:
-        response = projects_table.query(
+        items, next_cursor = _read_page(
+            projects_table.query,
+            limit,
+            cursor,
             IndexName="owner_id-index",
             KeyConditionExpression=Key('owner_id').eq(owner_id)
         )
-        items = response.get("Items", [])
-        return [convert_decimals(item) for item in items]
+        return {"items": [convert_decimals(item) for item in items], "next_cursor": next_cursor}
     except ClientError as e:
         print(f"Error querying projects: {e}")
-        return []
+        return {"items": [], "next_cursor": None}
+
+
+def get_projects(project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch many projects by ID with BatchGetItem
+
+    Returns:
+        Mapping of project_id -> project (missing IDs are absent)
+    """
+    ids = [pid for pid in project_ids if pid]
+    if not ids:
+        return {}
+    try:
+        items = batch_get_items(projects_table, [{"project_id": pid} for pid in ids])
+    except ClientError as e:
+        print(f"Error batch-reading projects: {e}")
+        return {}
+    return {item["project_id"]: convert_decimals(item) for item in items}
 
 
 def update_project(
@@ -515,12 +901,17 @@ def delete_project(project_id: str) -> bool:
 
 
 def update_project_flow_graph(project_id: str, flow_graph: dict) -> Dict[str, Any]:
-    """Update project's flow_graph"""
+    """
+    Store a full flow_graph on the project item
+    
+    Used for live progress during generation; finished versions are stored
+    with update_project_flow_ref. Clears any flow_ref so the two never disagree.
+    """
     now = get_timestamp()
     
     response = projects_table.update_item(
         Key={"project_id": project_id},
-        UpdateExpression="SET flow_graph = :flow_graph, updated_at = :updated",
+        UpdateExpression="SET flow_graph = :flow_graph, updated_at = :updated REMOVE flow_ref",
         ExpressionAttributeValues={
             ":flow_graph": flow_graph,
             ":updated": now
@@ -531,6 +922,36 @@ def update_project_flow_graph(project_id: str, flow_graph: dict) -> Dict[str, An
     return response.get("Attributes", {})
 
 
+def update_project_flow_ref(project_id: str, flow_ref: dict) -> Dict[str, Any]:
+    """
+    Point the project at a stored flow version instead of embedding the graph
+    
+    Keeps the item small (well under the 400 KB limit) however large the
+    project's code gets. Readers resolve it with
+    app.core.storage.resolve_project_flow_graph.
+    
+    Args:
+        project_id: Project ID
+        flow_ref: Pointer from app.core.storage.put_project_flow
+    
+    Returns:
+        Updated project item
+    """
+    now = get_timestamp()
+    
+    response = projects_table.update_item(
+        Key={"project_id": project_id},
+        UpdateExpression="SET flow_ref = :flow_ref, updated_at = :updated REMOVE flow_graph",
+        ExpressionAttributeValues={
+            ":flow_ref": flow_ref,
+            ":updated": now
+        },
+        ReturnValues="ALL_NEW"
+    )
+    
+    return response.get("Attributes", {})
+
+
 # ============================================================================
 # DESIGN MUTATIONS OPERATIONS
 # ============================================================================
@@ -563,50 +984,133 @@ def create_design_mutation(
     return item
 
 
+def create_design_mutations(
+    project_id: str,
+    screen_id: str,
+    mutations: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Create many design mutations for a screen with BatchWriteItem
+
+    Args:
+        project_id: Project ID
+        screen_id: Screen ID
+        mutations: Dicts with mutation_type, element_path, element_index, mutation_data
+
+    Returns:
+        The created items
+    """
+    now = get_timestamp()
+    items = [
+        {
+            "mutation_id": generate_uuid(),
+            "project_id": project_id,
+            "screen_id": screen_id,
+            "mutation_type": mutation.get("mutation_type", "style_override"),
+            "element_path": mutation.get("element_path", ""),
+            "element_index": mutation.get("element_index", 0),
+            "mutation_data": mutation.get("mutation_data", {}),
+            "created_at": now,
+            "updated_at": now
+        }
+        for mutation in mutations
+    ]
+    batch_put_items(design_mutations_table, items)
+    return items
+
+
+def _iter_design_mutations(
+    project_id: str,
+    screen_id: str,
+    projection: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream design mutations for a screen, every page
+
+    Falls back to a paginated scan if the GSI is missing (slower but works).
+    """
+    key_condition = Key('project_id').eq(project_id) & Key('screen_id').eq(screen_id)
+    filter_expression = Attr('project_id').eq(project_id) & Attr('screen_id').eq(screen_id)
+    extra = {"ProjectionExpression": projection} if projection else {}
+
+    try:
+        # Pull the first page eagerly so a missing index surfaces here
+        pages = _iter_items(
+            design_mutations_table.query,
+            IndexName="project_id-screen_id-index",
+            KeyConditionExpression=key_condition,
+            **extra
+        )
+        first = next(pages, None)
+    except ClientError as e:
+        print(f"Error querying design mutations: {e}")
+        yield from _iter_items(
+            design_mutations_table.scan,
+            FilterExpression=filter_expression,
+            **extra
+        )
+        return
+
+    if first is not None:
+        yield first
+        yield from pages
+
+
 def get_design_mutations_for_screen(
     project_id: str,
     screen_id: str
 ) -> List[Dict[str, Any]]:
-    """Get all design mutations for a specific screen"""
+    """Get all design mutations for a specific screen (follows every page)"""
+    try:
+        return [convert_decimals(item) for item in _iter_design_mutations(project_id, screen_id)]
+    except ClientError as e:
+        print(f"Error scanning design mutations: {e}")
+        return []
+
+
+def get_design_mutations_for_screen_page(
+    project_id: str,
+    screen_id: str,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get one page of design mutations for a screen
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
     try:
-        response = design_mutations_table.query(
+        items, next_cursor = _read_page(
+            design_mutations_table.query,
+            limit,
+            cursor,
             IndexName="project_id-screen_id-index",
             KeyConditionExpression=Key('project_id').eq(project_id) & Key('screen_id').eq(screen_id)
         )
-        items = response.get("Items", [])
-        return [convert_decimals(item) for item in items]
+        return {"items": [convert_decimals(item) for item in items], "next_cursor": next_cursor}
     except ClientError as e:
         print(f"Error querying design mutations: {e}")
-        # If index doesn't exist, fall back to scan (slower but works)
-        try:
-            response = design_mutations_table.scan(
-                FilterExpression=Attr('project_id').eq(project_id) & Attr('screen_id').eq(screen_id)
-            )
-            items = response.get("Items", [])
-            return [convert_decimals(item) for item in items]
-        except ClientError as e2:
-            print(f"Error scanning design mutations: {e2}")
-            return []
+        return {"items": [], "next_cursor": None}
 
 
 def delete_design_mutations_for_screen(
     project_id: str,
     screen_id: str
 ) -> int:
-    """Delete all design mutations for a specific screen"""
-    mutations = get_design_mutations_for_screen(project_id, screen_id)
-    deleted_count = 0
-    
-    for mutation in mutations:
-        try:
-            design_mutations_table.delete_item(
-                Key={"mutation_id": mutation["mutation_id"]}
-            )
-            deleted_count += 1
-        except ClientError as e:
-            print(f"Error deleting mutation {mutation['mutation_id']}: {e}")
-    
-    return deleted_count
+    """Delete all design mutations for a specific screen (batched writes)"""
+    try:
+        keys = [
+            {"mutation_id": item["mutation_id"]}
+            for item in _iter_design_mutations(project_id, screen_id, projection="mutation_id")
+        ]
+        return batch_delete_items(design_mutations_table, keys)
+    except ClientError as e:
+        print(f"Error deleting mutations for screen {screen_id}: {e}")
+        return 0
 
 
 def delete_design_mutation(mutation_id: str) -> bool:
@@ -659,25 +1163,76 @@ def update_project_flow_version(project_id: str, version: int):
 # USER LISTING (for share-to-user feature)
 # ============================================================================
 
+USER_SUMMARY_PROJECTION = "user_id, email, #n, picture"
+USER_SUMMARY_NAMES = {"#n": "name"}
+
+
 def list_all_users() -> List[Dict[str, Any]]:
     """List all users (for share-to-user dropdown). Returns minimal info only."""
     try:
-        response = users_table.scan(
-            ProjectionExpression="user_id, email, #n, picture",
-            ExpressionAttributeNames={"#n": "name"}
-        )
-        return response.get("Items", [])
+        return list(_iter_items(
+            users_table.scan,
+            ProjectionExpression=USER_SUMMARY_PROJECTION,
+            ExpressionAttributeNames=USER_SUMMARY_NAMES
+        ))
     except ClientError as e:
         print(f"Error listing users: {e}")
         return []
 
 
+def list_users_page(limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    List one page of users (minimal info only)
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        items, next_cursor = _read_page(
+            users_table.scan,
+            limit,
+            cursor,
+            ProjectionExpression=USER_SUMMARY_PROJECTION,
+            ExpressionAttributeNames=USER_SUMMARY_NAMES
+        )
+        return {"items": items, "next_cursor": next_cursor}
+    except ClientError as e:
+        print(f"Error listing users: {e}")
+        return {"items": [], "next_cursor": None}
+
+
+def get_users(user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch many users by ID with BatchGetItem (minimal info only)
+
+    Returns:
+        Mapping of user_id -> user (missing IDs are absent)
+    """
+    ids = [uid for uid in user_ids if uid]
+    if not ids:
+        return {}
+    try:
+        items = batch_get_items(
+            users_table,
+            [{"user_id": uid} for uid in ids],
+            projection=USER_SUMMARY_PROJECTION,
+            expression_attribute_names=USER_SUMMARY_NAMES
+        )
+    except ClientError as e:
+        print(f"Error batch-reading users: {e}")
+        return {}
+    return {item["user_id"]: item for item in items}
+
+
 # ============================================================================
 # PROJECT SHARES TABLE OPERATIONS
 # ============================================================================
 
 SHARES_TABLE_NAME = os.getenv("SHARES_TABLE", "OsyleProjectShares")
-shares_table = dynamodb.Table(SHARES_TABLE_NAME)
+shares_table = _lazy_table(SHARES_TABLE_NAME)
 
 
 def create_project_share(
@@ -704,31 +1259,87 @@ def create_project_share(
 
 
 def list_shares_for_recipient(recipient_id: str) -> List[Dict[str, Any]]:
-    """List all shares sent TO a specific user."""
+    """List all shares sent TO a specific user (follows every page)."""
     try:
-        response = shares_table.query(
+        return list(_iter_items(
+            shares_table.query,
             IndexName="recipient_id-index",
             KeyConditionExpression=Key("recipient_id").eq(recipient_id),
-        )
-        return response.get("Items", [])
+        ))
     except ClientError as e:
         print(f"Error querying shares: {e}")
         return []
 
 
+def list_shares_for_recipient_page(
+    recipient_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    List one page of shares sent TO a specific user.
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        items, next_cursor = _read_page(
+            shares_table.query,
+            limit,
+            cursor,
+            IndexName="recipient_id-index",
+            KeyConditionExpression=Key("recipient_id").eq(recipient_id),
+        )
+        return {"items": items, "next_cursor": next_cursor}
+    except ClientError as e:
+        print(f"Error querying shares: {e}")
+        return {"items": [], "next_cursor": None}
+
+
 def list_shares_sent_by(sender_id: str) -> List[Dict[str, Any]]:
-    """List all shares sent BY a specific user."""
+    """List all shares sent BY a specific user (follows every page)."""
     try:
-        response = shares_table.query(
+        return list(_iter_items(
+            shares_table.query,
             IndexName="sender_id-index",
             KeyConditionExpression=Key("sender_id").eq(sender_id),
-        )
-        return response.get("Items", [])
+        ))
     except ClientError as e:
         print(f"Error querying sent shares: {e}")
         return []
 
 
+def list_shares_sent_by_page(
+    sender_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    List one page of shares sent BY a specific user.
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        items, next_cursor = _read_page(
+            shares_table.query,
+            limit,
+            cursor,
+            IndexName="sender_id-index",
+            KeyConditionExpression=Key("sender_id").eq(sender_id),
+        )
+        return {"items": items, "next_cursor": next_cursor}
+    except ClientError as e:
+        print(f"Error querying sent shares: {e}")
+        return {"items": [], "next_cursor": None}
+
+
 def get_share(share_id: str) -> Optional[Dict[str, Any]]:
     """Get a single share record."""
     try:
@@ -751,17 +1362,20 @@ def delete_shares_for_project(project_id: str) -> int:
     """
     Delete all share records that reference a given project_id.
     Called when a project is deleted so orphaned inbox entries are cleaned up.
-    Uses a Scan + filter — acceptable because project deletion is infrequent.
+    Uses a paginated Scan + filter — acceptable because project deletion is
+    infrequent. Deletes are batched.
     Returns the number of share records deleted.
     """
     try:
-        response = shares_table.scan(
-            FilterExpression=Attr("original_project_id").eq(project_id)
-        )
-        items = response.get("Items", [])
-        for item in items:
-            shares_table.delete_item(Key={"share_id": item["share_id"]})
-        return len(items)
+        keys = [
+            {"share_id": item["share_id"]}
+            for item in _iter_items(
+                shares_table.scan,
+                FilterExpression=Attr("original_project_id").eq(project_id),
+                ProjectionExpression="share_id",
+            )
+        ]
+        return batch_delete_items(shares_table, keys)
     except ClientError as e:
         print(f"Error cleaning up shares for project {project_id}: {e}")
         return 0
\ No newline at end of file
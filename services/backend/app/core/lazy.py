@@ -0,0 +1,139 @@
+"""
+Lazy initialization for cold starts
+Heavy clients and libraries (LLM provider SDKs, PIL, sklearn, DynamoDB/S3
+handles) are created on first use instead of at import
+
+LAZY_INIT picks the mode:
+- "true": nothing heavy loads until a request needs it (fastest cold start)
+- "false": app.main loads the provider SDKs, PIL and AWS handles at import
+  via warm_up() (first requests pay nothing; what long-running servers want)
+- "auto" (default): lazy on AWS Lambda, eager elsewhere
+"""
+import os
+import time
+import importlib
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+# ============================================================================
+# MODE
+# ============================================================================
+
+LAZY_INIT = os.getenv("LAZY_INIT", "auto").lower()
+
+
+def is_lazy_init() -> bool:
+    """True if heavy dependencies should load on first use"""
+    if LAZY_INIT == "auto":
+        return bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+    return LAZY_INIT == "true"
+
+
+# ============================================================================
+# LAZY OBJECTS
+# ============================================================================
+
+class LazyObject:
+    """
+    Stand-in for an object that is created on first attribute access
+
+    Module globals such as db.projects_table keep working unchanged
+    (projects_table.query(...)); the factory runs once, thread-safely.
+    """
+
+    __slots__ = ("_lazy_factory", "_lazy_name", "_lazy_instance", "_lazy_lock")
+
+    def __init__(self, factory: Callable[[], Any], name: str):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_instance", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    def resolve(self) -> Any:
+        """Create the object if needed and return it"""
+        instance = self._lazy_instance
+        if instance is None:
+            with self._lazy_lock:
+                instance = self._lazy_instance
+                if instance is None:
+                    instance = self._lazy_factory()
+                    object.__setattr__(self, "_lazy_instance", instance)
+        return instance
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._lazy_instance is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self.resolve(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "resolved" if self.is_resolved else "pending"
+        return f"<LazyObject {self._lazy_name} ({state})>"
+
+
+def resolve(value: Any) -> Any:
+    """The real object behind a LazyObject (other values are returned as-is)"""
+    return value.resolve() if isinstance(value, LazyObject) else value
+
+
+# ============================================================================
+# WARM-UP
+# ============================================================================
+
+def _warm_dynamodb() -> None:
+    from app.core import db
+    for table in (db.users_table, db.tastes_table, db.resources_table,
+                  db.projects_table, db.design_mutations_table):
+        resolve(table)
+
+
+def _warm_s3() -> None:
+    from app.core import storage
+    resolve(storage.s3_client)
+
+
+def _import(module: str) -> Callable[[], None]:
+    return lambda: importlib.import_module(module)
+
+
+# Everything LAZY_INIT=true defers
+WARM_UP_STEPS: Dict[str, Callable[[], None]] = {
+    "dynamodb": _warm_dynamodb,
+    "s3": _warm_s3,
+    "anthropic": _import("app.llm.providers.anthropic"),
+    "google": _import("app.llm.providers.google"),
+    "openai": _import("app.llm.providers.openai"),
+    "pil": _import("PIL.Image"),
+    "sklearn": _import("sklearn.cluster"),
+}
+
+# What eager mode loads, in order. sklearn is left out: it only backs the
+# k-means palette path, which the pipeline no longer takes by default.
+EAGER_WARM_UP_STEPS = ("dynamodb", "s3", "anthropic", "google", "openai", "pil")
+
+
+def warm_up(steps: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Load deferred dependencies now
+
+    Args:
+        steps: Names from WARM_UP_STEPS (default: EAGER_WARM_UP_STEPS)
+
+    Returns:
+        Milliseconds per step (steps that fail to load are reported and skipped)
+    """
+    timings = {}
+    for name in (steps if steps is not None else EAGER_WARM_UP_STEPS):
+        start = time.perf_counter()
+        try:
+            WARM_UP_STEPS[name]()
+        except Exception as e:
+            print(f"⚠️  Warm-up step {name} failed: {e}")
+            continue
+        timings[name] = (time.perf_counter() - start) * 1000
+    return timings
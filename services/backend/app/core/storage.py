@@ -5,10 +5,16 @@ Provides presigned URL generation and file operations
 import os
 import re
 import json
+import base64
+import hashlib
+import threading
 import boto3
+from concurrent.futures import ThreadPoolExecutor
 from botocore.config import Config
 from botocore.exceptions import ClientError
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
+
+from app.core.lazy import LazyObject
 
 
 # ============================================================================
@@ -19,21 +25,26 @@ S3_REGION = os.getenv("AWS_REGION", "us-east-1")
 S3_BUCKET = os.getenv("S3_BUCKET", "osyle-shared-assets")
 S3_ENDPOINT = os.getenv("S3_ENDPOINT_URL")  # For local development (LocalStack)
 PRESIGNED_EXPIRATION = int(os.getenv("PRESIGNED_EXPIRATION", "3600"))  # 1 hour default
+# HTTP connection pool size; sized for concurrent calls from app.core.async_io
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50"))
+# Concurrent GETs per bulk fetch (kept below the connection pool size)
+S3_BULK_FETCH_CONCURRENCY = int(os.getenv("S3_BULK_FETCH_CONCURRENCY", "16"))
+# Body read size when streaming objects
+S3_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _create_s3_client():
+    kwargs = {
+        "region_name": S3_REGION,
+        "config": Config(signature_version='s3v4', max_pool_connections=S3_MAX_POOL_CONNECTIONS),
+    }
+    if S3_ENDPOINT:
+        kwargs["endpoint_url"] = S3_ENDPOINT
+    return boto3.client("s3", **kwargs)
 
-# Initialize S3 client
-if S3_ENDPOINT:
-    s3_client = boto3.client(
-        "s3",
-        region_name=S3_REGION,
-        endpoint_url=S3_ENDPOINT,
-        config=Config(signature_version='s3v4')
-    )
-else:
-    s3_client = boto3.client(
-        "s3",
-        region_name=S3_REGION,
-        config=Config(signature_version='s3v4')
-    )
+
+# S3 client is created on first use (see app.core.lazy)
+s3_client = LazyObject(_create_s3_client, "s3")
 
 
 # ============================================================================
@@ -233,6 +244,110 @@ def delete_object(key: str) -> bool:
         return False
 
 
+def get_object_bytes(key: str) -> bytes:
+    """
+    Download an object's raw bytes from S3
+    
+    Args:
+        key: S3 object key
+    
+    Returns:
+        Object body
+    
+    Raises:
+        ClientError: If the object is missing or the request fails
+    """
+    response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
+    return response['Body'].read()
+
+
+def put_object_bytes(key: str, body: bytes, content_type: str) -> None:
+    """
+    Upload raw bytes to S3
+    
+    Args:
+        key: S3 object key
+        body: Object body
+        content_type: MIME type of the object
+    
+    Raises:
+        ClientError: If the upload fails
+    """
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=key,
+        Body=body,
+        ContentType=content_type
+    )
+
+
+# Dedicated pool for bulk fetches. Separate from app.core.async_io so a bulk
+# fetch that is itself running on an I/O worker can never starve that pool.
+_bulk_fetch_executor: Optional[ThreadPoolExecutor] = None
+_bulk_fetch_lock = threading.Lock()
+
+
+def _get_bulk_fetch_executor() -> ThreadPoolExecutor:
+    global _bulk_fetch_executor
+    if _bulk_fetch_executor is None:
+        with _bulk_fetch_lock:
+            if _bulk_fetch_executor is None:
+                _bulk_fetch_executor = ThreadPoolExecutor(
+                    max_workers=S3_BULK_FETCH_CONCURRENCY,
+                    thread_name_prefix="osyle-s3-fetch"
+                )
+    return _bulk_fetch_executor
+
+
+def _fetch_object(key: str, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Stream one object into memory; errors are returned, not raised"""
+    result = {'key': key, 'body': None, 'content_type': None, 'error': None}
+    try:
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
+        if max_bytes is not None and response.get('ContentLength', 0) > max_bytes:
+            response['Body'].close()
+            result['error'] = f"object is {response['ContentLength']} bytes (limit {max_bytes})"
+            return result
+
+        chunks = []
+        for chunk in response['Body'].iter_chunks(chunk_size=S3_STREAM_CHUNK_SIZE):
+            chunks.append(chunk)
+        result['body'] = b"".join(chunks)
+        result['content_type'] = response.get('ContentType')
+    except ClientError as e:
+        result['error'] = e.response.get('Error', {}).get('Code') or str(e)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def get_objects_bytes(keys: List[str], max_bytes: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Download many objects concurrently over a bounded pool
+    
+    Args:
+        keys: S3 object keys (duplicates are fetched once)
+        max_bytes: Optional per-object size limit; larger objects are reported as errors
+    
+    Returns:
+        One dict per key, in the same order as keys:
+        {'key', 'body': bytes | None, 'content_type': str | None, 'error': str | None}
+        A missing object has error 'NoSuchKey'. Never raises for per-key failures.
+    """
+    if not keys:
+        return []
+    
+    unique_keys = list(dict.fromkeys(keys))
+    if len(unique_keys) == 1:
+        fetched = {unique_keys[0]: _fetch_object(unique_keys[0], max_bytes)}
+    else:
+        executor = _get_bulk_fetch_executor()
+        futures = {key: executor.submit(_fetch_object, key, max_bytes) for key in unique_keys}
+        fetched = {key: future.result() for key, future in futures.items()}
+    
+    return [dict(fetched[key]) for key in keys]
+
+
 def delete_resource_files(owner_id: str, taste_id: str, resource_id: str) -> dict:
     """
     Delete both figma.json and image.png for a resource
@@ -435,28 +550,19 @@ def get_inspiration_images(user_id: str, project_id: str, image_keys: List[str])
     """
     Get inspiration images for a project
     
-    Returns list of dicts with base64 data and media_type
+    Returns list of dicts with base64 data and media_type, in image_keys order
+    (images that fail to load are skipped)
     """
     images = []
     
-    for key in image_keys:
-        try:
-            response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
-            image_bytes = response['Body'].read()
-            
-            # Encode as base64
-            import base64
-            base64_data = base64.b64encode(image_bytes).decode('utf-8')
-            
-            # Get content type
-            content_type = response.get('ContentType', 'image/png')
-            
-            images.append({
-                'data': base64_data,
-                'media_type': content_type
-            })
-        except Exception as e:
-            print(f"Error loading inspiration image {key}: {e}")
+    for fetched in get_objects_bytes(image_keys):
+        if fetched['error']:
+            print(f"Error loading inspiration image {fetched['key']}: {fetched['error']}")
+            continue
+        images.append({
+            'data': base64.b64encode(fetched['body']).decode('utf-8'),
+            'media_type': fetched['content_type'] or 'image/png'
+        })
     
     return images
 
@@ -467,52 +573,313 @@ def get_screen_reference_files(user_id: str, project_id: str, screen_index: int,
     
     Returns dict with figma_data and images list
     """
-    result = {
-        'figma_data': None,
-        'images': []
-    }
+    return get_screens_reference_files(user_id, project_id, [{
+        'screen_index': screen_index,
+        'has_figma': has_figma,
+        'image_count': image_count
+    }])[0]
+
+
+def get_screens_reference_files(user_id: str, project_id: str, screens: List[dict]) -> List[dict]:
+    """
+    Get reference files for several screens with one concurrent bulk fetch
     
-    # Get figma.json if available
-    if has_figma:
-        try:
-            figma_key = get_screen_reference_figma_key(user_id, project_id, screen_index)
-            response = s3_client.get_object(Bucket=S3_BUCKET, Key=figma_key)
-            figma_str = response['Body'].read().decode('utf-8')
-            result['figma_data'] = json.loads(figma_str)
-        except Exception as e:
-            print(f"Error loading screen {screen_index} figma: {e}")
+    Args:
+        user_id: Project owner
+        project_id: Project ID
+        screens: Dicts with screen_index, has_figma and image_count
     
-    # Get images if available
-    for img_idx in range(image_count):
-        try:
-            img_key = get_screen_reference_image_key(user_id, project_id, screen_index, img_idx)
-            response = s3_client.get_object(Bucket=S3_BUCKET, Key=img_key)
-            image_bytes = response['Body'].read()
-            
-            import base64
-            base64_data = base64.b64encode(image_bytes).decode('utf-8')
-            content_type = response.get('ContentType', 'image/png')
-            
+    Returns:
+        One {'figma_data', 'images'} dict per screen, in the same order
+        (files that fail to load are skipped, as in get_screen_reference_files)
+    """
+    # Plan every key up front so all screens share one pool
+    plan = []
+    for screen in screens:
+        screen_index = screen['screen_index']
+        if screen.get('has_figma'):
+            plan.append((screen_index, 'figma', get_screen_reference_figma_key(user_id, project_id, screen_index)))
+        for img_idx in range(screen.get('image_count', 0)):
+            plan.append((screen_index, img_idx, get_screen_reference_image_key(user_id, project_id, screen_index, img_idx)))
+    
+    fetched_list = get_objects_bytes([key for _, _, key in plan])
+    
+    results = {screen['screen_index']: {'figma_data': None, 'images': []} for screen in screens}
+    for (screen_index, kind, _), fetched in zip(plan, fetched_list):
+        result = results[screen_index]
+        if kind == 'figma':
+            if fetched['error']:
+                print(f"Error loading screen {screen_index} figma: {fetched['error']}")
+                continue
+            try:
+                result['figma_data'] = json.loads(fetched['body'].decode('utf-8'))
+            except Exception as e:
+                print(f"Error loading screen {screen_index} figma: {e}")
+        else:
+            if fetched['error']:
+                print(f"Error loading screen {screen_index} image {kind}: {fetched['error']}")
+                continue
             result['images'].append({
-                'data': base64_data,
-                'media_type': content_type
+                'data': base64.b64encode(fetched['body']).decode('utf-8'),
+                'media_type': fetched['content_type'] or 'image/png'
             })
-        except Exception as e:
-            print(f"Error loading screen {screen_index} image {img_idx}: {e}")
     
-    return result
+    return [results[screen['screen_index']] for screen in screens]
 
 
 # ============================================================================
 # FLOW VERSIONING FUNCTIONS
 # ============================================================================
+#
+# Flow versions are stored content-addressed so an edit only writes what
+# changed:
+#   projects/{user}/{project}/blobs/{hh}/{sha256}     - one large string (screen code)
+#   projects/{user}/{project}/flow_v{N}.manifest.json - the graph with large
+#                                                       strings replaced by {"$blob": sha256}
+# The DynamoDB project item keeps only a flow_ref pointer to the manifest.
+# Legacy flow_v{N}.json copies are still read. Blobs are never deleted with a
+# version because later versions share them.
+#
+# shadcn/ui components are not stored per project at all: the graph keeps a
+# project.component_bundle reference and the sources come from the bundle
+# with that content hash (see COMPONENT BUNDLES below).
+
+FLOW_MANIFEST_FORMAT = "osyle.flow-manifest/1"
+BLOB_REF_KEY = "$blob"
+# Strings at least this long (in bytes) are moved out of the manifest into blobs
+FLOW_BLOB_MIN_BYTES = int(os.getenv("FLOW_BLOB_MIN_BYTES", "512"))
+
+_FLOW_VERSION_KEY_RE = re.compile(r'flow_v(\d+)(?:\.manifest)?\.json$')
+
+
+def get_flow_manifest_key(owner_id: str, project_id: str, version: int) -> str:
+    """Generate S3 key for a flow version manifest"""
+    return f"projects/{owner_id}/{project_id}/flow_v{version}.manifest.json"
+
+
+def get_flow_legacy_key(owner_id: str, project_id: str, version: int) -> str:
+    """Generate S3 key for a full-copy flow version (pre-manifest format)"""
+    return f"projects/{owner_id}/{project_id}/flow_v{version}.json"
+
+
+def get_flow_blob_key(owner_id: str, project_id: str, digest: str) -> str:
+    """Generate S3 key for a content-addressed flow blob"""
+    return f"projects/{owner_id}/{project_id}/blobs/{digest[:2]}/{digest}"
+
+
+def make_flow_ref(owner_id: str, project_id: str, version: int) -> dict:
+    """Pointer stored on the project item instead of the full flow graph"""
+    return {
+        "version": version,
+        "manifest_key": get_flow_manifest_key(owner_id, project_id, version),
+    }
+
+
+def split_flow_graph(flow_graph: dict) -> tuple:
+    """
+    Move large strings out of a flow graph
+    
+    Args:
+        flow_graph: JSON-serializable flow graph
+    
+    Returns:
+        (skeleton with {"$blob": sha256} in place of each large string,
+         {sha256: string} for every distinct blob)
+    """
+    blobs: Dict[str, str] = {}
+    
+    def walk(value):
+        if isinstance(value, str):
+            encoded = value.encode('utf-8')
+            if len(encoded) < FLOW_BLOB_MIN_BYTES:
+                return value
+            digest = hashlib.sha256(encoded).hexdigest()
+            blobs[digest] = value
+            return {BLOB_REF_KEY: digest}
+        if isinstance(value, dict):
+            return {k: walk(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [walk(v) for v in value]
+        return value
+    
+    return walk(flow_graph), blobs
+
+
+def join_flow_graph(skeleton: Any, blobs: Dict[str, str]) -> Any:
+    """Inverse of split_flow_graph"""
+    if isinstance(skeleton, dict):
+        if len(skeleton) == 1 and BLOB_REF_KEY in skeleton:
+            return blobs[skeleton[BLOB_REF_KEY]]
+        return {k: join_flow_graph(v, blobs) for k, v in skeleton.items()}
+    if isinstance(skeleton, list):
+        return [join_flow_graph(v, blobs) for v in skeleton]
+    return skeleton
+
+
+def _put_blob(key: str, text: str) -> int:
+    body = text.encode('utf-8')
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=key,
+        Body=body,
+        ContentType='text/plain; charset=utf-8'
+    )
+    return len(body)
+
+
+# ============================================================================
+# COMPONENT BUNDLES
+# ============================================================================
+#
+# Static component libraries, stored once per version for every project:
+#   bundles/{name}/{version}.json - {"name", "version", "files"}
+# The running process always has its own bundle; the S3 copy serves flows
+# saved by a deploy with a different library.
+
+_stored_bundles = set()
+_stored_bundles_lock = threading.Lock()
+
+
+def get_component_bundle_key(name: str, version: str) -> str:
+    """Generate S3 key for a component bundle version"""
+    return f"bundles/{name}/{version}.json"
+
+
+def store_component_bundle(bundle) -> None:
+    """
+    Upload a bundle version unless it is already stored (checked once per process)
+    
+    Args:
+        bundle: app.generation.component_bundle.ComponentBundle
+    """
+    key = get_component_bundle_key(bundle.name, bundle.version)
+    with _stored_bundles_lock:
+        if key in _stored_bundles:
+            return
+    
+    if not check_object_exists(key):
+        put_object_bytes(
+            key,
+            json.dumps(bundle.to_dict(), separators=(',', ':')).encode('utf-8'),
+            'application/json'
+        )
+        print(f"✅ Stored component bundle {bundle.name}@{bundle.version} ({bundle.size / 1024:.1f} KB)")
+    
+    with _stored_bundles_lock:
+        _stored_bundles.add(key)
+
+
+def load_component_bundle(name: str, version: str):
+    """
+    Get a bundle version from this process or from S3
+    
+    Returns:
+        ComponentBundle (registered for later lookups), or None if not stored
+    """
+    from app.generation.component_bundle import ComponentBundle, get_registered_bundle, register_bundle
+    
+    bundle = get_registered_bundle(name, version)
+    if bundle is not None:
+        return bundle
+    
+    try:
+        data = json.loads(get_object_bytes(get_component_bundle_key(name, version)).decode('utf-8'))
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return None
+        raise
+    return register_bundle(ComponentBundle.from_dict(data))
+
+
+def pack_flow_graph(flow_graph: dict) -> dict:
+    """
+    Replace the shadcn/ui sources in a flow graph's project with a bundle reference
+    
+    The bundle is stored first so the reference can always be resolved. If
+    that fails the graph is returned with its sources (just larger).
+    
+    Args:
+        flow_graph: Flow graph with project.files
+    
+    Returns:
+        New flow graph (the input is not modified)
+    """
+    from app.generation.component_bundle import get_default_bundle, pack_project
+    
+    project = flow_graph.get("project") if isinstance(flow_graph, dict) else None
+    if not isinstance(project, dict) or not isinstance(project.get("files"), dict):
+        return flow_graph
+    
+    bundle = get_default_bundle()
+    try:
+        store_component_bundle(bundle)
+    except Exception as e:
+        print(f"⚠️  Could not store component bundle {bundle.name}@{bundle.version}, keeping sources: {e}")
+        return flow_graph
+    
+    return {**flow_graph, "project": pack_project(project, bundle)}
+
+
+def unpack_flow_graph(flow_graph: Any) -> Any:
+    """
+    Inverse of pack_flow_graph (graphs without a bundle reference are returned as-is)
+    
+    Raises:
+        ValueError: If the referenced bundle version is not stored
+    """
+    from app.generation.component_bundle import unpack_project
+    
+    project = flow_graph.get("project") if isinstance(flow_graph, dict) else None
+    if not isinstance(project, dict):
+        return flow_graph
+    
+    unpacked = unpack_project(project, loader=load_component_bundle)
+    if unpacked is project:
+        return flow_graph
+    return {**flow_graph, "project": unpacked}
+
+
+def get_flow_manifest(user_id: str, project_id: str, version: int) -> Optional[dict]:
+    """Load a version's manifest (None if the version is missing or legacy)"""
+    try:
+        response = s3_client.get_object(
+            Bucket=S3_BUCKET, Key=get_flow_manifest_key(user_id, project_id, version)
+        )
+        return json.loads(response['Body'].read().decode('utf-8'))
+    except s3_client.exceptions.NoSuchKey:
+        return None
+
+
+def hydrate_flow_manifest(user_id: str, project_id: str, manifest: dict) -> dict:
+    """
+    Rebuild the full flow graph from a manifest (blobs fetched concurrently)
+    
+    Raises:
+        ValueError: If a referenced blob is missing
+    """
+    digests = manifest.get("blobs", [])
+    fetched = get_objects_bytes([get_flow_blob_key(user_id, project_id, d) for d in digests])
+    
+    blobs = {}
+    for digest, result in zip(digests, fetched):
+        if result['error']:
+            raise ValueError(f"Flow blob {digest[:12]} unavailable: {result['error']}")
+        blobs[digest] = result['body'].decode('utf-8')
+    
+    return unpack_flow_graph(join_flow_graph(manifest["graph"], blobs))
+
 
 def get_project_flow(user_id: str, project_id: str, version: int = 1) -> dict:
     """Get flow graph from project (specific version)"""
-    key = f"projects/{user_id}/{project_id}/flow_v{version}.json"
-    
     try:
-        response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
+        manifest = get_flow_manifest(user_id, project_id, version)
+        if manifest is not None:
+            return hydrate_flow_manifest(user_id, project_id, manifest)
+        
+        # Versions saved before manifests were full copies
+        response = s3_client.get_object(
+            Bucket=S3_BUCKET, Key=get_flow_legacy_key(user_id, project_id, version)
+        )
         content = response['Body'].read().decode('utf-8')
         return json.loads(content)
     except s3_client.exceptions.NoSuchKey:
@@ -522,48 +889,126 @@ def get_project_flow(user_id: str, project_id: str, version: int = 1) -> dict:
         raise
 
 
-def put_project_flow(user_id: str, project_id: str, flow_graph: dict, version: int = 1):
-    """Save flow graph to project (versioned)"""
-    key = f"projects/{user_id}/{project_id}/flow_v{version}.json"
+def put_project_flow(
+    user_id: str,
+    project_id: str,
+    flow_graph: dict,
+    version: int = 1,
+    base_version: Optional[int] = None
+) -> dict:
+    """
+    Save flow graph to project (versioned)
+    
+    Only blobs the base version does not already reference are uploaded, so
+    saving after a one-screen edit writes that screen's code plus the manifest.
+    shadcn/ui components are saved as a bundle reference (pack_flow_graph).
     
+    Args:
+        user_id: Project owner ID
+        project_id: Project ID
+        flow_graph: JSON-serializable flow graph (no Decimals)
+        version: Version number to write
+        base_version: Version whose blobs are known to exist (default: version - 1)
+    
+    Returns:
+        flow_ref pointer for the project item (see make_flow_ref)
+    """
     try:
         # ✅ Validate JSON serialization (catches Decimal objects)
-        json_str = json.dumps(flow_graph, indent=2)
+        json.dumps(flow_graph)
+    except TypeError as e:
+        print(f"❌ JSON serialization error (likely Decimal objects): {e}")
+        print(f"❌ flow_graph keys: {list(flow_graph.keys())}")
+        raise ValueError(f"Cannot save flow_graph: contains non-JSON-serializable objects. Did you convert Decimals to floats first?")
+    
+    try:
+        skeleton, blobs = split_flow_graph(pack_flow_graph(flow_graph))
+        
+        if base_version is None:
+            base_version = version - 1
+        base_manifest = (
+            get_flow_manifest(user_id, project_id, base_version) if base_version >= 1 else None
+        )
+        known = set(base_manifest.get("blobs", [])) if base_manifest else set()
+        
+        # Content-addressed writes are idempotent, so re-uploading is only wasted bytes
+        new_digests = [digest for digest in blobs if digest not in known]
+        blob_bytes = 0
+        if new_digests:
+            executor = _get_bulk_fetch_executor()
+            futures = [
+                executor.submit(_put_blob, get_flow_blob_key(user_id, project_id, digest), blobs[digest])
+                for digest in new_digests
+            ]
+            blob_bytes = sum(future.result() for future in futures)
         
+        manifest = {
+            "format": FLOW_MANIFEST_FORMAT,
+            "version": version,
+            "graph": skeleton,
+            "blobs": sorted(blobs),
+        }
+        manifest_body = json.dumps(manifest, separators=(',', ':'))
         s3_client.put_object(
             Bucket=S3_BUCKET,
-            Key=key,
-            Body=json_str,
+            Key=get_flow_manifest_key(user_id, project_id, version),
+            Body=manifest_body,
             ContentType='application/json'
         )
-        print(f"✅ Successfully saved flow version {version} to S3")
-    except TypeError as e:
-        print(f"❌ JSON serialization error (likely Decimal objects): {e}")
-        print(f"❌ flow_graph keys: {list(flow_graph.keys())}")
-        raise ValueError(f"Cannot save flow_graph: contains non-JSON-serializable objects. Did you convert Decimals to floats first?")
+        
+        written_kb = (blob_bytes + len(manifest_body)) / 1024
+        print(f"✅ Successfully saved flow version {version} to S3 "
+              f"({len(new_digests)}/{len(blobs)} new blobs, {written_kb:.1f} KB written)")
+        return make_flow_ref(user_id, project_id, version)
     except Exception as e:
         print(f"❌ Error saving flow to S3: {e}")
         raise
 
 
+def copy_project_flow_version(user_id: str, project_id: str, version: int, new_version: int) -> dict:
+    """
+    Save an existing version again as new_version (used by revert)
+    
+    Manifest versions are copied without touching any blob.
+    
+    Returns:
+        flow_ref pointer for the project item
+    
+    Raises:
+        ValueError: If the version does not exist
+    """
+    manifest = get_flow_manifest(user_id, project_id, version)
+    if manifest is None:
+        flow_graph = get_project_flow(user_id, project_id, version)
+        if flow_graph is None:
+            raise ValueError(f"Flow version {version} not found")
+        return put_project_flow(user_id, project_id, flow_graph, new_version)
+    
+    manifest["version"] = new_version
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=get_flow_manifest_key(user_id, project_id, new_version),
+        Body=json.dumps(manifest, separators=(',', ':')),
+        ContentType='application/json'
+    )
+    print(f"✅ Copied flow version {version} to version {new_version}")
+    return make_flow_ref(user_id, project_id, new_version)
+
+
 def list_project_flow_versions(user_id: str, project_id: str) -> list:
     """List all flow versions for a project"""
-    prefix = f"projects/{user_id}/{project_id}/"
+    # The flow_v prefix skips blobs and conversations
+    prefix = f"projects/{user_id}/{project_id}/flow_v"
     
     try:
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET,
-            Prefix=prefix
-        )
-        
-        versions = []
-        for obj in response.get('Contents', []):
-            key = obj['Key']
-            if key.endswith('.json') and 'flow_v' in key:
-                # Extract version number from flow_v1.json, flow_v2.json, etc.
-                match = re.search(r'flow_v(\d+)\.json', key)
+        versions = set()
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                # flow_v1.json (legacy) or flow_v1.manifest.json
+                match = _FLOW_VERSION_KEY_RE.search(obj['Key'])
                 if match:
-                    versions.append(int(match.group(1)))
+                    versions.add(int(match.group(1)))
         
         return sorted(versions)
     except Exception as e:
@@ -575,6 +1020,8 @@ def delete_project_flow_version(user_id: str, project_id: str, version: int) ->
     """
     Delete a specific flow version
     
+    Blobs stay in place since other versions may share them.
+    
     Args:
         user_id: User ID
         project_id: Project ID
@@ -583,23 +1030,74 @@ def delete_project_flow_version(user_id: str, project_id: str, version: int) ->
     Returns:
         True if deletion successful, False otherwise
     """
-    flow_key = f"projects/{user_id}/{project_id}/flow_v{version}.json"
+    manifest_key = get_flow_manifest_key(user_id, project_id, version)
+    flow_key = get_flow_legacy_key(user_id, project_id, version)
     conversation_key = f"projects/{user_id}/{project_id}/conversation_v{version}.json"
     
     try:
-        # Delete flow file
+        # Delete flow files (whichever format the version was saved in)
+        manifest_deleted = delete_object(manifest_key)
         flow_deleted = delete_object(flow_key)
         
         # Delete conversation file (if exists)
         conversation_deleted = delete_object(conversation_key)
         
-        print(f"✅ Deleted version {version}: flow={flow_deleted}, conversation={conversation_deleted}")
-        return flow_deleted  # Return True if at least flow was deleted
+        print(f"✅ Deleted version {version}: flow={manifest_deleted and flow_deleted}, conversation={conversation_deleted}")
+        return manifest_deleted and flow_deleted
     except Exception as e:
         print(f"❌ Error deleting version {version}: {e}")
         return False
 
 
+def resolve_project_flow_graph(project: Optional[dict]) -> Optional[dict]:
+    """
+    Fill in project["flow_graph"] from its flow_ref pointer
+    
+    Projects saved before flow_ref (or mid-generation, with a live graph)
+    keep flow_graph on the item; only its shadcn/ui components are filled in.
+    
+    Args:
+        project: Project item from app.core.db (Decimals already converted)
+    
+    Returns:
+        The same project dict
+    """
+    if project and project.get("flow_graph"):
+        try:
+            project["flow_graph"] = unpack_flow_graph(project["flow_graph"])
+        except Exception as e:
+            print(f"⚠️  Could not load components for project {project.get('project_id')}: {e}")
+        return project
+    if not project or not project.get("flow_ref"):
+        return project
+    
+    version = project["flow_ref"].get("version")
+    try:
+        project["flow_graph"] = get_project_flow(project["owner_id"], project["project_id"], int(version))
+    except Exception as e:
+        print(f"⚠️  Could not load flow v{version} for project {project.get('project_id')}: {e}")
+    return project
+
+
+def resolve_projects_flow_graphs(projects: List[dict]) -> List[dict]:
+    """resolve_project_flow_graph for many projects, loaded concurrently"""
+    # Embedded graphs only need their components filled in (no S3 reads)
+    for project in projects:
+        if project and project.get("flow_graph"):
+            resolve_project_flow_graph(project)
+    
+    pending = [p for p in projects if p and not p.get("flow_graph") and p.get("flow_ref")]
+    if len(pending) <= 1:
+        for project in pending:
+            resolve_project_flow_graph(project)
+        return projects
+    
+    # Each hydration fans out on the bulk fetch pool, so the outer loop uses its own threads
+    with ThreadPoolExecutor(max_workers=min(len(pending), 8), thread_name_prefix="osyle-flow-load") as executor:
+        list(executor.map(resolve_project_flow_graph, pending))
+    return projects
+
+
 # ============================================================================
 # CONVERSATION VERSIONING FUNCTIONS
 # ============================================================================
@@ -780,6 +1278,51 @@ def load_json_from_s3(key: str) -> Optional[dict]:
         return None
 
 
+def load_jsons_from_s3(keys: List[str]) -> Dict[str, Optional[dict]]:
+    """
+    Load many JSON objects concurrently
+    
+    Args:
+        keys: S3 object keys
+    
+    Returns:
+        {key: dictionary, or None if missing/unreadable}
+    """
+    loaded = {}
+    for result in get_objects_bytes(keys):
+        key = result['key']
+        loaded[key] = None
+        if result['error']:
+            if result['error'] != 'NoSuchKey':
+                print(f"Error loading JSON from S3 ({key}): {result['error']}")
+            continue
+        try:
+            loaded[key] = json.loads(result['body'].decode('utf-8'))
+        except ValueError as e:
+            print(f"Error loading JSON from S3 ({key}): {e}")
+    return loaded
+
+
+def save_jsons_to_s3(items: Dict[str, dict]) -> int:
+    """
+    Save many JSON objects concurrently (same format as save_json_to_s3)
+    
+    Args:
+        items: {key: dictionary}
+    
+    Returns:
+        Number of objects saved
+    """
+    if not items:
+        return 0
+    if len(items) == 1:
+        return sum(save_json_to_s3(key, data) for key, data in items.items())
+    
+    executor = _get_bulk_fetch_executor()
+    futures = [executor.submit(save_json_to_s3, key, data) for key, data in items.items()]
+    return sum(future.result() for future in futures)
+
+
 # ============================================================================
 # DTR S3 KEY GENERATION
 # ============================================================================
@@ -794,6 +1337,11 @@ def get_dtr_pass_versioned_key(owner_id: str, taste_id: str, resource_id: str, p
     return f"resources/{owner_id}/{taste_id}/{resource_id}/dtr/versions/{pass_name}_{timestamp}.json"
 
 
+def get_dtr_pass_fingerprint_key(owner_id: str, taste_id: str, resource_id: str, pass_name: str) -> str:
+    """Generate S3 key for the input fingerprint of a DTR pass output"""
+    return f"resources/{owner_id}/{taste_id}/{resource_id}/dtr/fingerprints/{pass_name}.json"
+
+
 def get_dtr_extraction_status_key(owner_id: str, taste_id: str, resource_id: str) -> str:
     """Generate S3 key for extraction status"""
     return f"resources/{owner_id}/{taste_id}/{resource_id}/dtr/extraction_status.json"
@@ -833,31 +1381,37 @@ def get_dtm_subset_index_key(owner_id: str, taste_id: str) -> str:
     return f"tastes/{owner_id}/{taste_id}/dtm_subsets/subset_index.json"
 
 
+def get_dtm_synthesis_state_key(owner_id: str, taste_id: str) -> str:
+    """Generate S3 key for incremental synthesis state"""
+    return f"tastes/{owner_id}/{taste_id}/dtm_synthesis_state.json"
+
+
+def get_dtm_partials_key(owner_id: str, taste_id: str) -> str:
+    """Generate S3 key for per-resource synthesis partials"""
+    return f"tastes/{owner_id}/{taste_id}/dtm_partials.json"
+
+
 # ============================================================================
 # FLOW VERSION MANAGEMENT
 # ============================================================================
 
-def save_flow_version(user_id: str, project_id: str, flow_graph: dict, version: int):
+def save_flow_version(user_id: str, project_id: str, flow_graph: dict, version: int) -> dict:
     """
     Save flow graph to S3 with version number
-    Stored at: projects/{user_id}/{project_id}/flow_v{version}.json
+    Stored as a manifest at: projects/{user_id}/{project_id}/flow_v{version}.manifest.json
+    
+    Returns:
+        flow_ref pointer for the project item
     """
     from app.core.db import convert_decimals
     
     # Convert Decimals back to regular numbers for JSON serialization
     flow_graph_json = convert_decimals(flow_graph)
     
-    key = f"projects/{user_id}/{project_id}/flow_v{version}.json"
-    
     try:
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=key,
-            Body=json.dumps(flow_graph_json, indent=2),
-            ContentType="application/json"
-        )
-        
-        print(f"  ✓ Flow v{version} saved to S3: {key}")
+        flow_ref = put_project_flow(user_id, project_id, flow_graph_json, version)
+        print(f"  ✓ Flow v{version} saved to S3: {flow_ref['manifest_key']}")
+        return flow_ref
     except Exception as e:
         print(f"  ✗ Failed to save flow to S3: {e}")
         raise
@@ -878,8 +1432,8 @@ def copy_project_flow_for_recipient(
     new_project_id: str,
 ) -> int:
     """
-    Deep-copy all flow_vN.json and conversation_vN.json files from sender's
-    project into the recipient's project namespace.  Returns the number of
+    Deep-copy all flow versions (manifests and blobs) and conversation_vN.json
+    files from sender's project into the recipient's project namespace.  Returns the number of
     S3 objects copied.
     """
     prefix = f"projects/{sender_id}/{original_project_id}/"
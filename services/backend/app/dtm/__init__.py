@@ -11,18 +11,21 @@ from . import conflicts
 from . import synthesizer
 
 # Public API
-from .synthesizer import synthesize_dtm
+from .synthesizer import synthesize_dtm, synthesize_subset_dtm
 from .storage import (
     save_dtm,
     load_dtm,
     dtm_exists,
     delete_dtm,
     save_fingerprint,
+    save_fingerprints,
     load_fingerprint,
     load_all_fingerprints,
     save_subset_dtm,
     load_subset_dtm,
-    is_dtm_fresh
+    is_dtm_fresh,
+    load_synthesis_state,
+    mark_resources_stale
 )
 
 __all__ = [
@@ -38,14 +41,18 @@ __all__ = [
     
     # Main functions
     "synthesize_dtm",
+    "synthesize_subset_dtm",
     "save_dtm",
     "load_dtm",
     "dtm_exists",
     "delete_dtm",
     "save_fingerprint",
+    "save_fingerprints",
     "load_fingerprint",
     "load_all_fingerprints",
     "save_subset_dtm",
     "load_subset_dtm",
-    "is_dtm_fresh"
+    "is_dtm_fresh",
+    "load_synthesis_state",
+    "mark_resources_stale"
 ]
\ No newline at end of file
@@ -2,20 +2,38 @@
 DTM Builder - Smart DTM retrieval and generation
 Handles single resource (DTR), full taste (global DTM), and subsets (cached DTMs)
 """
+import os
 import time
+import asyncio
 from typing import List, Optional, Dict, Any
 from app.dtr import storage as dtr_storage
 from app.dtr.schemas import Pass6CompleteDTR
 from app.core.db import list_resources_for_taste
+from app.core.async_io import run_blocking
 from . import storage
 from . import synthesizer
 from .schemas import Pass7CompleteDTM
 
 
+# A cached DTM whose resource set is at least this similar (Jaccard) to a
+# requested subset is served at once, and the exact subset is synthesized in
+# the background (set above 1 to always synthesize synchronously)
+SUBSET_REUSE_MIN_SIMILARITY = float(os.getenv("DTM_SUBSET_REUSE_MIN_SIMILARITY", "0.75"))
+# Longest a short-lived loop (a Lambda invocation) waits on its own background refreshes
+SUBSET_REFRESH_MAX_WAIT_SECS = float(os.getenv("DTM_SUBSET_REFRESH_MAX_WAIT_SECS", "10"))
+# Lambda closes the event loop after each invocation, so background work
+# only survives there while a long handler keeps the loop busy
+ON_LAMBDA = bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+
+# Subset hash -> in-flight background synthesis
+_subset_refreshes: Dict[str, asyncio.Task] = {}
+
+
 async def get_or_build_dtm(
     taste_id: str,
     resource_ids: List[str],
-    mode: str = "auto"
+    mode: str = "auto",
+    refresh_in_background: bool = True
 ) -> Dict[str, Any]:
     """
     Smart DTM retrieval/generation for UI generation.
@@ -26,18 +44,27 @@ async def get_or_build_dtm(
     - subset: Build/load subset DTM (specific resources)
     - single: Use DTR directly (single resource, wrapped in DTM-like format)
     
+    A near-match subset is cached under its own hash as provisional and
+    synthesized in full in the background. Pass refresh_in_background=False
+    when nothing keeps the event loop alive afterwards (a standalone request
+    on Lambda): the exact subset is then synthesized before returning.
+    
     Returns:
         Dict with:
         - mode: str (what mode was used)
         - dtm: Pass7CompleteDTM (the actual DTM)
         - hash: Optional[str] (subset hash if applicable)
         - was_cached: bool (whether loaded from cache)
+        - reused_from: Optional[Dict] (near-match subset: {"hash", "similarity"}
+          of the cached DTM whose narrative was reused while the exact subset
+          is synthesized in the background)
+        - provisional: bool (the subset DTM reuses another DTM's narrative)
         - build_time_ms: int (time taken to build/load)
     """
     start_time = time.time()
     
     # Determine mode
-    actual_mode = _determine_mode(taste_id, resource_ids, mode)
+    actual_mode = await run_blocking(_determine_mode, taste_id, resource_ids, mode)
     
     print(f"\n{'='*70}")
     print(f"DTM Builder: taste_id={taste_id}")
@@ -50,6 +77,8 @@ async def get_or_build_dtm(
         "dtm": None,
         "hash": None,
         "was_cached": False,
+        "reused_from": None,
+        "provisional": False,
         "build_time_ms": 0,
         "resource_ids": resource_ids
     }
@@ -57,7 +86,7 @@ async def get_or_build_dtm(
     # Single resource: Use DTR directly
     if actual_mode == "single":
         print(f"📄 Single resource mode: Loading DTR for {resource_ids[0]}")
-        dtr = dtr_storage.load_complete_dtr(resource_ids[0])
+        dtr = await run_blocking(dtr_storage.load_complete_dtr, resource_ids[0])
         if not dtr:
             raise ValueError(f"No DTR found for resource {resource_ids[0]}")
         
@@ -71,17 +100,17 @@ async def get_or_build_dtm(
         print(f"🌍 Full taste mode: Checking global DTM freshness...")
         
         # Check if cached DTM is fresh (matches current resource set)
-        is_fresh = storage.is_dtm_fresh(taste_id, resource_ids)
+        is_fresh = await run_blocking(storage.is_dtm_fresh, taste_id, resource_ids)
         
         if is_fresh:
-            dtm = storage.load_dtm(taste_id)
+            dtm = await run_blocking(storage.load_dtm, taste_id)
             print(f"✅ Loaded fresh global DTM from cache")
             result["was_cached"] = True
         else:
             # Build/rebuild if missing or stale
             print(f"🔨 Global DTM is stale or missing, rebuilding...")
-            dtm = await synthesizer.synthesize_dtm(taste_id, resource_ids)
-            storage.save_dtm(taste_id, dtm, resource_ids)
+            dtm = await synthesizer.synthesize_dtm(taste_id, resource_ids, incremental=True)
+            await run_blocking(storage.save_dtm, taste_id, dtm, resource_ids)
             result["was_cached"] = False
         
         result["dtm"] = dtm
@@ -92,25 +121,60 @@ async def get_or_build_dtm(
         print(f"🔍 Subset mode: Hash = {subset_hash}")
         
         # Try to load from cache
-        cached_dtm = storage.load_subset_dtm(taste_id, resource_ids)
+        cached_dtm = await run_blocking(storage.load_subset_dtm, taste_id, resource_ids)
+        provisional = bool(cached_dtm) and await run_blocking(
+            storage.is_subset_provisional, taste_id, subset_hash
+        )
         
-        if cached_dtm:
-            print(f"✅ Using cached subset DTM")
+        if cached_dtm and not (provisional and not refresh_in_background):
+            print(f"✅ Using cached {'provisional ' if provisional else ''}subset DTM")
+            if provisional:
+                _schedule_subset_refresh(taste_id, resource_ids, subset_hash)
             result["dtm"] = cached_dtm
             result["hash"] = subset_hash
             result["was_cached"] = True
+            result["provisional"] = provisional
         else:
-            # Build new subset DTM
-            print(f"🔨 Building new subset DTM for {len(resource_ids)} resources...")
-            subset_dtm = await synthesizer.synthesize_dtm(taste_id, resource_ids)
+            nearest = None
+            if refresh_in_background:
+                nearest = await run_blocking(
+                    storage.find_nearest_subset, taste_id, resource_ids, SUBSET_REUSE_MIN_SIMILARITY
+                )
             
-            # Cache it
-            storage.save_subset_dtm(taste_id, resource_ids, subset_dtm)
-            print(f"💾 Cached subset DTM: {subset_hash}")
+            if nearest:
+                # Near match: recompute consensus/tokens for the exact subset,
+                # reuse the cached narrative, refresh in the background
+                print(f"♻️  Near match {nearest['hash']} (Jaccard {nearest['similarity']:.2f}), "
+                      f"reusing its narrative")
+                subset_dtm = await synthesizer.synthesize_subset_dtm(
+                    taste_id, resource_ids, base_dtm=nearest["dtm"]
+                )
+                # Cache it so repeat requests skip the near-match work even if
+                # the refresh doesn't finish (an in-flight one saves the real DTM)
+                if not _refresh_in_flight(subset_hash):
+                    await run_blocking(
+                        storage.save_subset_dtm, taste_id, resource_ids, subset_dtm, provisional=True
+                    )
+                _schedule_subset_refresh(taste_id, resource_ids, subset_hash)
+                
+                result["was_cached"] = True
+                result["provisional"] = True
+                result["reused_from"] = {
+                    "hash": nearest["hash"],
+                    "similarity": nearest["similarity"]
+                }
+            else:
+                # Build new subset DTM
+                print(f"🔨 Building new subset DTM for {len(resource_ids)} resources...")
+                subset_dtm = await synthesizer.synthesize_subset_dtm(taste_id, resource_ids)
+                
+                # Cache it
+                await run_blocking(storage.save_subset_dtm, taste_id, resource_ids, subset_dtm)
+                print(f"💾 Cached subset DTM: {subset_hash}")
+                result["was_cached"] = False
             
             result["dtm"] = subset_dtm
             result["hash"] = subset_hash
-            result["was_cached"] = False
     
     # Calculate build time
     build_time = (time.time() - start_time) * 1000  # Convert to ms
@@ -126,6 +190,62 @@ async def get_or_build_dtm(
     return result
 
 
+def _refresh_in_flight(subset_hash: str) -> bool:
+    """True if a background synthesis for this subset is still running"""
+    # A task left on a closed loop (an earlier invocation) never runs its
+    # done callback, so it doesn't count as in flight
+    existing = _subset_refreshes.get(subset_hash)
+    return bool(existing) and not existing.get_loop().is_closed()
+
+
+def _schedule_subset_refresh(taste_id: str, resource_ids: List[str], subset_hash: str):
+    """Synthesize and cache the exact subset DTM in the background (once per hash)"""
+    if _refresh_in_flight(subset_hash):
+        return
+    
+    task = asyncio.create_task(_refresh_subset_dtm(taste_id, list(resource_ids), subset_hash))
+    _subset_refreshes[subset_hash] = task
+    
+    def forget(done: asyncio.Task):
+        if _subset_refreshes.get(subset_hash) is done:
+            del _subset_refreshes[subset_hash]
+    
+    task.add_done_callback(forget)
+
+
+async def _refresh_subset_dtm(taste_id: str, resource_ids: List[str], subset_hash: str):
+    """Background job: full subset synthesis (with LLM), then cache it"""
+    try:
+        print(f"🔄 Background: synthesizing subset DTM {subset_hash}...")
+        subset_dtm = await synthesizer.synthesize_subset_dtm(taste_id, resource_ids)
+        await run_blocking(storage.save_subset_dtm, taste_id, resource_ids, subset_dtm)
+        print(f"💾 Background: cached subset DTM {subset_hash}")
+    except Exception as e:
+        print(f"⚠️  Background subset synthesis failed for {subset_hash}: {e}")
+
+
+async def wait_for_subset_refreshes(timeout: float = SUBSET_REFRESH_MAX_WAIT_SECS):
+    """
+    Give background subset syntheses started on this loop up to `timeout`
+    seconds to finish, then cancel the rest
+    
+    Call before closing an event loop that served get_or_build_dtm (e.g. at
+    the end of a Lambda invocation). A cancelled refresh leaves the subset's
+    provisional DTM cached, and a later request schedules a new one.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [task for task in _subset_refreshes.values() if task.get_loop() is loop]
+    if not tasks:
+        return
+    
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        print(f"⏱️  Cancelled {len(pending)} subset DTM refresh(es) after {timeout:.0f}s")
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 def _determine_mode(taste_id: str, resource_ids: List[str], mode: str) -> str:
     """
     Determine which mode to use based on resource count.
@@ -2,6 +2,9 @@
 Conflict Detection and Resolution
 """
 from typing import List, Dict, Any, Optional
+from collections import Counter
+
+import numpy as np
 
 
 def detect_conflicts(
@@ -64,22 +67,39 @@ def _enrich_conflict(
 
 
 def _group_similar_values(values: List[float], tolerance: float = 0.1) -> Dict[float, List[int]]:
-    """Group numerical values that are similar"""
-    groups = {}
-    
-    for i, val in enumerate(values):
-        # Find existing group
-        found_group = False
-        for group_val in groups.keys():
-            if abs(val - group_val) / max(abs(group_val), 0.01) <= tolerance:
-                groups[group_val].append(i)
-                found_group = True
-                break
+    """
+    Group numerical values that are similar
+    
+    Each value joins the first earlier group whose leader is within tolerance
+    (relative to the leader), otherwise it leads a new group. Equivalently,
+    the first ungrouped value leads the next group and takes every ungrouped
+    value within tolerance of it, so each group is one vectorized pass.
+    """
+    array = np.asarray(values, dtype=np.float64)
+    group_of = np.full(len(array), -1, dtype=np.int64)
+    leaders: List[int] = []
+    
+    while True:
+        pending = np.flatnonzero(group_of < 0)
+        if not pending.size:
+            break
         
-        if not found_group:
-            groups[val] = [i]
+        leader = int(pending[0])
+        leader_value = array[leader]
+        within = np.abs(array[pending] - leader_value) / max(abs(leader_value), 0.01) <= tolerance
+        within[0] = True
+        group_of[pending[within]] = len(leaders)
+        leaders.append(leader)
+    
+    # Split value indices by group, keeping them in order
+    by_group = np.argsort(group_of, kind="stable")
+    sizes = np.bincount(group_of, minlength=len(leaders))
+    members = np.split(by_group, np.cumsum(sizes)[:-1])
     
-    return groups
+    return {
+        values[leader]: indices.tolist()
+        for leader, indices in zip(leaders, members)
+    }
 
 
 def resolve_conflicts(
@@ -128,9 +148,10 @@ def _resolve_weighted_majority(conflict: Dict[str, Any]) -> Dict[str, Any]:
         
         # Find alternative values (distinct values far from mean)
         alternatives = []
+        counts = Counter(values)
         for val in set(values):
             if abs(val - mean_val) > std_dev:
-                count = values.count(val)
+                count = counts[val]
                 support = count / len(values)
                 alternatives.append({
                     "value": val,
@@ -1,9 +1,43 @@
 """
 Consensus Extraction - Find agreement across DTRs
 """
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from collections import Counter
+
+import numpy as np
+
 from .schemas import StyleFingerprint
+from .feature_matrix import FeatureMatrix
+
+
+NUMERICAL_FEATURES = [
+    "spacing_quantum",
+    "spacing_scale_ratio",
+    "type_scale_ratio",
+    "primary_font_weight_avg",
+    "border_radius_min",
+    "border_radius_max",
+    "border_radius_avg",
+    "component_density_score",
+    "primary_color_hue",
+    "primary_color_saturation",
+    "primary_color_lightness",
+    "background_lightness"
+]
+
+CATEGORICAL_FEATURES = [
+    "uses_uppercase_labels",
+    "uses_shadows",
+    "uses_blur_effects",
+    "uses_gradients",
+    "uses_illustrations",
+    "uses_photos"
+]
+
+FREQUENCY_FEATURES = [
+    "shadow_frequency",
+    "blur_frequency"
+]
 
 
 def extract_consensus(fingerprints: List[StyleFingerprint]) -> Dict[str, Any]:
@@ -47,76 +81,78 @@ def _analyze_numerical_features(
     fingerprints: List[StyleFingerprint],
     consensus: Dict[str, Any]
 ):
-    """Analyze numerical features for consensus"""
-    
-    numerical_features = [
-        "spacing_quantum",
-        "spacing_scale_ratio",
-        "type_scale_ratio",
-        "primary_font_weight_avg",
-        "border_radius_min",
-        "border_radius_max",
-        "border_radius_avg",
-        "component_density_score",
-        "primary_color_hue",
-        "primary_color_saturation",
-        "primary_color_lightness",
-        "background_lightness"
-    ]
-    
-    for feature in numerical_features:
-        values = []
-        
-        for fp in fingerprints:
-            val = getattr(fp.comparable_tokens, feature, None)
-            if val is not None:
-                values.append(val)
-        
-        if not values:
-            continue
-        
-        # Calculate statistics
-        mean_val = sum(values) / len(values)
-        
-        if len(values) > 1:
-            variance = sum((x - mean_val) ** 2 for x in values) / len(values)
-            std_dev = variance ** 0.5
-            
-            # Coefficient of variation
-            if mean_val != 0:
-                cv = std_dev / abs(mean_val)
-            else:
-                cv = float('inf')
-        else:
-            cv = 0.0
+    """Analyze numerical features for consensus (all features at once)"""
+    matrix = FeatureMatrix.from_fingerprints(fingerprints, "comparable_tokens", NUMERICAL_FEATURES)
+    means = matrix.means()
+    _classify_numerical(
+        consensus, NUMERICAL_FEATURES, matrix.counts, means,
+        matrix.population_std(means), matrix.column_values
+    )
+
+
+def _classify_numerical(
+    consensus: Dict[str, Any],
+    features: List[str],
+    counts: np.ndarray,
+    means: np.ndarray,
+    std_devs: np.ndarray,
+    get_values: Callable[[int], List[float]]
+):
+    """
+    Place numerical features by their coefficient of variation
+    
+    Args:
+        features: Feature names (columns)
+        counts / means / std_devs: Per-column statistics
+        get_values: Column index -> values, only called for conflicts
+    """
+    counts = np.asarray(counts)
+    means = np.asarray(means, dtype=np.float64)
+    multiple = counts > 1
+    std_devs = np.where(multiple, np.asarray(std_devs, dtype=np.float64), 0.0)
+    
+    # Coefficient of variation (inf when the mean is zero)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cvs = np.where(
+            multiple,
+            np.where(means != 0, std_devs / np.abs(means), np.inf),
+            0.0
+        )
+    levels = np.select([cvs < 0.1, cvs < 0.3, cvs < 0.5], [0, 1, 2], default=3)
+    
+    for column in np.flatnonzero(counts):
+        feature = features[column]
+        mean_val = float(means[column])
+        std_dev = float(std_devs[column])
+        cv = float(cvs[column])
+        level = levels[column]
         
-        # Classify by coefficient of variation
-        if cv < 0.1:
+        if level == 0:
             consensus["invariants"][feature] = {
                 "value": mean_val,
                 "confidence": 1.0 - cv,
-                "std_dev": std_dev if len(values) > 1 else 0.0
+                "std_dev": std_dev
             }
-        elif cv < 0.3:
+        elif level == 1:
             consensus["strong"][feature] = {
                 "value": mean_val,
                 "confidence": 0.8,
-                "std_dev": std_dev if len(values) > 1 else 0.0
+                "std_dev": std_dev
             }
-        elif cv < 0.5:
+        elif level == 2:
             consensus["moderate"][feature] = {
                 "value": mean_val,
                 "confidence": 0.6,
-                "std_dev": std_dev if len(values) > 1 else 0.0
+                "std_dev": std_dev
             }
         else:
             # High variance - conflict
             consensus["conflicts"].append({
                 "feature": feature,
                 "type": "numerical",
-                "values": values,
+                "values": get_values(int(column)),
                 "mean": mean_val,
-                "std_dev": std_dev if len(values) > 1 else 0.0,
+                "std_dev": std_dev,
                 "coefficient_of_variation": cv
             })
 
@@ -127,56 +163,74 @@ def _analyze_categorical_features(
 ):
     """Analyze categorical/boolean features for consensus"""
     
-    categorical_features = [
-        "uses_uppercase_labels",
-        "uses_shadows",
-        "uses_blur_effects",
-        "uses_gradients",
-        "uses_illustrations",
-        "uses_photos"
-    ]
+    # Analyze boolean patterns
+    flags = FeatureMatrix.from_fingerprints(fingerprints, "patterns", CATEGORICAL_FEATURES)
+    first_rows = flags.first_present()
+    _classify_categorical(
+        consensus,
+        CATEGORICAL_FEATURES,
+        true_counts=np.where(flags.mask, flags.values != 0, False).sum(axis=0),
+        totals=flags.counts,
+        first_values=flags.values[first_rows, np.arange(len(CATEGORICAL_FEATURES))] != 0
+    )
     
-    frequency_features = [
-        "shadow_frequency",
-        "blur_frequency"
-    ]
+    # Analyze frequency features (treat as numerical)
+    frequencies = FeatureMatrix.from_fingerprints(fingerprints, "patterns", FREQUENCY_FEATURES)
+    _classify_frequency(consensus, FREQUENCY_FEATURES, frequencies.counts, frequencies.means())
+
+
+def _classify_categorical(
+    consensus: Dict[str, Any],
+    features: List[str],
+    true_counts: np.ndarray,
+    totals: np.ndarray,
+    first_values: np.ndarray
+):
+    """
+    Place boolean features by their agreement rate
     
-    # Analyze boolean patterns
-    for feature in categorical_features:
-        values = []
-        
-        for fp in fingerprints:
-            val = getattr(fp.patterns, feature, None)
-            if val is not None:
-                values.append(val)
-        
-        if not values:
-            continue
-        
-        # Count occurrences
-        counter = Counter(values)
-        most_common_value, count = counter.most_common(1)[0]
-        agreement_rate = count / len(values)
+    Args:
+        features: Feature names (columns)
+        true_counts: True values per column
+        totals: Present values per column
+        first_values: First value seen per column (wins ties, like Counter.most_common)
+    """
+    true_counts = np.asarray(true_counts, dtype=np.int64)
+    totals = np.asarray(totals, dtype=np.int64)
+    first_values = np.asarray(first_values, dtype=bool)
+    false_counts = totals - true_counts
+    
+    most_common = np.where(
+        true_counts == false_counts, first_values, true_counts > false_counts
+    )
+    counts = np.maximum(true_counts, false_counts)
+    agreement_rates = np.divide(
+        counts, totals, out=np.zeros(len(features)), where=totals > 0
+    )
+    levels = np.select(
+        [agreement_rates >= 0.9, agreement_rates >= 0.7, agreement_rates >= 0.5],
+        ["invariants", "strong", "moderate"],
+        default="conflicts"
+    )
+    
+    for column in np.flatnonzero(totals):
+        feature = features[column]
+        most_common_value = bool(most_common[column])
+        agreement_rate = float(agreement_rates[column])
+        level = str(levels[column])
         
-        # Classify by agreement rate
-        if agreement_rate >= 0.9:
-            consensus["invariants"][feature] = {
-                "value": most_common_value,
-                "confidence": agreement_rate
-            }
-        elif agreement_rate >= 0.7:
-            consensus["strong"][feature] = {
-                "value": most_common_value,
-                "confidence": agreement_rate
-            }
-        elif agreement_rate >= 0.5:
-            consensus["moderate"][feature] = {
+        if level != "conflicts":
+            consensus[level][feature] = {
                 "value": most_common_value,
                 "confidence": agreement_rate
             }
         else:
-            # Conflict
-            distribution = dict(counter)
+            # Conflict (distribution in first-seen order)
+            first = bool(first_values[column])
+            by_value = {True: int(true_counts[column]), False: int(false_counts[column])}
+            distribution = {
+                value: by_value[value] for value in (first, not first) if by_value[value]
+            }
             consensus["conflicts"].append({
                 "feature": feature,
                 "type": "categorical",
@@ -184,30 +238,29 @@ def _analyze_categorical_features(
                 "most_common": most_common_value,
                 "agreement_rate": agreement_rate
             })
+
+
+def _classify_frequency(
+    consensus: Dict[str, Any],
+    features: List[str],
+    counts: np.ndarray,
+    means: np.ndarray
+):
+    """Place frequency features by their mean"""
+    means = np.asarray(means, dtype=np.float64)
     
-    # Analyze frequency features (treat as numerical)
-    for feature in frequency_features:
-        values = []
-        
-        for fp in fingerprints:
-            val = getattr(fp.patterns, feature, None)
-            if val is not None:
-                values.append(val)
-        
-        if not values:
-            continue
-        
-        mean_val = sum(values) / len(values)
-        
-        # All frequencies should be high consensus if present
-        if mean_val >= 0.7:
-            consensus["strong"][feature] = {
-                "value": mean_val,
+    # All frequencies should be high consensus if present
+    levels = np.select([means >= 0.7, means >= 0.3], [1, 2], default=0)
+    
+    for column in np.flatnonzero(np.asarray(counts)):
+        if levels[column] == 1:
+            consensus["strong"][features[column]] = {
+                "value": float(means[column]),
                 "confidence": 0.8
             }
-        elif mean_val >= 0.3:
-            consensus["moderate"][feature] = {
-                "value": mean_val,
+        elif levels[column] == 2:
+            consensus["moderate"][features[column]] = {
+                "value": float(means[column]),
                 "confidence": 0.6
             }
 
@@ -219,4 +272,202 @@ def get_consensus_summary(consensus: Dict[str, Any]) -> Dict[str, int]:
         "strong_count": len(consensus.get("strong", {})),
         "moderate_count": len(consensus.get("moderate", {})),
         "conflicts_count": len(consensus.get("conflicts", []))
-    }
\ No newline at end of file
+    }
+
+
+def get_consensus_signature(consensus: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Consensus class of every feature (what the LLM narrative depends on)
+    
+    Categorical features include their majority value, since flipping
+    "uses_shadows" from True to False keeps the class but changes the story.
+    
+    Returns:
+        {feature: "invariants" | "strong" | "moderate" | "conflicts" [":value"]}
+    """
+    signature = {}
+    for level in ("invariants", "strong", "moderate"):
+        for feature, entry in consensus.get(level, {}).items():
+            if feature in CATEGORICAL_FEATURES:
+                signature[feature] = f"{level}:{entry['value']}"
+            else:
+                signature[feature] = level
+    for conflict in consensus.get("conflicts", []):
+        signature[conflict["feature"]] = "conflicts"
+    return signature
+
+
+# ============================================================================
+# RUNNING STATISTICS (incremental synthesis)
+# ============================================================================
+
+class RunningStat:
+    """Count/mean/M2 (Welford) that supports removing samples"""
+    
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+    
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+    
+    def remove(self, x: float):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.count -= 1
+        self.mean = (old_mean * (self.count + 1) - x) / self.count
+        self.m2 = max(0.0, self.m2 - (x - old_mean) * (x - self.mean))
+    
+    @property
+    def std_dev(self) -> float:
+        """Population standard deviation (matches extract_consensus)"""
+        return (self.m2 / self.count) ** 0.5 if self.count > 1 else 0.0
+    
+    def to_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+
+class ConsensusStats:
+    """
+    Running consensus aggregates over a set of fingerprints
+    
+    Adding or removing a resource is O(features); extract_consensus output
+    is rebuilt from the aggregates without rescanning the fingerprints.
+    """
+    
+    def __init__(self):
+        self.numerical: Dict[str, RunningStat] = {f: RunningStat() for f in NUMERICAL_FEATURES}
+        self.frequency: Dict[str, RunningStat] = {f: RunningStat() for f in FREQUENCY_FEATURES}
+        self.categorical: Dict[str, Counter] = {f: Counter() for f in CATEGORICAL_FEATURES}
+        self.count = 0
+    
+    @classmethod
+    def from_fingerprints(cls, fingerprints: List[StyleFingerprint]) -> "ConsensusStats":
+        stats = cls()
+        for fp in fingerprints:
+            stats.add(fp)
+        return stats
+    
+    def _update(self, fp: StyleFingerprint, sign: int):
+        self.count += sign
+        for feature, stat in self.numerical.items():
+            val = getattr(fp.comparable_tokens, feature, None)
+            if val is not None:
+                stat.add(val) if sign > 0 else stat.remove(val)
+        for feature, stat in self.frequency.items():
+            val = getattr(fp.patterns, feature, None)
+            if val is not None:
+                stat.add(val) if sign > 0 else stat.remove(val)
+        for feature, counter in self.categorical.items():
+            val = getattr(fp.patterns, feature, None)
+            if val is not None:
+                counter[val] += sign
+                if counter[val] <= 0:
+                    del counter[val]
+    
+    def add(self, fp: StyleFingerprint):
+        """Include a fingerprint"""
+        self._update(fp, 1)
+    
+    def remove(self, fp: StyleFingerprint):
+        """Exclude a fingerprint that was previously added"""
+        self._update(fp, -1)
+    
+    def to_consensus(self, fingerprints: List[StyleFingerprint]) -> Dict[str, Any]:
+        """
+        Build the extract_consensus dictionary from the aggregates
+        
+        Args:
+            fingerprints: The fingerprints currently included, in resource
+                order; only read for conflict value lists and tie-breaking
+        """
+        consensus = {
+            "invariants": {},
+            "strong": {},
+            "moderate": {},
+            "conflicts": []
+        }
+        if self.count < 2:
+            return consensus
+        
+        numerical = [self.numerical[f] for f in NUMERICAL_FEATURES]
+        _classify_numerical(
+            consensus,
+            NUMERICAL_FEATURES,
+            np.array([stat.count for stat in numerical]),
+            np.array([stat.mean for stat in numerical]),
+            np.array([stat.std_dev for stat in numerical]),
+            lambda column: _feature_values(fingerprints, "comparable_tokens", NUMERICAL_FEATURES[column])
+        )
+        
+        first_values = []
+        for feature in CATEGORICAL_FEATURES:
+            ordered = _first_seen_order(self.categorical[feature], fingerprints, feature)
+            first_values.append(next(iter(ordered), False))
+        _classify_categorical(
+            consensus,
+            CATEGORICAL_FEATURES,
+            true_counts=np.array([self.categorical[f][True] for f in CATEGORICAL_FEATURES]),
+            totals=np.array([sum(self.categorical[f].values()) for f in CATEGORICAL_FEATURES]),
+            first_values=np.array(first_values, dtype=bool)
+        )
+        
+        frequency = [self.frequency[f] for f in FREQUENCY_FEATURES]
+        _classify_frequency(
+            consensus,
+            FREQUENCY_FEATURES,
+            np.array([stat.count for stat in frequency]),
+            np.array([stat.mean for stat in frequency])
+        )
+        
+        return consensus
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "numerical": {f: s.to_dict() for f, s in self.numerical.items()},
+            "frequency": {f: s.to_dict() for f, s in self.frequency.items()},
+            # JSON keys must be strings, so store [value, count] pairs
+            "categorical": {f: [[v, n] for v, n in c.items()] for f, c in self.categorical.items()},
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConsensusStats":
+        stats = cls()
+        stats.count = data.get("count", 0)
+        for feature, raw in data.get("numerical", {}).items():
+            stats.numerical[feature] = RunningStat(**raw)
+        for feature, raw in data.get("frequency", {}).items():
+            stats.frequency[feature] = RunningStat(**raw)
+        for feature, pairs in data.get("categorical", {}).items():
+            stats.categorical[feature] = Counter({value: count for value, count in pairs})
+        return stats
+
+
+def _feature_values(fingerprints: List[StyleFingerprint], group: str, feature: str) -> List[Any]:
+    """Non-missing values of one feature, in fingerprint order"""
+    values = []
+    for fp in fingerprints:
+        val = getattr(getattr(fp, group), feature, None)
+        if val is not None:
+            values.append(val)
+    return values
+
+
+def _first_seen_order(counter: Counter, fingerprints: List[StyleFingerprint], feature: str) -> Counter:
+    """Reorder counts as Counter(values) would, so most_common ties break the same way"""
+    ordered = Counter()
+    for fp in fingerprints:
+        val = getattr(fp.patterns, feature, None)
+        if val is not None and val in counter and val not in ordered:
+            ordered[val] = counter[val]
+    for val, count in counter.items():
+        if val not in ordered:
+            ordered[val] = count
+    return ordered
@@ -173,6 +173,34 @@ def save_fingerprint(taste_id: str, fingerprint: StyleFingerprint) -> str:
     return key
 
 
+def save_fingerprints(taste_id: str, fingerprints: List[StyleFingerprint]) -> int:
+    """
+    Save style fingerprints for many resources (written concurrently)
+    
+    Args:
+        taste_id: Taste UUID
+        fingerprints: Style fingerprints
+    
+    Returns:
+        Number of fingerprints saved
+    """
+    if not fingerprints:
+        return 0
+    
+    # Get taste to find owner_id
+    taste = db.get_taste(taste_id)
+    if not taste:
+        raise ValueError(f"Taste {taste_id} not found")
+    
+    owner_id = taste["owner_id"]
+    
+    return s3_storage.save_jsons_to_s3({
+        s3_storage.get_dtm_fingerprint_key(owner_id, taste_id, fp.resource_id):
+            fp.model_dump() if hasattr(fp, 'model_dump') else fp.dict()
+        for fp in fingerprints
+    })
+
+
 def load_fingerprint(taste_id: str, resource_id: str) -> Optional[StyleFingerprint]:
     """
     Load style fingerprint for a resource
@@ -239,7 +267,12 @@ def compute_subset_hash(resource_ids: List[str]) -> str:
     return hashlib.md5(hash_input.encode()).hexdigest()[:16]
 
 
-def save_subset_dtm(taste_id: str, resource_ids: List[str], dtm: Pass7CompleteDTM) -> str:
+def save_subset_dtm(
+    taste_id: str,
+    resource_ids: List[str],
+    dtm: Pass7CompleteDTM,
+    provisional: bool = False
+) -> str:
     """
     Save subset DTM to S3 cache
     
@@ -247,6 +280,7 @@ def save_subset_dtm(taste_id: str, resource_ids: List[str], dtm: Pass7CompleteDT
         taste_id: Taste UUID
         resource_ids: List of resource UUIDs
         dtm: Subset DTM
+        provisional: DTM reuses another DTM's narrative until a full synthesis replaces it
     
     Returns:
         S3 key of saved file
@@ -269,13 +303,19 @@ def save_subset_dtm(taste_id: str, resource_ids: List[str], dtm: Pass7CompleteDT
     s3_storage.save_json_to_s3(key, dtm_dict)
     
     # Update subset index
-    _update_subset_index(owner_id, taste_id, subset_hash, resource_ids)
+    _update_subset_index(owner_id, taste_id, subset_hash, resource_ids, provisional)
     
-    print(f"✅ Cached subset DTM to S3: {subset_hash}")
+    print(f"✅ Cached {'provisional ' if provisional else ''}subset DTM to S3: {subset_hash}")
     return key
 
 
-def _update_subset_index(owner_id: str, taste_id: str, subset_hash: str, resource_ids: List[str]):
+def _update_subset_index(
+    owner_id: str,
+    taste_id: str,
+    subset_hash: str,
+    resource_ids: List[str],
+    provisional: bool = False
+):
     """
     Update subset_index.json with new subset entry
     
@@ -284,6 +324,7 @@ def _update_subset_index(owner_id: str, taste_id: str, subset_hash: str, resourc
         taste_id: Taste UUID
         subset_hash: Hash of the subset
         resource_ids: List of resource UUIDs
+        provisional: Entry holds a near-match DTM awaiting full synthesis
     """
     # Load existing index
     index_key = s3_storage.get_dtm_subset_index_key(owner_id, taste_id)
@@ -293,7 +334,8 @@ def _update_subset_index(owner_id: str, taste_id: str, subset_hash: str, resourc
     index[subset_hash] = {
         "resource_ids": sorted(resource_ids),
         "created_at": datetime.now().isoformat(),
-        "dtm_file": f"{subset_hash}.json"
+        "dtm_file": f"{subset_hash}.json",
+        "provisional": provisional
     }
     
     # Save index
@@ -323,6 +365,20 @@ def load_subset_index(taste_id: str) -> Dict[str, Any]:
     return s3_storage.load_json_from_s3(index_key) or {}
 
 
+def is_subset_provisional(taste_id: str, subset_hash: str) -> bool:
+    """
+    Check whether a cached subset DTM is a provisional near-match copy
+    
+    Args:
+        taste_id: Taste UUID
+        subset_hash: Hash of the subset
+    
+    Returns:
+        True if the subset still awaits its full synthesis
+    """
+    return bool(load_subset_index(taste_id).get(subset_hash, {}).get("provisional"))
+
+
 def load_subset_dtm(taste_id: str, resource_ids: List[str]) -> Optional[Pass7CompleteDTM]:
     """
     Load subset DTM from S3 cache
@@ -351,6 +407,58 @@ def load_subset_dtm(taste_id: str, resource_ids: List[str]) -> Optional[Pass7Com
     return Pass7CompleteDTM(**data)
 
 
+def find_nearest_subset(
+    taste_id: str,
+    resource_ids: List[str],
+    min_similarity: float
+) -> Optional[Dict[str, Any]]:
+    """
+    Find the cached DTM whose resource set is closest to a requested subset
+    
+    Candidates are every fully synthesized entry of the subset index plus the
+    global DTM. Similarity is the Jaccard index of the two resource sets.
+    
+    Args:
+        taste_id: Taste UUID
+        resource_ids: Requested resource UUIDs
+        min_similarity: Minimum Jaccard index to accept (0-1)
+    
+    Returns:
+        {"hash": subset hash or "global", "similarity": float,
+         "resource_ids": [...], "dtm": Pass7CompleteDTM} or None
+    """
+    requested = set(resource_ids)
+    candidates = [
+        (subset_hash, entry.get("resource_ids", []))
+        for subset_hash, entry in load_subset_index(taste_id).items()
+        if not entry.get("provisional")
+    ]
+    metadata = load_dtm_metadata(taste_id)
+    if metadata and metadata.resource_ids_at_rebuild:
+        candidates.append(("global", metadata.resource_ids_at_rebuild))
+    
+    scored = []
+    for subset_hash, candidate_ids in candidates:
+        candidate = set(candidate_ids)
+        union = requested | candidate
+        similarity = len(requested & candidate) / len(union) if union else 0.0
+        if similarity >= min_similarity:
+            scored.append((similarity, subset_hash, candidate_ids))
+    
+    # Best first; prefer subsets over the global DTM on ties (narrower narrative)
+    scored.sort(key=lambda item: (-item[0], item[1] == "global"))
+    for similarity, subset_hash, candidate_ids in scored:
+        dtm = load_dtm(taste_id) if subset_hash == "global" else load_subset_dtm(taste_id, candidate_ids)
+        if dtm:
+            return {
+                "hash": subset_hash,
+                "similarity": similarity,
+                "resource_ids": candidate_ids,
+                "dtm": dtm
+            }
+    return None
+
+
 def delete_subsets_containing_resource(taste_id: str, resource_id: str):
     """
     Delete all subset DTMs that contain a specific resource
@@ -396,17 +504,162 @@ def delete_subsets_containing_resource(taste_id: str, resource_id: str):
     print(f"✅ Deleted {len(subsets_to_delete)} subset DTMs containing resource {resource_id}")
 
 
-def invalidate_global_dtm(taste_id: str):
+def invalidate_global_dtm(taste_id: str, resource_id: Optional[str] = None):
     """
     Invalidate global DTM by deleting it (will be rebuilt on next use)
     
+    The incremental synthesis state is kept, so the rebuild only has to
+    process what changed. Added and removed resources are detected from
+    the resource list; pass resource_id when an existing resource's DTR
+    was re-extracted so its fingerprint is recomputed.
+    
     Args:
         taste_id: Taste UUID
+        resource_id: Resource whose DTR changed (optional)
     """
     delete_dtm(taste_id)
+    if resource_id:
+        mark_resources_stale(taste_id, [resource_id])
+        drop_resource_partials(taste_id, [resource_id])
     print(f"🔄 Invalidated global DTM for taste {taste_id}")
 
 
+# ============================================================================
+# INCREMENTAL SYNTHESIS STATE
+# ============================================================================
+
+def save_synthesis_state(taste_id: str, state: Dict[str, Any]) -> str:
+    """
+    Save incremental synthesis state (fingerprints, running consensus stats,
+    last LLM synthesis) for a taste
+    
+    Args:
+        taste_id: Taste UUID
+        state: State dictionary built by the synthesizer
+    
+    Returns:
+        S3 key of saved file
+    """
+    # Get taste to find owner_id
+    taste = db.get_taste(taste_id)
+    if not taste:
+        raise ValueError(f"Taste {taste_id} not found")
+    
+    key = s3_storage.get_dtm_synthesis_state_key(taste["owner_id"], taste_id)
+    s3_storage.save_json_to_s3(key, state)
+    return key
+
+
+def load_synthesis_state(taste_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load incremental synthesis state
+    
+    Args:
+        taste_id: Taste UUID
+    
+    Returns:
+        State dictionary or None if the taste has never been synthesized
+    """
+    # Get taste to find owner_id
+    taste = db.get_taste(taste_id)
+    if not taste:
+        return None
+    
+    key = s3_storage.get_dtm_synthesis_state_key(taste["owner_id"], taste_id)
+    return s3_storage.load_json_from_s3(key)
+
+
+def mark_resources_stale(taste_id: str, resource_ids: List[str]):
+    """
+    Flag resources whose DTR changed so the next incremental synthesis
+    recomputes their fingerprints
+    
+    Args:
+        taste_id: Taste UUID
+        resource_ids: Resource UUIDs
+    """
+    state = load_synthesis_state(taste_id)
+    if not state:
+        return
+    
+    stale = set(state.get("stale_resource_ids", []))
+    stale.update(rid for rid in resource_ids if rid in state.get("fingerprints", {}))
+    if stale == set(state.get("stale_resource_ids", [])):
+        return
+    
+    state["stale_resource_ids"] = sorted(stale)
+    save_synthesis_state(taste_id, state)
+
+
+# ============================================================================
+# RESOURCE PARTIALS (subset synthesis)
+# ============================================================================
+
+def load_resource_partials(taste_id: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load per-resource synthesis partials (fingerprint plus the slice of the
+    DTR that synthesis reads), keyed by resource ID
+    
+    Args:
+        taste_id: Taste UUID
+    
+    Returns:
+        {resource_id: partial} (empty if none saved yet)
+    """
+    # Get taste to find owner_id
+    taste = db.get_taste(taste_id)
+    if not taste:
+        return {}
+    
+    key = s3_storage.get_dtm_partials_key(taste["owner_id"], taste_id)
+    return s3_storage.load_json_from_s3(key) or {}
+
+
+def save_resource_partials(taste_id: str, partials: Dict[str, Dict[str, Any]]):
+    """
+    Add or replace partials for some resources (others are kept)
+    
+    Args:
+        taste_id: Taste UUID
+        partials: {resource_id: partial}
+    """
+    if not partials:
+        return
+    
+    # Get taste to find owner_id
+    taste = db.get_taste(taste_id)
+    if not taste:
+        raise ValueError(f"Taste {taste_id} not found")
+    
+    key = s3_storage.get_dtm_partials_key(taste["owner_id"], taste_id)
+    merged = s3_storage.load_json_from_s3(key) or {}
+    merged.update(partials)
+    s3_storage.save_json_to_s3(key, merged)
+
+
+def drop_resource_partials(taste_id: str, resource_ids: List[str]):
+    """
+    Forget partials of resources whose DTR changed
+    
+    Args:
+        taste_id: Taste UUID
+        resource_ids: Resource UUIDs
+    """
+    # Get taste to find owner_id
+    taste = db.get_taste(taste_id)
+    if not taste:
+        return
+    
+    key = s3_storage.get_dtm_partials_key(taste["owner_id"], taste_id)
+    partials = s3_storage.load_json_from_s3(key)
+    if not partials or not any(rid in partials for rid in resource_ids):
+        return
+    
+    for rid in resource_ids:
+        partials.pop(rid, None)
+    s3_storage.save_json_to_s3(key, partials)
+
+
 # ============================================================================
 # METADATA OPERATIONS
 # ============================================================================
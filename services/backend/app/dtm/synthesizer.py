@@ -2,9 +2,13 @@
 DTM Synthesizer - Pass 7 Main Orchestrator
 Synthesizes multiple DTRs into a unified narrative-rich DTM
 """
+import re
+import json
 import time
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from app.core.async_io import run_blocking
 from app.dtr import storage as dtr_storage
 from app.llm import LLMService, Message, MessageRole
 from . import storage
@@ -25,12 +29,19 @@ from .schemas import (
 )
 
 
+# Token categories consolidated from the first DTR that has them
+TOKEN_CATEGORIES = ("colors", "typography", "spacing", "materials")
+
+SYNTHESIS_STATE_VERSION = 1
+
+
 async def synthesize_dtm(
     taste_id: str,
     resource_ids: List[str],
     llm: Optional[LLMService] = None,
     priority_mode: bool = False,
-    prioritized_resource_ids: Optional[List[str]] = None
+    prioritized_resource_ids: Optional[List[str]] = None,
+    incremental: bool = False
 ) -> Pass7CompleteDTM:
     """
     Main Pass 7 synthesizer
@@ -43,6 +54,12 @@ async def synthesize_dtm(
     5. Resolve conflicts
     6. LLM synthesis (narrative generation)
     7. Build complete DTM
+    
+    With incremental=True the taste's synthesis state from the previous run
+    is reused: only added or changed resources are loaded and fingerprinted,
+    consensus is updated from running statistics, and the LLM is only called
+    again if some feature's consensus class changed. Use it for the taste's
+    full resource set (the state is per taste, not per subset).
     """
     
     start_time = time.time()
@@ -53,17 +70,22 @@ async def synthesize_dtm(
     print(f"Taste ID: {taste_id}")
     print(f"Resources: {len(resource_ids)}")
     print(f"Priority mode: {priority_mode}")
+    print(f"Incremental: {incremental}")
     print(f"{'='*80}\n")
     
-    # Step 1: Load all DTRs
+    if incremental:
+        state = await run_blocking(storage.load_synthesis_state, taste_id)
+        if state and state.get("version") == SYNTHESIS_STATE_VERSION:
+            dtm = await _synthesize_incremental(
+                taste_id, resource_ids, state, llm, priority_mode, prioritized_resource_ids
+            )
+            await _finish_synthesis(taste_id, dtm, resource_ids, start_time, "incremental")
+            return dtm
+        print("ℹ️  No synthesis state yet, running full synthesis\n")
+    
+    # Step 1: Load all DTRs (one batch resource lookup, concurrent S3 reads)
     print("📂 Step 1: Loading DTRs...")
-    dtrs = []
-    for resource_id in resource_ids:
-        dtr = dtr_storage.load_complete_dtr(resource_id)
-        if not dtr:
-            print(f"⚠️  Warning: No DTR found for resource {resource_id}")
-            continue
-        dtrs.append({"resource_id": resource_id, "dtr": dtr})
+    dtrs = await _load_dtrs(resource_ids)
     
     if len(dtrs) < 2:
         raise Exception(f"Need at least 2 DTRs, found {len(dtrs)}")
@@ -72,19 +94,106 @@ async def synthesize_dtm(
     
     # Step 2: Extract fingerprints
     print("🔍 Step 2: Extracting fingerprints...")
-    fingerprints = []
-    for item in dtrs:
-        fp = fingerprinting.extract_fingerprint(item["dtr"], item["resource_id"])
-        fingerprints.append(fp)
-        
-        # Save fingerprint
-        storage.save_fingerprint(taste_id, fp)
+    fingerprints = [
+        fingerprinting.extract_fingerprint(item["dtr"], item["resource_id"])
+        for item in dtrs
+    ]
     
+    # Save fingerprints
+    await asyncio.gather(
+        run_blocking(storage.save_fingerprints, taste_id, fingerprints),
+        _save_partials(taste_id, dtrs, fingerprints)
+    )
     print(f"✅ Extracted {len(fingerprints)} fingerprints\n")
     
-    # Step 3: Compute consensus
-    print("🤝 Step 3: Computing consensus...")
+    # Steps 3-5: Consensus, conflicts, resolution
     consensus = consensus_module.extract_consensus(fingerprints)
+    resolved_conflicts = _resolve_consensus(
+        consensus, fingerprints, priority_mode, prioritized_resource_ids
+    )
+    
+    # Step 6: LLM synthesis (narrative generation)
+    synthesis_result = await _run_llm_synthesis(llm, dtrs, consensus, resolved_conflicts)
+    
+    # Step 7: Build complete DTM
+    print("🏗️  Step 7: Building complete DTM...")
+    
+    consolidated_tokens = _consolidate_tokens(dtrs)
+    dtm = _build_complete_dtm(
+        taste_id=taste_id,
+        resource_ids=resource_ids,
+        prioritized_resource_ids=prioritized_resource_ids,
+        consolidated_tokens=consolidated_tokens,
+        consensus=consensus,
+        resolved_conflicts=resolved_conflicts,
+        synthesis_result=synthesis_result
+    )
+    
+    if incremental:
+        token_index = {item["resource_id"]: _token_index(item["dtr"]) for item in dtrs}
+        await run_blocking(storage.save_synthesis_state, taste_id, _build_synthesis_state(
+            fingerprints=fingerprints,
+            stats=consensus_module.ConsensusStats.from_fingerprints(fingerprints),
+            signature=consensus_module.get_consensus_signature(consensus),
+            synthesis_result=synthesis_result,
+            token_index=token_index,
+            consolidated_tokens=consolidated_tokens
+        ))
+    
+    await _finish_synthesis(taste_id, dtm, resource_ids, start_time, "manual")  # Trigger updated by caller
+    return dtm
+
+
+async def _load_dtrs(resource_ids: List[str]) -> List[Dict[str, Any]]:
+    """Load complete DTRs in one batch, as [{"resource_id", "dtr"}] in resource order"""
+    if not resource_ids:
+        return []
+    
+    loaded = await run_blocking(dtr_storage.load_complete_dtrs, resource_ids)
+    dtrs = []
+    for resource_id in resource_ids:
+        if resource_id not in loaded:
+            print(f"⚠️  Warning: No DTR found for resource {resource_id}")
+            continue
+        dtrs.append({"resource_id": resource_id, "dtr": loaded[resource_id]})
+    return dtrs
+
+
+async def _finish_synthesis(
+    taste_id: str,
+    dtm: Pass7CompleteDTM,
+    resource_ids: List[str],
+    start_time: float,
+    trigger: str
+):
+    """Save the DTM and its rebuild metadata"""
+    # Save DTM and metadata
+    duration = time.time() - start_time
+    metadata = DTMMetadata(
+        taste_id=taste_id,
+        last_rebuild=datetime.now().isoformat(),
+        resource_ids_at_rebuild=resource_ids,
+        rebuild_trigger=trigger,
+        rebuild_duration_seconds=duration,
+        subsets_cached=[]
+    )
+    await asyncio.gather(
+        run_blocking(storage.save_dtm, taste_id, dtm, resource_ids),
+        run_blocking(storage.save_dtm_metadata, metadata)
+    )
+    
+    print(f"✅ DTM synthesis complete ({duration:.1f}s)\n")
+    print(f"{'='*80}\n")
+
+
+def _resolve_consensus(
+    consensus: Dict[str, Any],
+    fingerprints: List[StyleFingerprint],
+    priority_mode: bool,
+    prioritized_resource_ids: Optional[List[str]]
+) -> List[Dict[str, Any]]:
+    """Steps 3-5: report consensus, detect and resolve conflicts"""
+    print("🤝 Step 3: Computing consensus...")
     summary = consensus_module.get_consensus_summary(consensus)
     print(f"  Invariants: {summary['invariants_count']}")
     print(f"  Strong: {summary['strong_count']}")
@@ -107,8 +216,16 @@ async def synthesize_dtm(
         priority_resource_ids=prioritized_resource_ids
     )
     print(f"✅ Resolved {len(resolved_conflicts)} conflicts using {strategy}\n")
-    
-    # Step 6: LLM synthesis (narrative generation)
+    return resolved_conflicts
+
+
+async def _run_llm_synthesis(
+    llm: Optional[LLMService],
+    dtrs: List[Dict[str, Any]],
+    consensus: Dict[str, Any],
+    resolved_conflicts: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Step 6: narrative synthesis with Claude Opus (returns the parsed JSON)"""
     print("🧠 Step 6: LLM synthesis (Claude Opus)...")
     
     if llm is None:
@@ -135,9 +252,6 @@ async def synthesize_dtm(
     )
     
     # Parse response (expecting JSON)
-    import json
-    import re
-    
     print(f"\n{'='*80}")
     print(f"LLM Response (first 500 chars):")
     print(response.text[:500])
@@ -174,41 +288,366 @@ async def synthesize_dtm(
             raise ValueError(f"LLM did not return JSON. Response: {response.text[:1000]}")
     
     print("✅ LLM synthesis complete\n")
+    return synthesis_result
+
+
+# ============================================================================
+# INCREMENTAL SYNTHESIS
+# ============================================================================
+
+async def _synthesize_incremental(
+    taste_id: str,
+    resource_ids: List[str],
+    state: Dict[str, Any],
+    llm: Optional[LLMService],
+    priority_mode: bool,
+    prioritized_resource_ids: Optional[List[str]]
+) -> Pass7CompleteDTM:
+    """Update the previous synthesis with the resources that changed"""
+    previous = state.get("fingerprints", {})
+    stale = set(state.get("stale_resource_ids", []))
+    current = set(resource_ids)
+    
+    to_remove = [rid for rid in previous if rid not in current or rid in stale]
+    to_add = [rid for rid in resource_ids if rid not in previous or rid in stale]
+    print(f"♻️  Incremental: {len(previous) - len(to_remove)} reused, "
+          f"{len(to_add)} to add, {len(to_remove)} to remove\n")
+    
+    stats = consensus_module.ConsensusStats.from_dict(state["stats"])
+    token_index = dict(state.get("token_index", {}))
+    for rid in to_remove:
+        stats.remove(StyleFingerprint(**previous[rid]))
+        token_index.pop(rid, None)
+    
+    # Step 1-2: Load and fingerprint only what is new
+    print("📂 Step 1: Loading new DTRs...")
+    fresh_dtrs: Dict[str, Dict[str, Any]] = {
+        item["resource_id"]: item["dtr"] for item in await _load_dtrs(to_add)
+    }
+    
+    print(f"🔍 Step 2: Extracting {len(fresh_dtrs)} fingerprints...")
+    fingerprints_by_id = {
+        rid: StyleFingerprint(**fp) for rid, fp in previous.items()
+        if rid in current and rid not in stale
+    }
+    for resource_id, dtr in fresh_dtrs.items():
+        fp = fingerprinting.extract_fingerprint(dtr, resource_id)
+        stats.add(fp)
+        fingerprints_by_id[resource_id] = fp
+        token_index[resource_id] = _token_index(dtr)
+    await asyncio.gather(
+        run_blocking(storage.save_fingerprints, taste_id, [fingerprints_by_id[rid] for rid in fresh_dtrs]),
+        _save_partials(
+            taste_id,
+            [{"resource_id": rid, "dtr": dtr} for rid, dtr in fresh_dtrs.items()],
+            [fingerprints_by_id[rid] for rid in fresh_dtrs]
+        )
+    )
+    
+    included = [rid for rid in resource_ids if rid in fingerprints_by_id]
+    if len(included) < 2:
+        raise Exception(f"Need at least 2 DTRs, found {len(included)}")
+    fingerprints = [fingerprints_by_id[rid] for rid in included]
+    print(f"✅ {len(fingerprints)} fingerprints ({len(fresh_dtrs)} new)\n")
+    
+    # Steps 3-5 from the running statistics
+    consensus = stats.to_consensus(fingerprints)
+    resolved_conflicts = _resolve_consensus(
+        consensus, fingerprints, priority_mode, prioritized_resource_ids
+    )
+    
+    # Step 6: The narrative only depends on which class each feature is in
+    signature = consensus_module.get_consensus_signature(consensus)
+    synthesis_result = state.get("synthesis_result")
+    if synthesis_result and signature == state.get("signature"):
+        print("🧠 Step 6: Consensus classes unchanged, reusing previous LLM synthesis\n")
+    else:
+        changed = sorted(
+            feature for feature in set(signature) | set(state.get("signature", {}))
+            if signature.get(feature) != state.get("signature", {}).get(feature)
+        )
+        print(f"🧠 Consensus changed for {changed}, loading remaining DTRs for synthesis...")
+        for item in await _load_dtrs([rid for rid in included if rid not in fresh_dtrs]):
+            fresh_dtrs[item["resource_id"]] = item["dtr"]
+        dtrs = [{"resource_id": rid, "dtr": fresh_dtrs[rid]} for rid in included if rid in fresh_dtrs]
+        synthesis_result = await _run_llm_synthesis(llm, dtrs, consensus, resolved_conflicts)
     
     # Step 7: Build complete DTM
     print("🏗️  Step 7: Building complete DTM...")
-    
+    consolidated_tokens = await _consolidate_tokens_incremental(included, token_index, state, fresh_dtrs)
     dtm = _build_complete_dtm(
         taste_id=taste_id,
         resource_ids=resource_ids,
         prioritized_resource_ids=prioritized_resource_ids,
-        dtrs=dtrs,
+        consolidated_tokens=consolidated_tokens,
         consensus=consensus,
         resolved_conflicts=resolved_conflicts,
         synthesis_result=synthesis_result
     )
     
-    # Save DTM
-    storage.save_dtm(taste_id, dtm, resource_ids)
+    await run_blocking(storage.save_synthesis_state, taste_id, _build_synthesis_state(
+        fingerprints=fingerprints,
+        stats=stats,
+        signature=signature,
+        synthesis_result=synthesis_result,
+        token_index={rid: token_index[rid] for rid in included},
+        consolidated_tokens=consolidated_tokens
+    ))
+    return dtm
+
+
+def _build_synthesis_state(
+    fingerprints: List[StyleFingerprint],
+    stats: "consensus_module.ConsensusStats",
+    signature: Dict[str, str],
+    synthesis_result: Dict[str, Any],
+    token_index: Dict[str, Dict[str, Any]],
+    consolidated_tokens: ConsolidatedTokens
+) -> Dict[str, Any]:
+    """State saved after a synthesis for the next incremental run"""
+    return {
+        "version": SYNTHESIS_STATE_VERSION,
+        "resource_ids": [fp.resource_id for fp in fingerprints],
+        "fingerprints": {
+            fp.resource_id: fp.model_dump() if hasattr(fp, 'model_dump') else fp.dict()
+            for fp in fingerprints
+        },
+        "stale_resource_ids": [],
+        "stats": stats.to_dict(),
+        "signature": signature,
+        "synthesis_result": synthesis_result,
+        "token_index": token_index,
+        "consolidated_tokens": (
+            consolidated_tokens.model_dump() if hasattr(consolidated_tokens, 'model_dump')
+            else consolidated_tokens.dict()
+        ),
+    }
+
+
+def _token_index(dtr: Dict[str, Any]) -> Dict[str, Any]:
+    """Which token categories a DTR contributes, and how many components"""
+    exact_tokens = dtr.get("exact_tokens", {})
+    return {
+        "categories": [category for category in TOKEN_CATEGORIES if exact_tokens.get(category)],
+        "components": len(exact_tokens.get("components") or []),
+    }
+
+
+async def _consolidate_tokens_incremental(
+    resource_ids: List[str],
+    token_index: Dict[str, Dict[str, Any]],
+    state: Dict[str, Any],
+    fresh_dtrs: Dict[str, Dict[str, Any]]
+) -> ConsolidatedTokens:
+    """
+    Same result as _consolidate_tokens over every DTR, reusing the previous
+    consolidated tokens for resources whose DTR was not reloaded
+    """
+    previous_tokens = state.get("consolidated_tokens", {})
+    previous_index = state.get("token_index", {})
+    previous_order = state.get("resource_ids", [])
+    
+    def source_of(category: str, order: List[str], index: Dict[str, Any]) -> Optional[str]:
+        return next((rid for rid in order if category in index.get(rid, {}).get("categories", [])), None)
+    
+    merged: Dict[str, Any] = {}
+    for category in TOKEN_CATEGORIES:
+        source = source_of(category, resource_ids, token_index)
+        if source is None:
+            merged[category] = {}
+        elif source not in fresh_dtrs and source == source_of(category, previous_order, previous_index):
+            merged[category] = previous_tokens.get(category, {})
+        else:
+            if source not in fresh_dtrs:
+                fresh_dtrs[source] = await run_blocking(dtr_storage.load_complete_dtr, source) or {}
+            merged[category] = fresh_dtrs[source].get("exact_tokens", {}).get(category, {})
+    
+    # Previous components are the per-resource lists concatenated in order
+    previous_components = previous_tokens.get("components", [])
+    slices: Dict[str, List[Dict[str, Any]]] = {}
+    offset = 0
+    for rid in previous_order:
+        count = previous_index.get(rid, {}).get("components", 0)
+        slices[rid] = previous_components[offset:offset + count]
+        offset += count
+    
+    components = []
+    for rid in resource_ids:
+        if rid in fresh_dtrs:
+            components.extend(fresh_dtrs[rid].get("exact_tokens", {}).get("components") or [])
+        else:
+            components.extend(slices.get(rid, []))
     
-    # Save metadata
-    duration = time.time() - start_time
-    metadata = DTMMetadata(
+    return ConsolidatedTokens(components=components, **merged)
+
+
+# ============================================================================
+# SUBSET SYNTHESIS
+# ============================================================================
+
+# The synthesis prompt only shows this much of each personality text
+PROMPT_TEXT_LIMIT = 200
+
+
+async def synthesize_subset_dtm(
+    taste_id: str,
+    resource_ids: List[str],
+    llm: Optional[LLMService] = None,
+    base_dtm: Optional[Pass7CompleteDTM] = None
+) -> Pass7CompleteDTM:
+    """
+    Synthesize a DTM for a subset of a taste's resources
+    
+    Each resource contributes a saved partial (fingerprint plus the token and
+    prompt slices of its DTR), so only resources never synthesized before are
+    loaded from DTR storage. Consensus, conflicts and tokens are recomputed
+    for the exact subset. Unlike synthesize_dtm, the taste's global DTM is
+    left untouched.
+    
+    Args:
+        taste_id: Taste UUID
+        resource_ids: Resources in the subset
+        llm: LLM service (created on first use)
+        base_dtm: DTM of a similar resource set whose narrative is reused
+            instead of calling the LLM
+    
+    Returns:
+        Subset DTM (not cached; callers decide)
+    """
+    start_time = time.time()
+    print(f"🧩 Subset synthesis: {len(resource_ids)} resources"
+          f"{' (reusing cached narrative)' if base_dtm else ''}")
+    
+    dtrs, fingerprints = await _load_partials(taste_id, resource_ids)
+    if len(dtrs) < 2:
+        raise Exception(f"Need at least 2 DTRs, found {len(dtrs)}")
+    
+    consensus = consensus_module.extract_consensus(fingerprints)
+    resolved_conflicts = _resolve_consensus(consensus, fingerprints, False, None)
+    
+    if base_dtm is not None:
+        print("🧠 Step 6: Reusing narrative of a similar cached DTM\n")
+        synthesis_result = _synthesis_result_from_dtm(base_dtm, resolved_conflicts)
+    else:
+        synthesis_result = await _run_llm_synthesis(llm, dtrs, consensus, resolved_conflicts)
+    
+    dtm = _build_complete_dtm(
         taste_id=taste_id,
-        last_rebuild=datetime.now().isoformat(),
-        resource_ids_at_rebuild=resource_ids,
-        rebuild_trigger="manual",  # Will be updated by caller
-        rebuild_duration_seconds=duration,
-        subsets_cached=[]
+        resource_ids=resource_ids,
+        prioritized_resource_ids=None,
+        consolidated_tokens=_consolidate_tokens(dtrs),
+        consensus=consensus,
+        resolved_conflicts=resolved_conflicts,
+        synthesis_result=synthesis_result
     )
-    storage.save_dtm_metadata(metadata)
-    
-    print(f"✅ DTM synthesis complete ({duration:.1f}s)\n")
-    print(f"{'='*80}\n")
     
+    print(f"✅ Subset synthesis complete ({time.time() - start_time:.1f}s)\n")
     return dtm
 
 
+def _resource_partial(dtr: Dict[str, Any], fingerprint: StyleFingerprint) -> Dict[str, Any]:
+    """Fingerprint plus the parts of a DTR that synthesis reads"""
+    personality = dtr.get("personality", {})
+    exact_tokens = dtr.get("exact_tokens", {})
+    return {
+        "fingerprint": fingerprint.model_dump() if hasattr(fingerprint, 'model_dump') else fingerprint.dict(),
+        "dtr": {
+            "personality": {
+                **{
+                    field: personality[field][:PROMPT_TEXT_LIMIT]
+                    for field in ("lineage", "emotional_register")
+                    if isinstance(personality.get(field), str)
+                },
+                "obsessions": personality.get("obsessions", []),
+                "notable_absences": personality.get("notable_absences", []),
+            },
+            "exact_tokens": {
+                category: exact_tokens[category]
+                for category in (*TOKEN_CATEGORIES, "components")
+                if category in exact_tokens
+            },
+        },
+    }
+
+
+async def _save_partials(
+    taste_id: str,
+    dtrs: List[Dict[str, Any]],
+    fingerprints: List[StyleFingerprint]
+):
+    """Record partials for freshly loaded DTRs (best effort, it is only a cache)"""
+    try:
+        await run_blocking(storage.save_resource_partials, taste_id, {
+            item["resource_id"]: _resource_partial(item["dtr"], fp)
+            for item, fp in zip(dtrs, fingerprints)
+        })
+    except Exception as e:
+        print(f"⚠️  Warning: Failed to save resource partials: {e}")
+
+
+async def _load_partials(
+    taste_id: str,
+    resource_ids: List[str]
+) -> Tuple[List[Dict[str, Any]], List[StyleFingerprint]]:
+    """
+    Partial DTRs and fingerprints for a subset, loading only resources
+    that have no partial yet
+    
+    Returns:
+        (dtrs as [{"resource_id", "dtr"}], fingerprints), in resource order
+    """
+    partials = await run_blocking(storage.load_resource_partials, taste_id)
+    missing = [rid for rid in resource_ids if rid not in partials]
+    
+    if missing:
+        print(f"📂 Loading {len(missing)} DTRs without partials...")
+        loaded = await _load_dtrs(missing)
+        fingerprints = [
+            fingerprinting.extract_fingerprint(item["dtr"], item["resource_id"])
+            for item in loaded
+        ]
+        
+        await _save_partials(taste_id, loaded, fingerprints)
+        for item, fp in zip(loaded, fingerprints):
+            partials[item["resource_id"]] = _resource_partial(item["dtr"], fp)
+    
+    included = [rid for rid in resource_ids if rid in partials]
+    print(f"✅ {len(included)} resources ({len(included) - len(missing)} from partials)\n")
+    return (
+        [{"resource_id": rid, "dtr": partials[rid]["dtr"]} for rid in included],
+        [StyleFingerprint(**partials[rid]["fingerprint"]) for rid in included]
+    )
+
+
+def _synthesis_result_from_dtm(
+    dtm: Pass7CompleteDTM,
+    resolved_conflicts: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Rebuild an LLM synthesis result from an existing DTM
+    
+    Conflict narratives are matched by dimension; conflicts the DTM did not
+    have fall back to the rule-based narrative.
+    """
+    def dump(model) -> Dict[str, Any]:
+        return model.model_dump() if hasattr(model, 'model_dump') else model.dict()
+    
+    narratives = {
+        resolution.dimension: resolution.resolution_narrative
+        for resolution in dtm.conflict_resolutions
+    }
+    return {
+        "consensus_narrative": dump(dtm.consensus_narrative),
+        "conflict_resolutions_narrative": [
+            {"dimension": resolved["dimension"], "resolution_narrative": narratives[resolved["dimension"]]}
+            if resolved.get("dimension") in narratives else {}
+            for resolved in resolved_conflicts
+        ],
+        "unified_personality": dump(dtm.unified_personality),
+        "generation_guidance": dump(dtm.generation_guidance),
+    }
+
+
 def _build_synthesis_prompt(
     dtrs: List[Dict[str, Any]],
     consensus: Dict[str, Any],
@@ -310,7 +749,7 @@ def _build_complete_dtm(
     taste_id: str,
     resource_ids: List[str],
     prioritized_resource_ids: Optional[List[str]],
-    dtrs: List[Dict[str, Any]],
+    consolidated_tokens: ConsolidatedTokens,
     consensus: Dict[str, Any],
     resolved_conflicts: List[Dict[str, Any]],
     synthesis_result: Dict[str, Any]
@@ -362,9 +801,6 @@ def _build_complete_dtm(
         universal_absences=personality_data.get("universal_absences", [])
     )
     
-    # Consolidate tokens from all DTRs
-    consolidated_tokens = _consolidate_tokens(dtrs)
-    
     # Build generation guidance
     guidance_data = synthesis_result.get("generation_guidance", {})
     generation_guidance = GenerationGuidance(
@@ -32,7 +32,9 @@ from .storage import (
     save_pass_result,
     save_complete_dtr,
     load_extraction_status,
-    delete_resource_dtr
+    delete_resource_dtr,
+    hash_pass_inputs,
+    load_unchanged_pass_result
 )
 from .schemas import (
     Pass1StructureDTR,
@@ -68,6 +70,8 @@ __all__ = [
     'save_complete_dtr',
     'load_extraction_status',
     'delete_resource_dtr',
+    'hash_pass_inputs',
+    'load_unchanged_pass_result',
     
     # Schemas
     'Pass1StructureDTR',
@@ -5,6 +5,8 @@ Low-level extraction utilities for parsing Figma JSON and analyzing images.
 """
 from .figma_parser import (
     FigmaParser,
+    ParsedFigmaDocument,
+    parse_figma_document,
     parse_figma_structure,
     parse_figma_surface,
     parse_figma_typography,
@@ -22,6 +24,7 @@ from .vision import (
 )
 from .algorithmic import (
     k_means_color_clustering,
+    median_cut_palette,
     edge_detection_spacing,
     fft_grid_detection
 )
@@ -29,6 +32,8 @@ from .algorithmic import (
 __all__ = [
     # Figma parsing
     'FigmaParser',
+    'ParsedFigmaDocument',
+    'parse_figma_document',
     'parse_figma_structure',
     'parse_figma_surface',
     'parse_figma_typography',
@@ -46,6 +51,7 @@ __all__ = [
     
     # Algorithmic CV (optional)
     'k_means_color_clustering',
+    'median_cut_palette',
     'edge_detection_spacing',
     'fft_grid_detection'
 ]
\ No newline at end of file
@@ -7,9 +7,8 @@ Optional verification layer that can run alongside LLM analysis.
 NOTE: These are optional enhancements. Pass 1 can work without them.
 Implement when needed for higher precision.
 """
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import numpy as np
-from PIL import Image
 import io
 
 
@@ -31,6 +30,7 @@ def k_means_color_clustering(
         List of hex color strings (e.g., ['#0A0A1A', '#5856D6', ...])
     """
     try:
+        from PIL import Image
         from sklearn.cluster import KMeans
         
         # Load image
@@ -49,8 +49,10 @@ def k_means_color_clustering(
         pixels = np.array(image).reshape(-1, 3)
         
         # Sample pixels if still too many (for very large images)
+        # Seeded so repeated extractions of the same image agree
         if len(pixels) > 10000:
-            indices = np.random.choice(len(pixels), 10000, replace=False)
+            rng = np.random.default_rng(42)
+            indices = rng.choice(len(pixels), 10000, replace=False)
             pixels = pixels[indices]
         
         # K-means clustering
@@ -85,6 +87,123 @@ def k_means_color_clustering(
         return []
 
 
+def median_cut_palette(
+    image_bytes: bytes,
+    n_colors: int = 10,
+    bits: int = 5
+) -> List[str]:
+    """
+    Extract dominant colors with a deterministic median-cut quantizer.
+    
+    NumPy-only replacement for k_means_color_clustering in the Pass 2 hot
+    path: no sklearn import, no random sampling, one pass over the pixels.
+    Pixels are bucketed into a (2^bits)^3 color histogram, then the box
+    with the largest weighted variance is repeatedly split at its weighted
+    median along its widest channel until n_colors boxes remain.
+    
+    Args:
+        image_bytes: Image data as bytes
+        n_colors: Number of dominant colors to extract (default 10)
+        bits: Histogram precision per channel, 5 or 6 (default 5)
+    
+    Returns:
+        List of hex color strings sorted by frequency (most common first)
+    """
+    try:
+        from PIL import Image
+        
+        # Load image (JPEGs decode straight at reduced scale)
+        max_size = 400
+        image = Image.open(io.BytesIO(image_bytes))
+        image.draft('RGB', (max_size, max_size))
+        image = image.convert('RGB')
+        
+        # Downsample to ~400px with a box filter; averaging is all a
+        # histogram needs and is an order of magnitude cheaper than LANCZOS
+        factor = -(-max(image.size) // max_size)
+        if factor > 1:
+            image = image.reduce(factor)
+        
+        pixels = np.asarray(image, dtype=np.uint8).reshape(-1, 3)
+        return _median_cut_pixels(pixels, n_colors, bits)
+    
+    except Exception as e:
+        print(f"Error in median-cut palette extraction: {e}")
+        return []
+
+
+def _median_cut_pixels(
+    pixels: np.ndarray,
+    n_colors: int,
+    bits: int
+) -> List[str]:
+    """
+    Median-cut over the quantized color histogram of an (N, 3) uint8 array.
+    
+    Each histogram bin is represented by the mean of the real pixels that
+    fell into it, so quantization only affects grouping, not output colors.
+    """
+    if len(pixels) == 0 or n_colors < 1:
+        return []
+    
+    # Step 1: Quantized histogram (one bincount per channel for bin means)
+    shift = 8 - bits
+    quantized = (pixels >> shift).astype(np.int64)
+    bin_index = (quantized[:, 0] << (2 * bits)) | (quantized[:, 1] << bits) | quantized[:, 2]
+    n_bins = 1 << (3 * bits)
+    
+    counts = np.bincount(bin_index, minlength=n_bins)
+    occupied = np.flatnonzero(counts)
+    weights = counts[occupied].astype(np.float64)
+    sums = np.stack([
+        np.bincount(bin_index, weights=pixels[:, channel], minlength=n_bins)[occupied]
+        for channel in range(3)
+    ], axis=1)
+    colors = sums / weights[:, None]
+    
+    def box_error(members: np.ndarray) -> float:
+        # Weighted sum of squared distances to the box mean
+        if len(members) < 2:
+            return 0.0
+        w = weights[members]
+        c = colors[members]
+        mean = (c * w[:, None]).sum(axis=0) / w.sum()
+        return float((w[:, None] * (c - mean) ** 2).sum())
+    
+    # Step 2: Split the worst box until we have n_colors boxes
+    boxes = [np.arange(len(occupied))]
+    errors = [box_error(boxes[0])]
+    
+    while len(boxes) < n_colors:
+        worst = int(np.argmax(errors))
+        if errors[worst] <= 0.0:
+            break
+        
+        members = boxes[worst]
+        c = colors[members]
+        channel = int(np.argmax(c.max(axis=0) - c.min(axis=0)))
+        ordered = members[np.argsort(c[:, channel], kind='stable')]
+        
+        cumulative = np.cumsum(weights[ordered])
+        split = int(np.searchsorted(cumulative, cumulative[-1] / 2.0)) + 1
+        split = min(max(split, 1), len(ordered) - 1)
+        
+        left, right = ordered[:split], ordered[split:]
+        boxes[worst:worst + 1] = [left, right]
+        errors[worst:worst + 1] = [box_error(left), box_error(right)]
+    
+    # Step 3: Weighted box means, merged by hex, sorted by frequency
+    palette: Dict[str, float] = {}
+    for members in boxes:
+        weight = weights[members].sum()
+        mean = sums[members].sum(axis=0) / weight
+        r, g, b = np.clip(np.rint(mean), 0, 255).astype(int)
+        hex_color = f"#{r:02X}{g:02X}{b:02X}"
+        palette[hex_color] = palette.get(hex_color, 0.0) + weight
+    
+    return [hex_color for hex_color, _ in sorted(palette.items(), key=lambda item: (-item[1], item[0]))]
+
+
 def edge_detection_spacing(
     image_bytes: bytes
 ) -> List[int]:
@@ -162,6 +281,7 @@ def fft_grid_detection(
 
 __all__ = [
     'k_means_color_clustering',
+    'median_cut_palette',
     'edge_detection_spacing',
     'fft_grid_detection'
 ]
\ No newline at end of file
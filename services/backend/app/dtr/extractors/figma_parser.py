@@ -6,12 +6,139 @@ The plugin exports a single root FRAME node with a complete children tree.
 
 Pass 1 Focus: Layout topology, hierarchy, content density, spacing system
 """
-from typing import Dict, List, Any, Optional, Tuple, Set
+from typing import Dict, List, Any, Optional, Tuple, Set, Mapping, Union
+from dataclasses import dataclass
+from types import MappingProxyType
 import statistics
 from collections import Counter
 import math
 
 
+# ============================================================================
+# PARSED DOCUMENT
+# ============================================================================
+
+@dataclass(frozen=True)
+class ParsedFigmaDocument:
+    """
+    Read-only index over a Figma JSON tree, built in a single walk.
+    
+    Passes 1-5 all need the same node lists. Building this once and sharing
+    it avoids re-walking the tree per pass. The source JSON is never mutated:
+    node depths live in a side table keyed by node identity instead of being
+    stamped into the dicts.
+    """
+    root: Dict[str, Any]
+    all_nodes: Tuple[Dict[str, Any], ...]
+    frames: Tuple[Dict[str, Any], ...]
+    text_nodes: Tuple[Dict[str, Any], ...]
+    image_nodes: Tuple[Dict[str, Any], ...]
+    spacing_values: Tuple[float, ...]
+    node_index: Mapping[str, Dict[str, Any]]
+    _depths: Mapping[int, int]
+    
+    @classmethod
+    def from_json(cls, figma_json: Dict[str, Any]) -> "ParsedFigmaDocument":
+        """
+        Walk the tree once and build all node indexes.
+        
+        Args:
+            figma_json: Root node from Figma plugin export (type: FRAME)
+        
+        Returns:
+            ParsedFigmaDocument over figma_json
+        """
+        all_nodes: List[Dict[str, Any]] = []
+        frames: List[Dict[str, Any]] = []
+        text_nodes: List[Dict[str, Any]] = []
+        image_nodes: List[Dict[str, Any]] = []
+        spacing_values: List[float] = []
+        node_index: Dict[str, Dict[str, Any]] = {}
+        depths: Dict[int, int] = {}
+        
+        # Iterative pre-order walk (same order as the old recursive walk,
+        # without the recursion limit on deeply nested exports)
+        stack: List[Tuple[Any, int]] = [(figma_json, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            
+            depths[id(node)] = depth
+            all_nodes.append(node)
+            
+            node_id = node.get('id')
+            if node_id is not None:
+                node_index.setdefault(node_id, node)
+            
+            # Categorize by type
+            node_type = node.get('type', '')
+            if node_type == 'FRAME':
+                frames.append(node)
+            elif node_type == 'TEXT':
+                text_nodes.append(node)
+            
+            # Check for image fills (RECTANGLE or ELLIPSE with IMAGE fill)
+            if node_type in ('RECTANGLE', 'ELLIPSE', 'VECTOR'):
+                for fill in node.get('fills', []):
+                    if fill.get('type') == 'IMAGE':
+                        image_nodes.append(node)
+                        break
+            
+            # Padding values
+            for key in ('paddingLeft', 'paddingRight', 'paddingTop', 'paddingBottom'):
+                val = node.get(key)
+                if val is not None and val > 0:
+                    spacing_values.append(val)
+            
+            # Item spacing (gap in auto-layout)
+            item_spacing = node.get('itemSpacing')
+            if item_spacing is not None and item_spacing > 0:
+                spacing_values.append(item_spacing)
+            
+            children = node.get('children')
+            if children:
+                stack.extend((child, depth + 1) for child in reversed(children))
+        
+        return cls(
+            root=figma_json,
+            all_nodes=tuple(all_nodes),
+            frames=tuple(frames),
+            text_nodes=tuple(text_nodes),
+            image_nodes=tuple(image_nodes),
+            spacing_values=tuple(spacing_values),
+            node_index=MappingProxyType(node_index),
+            _depths=MappingProxyType(depths),
+        )
+    
+    def depth_of(self, node: Dict[str, Any]) -> int:
+        """Nesting depth of a node in this document (0 for the root)"""
+        return self._depths.get(id(node), 0)
+    
+    @property
+    def max_depth(self) -> int:
+        """Deepest nesting level in the document"""
+        return max(self._depths.values(), default=0)
+
+
+FigmaSource = Union[Dict[str, Any], ParsedFigmaDocument]
+
+
+def parse_figma_document(figma_json: FigmaSource) -> ParsedFigmaDocument:
+    """
+    Build a ParsedFigmaDocument, or return it unchanged if already parsed.
+    
+    Args:
+        figma_json: Root FRAME node or an existing ParsedFigmaDocument
+    
+    Returns:
+        ParsedFigmaDocument
+    """
+    if isinstance(figma_json, ParsedFigmaDocument):
+        return figma_json
+    return ParsedFigmaDocument.from_json(figma_json)
+
+
 class FigmaParser:
     """
     Parse Figma JSON and extract structural properties deterministically.
@@ -26,67 +153,21 @@ class FigmaParser:
     - Spacing system (quantum/base unit, scale, consistency)
     """
     
-    def __init__(self, figma_json: Dict[str, Any]):
+    def __init__(self, figma_json: FigmaSource):
         """
         Initialize parser with Figma JSON root node.
         
         Args:
-            figma_json: Root node from Figma plugin export (type: FRAME)
+            figma_json: Root node from Figma plugin export (type: FRAME), or a
+                        ParsedFigmaDocument shared with other passes
         """
-        self.root = figma_json
-        self.all_nodes = []
-        self.frames = []
-        self.text_nodes = []
-        self.image_nodes = []
-        self.spacing_values = []
-        
-        # Collect all nodes with depth tracking
-        self._collect_nodes(figma_json, depth=0)
-    
-    def _collect_nodes(self, node: Any, depth: int = 0) -> None:
-        """Recursively collect all nodes with depth tracking"""
-        if not isinstance(node, dict):
-            return
-        
-        # Add depth for hierarchy analysis
-        node['_depth'] = depth
-        self.all_nodes.append(node)
-        
-        # Categorize by type
-        node_type = node.get('type', '')
-        if node_type == 'FRAME':
-            self.frames.append(node)
-        elif node_type == 'TEXT':
-            self.text_nodes.append(node)
-        
-        # Check for image fills (RECTANGLE or ELLIPSE with IMAGE fill)
-        if node_type in ['RECTANGLE', 'ELLIPSE', 'VECTOR']:
-            fills = node.get('fills', [])
-            for fill in fills:
-                if fill.get('type') == 'IMAGE':
-                    self.image_nodes.append(node)
-                    break
-        
-        # Collect spacing values from this node
-        self._collect_spacing_from_node(node)
-        
-        # Recurse into children
-        if 'children' in node:
-            for child in node.get('children', []):
-                self._collect_nodes(child, depth + 1)
-    
-    def _collect_spacing_from_node(self, node: Dict[str, Any]) -> None:
-        """Extract spacing values from a single node"""
-        # Padding values
-        for key in ['paddingLeft', 'paddingRight', 'paddingTop', 'paddingBottom']:
-            val = node.get(key)
-            if val is not None and val > 0:
-                self.spacing_values.append(val)
-        
-        # Item spacing (gap in auto-layout)
-        item_spacing = node.get('itemSpacing')
-        if item_spacing is not None and item_spacing > 0:
-            self.spacing_values.append(item_spacing)
+        self.document = parse_figma_document(figma_json)
+        self.root = self.document.root
+        self.all_nodes = self.document.all_nodes
+        self.frames = self.document.frames
+        self.text_nodes = self.document.text_nodes
+        self.image_nodes = self.document.image_nodes
+        self.spacing_values = self.document.spacing_values
     
     # ========================================================================
     # PASS 1: STRUCTURAL SKELETON EXTRACTION
@@ -142,7 +223,7 @@ class FigmaParser:
             direction = "free"  # Absolute positioning
         
         # Calculate max nesting depth
-        max_depth = max([n.get('_depth', 0) for n in self.all_nodes], default=0)
+        max_depth = self.document.max_depth
         
         return {
             "type": layout_type,
@@ -376,7 +457,7 @@ class FigmaParser:
             methods.append("position")
         
         # Check for nesting depth (less nested = more prominent)
-        depths = [n.get('_depth', 0) for n in nodes]
+        depths = [self.document.depth_of(n) for n in nodes]
         if depths and min(depths) <= 2:
             methods.append("hierarchy_level")
         
@@ -1058,8 +1139,7 @@ class FigmaParser:
         Returns:
             Dict with families, sizes, weights, spacing data (to be analyzed by LLM)
         """
-        text_nodes = []
-        self._collect_text_nodes(self.root, text_nodes)
+        text_nodes = [n for n in self.text_nodes if n.get('visible', True)]
         
         if not text_nodes:
             # No text found - return minimal data
@@ -1092,14 +1172,6 @@ class FigmaParser:
             "alignments": alignments
         }
     
-    def _collect_text_nodes(self, node: Dict[str, Any], collector: List[Dict]):
-        """Recursively collect all TEXT nodes"""
-        if node.get('type') == 'TEXT' and node.get('visible', True):
-            collector.append(node)
-        
-        for child in node.get('children', []):
-            self._collect_text_nodes(child, collector)
-    
     def _extract_font_families(self, text_nodes: List[Dict]) -> List[Dict[str, Any]]:
         """
         Extract font families with weights used.
@@ -1785,12 +1857,13 @@ class FigmaParser:
 # PUBLIC API
 # ============================================================================
 
-def parse_figma_structure(figma_json: Dict[str, Any]) -> Dict[str, Any]:
+def parse_figma_structure(figma_json: FigmaSource) -> Dict[str, Any]:
     """
     Parse structural information from Figma JSON (Pass 1).
     
     Args:
-        figma_json: Root FRAME node from Figma plugin export
+        figma_json: Root FRAME node from Figma plugin export, or a
+                    ParsedFigmaDocument shared across passes
     
     Returns:
         Dict with layout, hierarchy, density, spacing data
@@ -1799,12 +1872,13 @@ def parse_figma_structure(figma_json: Dict[str, Any]) -> Dict[str, Any]:
     return parser.extract_structure()
 
 
-def parse_figma_surface(figma_json: Dict[str, Any]) -> Dict[str, Any]:
+def parse_figma_surface(figma_json: FigmaSource) -> Dict[str, Any]:
     """
     Parse surface treatment from Figma JSON (Pass 2).
     
     Args:
-        figma_json: Root FRAME node from Figma plugin export
+        figma_json: Root FRAME node from Figma plugin export, or a
+                    ParsedFigmaDocument shared across passes
     
     Returns:
         Dict with colors, effects, gradients, shadows data
@@ -1813,12 +1887,13 @@ def parse_figma_surface(figma_json: Dict[str, Any]) -> Dict[str, Any]:
     return parser.extract_surface()
 
 
-def parse_figma_typography(figma_json: Dict[str, Any]) -> Dict[str, Any]:
+def parse_figma_typography(figma_json: FigmaSource) -> Dict[str, Any]:
     """
     Parse typography system from Figma JSON (Pass 3).
     
     Args:
-        figma_json: Root FRAME node from Figma plugin export
+        figma_json: Root FRAME node from Figma plugin export, or a
+                    ParsedFigmaDocument shared across passes
     
     Returns:
         Dict with families, sizes, weights, line heights, letter spacing data
@@ -1827,12 +1902,13 @@ def parse_figma_typography(figma_json: Dict[str, Any]) -> Dict[str, Any]:
     return parser.extract_typography()
 
 
-def parse_figma_images(figma_json: Dict[str, Any]) -> Dict[str, Any]:
+def parse_figma_images(figma_json: FigmaSource) -> Dict[str, Any]:
     """
     Parse image usage from Figma JSON (Pass 4).
     
     Args:
-        figma_json: Root FRAME node from Figma plugin export
+        figma_json: Root FRAME node from Figma plugin export, or a
+                    ParsedFigmaDocument shared across passes
     
     Returns:
         Dict with image_nodes list containing metadata for all IMAGE fills
@@ -1841,12 +1917,13 @@ def parse_figma_images(figma_json: Dict[str, Any]) -> Dict[str, Any]:
     return parser.extract_images()
 
 
-def parse_figma_components(figma_json: Dict[str, Any]) -> Dict[str, Any]:
+def parse_figma_components(figma_json: FigmaSource) -> Dict[str, Any]:
     """
     Parse component vocabulary from Figma JSON (Pass 5).
     
     Args:
-        figma_json: Root FRAME node from Figma plugin export
+        figma_json: Root FRAME node from Figma plugin export, or a
+                    ParsedFigmaDocument shared across passes
     
     Returns:
         Dict with component inventory containing identified components and their properties
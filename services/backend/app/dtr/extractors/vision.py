@@ -10,8 +10,8 @@ import json
 import traceback
  
 from typing import List, Dict, Any, Optional
-import base64
 from app.llm import LLMService, Message, MessageRole, ImageContent, TextContent
+from app.llm.utils.images import get_prepared_image
 
 
 class VisionAnalyzer:
@@ -21,6 +21,9 @@ class VisionAnalyzer:
     Wraps LLMService for vision-based extraction tasks.
     """
     
+    # Vision model for every analysis (images are prepared for its provider)
+    MODEL = "gemini-2.5-flash"
+    
     def __init__(self):
         """Initialize with LLM service"""
         self.llm = LLMService()
@@ -47,8 +50,8 @@ class VisionAnalyzer:
         Returns:
             Dict with layout, hierarchy, density, spacing data
         """
-        # Encode image
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        # Shared prepared image (encoded once per resource)
+        prepared = get_prepared_image(image_bytes, image_format, model=self.MODEL)
         
         # Build prompt
         system_prompt = """You are a design analysis expert specializing in spatial structure and layout systems.
@@ -240,15 +243,15 @@ Respond with a JSON object matching this structure:
         
         # Call LLM vision model (Gemini 2.5 Flash - best for vision)
         response = await self.llm.generate(
-            model="gemini-2.5-flash",
+            model=self.MODEL,
             messages=[
                 Message(role=MessageRole.SYSTEM, content=system_prompt),
                 Message(
                     role=MessageRole.USER,
                     content=[
                         ImageContent(
-                            data=image_base64,
-                            media_type=f"image/{image_format}"
+                            data=prepared.data,
+                            media_type=prepared.media_type
                         ),
                         TextContent(text=user_prompt)
                     ]
@@ -324,7 +327,7 @@ Respond with a JSON object matching this structure:
         Returns:
             Validation results with discrepancies noted
         """
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        prepared = get_prepared_image(image_bytes, image_format, model=self.MODEL)
         
         system_prompt = """You are a design analysis expert. Compare the visual hierarchy you see in the image against the structural hierarchy from code."""
         
@@ -374,13 +377,13 @@ Respond with:
         }
         
         response = await self.llm.generate(
-            model="gemini-2.5-flash",
+            model=self.MODEL,
             messages=[
                 Message(role=MessageRole.SYSTEM, content=system_prompt),
                 Message(
                     role=MessageRole.USER,
                     content=[
-                        ImageContent(data=image_base64, media_type=f"image/{image_format}"),
+                        ImageContent(data=prepared.data, media_type=prepared.media_type),
                         TextContent(text=user_prompt)
                     ]
                 )
@@ -427,8 +430,8 @@ Respond with:
         Returns:
             Dict with colors, materials, effects, atmosphere
         """
-        # Encode image
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        # Shared prepared image (encoded once per resource)
+        prepared = get_prepared_image(image_bytes, image_format, model=self.MODEL)
         
         # Build prompt with kmeans reference if available
         kmeans_reference = ""
@@ -614,7 +617,7 @@ Respond with a JSON object:{kmeans_reference}
         
         # Call LLM with vision
         response = await self.llm.generate(
-            model="gemini-2.5-flash",
+            model=self.MODEL,
             messages=[
                 Message(
                     role=MessageRole.SYSTEM,
@@ -624,8 +627,8 @@ Respond with a JSON object:{kmeans_reference}
                     role=MessageRole.USER,
                     content=[
                         ImageContent(
-                            data=image_base64,
-                            media_type=f"image/{image_format}"
+                            data=prepared.data,
+                            media_type=prepared.media_type
                         ),
                         TextContent(text=user_prompt)
                     ]
@@ -680,8 +683,8 @@ Respond with a JSON object:{kmeans_reference}
         Returns:
             Dict with typography data including families, scale, narratives
         """
-        # Convert to base64
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        # Shared prepared image (encoded once per resource)
+        prepared = get_prepared_image(image_bytes, image_format, model=self.MODEL)
         
         system_prompt = """You are a typography expert analyzing a design's type system.
 
@@ -851,7 +854,7 @@ CRITICAL: All narrative fields must be rich, multi-sentence paragraphs that expl
         # Call LLM with vision
         # Using Gemini 2.5 Flash - handles structured typography analysis well
         response = await self.llm.generate(
-            model="gemini-2.5-flash",
+            model=self.MODEL,
             messages=[
                 Message(
                     role=MessageRole.SYSTEM,
@@ -861,8 +864,8 @@ CRITICAL: All narrative fields must be rich, multi-sentence paragraphs that expl
                     role=MessageRole.USER,
                     content=[
                         ImageContent(
-                            data=image_base64,
-                            media_type=f"image/{image_format}"
+                            data=prepared.data,
+                            media_type=prepared.media_type
                         ),
                         TextContent(text=user_prompt)
                     ]
@@ -924,8 +927,8 @@ CRITICAL: All narrative fields must be rich, multi-sentence paragraphs that expl
         Returns:
             Dict with has_images, placements, content_style, rhythm data
         """
-        # Encode image
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        # Shared prepared image (encoded once per resource)
+        prepared = get_prepared_image(image_bytes, image_format, model=self.MODEL)
         
         # Build system prompt - EXPLICIT about what counts as imagery
         system_prompt = """You are a design analyst specializing in understanding how designers use imagery.
@@ -1030,15 +1033,15 @@ CRITICAL: Return ONLY the JSON object. No markdown, no backticks, no explanation
                 
                 # Use Gemini 2.5 Flash (cheaper, faster) with retries instead of Claude
                 response = await self.llm.generate(
-                    model="gemini-2.5-flash",
+                    model=self.MODEL,
                     messages=[
                         Message(role=MessageRole.SYSTEM, content=system_prompt),
                         Message(
                             role=MessageRole.USER,
                             content=[
                                 ImageContent(
-                                    data=image_base64,
-                                    media_type=f"image/{image_format}"
+                                    data=prepared.data,
+                                    media_type=prepared.media_type
                                 ),
                                 TextContent(text=user_prompt)
                             ]
@@ -1163,8 +1166,8 @@ CRITICAL: Return ONLY the JSON object. No markdown, no backticks, no explanation
         Returns:
             Dict with component inventory, properties, and rich narratives
         """
-        # Encode image
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        # Shared prepared image (encoded once per resource)
+        prepared = get_prepared_image(image_bytes, image_format, model=self.MODEL)
         
         # Build context from Figma inventory if provided
         figma_context = ""
@@ -1245,7 +1248,7 @@ CRITICAL:
                 print(f"Component analysis attempt {attempt}/{max_attempts}...")
                 
                 response = await self.llm.generate(
-                    model="gemini-2.5-flash",
+                    model=self.MODEL,
                     messages=[
                         Message(
                             role=MessageRole.SYSTEM,
@@ -1255,8 +1258,8 @@ CRITICAL:
                             role=MessageRole.USER,
                             content=[
                                 ImageContent(
-                                    data=image_base64,
-                                    media_type=f"image/{image_format}"
+                                    data=prepared.data,
+                                    media_type=prepared.media_type
                                 ),
                                 TextContent(text=user_prompt)
                             ]
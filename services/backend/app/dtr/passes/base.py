@@ -9,6 +9,8 @@ from typing import Dict, Any, Optional, Literal
 from datetime import datetime
 import time
 
+from ..extractors.figma_parser import ParsedFigmaDocument, FigmaSource
+
 
 class BasePass(ABC):
     """
@@ -17,10 +19,17 @@ class BasePass(ABC):
     All passes implement this interface for consistency.
     """
     
+    # Bump in a subclass whenever its prompt or extraction logic changes, so
+    # saved results keyed by input hash are recomputed instead of reused
+    VERSION = "1"
+    
     def __init__(self):
         """Initialize pass"""
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
+        
+        # Pre-parsed Figma tree shared across parallel passes (optional)
+        self.parsed_figma: Optional[ParsedFigmaDocument] = None
     
     @abstractmethod
     async def execute(
@@ -60,6 +69,23 @@ class BasePass(ABC):
             return 0
         return int((self.end_time - self.start_time) * 1000)
     
+    def _figma_source(self, figma_json: Dict[str, Any]) -> FigmaSource:
+        """
+        Return what the Figma parsers should read from
+        
+        Prefers the shared ParsedFigmaDocument when the pipeline provided one,
+        so the node tree is walked once per resource instead of once per pass.
+        
+        Args:
+            figma_json: Raw Figma JSON passed to execute()
+        
+        Returns:
+            ParsedFigmaDocument if set, else figma_json
+        """
+        if self.parsed_figma is not None:
+            return self.parsed_figma
+        return figma_json
+    
     def _determine_authority(
         self,
         has_figma: bool,
@@ -11,6 +11,7 @@ Handles three scenarios:
 from typing import Dict, Any, Optional
 from .base import BasePass, PassRegistry
 from ..schemas import Pass1StructureDTR
+from ..extractors.figma_parser import ParsedFigmaDocument
 from ..extractors import parse_figma_structure, analyze_structure_from_image, validate_hierarchy
 from app.llm import LLMService, Message, MessageRole
 
@@ -106,7 +107,7 @@ class Pass1Structure(BasePass):
             Structure data dict with rich narratives
         """
         # Step 1: Code extraction (deterministic)
-        code_result = parse_figma_structure(figma_json)
+        code_result = parse_figma_structure(self._figma_source(figma_json))
         
         # Step 2: LLM analysis to add rich narratives
         analyzed = await self._llm_analyze_extracted_structure(code_result)
@@ -162,7 +163,7 @@ class Pass1Structure(BasePass):
         
         # Run both extractions in parallel
         # Figma parsing is synchronous, so wrap in thread to avoid blocking
-        figma_task = asyncio.to_thread(parse_figma_structure, figma_json)
+        figma_task = asyncio.to_thread(parse_figma_structure, self._figma_source(figma_json))
         
         # Vision analysis runs independently (now includes rich narratives)
         vision_task = analyze_structure_from_image(image_bytes, image_format)
@@ -389,7 +390,8 @@ PassRegistry.register("pass_1_structure", Pass1Structure)
 async def run_pass_1(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
-    image_format: str = "png"
+    image_format: str = "png",
+    parsed_figma: Optional[ParsedFigmaDocument] = None
 ) -> Pass1StructureDTR:
     """
     Run Pass 1: Structural Skeleton
@@ -400,11 +402,13 @@ async def run_pass_1(
         figma_json: Optional Figma JSON document
         image_bytes: Optional image data
         image_format: Image format (png, jpg, webp)
+        parsed_figma: Optional pre-parsed figma_json shared across passes
     
     Returns:
         Pass1StructureDTR with structural analysis
     """
     pass_instance = Pass1Structure()
+    pass_instance.parsed_figma = parsed_figma
     return await pass_instance.execute(
         figma_json=figma_json,
         image_bytes=image_bytes,
@@ -15,12 +15,14 @@ from datetime import datetime
 
 from .base import BasePass, PassRegistry
 from ..schemas import Pass2SurfaceDTR, ColorEntry, ColorSystem, MaterialSystem, DepthPlane, Effect
+from ..extractors.figma_parser import ParsedFigmaDocument
 from ..extractors import (
     parse_figma_surface,
     analyze_surface_from_image,
-    k_means_color_clustering
+    median_cut_palette
 )
 from app.llm import LLMService, Message, MessageRole, TextContent
+from app.core.async_cpu import run_cpu_bound
 
 
 class Pass2Surface(BasePass):
@@ -105,7 +107,7 @@ class Pass2Surface(BasePass):
             Surface data dict
         """
         # Step 1: Code extraction (deterministic)
-        figma_data = parse_figma_surface(figma_json)
+        figma_data = parse_figma_surface(self._figma_source(figma_json))
         
         # Step 2: LLM analysis of extracted values
         analyzed = await self._llm_analyze_extracted_data(figma_data)
@@ -130,8 +132,11 @@ class Pass2Surface(BasePass):
         Returns:
             Surface data dict
         """
-        # Step 1: K-means clustering (algorithmic ground truth)
-        kmeans_colors = k_means_color_clustering(image_bytes, n_colors=10)
+        # Step 1: Palette quantization (algorithmic ground truth), off the event
+        # loop so the other passes' vision requests keep flowing meanwhile.
+        # median_cut_palette replaces sklearn k-means here; the palette is still
+        # passed around as "kmeans_colors" to keep prompts and DTR output stable.
+        kmeans_colors = await run_cpu_bound(median_cut_palette, image_bytes, n_colors=10)
         
         # Step 2: LLM vision analysis (with kmeans reference)
         vision_data = await analyze_surface_from_image(
@@ -166,18 +171,25 @@ class Pass2Surface(BasePass):
             Combined surface data dict
         """
         # Run both extractions in parallel
-        figma_task = asyncio.to_thread(parse_figma_surface, figma_json)
-        
-        # K-means + vision analysis
-        kmeans_colors = k_means_color_clustering(image_bytes, n_colors=10)
-        vision_task = analyze_surface_from_image(
-            image_bytes, 
-            image_format,
-            kmeans_colors=kmeans_colors
+        figma_task = asyncio.create_task(
+            asyncio.to_thread(parse_figma_surface, self._figma_source(figma_json))
         )
         
+        # K-means + vision analysis (vision prompt needs the kmeans palette,
+        # so only the Figma parse can overlap the clustering)
+        async def _kmeans_then_vision():
+            kmeans = await run_cpu_bound(median_cut_palette, image_bytes, n_colors=10)
+            vision = await analyze_surface_from_image(
+                image_bytes,
+                image_format,
+                kmeans_colors=kmeans
+            )
+            return kmeans, vision
+        
         # Wait for both
-        figma_data, vision_data = await asyncio.gather(figma_task, vision_task)
+        figma_data, (kmeans_colors, vision_data) = await asyncio.gather(
+            figma_task, _kmeans_then_vision()
+        )
         
         # Merge: Use Figma for exact values, vision for atmosphere/materials
         merged = await self._merge_figma_and_vision(figma_data, vision_data, kmeans_colors)
@@ -672,7 +684,8 @@ PassRegistry.register("pass_2_surface", Pass2Surface)
 async def run_pass_2(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
-    image_format: str = "png"
+    image_format: str = "png",
+    parsed_figma: Optional[ParsedFigmaDocument] = None
 ) -> Pass2SurfaceDTR:
     """
     Run Pass 2: Surface Treatment
@@ -683,11 +696,13 @@ async def run_pass_2(
         figma_json: Optional Figma JSON document
         image_bytes: Optional image data
         image_format: Image format (png, jpg, webp)
+        parsed_figma: Optional pre-parsed figma_json shared across passes
     
     Returns:
         Pass2SurfaceDTR with surface analysis
     """
     pass_instance = Pass2Surface()
+    pass_instance.parsed_figma = parsed_figma
     return await pass_instance.execute(
         figma_json=figma_json,
         image_bytes=image_bytes,
@@ -17,7 +17,7 @@ from datetime import datetime
 
 from app.llm import get_llm_service, Message, MessageRole, TextContent
 from app.dtr.schemas import Pass3TypographyDTR, FontFamily, ScaleMetrics
-from app.dtr.extractors.figma_parser import parse_figma_typography
+from app.dtr.extractors.figma_parser import parse_figma_typography, ParsedFigmaDocument
 from app.dtr.extractors.vision import analyze_typography_from_image
 from app.dtr.passes.base import BasePass
 
@@ -101,7 +101,7 @@ class Pass3Typography(BasePass):
         """
         try:
             # Step 1: Code extraction
-            extracted = parse_figma_typography(figma_json)
+            extracted = parse_figma_typography(self._figma_source(figma_json))
             
             # Step 2: Compute metrics
             metrics = self._compute_metrics(extracted)
@@ -123,7 +123,7 @@ class Pass3Typography(BasePass):
             
             # Try to at least get the metrics if we can
             try:
-                extracted = parse_figma_typography(figma_json)
+                extracted = parse_figma_typography(self._figma_source(figma_json))
                 metrics = self._compute_metrics(extracted)
             except Exception as inner_e:
                 print(f"ERROR: Even basic extraction failed: {inner_e}")
@@ -195,7 +195,7 @@ class Pass3Typography(BasePass):
         so we use those directly rather than re-generating with another LLM call.
         """
         # Get code extraction (exact values from Figma)
-        extracted = parse_figma_typography(figma_json)
+        extracted = parse_figma_typography(self._figma_source(figma_json))
         metrics = self._compute_metrics(extracted)
         
         # Get vision analysis (perceptual validation + rich narratives)
@@ -706,7 +706,8 @@ Letter spacing: {spacing}"""
 async def run_pass_3(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
-    image_format: str = "png"
+    image_format: str = "png",
+    parsed_figma: Optional[ParsedFigmaDocument] = None
 ) -> Pass3TypographyDTR:
     """
     Run Pass 3 (Typography System) extraction.
@@ -715,11 +716,13 @@ async def run_pass_3(
         figma_json: Optional Figma JSON document
         image_bytes: Optional image data
         image_format: Image format (png, jpg, webp)
+        parsed_figma: Optional pre-parsed figma_json shared across passes
     
     Returns:
         Pass3TypographyDTR with typography analysis
     """
     pass_3 = Pass3Typography()
+    pass_3.parsed_figma = parsed_figma
     return await pass_3.execute(
         figma_json=figma_json,
         image_bytes=image_bytes,
@@ -12,7 +12,7 @@ from datetime import datetime
 from .base import BasePass, PassRegistry
 from app.llm import LLMService, Message, MessageRole
 from app.dtr.schemas import Pass4ImageUsageDTR
-from app.dtr.extractors.figma_parser import parse_figma_images
+from app.dtr.extractors.figma_parser import parse_figma_images, ParsedFigmaDocument
 from app.dtr.extractors import analyze_image_usage_from_image
 
 
@@ -71,7 +71,7 @@ class Pass4ImageUsage(BasePass):
                 print(f"Found {len(figma_image_exports)} embedded images in Figma JSON")
             
             # Parse image metadata
-            figma_image_data = parse_figma_images(figma_json)
+            figma_image_data = parse_figma_images(self._figma_source(figma_json))
             image_count = figma_image_data.get("image_count", 0)
             print(f"Found {image_count} image nodes in Figma JSON metadata")
         
@@ -330,7 +330,8 @@ Return ONLY the narrative text, no preamble."""
 async def run_pass_4(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
-    image_format: str = "png"
+    image_format: str = "png",
+    parsed_figma: Optional[ParsedFigmaDocument] = None
 ) -> Pass4ImageUsageDTR:
     """
     Run Pass 4 image usage extraction.
@@ -341,11 +342,13 @@ async def run_pass_4(
         figma_json: Optional Figma JSON document
         image_bytes: Optional image data
         image_format: Image format (png, jpg, webp)
+        parsed_figma: Optional pre-parsed figma_json shared across passes
     
     Returns:
         Pass4ImageUsageDTR with image usage analysis
     """
     pass_instance = Pass4ImageUsage()
+    pass_instance.parsed_figma = parsed_figma
     return await pass_instance.execute(
         figma_json=figma_json,
         image_bytes=image_bytes,
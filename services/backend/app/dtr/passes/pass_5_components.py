@@ -10,7 +10,7 @@ from datetime import datetime
 from .base import BasePass, PassRegistry
 from app.llm import LLMService, Message, MessageRole, TextContent
 from app.dtr.schemas import Pass5ComponentsDTR, ComponentInventoryItem, ComponentProperties
-from app.dtr.extractors.figma_parser import parse_figma_components
+from app.dtr.extractors.figma_parser import parse_figma_components, ParsedFigmaDocument
 from app.dtr.extractors import analyze_components_from_image
 
 
@@ -78,7 +78,7 @@ class Pass5Components(BasePass):
         print("Extracting components from Figma JSON (code-based)...")
         
         # Parse components
-        figma_data = parse_figma_components(figma_json)
+        figma_data = parse_figma_components(self._figma_source(figma_json))
         
         if not figma_data.get('has_components'):
             return self._create_no_components_dtr()
@@ -202,7 +202,7 @@ class Pass5Components(BasePass):
         print("Extracting components in hybrid mode (Figma + vision)...")
         
         # 1. Parse Figma components for exact properties
-        figma_data = parse_figma_components(figma_json)
+        figma_data = parse_figma_components(self._figma_source(figma_json))
         
         # 2. Run vision analysis with Figma context
         vision_data = await analyze_components_from_image(
@@ -620,7 +620,8 @@ async def run_pass_5(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
     image_format: str = "png",
-    prev_passes: Optional[Dict[str, Any]] = None
+    prev_passes: Optional[Dict[str, Any]] = None,
+    parsed_figma: Optional[ParsedFigmaDocument] = None
 ) -> Pass5ComponentsDTR:
     """
     Run Pass 5 (Component Vocabulary).
@@ -630,11 +631,13 @@ async def run_pass_5(
         image_bytes: Optional image data
         image_format: Image format
         prev_passes: Results from previous passes
+        parsed_figma: Optional pre-parsed figma_json shared across passes
     
     Returns:
         Pass5ComponentsDTR
     """
     pass_instance = Pass5Components()
+    pass_instance.parsed_figma = parsed_figma
     return await pass_instance.execute(
         figma_json=figma_json,
         image_bytes=image_bytes,
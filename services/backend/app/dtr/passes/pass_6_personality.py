@@ -8,7 +8,6 @@ This is the final pass for a single resource. After completion, the system
 has a complete understanding of the design and can generate UI in the designer's style.
 """
 import json
-import base64
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -30,7 +29,8 @@ from app.dtr.schemas import (
     Pass4ImageUsageDTR,
     Pass5ComponentsDTR,
 )
-from app.llm import LLMService, Message, MessageRole, TextContent, ImageContent
+from app.llm import LLMService, Message, MessageRole, TextContent
+from app.llm.utils.images import get_prepared_image
 
 
 class Pass6Personality:
@@ -46,6 +46,12 @@ class Pass6Personality:
     - Includes exact tokens + personality synthesis + generation guidance
     """
     
+    # Bump when the synthesis prompt or logic changes (see BasePass.VERSION)
+    VERSION = "1"
+    
+    # Opus for deep reasoning (the image is prepared for this model's provider)
+    MODEL = "claude-opus-4.5"
+    
     def __init__(self):
         self.llm_service = LLMService()
     
@@ -362,11 +368,8 @@ CRITICAL: Respond with ONLY the JSON object. No markdown backticks, no explanati
         
         # Add image if available
         if image_bytes:
-            content.append(ImageContent(
-                data=base64.b64encode(image_bytes).decode('utf-8'),
-                media_type=f"image/{image_format}",
-                detail="high"
-            ))
+            # Same prepared image as Passes 1-5 when run inside shared_image()
+            content.append(get_prepared_image(image_bytes, image_format, model=self.MODEL).to_content(detail="high"))
         
         # Add text prompt
         content.append(TextContent(text=user_prompt))
@@ -374,7 +377,7 @@ CRITICAL: Respond with ONLY the JSON object. No markdown backticks, no explanati
         # Call Claude Opus
         print("🧠 Calling Claude Opus 4.5 for personality synthesis...")
         response = await self.llm_service.generate(
-            model="claude-opus-4.5",  # Use Opus for deep reasoning
+            model=self.MODEL,
             messages=[
                 Message(role=MessageRole.SYSTEM, content=system_prompt),
                 Message(role=MessageRole.USER, content=content)
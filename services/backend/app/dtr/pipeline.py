@@ -6,12 +6,21 @@ Handles progress tracking, error handling, and result storage.
 """
 from typing import Dict, Any, Optional, Callable, Awaitable
 import asyncio
-from .passes import run_pass_1, run_pass_2, run_pass_3, run_pass_4, Pass4ImageUsage
+from .passes import (
+    run_pass_1, run_pass_2, run_pass_3, run_pass_4, Pass4ImageUsage,
+    Pass1Structure, Pass2Surface, Pass3Typography, Pass5Components, Pass6Personality
+)
+from .extractors.figma_parser import ParsedFigmaDocument, parse_figma_document
+from app.core.async_io import run_blocking
+from app.llm.utils.images import ImageUsage, shared_image, track_image_usage
+from .extractors.vision import VisionAnalyzer
 from .storage import (
     save_pass_result,
     save_complete_dtr,
     save_extraction_status,
-    load_pass_result
+    load_pass_result,
+    hash_pass_inputs,
+    load_unchanged_pass_result
 )
 
 
@@ -19,6 +28,53 @@ from .storage import (
 ProgressCallback = Callable[[str, str], Awaitable[None]]
 
 
+async def _reuse_unchanged_pass(
+    resource_id: str,
+    pass_name: str,
+    pass_version: str,
+    input_hash: str,
+    force: bool
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the saved result of a pass if its inputs and version are unchanged
+    
+    Args:
+        resource_id: Resource UUID
+        pass_name: Pass name (e.g., "pass_1_structure")
+        pass_version: Current version of the pass
+        input_hash: hash_pass_inputs() digest of the current inputs
+        force: Skip the lookup and always re-run the pass
+    
+    Returns:
+        Saved pass result, or None if the pass has to run
+    """
+    if force:
+        return None
+    
+    cached = await run_blocking(
+        load_unchanged_pass_result, resource_id, pass_name, input_hash, pass_version
+    )
+    if cached is not None:
+        print(f"♻️  {pass_name}: inputs unchanged (v{pass_version}) - reusing saved result")
+    return cached
+
+
+def _add_image_metrics(result: Dict[str, Any], usage: ImageUsage) -> Dict[str, Any]:
+    """
+    Record what the pass's prepared images saved (bytes and estimated tokens)
+    
+    Args:
+        result: Pass result dict
+        usage: ImageUsage collected while the pass ran
+    
+    Returns:
+        result, with "image_metrics" when the pass sent any images
+    """
+    if usage.images:
+        result["image_metrics"] = usage.to_dict()
+    return result
+
+
 class ExtractionPipeline:
     """
     Orchestrates DTR extraction for a single resource
@@ -57,7 +113,9 @@ class ExtractionPipeline:
         self,
         figma_json: Optional[Dict[str, Any]] = None,
         image_bytes: Optional[bytes] = None,
-        image_format: str = "png"
+        image_format: str = "png",
+        parsed_figma: Optional[ParsedFigmaDocument] = None,
+        input_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Run only Pass 1 (for initial implementation)
@@ -66,13 +124,16 @@ class ExtractionPipeline:
             figma_json: Optional Figma JSON document
             image_bytes: Optional image data
             image_format: Image format
+            parsed_figma: Optional pre-parsed figma_json shared across passes
+            input_hash: Optional input digest recorded next to the result
         
         Returns:
             Pass 1 results
         """
         try:
             # Update status
-            save_extraction_status(
+            await run_blocking(
+                save_extraction_status,
                 self.resource_id,
                 status="processing",
                 current_pass="pass_1_structure"
@@ -82,27 +143,33 @@ class ExtractionPipeline:
             await self._report_progress("pass-1", "Extracting structural skeleton...")
             
             # Run Pass 1
-            result = await run_pass_1(
-                figma_json=figma_json,
-                image_bytes=image_bytes,
-                image_format=image_format
-            )
+            with track_image_usage() as image_usage:
+                result = await run_pass_1(
+                    figma_json=figma_json,
+                    image_bytes=image_bytes,
+                    image_format=image_format,
+                    parsed_figma=parsed_figma
+                )
             
             # Convert to dict (use by_alias=True to get "global" instead of "global_density")
-            result_dict = result.model_dump(by_alias=True)
+            result_dict = _add_image_metrics(result.model_dump(by_alias=True), image_usage)
             
             # Save result
-            save_pass_result(
+            await run_blocking(
+                save_pass_result,
                 self.resource_id,
                 "pass_1_structure",
-                result_dict
+                result_dict,
+                input_hash=input_hash,
+                pass_version=Pass1Structure.VERSION
             )
             
             # Store in results
             self.results["pass_1_structure"] = result_dict
             
             # Update status
-            save_extraction_status(
+            await run_blocking(
+                save_extraction_status,
                 self.resource_id,
                 status="completed",
                 current_pass="pass_1_structure"
@@ -115,7 +182,8 @@ class ExtractionPipeline:
         
         except Exception as e:
             # Update status with error
-            save_extraction_status(
+            await run_blocking(
+                save_extraction_status,
                 self.resource_id,
                 status="failed",
                 current_pass="pass_1_structure",
@@ -159,7 +227,8 @@ class ExtractionPipeline:
             # TODO: Add other passes
         }
         
-        save_complete_dtr(
+        await run_blocking(
+            save_complete_dtr,
             self.resource_id,
             self.taste_id,
             complete_dtr
@@ -208,7 +277,10 @@ async def extract_pass_1_only(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
     image_format: str = "png",
-    progress_callback: Optional[ProgressCallback] = None
+    progress_callback: Optional[ProgressCallback] = None,
+    parsed_figma: Optional[ParsedFigmaDocument] = None,
+    input_hash: Optional[str] = None,
+    force: bool = False
 ) -> Dict[str, Any]:
     """
     Extract only Pass 1 (structural skeleton)
@@ -222,12 +294,28 @@ async def extract_pass_1_only(
         image_bytes: Optional image data
         image_format: Image format
         progress_callback: Optional async callback for progress updates
+        parsed_figma: Optional pre-parsed figma_json shared across passes
+        input_hash: Optional precomputed hash_pass_inputs() digest
+        force: Re-run even if the inputs are unchanged since the last run
     
     Returns:
         Pass 1 results
     """
+    if input_hash is None:
+        input_hash = await asyncio.to_thread(hash_pass_inputs, figma_json, image_bytes, image_format)
+    
+    cached = await _reuse_unchanged_pass(
+        resource_id, "pass_1_structure", Pass1Structure.VERSION, input_hash, force
+    )
+    if cached is not None:
+        if progress_callback:
+            await progress_callback("pass-1", "Structure unchanged - reused saved result")
+        return cached
+    
     pipeline = ExtractionPipeline(resource_id, taste_id, progress_callback)
-    return await pipeline.run_pass_1_only(figma_json, image_bytes, image_format)
+    return await pipeline.run_pass_1_only(
+        figma_json, image_bytes, image_format, parsed_figma=parsed_figma, input_hash=input_hash
+    )
 
 
 async def extract_pass_2_only(
@@ -236,7 +324,10 @@ async def extract_pass_2_only(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
     image_format: str = "png",
-    progress_callback: Optional[ProgressCallback] = None
+    progress_callback: Optional[ProgressCallback] = None,
+    parsed_figma: Optional[ParsedFigmaDocument] = None,
+    input_hash: Optional[str] = None,
+    force: bool = False
 ) -> Dict[str, Any]:
     """
     Extract only Pass 2 (surface treatment)
@@ -250,13 +341,28 @@ async def extract_pass_2_only(
         image_bytes: Optional image data
         image_format: Image format
         progress_callback: Optional async callback for progress updates
+        parsed_figma: Optional pre-parsed figma_json shared across passes
+        input_hash: Optional precomputed hash_pass_inputs() digest
+        force: Re-run even if the inputs are unchanged since the last run
     
     Returns:
         Pass 2 results
     """
     try:
+        if input_hash is None:
+            input_hash = await asyncio.to_thread(hash_pass_inputs, figma_json, image_bytes, image_format)
+        
+        cached = await _reuse_unchanged_pass(
+            resource_id, "pass_2_surface", Pass2Surface.VERSION, input_hash, force
+        )
+        if cached is not None:
+            if progress_callback:
+                await progress_callback("pass-2", "Surface treatment unchanged - reused saved result")
+            return cached
+        
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="processing",
             current_pass="pass_2_surface"
@@ -267,24 +373,30 @@ async def extract_pass_2_only(
             await progress_callback("pass-2", "Extracting surface treatment...")
         
         # Run Pass 2
-        result = await run_pass_2(
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format
-        )
+        with track_image_usage() as image_usage:
+            result = await run_pass_2(
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                parsed_figma=parsed_figma
+            )
         
         # Convert to dict
-        result_dict = result.model_dump(by_alias=True)
+        result_dict = _add_image_metrics(result.model_dump(by_alias=True), image_usage)
         
         # Save result
-        save_pass_result(
+        await run_blocking(
+            save_pass_result,
             resource_id,
             "pass_2_surface",
-            result_dict
+            result_dict,
+            input_hash=input_hash,
+            pass_version=Pass2Surface.VERSION
         )
         
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="completed",
             current_pass="pass_2_surface"
@@ -297,7 +409,8 @@ async def extract_pass_2_only(
     
     except Exception as e:
         # Update status to failed
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="failed",
             current_pass="pass_2_surface",
@@ -312,7 +425,10 @@ async def extract_pass_3_only(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
     image_format: str = "png",
-    progress_callback: Optional[ProgressCallback] = None
+    progress_callback: Optional[ProgressCallback] = None,
+    parsed_figma: Optional[ParsedFigmaDocument] = None,
+    input_hash: Optional[str] = None,
+    force: bool = False
 ) -> Dict[str, Any]:
     """
     Extract only Pass 3 (typography system)
@@ -326,13 +442,28 @@ async def extract_pass_3_only(
         image_bytes: Optional image data
         image_format: Image format
         progress_callback: Optional async callback for progress updates
+        parsed_figma: Optional pre-parsed figma_json shared across passes
+        input_hash: Optional precomputed hash_pass_inputs() digest
+        force: Re-run even if the inputs are unchanged since the last run
     
     Returns:
         Pass 3 results
     """
     try:
+        if input_hash is None:
+            input_hash = await asyncio.to_thread(hash_pass_inputs, figma_json, image_bytes, image_format)
+        
+        cached = await _reuse_unchanged_pass(
+            resource_id, "pass_3_typography", Pass3Typography.VERSION, input_hash, force
+        )
+        if cached is not None:
+            if progress_callback:
+                await progress_callback("pass-3", "Typography system unchanged - reused saved result")
+            return cached
+        
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="processing",
             current_pass="pass_3_typography"
@@ -343,24 +474,30 @@ async def extract_pass_3_only(
             await progress_callback("pass-3", "Extracting typography system...")
         
         # Run Pass 3
-        result = await run_pass_3(
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format
-        )
+        with track_image_usage() as image_usage:
+            result = await run_pass_3(
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                parsed_figma=parsed_figma
+            )
         
         # Convert to dict
-        result_dict = result.model_dump(by_alias=True)
+        result_dict = _add_image_metrics(result.model_dump(by_alias=True), image_usage)
         
         # Save result
-        save_pass_result(
+        await run_blocking(
+            save_pass_result,
             resource_id,
             "pass_3_typography",
-            result_dict
+            result_dict,
+            input_hash=input_hash,
+            pass_version=Pass3Typography.VERSION
         )
         
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="completed",
             current_pass="pass_3_typography"
@@ -373,7 +510,8 @@ async def extract_pass_3_only(
     
     except Exception as e:
         # Update status to failed
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="failed",
             current_pass="pass_3_typography",
@@ -388,7 +526,10 @@ async def extract_pass_4_only(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
     image_format: str = "png",
-    progress_callback: Optional[ProgressCallback] = None
+    progress_callback: Optional[ProgressCallback] = None,
+    parsed_figma: Optional[ParsedFigmaDocument] = None,
+    input_hash: Optional[str] = None,
+    force: bool = False
 ) -> Dict[str, Any]:
     """
     Extract only Pass 4 (image usage patterns)
@@ -402,13 +543,28 @@ async def extract_pass_4_only(
         image_bytes: Image data (required for content analysis)
         image_format: Image format
         progress_callback: Optional async callback for progress updates
+        parsed_figma: Optional pre-parsed figma_json shared across passes
+        input_hash: Optional precomputed hash_pass_inputs() digest
+        force: Re-run even if the inputs are unchanged since the last run
     
     Returns:
         Pass 4 results
     """
     try:
+        if input_hash is None:
+            input_hash = await asyncio.to_thread(hash_pass_inputs, figma_json, image_bytes, image_format)
+        
+        cached = await _reuse_unchanged_pass(
+            resource_id, "pass_4_image_usage", Pass4ImageUsage.VERSION, input_hash, force
+        )
+        if cached is not None:
+            if progress_callback:
+                await progress_callback("pass-4", "Image usage unchanged - reused saved result")
+            return cached
+        
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="processing",
             current_pass="pass_4_image_usage"
@@ -421,24 +577,30 @@ async def extract_pass_4_only(
         # Run Pass 4 (pass resource_id for asset extraction)
         pass_4 = Pass4ImageUsage()
         pass_4.resource_id = resource_id  # Set resource_id for asset extraction
-        result = await pass_4.execute(
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format
-        )
+        pass_4.parsed_figma = parsed_figma
+        with track_image_usage() as image_usage:
+            result = await pass_4.execute(
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format
+            )
         
         # Convert to dict
-        result_dict = result.model_dump(by_alias=True)
+        result_dict = _add_image_metrics(result.model_dump(by_alias=True), image_usage)
         
         # Save result
-        save_pass_result(
+        await run_blocking(
+            save_pass_result,
             resource_id,
             "pass_4_image_usage",
-            result_dict
+            result_dict,
+            input_hash=input_hash,
+            pass_version=Pass4ImageUsage.VERSION
         )
         
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="completed",
             current_pass="pass_4_image_usage"
@@ -451,7 +613,8 @@ async def extract_pass_4_only(
     
     except Exception as e:
         # Update status to failed
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="failed",
             current_pass="pass_4_image_usage",
@@ -466,7 +629,10 @@ async def extract_pass_5_only(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
     image_format: str = "png",
-    progress_callback: Optional[ProgressCallback] = None
+    progress_callback: Optional[ProgressCallback] = None,
+    parsed_figma: Optional[ParsedFigmaDocument] = None,
+    input_hash: Optional[str] = None,
+    force: bool = False
 ) -> Dict[str, Any]:
     """
     Extract only Pass 5 (component vocabulary)
@@ -480,13 +646,28 @@ async def extract_pass_5_only(
         image_bytes: Image data
         image_format: Image format
         progress_callback: Optional async callback for progress updates
+        parsed_figma: Optional pre-parsed figma_json shared across passes
+        input_hash: Optional precomputed hash_pass_inputs() digest
+        force: Re-run even if the inputs are unchanged since the last run
     
     Returns:
         Pass 5 results
     """
     try:
+        if input_hash is None:
+            input_hash = await asyncio.to_thread(hash_pass_inputs, figma_json, image_bytes, image_format)
+        
+        cached = await _reuse_unchanged_pass(
+            resource_id, "pass_5_components", Pass5Components.VERSION, input_hash, force
+        )
+        if cached is not None:
+            if progress_callback:
+                await progress_callback("pass-5", "Component vocabulary unchanged - reused saved result")
+            return cached
+        
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="processing",
             current_pass="pass_5_components"
@@ -498,24 +679,30 @@ async def extract_pass_5_only(
         
         # Run Pass 5
         from .passes import run_pass_5
-        result = await run_pass_5(
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format
-        )
+        with track_image_usage() as image_usage:
+            result = await run_pass_5(
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                parsed_figma=parsed_figma
+            )
         
         # Convert to dict
-        result_dict = result.model_dump(by_alias=True)
+        result_dict = _add_image_metrics(result.model_dump(by_alias=True), image_usage)
         
         # Save result
-        save_pass_result(
+        await run_blocking(
+            save_pass_result,
             resource_id,
             "pass_5_components",
-            result_dict
+            result_dict,
+            input_hash=input_hash,
+            pass_version=Pass5Components.VERSION
         )
         
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="completed",
             current_pass="pass_5_components"
@@ -528,7 +715,8 @@ async def extract_pass_5_only(
     
     except Exception as e:
         # Update status to failed
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="failed",
             current_pass="pass_5_components",
@@ -542,12 +730,14 @@ async def extract_pass_6_only(
     taste_id: str,
     image_bytes: Optional[bytes] = None,
     image_format: str = "png",
-    progress_callback: Optional[ProgressCallback] = None
+    progress_callback: Optional[ProgressCallback] = None,
+    force: bool = False
 ) -> Dict[str, Any]:
     """
     Extract Pass 6 (personality synthesis) - MUST run after Pass 1-5
     
     Pass 6 synthesizes all previous passes into a complete, self-contained DTR.
+    It is skipped when the image and all Pass 1-5 results are unchanged.
     
     Args:
         resource_id: Resource UUID
@@ -555,13 +745,15 @@ async def extract_pass_6_only(
         image_bytes: Original design image (highly recommended)
         image_format: Image format
         progress_callback: Optional async callback for progress updates
+        force: Re-run even if the inputs are unchanged since the last run
     
     Returns:
         Complete DTR from Pass 6
     """
     try:
         # Update status
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="processing",
             current_pass="pass_6_personality"
@@ -574,11 +766,22 @@ async def extract_pass_6_only(
         # Load Pass 1-5 results (Pass 6 depends on them)
         print(f"📂 Loading Pass 1-5 results for synthesis...")
         
-        pass_1_result = load_pass_result(resource_id, "pass_1_structure")
-        pass_2_result = load_pass_result(resource_id, "pass_2_surface")
-        pass_3_result = load_pass_result(resource_id, "pass_3_typography")
-        pass_4_result = load_pass_result(resource_id, "pass_4_image_usage")
-        pass_5_result = load_pass_result(resource_id, "pass_5_components")
+        (
+            pass_1_result,
+            pass_2_result,
+            pass_3_result,
+            pass_4_result,
+            pass_5_result
+        ) = await asyncio.gather(*(
+            run_blocking(load_pass_result, resource_id, pass_name)
+            for pass_name in (
+                "pass_1_structure",
+                "pass_2_surface",
+                "pass_3_typography",
+                "pass_4_image_usage",
+                "pass_5_components"
+            )
+        ))
         
         # Verify we have at least some results
         if not any([pass_1_result, pass_2_result, pass_3_result, pass_4_result, pass_5_result]):
@@ -586,29 +789,65 @@ async def extract_pass_6_only(
         
         print(f"✅ Loaded {sum([1 for r in [pass_1_result, pass_2_result, pass_3_result, pass_4_result, pass_5_result] if r])} pass results")
         
-        # Run Pass 6
+        # Pass 6 inputs = image + Pass 1-5 outputs
+        input_hash = await asyncio.to_thread(
+            hash_pass_inputs,
+            None,
+            image_bytes,
+            image_format,
+            {
+                "pass_1_structure": pass_1_result,
+                "pass_2_surface": pass_2_result,
+                "pass_3_typography": pass_3_result,
+                "pass_4_image_usage": pass_4_result,
+                "pass_5_components": pass_5_result
+            }
+        )
+        cached = await _reuse_unchanged_pass(
+            resource_id, "pass_6_complete_dtr", Pass6Personality.VERSION, input_hash, force
+        )
+        if cached is not None:
+            await run_blocking(
+                save_extraction_status,
+                resource_id,
+                status="completed",
+                current_pass="pass_6_personality",
+                quality_tier="base"
+            )
+            if progress_callback:
+                await progress_callback("pass-6", "DTR unchanged - reused saved synthesis")
+            return cached
+        
+        # Run Pass 6 (reuses the caller's prepared image when there is one)
         from .passes import run_pass_6
-        result = await run_pass_6(
-            resource_id=resource_id,
-            taste_id=taste_id,
-            image_bytes=image_bytes,
-            image_format=image_format,
-            pass_1_result=pass_1_result,
-            pass_2_result=pass_2_result,
-            pass_3_result=pass_3_result,
-            pass_4_result=pass_4_result,
-            pass_5_result=pass_5_result
-        )
+        async with shared_image(image_bytes, image_format, models=(Pass6Personality.MODEL,)):
+            with track_image_usage() as image_usage:
+                result = await run_pass_6(
+                    resource_id=resource_id,
+                    taste_id=taste_id,
+                    image_bytes=image_bytes,
+                    image_format=image_format,
+                    pass_1_result=pass_1_result,
+                    pass_2_result=pass_2_result,
+                    pass_3_result=pass_3_result,
+                    pass_4_result=pass_4_result,
+                    pass_5_result=pass_5_result
+                )
+        _add_image_metrics(result, image_usage)
         
         # Save result
-        save_pass_result(
+        await run_blocking(
+            save_pass_result,
             resource_id,
             "pass_6_complete_dtr",
-            result
+            result,
+            input_hash=input_hash,
+            pass_version=Pass6Personality.VERSION
         )
         
         # Update status to completed with base quality tier
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="completed",
             current_pass="pass_6_personality",
@@ -622,7 +861,8 @@ async def extract_pass_6_only(
     
     except Exception as e:
         # Update status to failed
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="failed",
             current_pass="pass_6_personality",
@@ -637,12 +877,14 @@ async def extract_all_passes_parallel(
     figma_json: Optional[Dict[str, Any]] = None,
     image_bytes: Optional[bytes] = None,
     image_format: str = "png",
-    progress_callback: Optional[ProgressCallback] = None
+    progress_callback: Optional[ProgressCallback] = None,
+    force: bool = False
 ) -> Dict[str, Any]:
     """
     Run Passes 1-5 in parallel
     
     Passes 1-5 are independent and can run simultaneously for faster extraction.
+    Passes whose inputs are unchanged since the last run reuse their saved result.
     
     Args:
         resource_id: Resource UUID
@@ -651,12 +893,14 @@ async def extract_all_passes_parallel(
         image_bytes: Optional image data
         image_format: Image format
         progress_callback: Optional async callback for progress updates
+        force: Re-run every pass even if its inputs are unchanged
     
     Returns:
         Dict with results from all passes
     """
     # Update status to processing
-    save_extraction_status(
+    await run_blocking(
+        save_extraction_status,
         resource_id,
         status="processing",
         current_pass="all_passes_parallel"
@@ -666,32 +910,48 @@ async def extract_all_passes_parallel(
         await progress_callback("start", "Running all extraction passes in parallel...")
     
     try:
+        # Walk the Figma tree once (off the event loop) and share the
+        # read-only index with every pass instead of re-parsing per pass
+        parsed_figma = None
+        if figma_json is not None:
+            parsed_figma = await asyncio.to_thread(parse_figma_document, figma_json)
+        
+        # Hash the inputs once for every pass's unchanged-input check
+        input_hash = await asyncio.to_thread(hash_pass_inputs, figma_json, image_bytes, image_format)
+        
         # Launch all passes in parallel
         pass_1_task = extract_pass_1_only(
-            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback
+            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback,
+            parsed_figma=parsed_figma, input_hash=input_hash, force=force
         )
         pass_2_task = extract_pass_2_only(
-            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback
+            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback,
+            parsed_figma=parsed_figma, input_hash=input_hash, force=force
         )
         pass_3_task = extract_pass_3_only(
-            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback
+            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback,
+            parsed_figma=parsed_figma, input_hash=input_hash, force=force
         )
         pass_4_task = extract_pass_4_only(
-            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback
+            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback,
+            parsed_figma=parsed_figma, input_hash=input_hash, force=force
         )
         pass_5_task = extract_pass_5_only(
-            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback
-        )
-        
-        # Wait for all to complete
-        results = await asyncio.gather(
-            pass_1_task,
-            pass_2_task,
-            pass_3_task,
-            pass_4_task,
-            pass_5_task,
-            return_exceptions=True
-        )
+            resource_id, taste_id, figma_json, image_bytes, image_format, progress_callback,
+            parsed_figma=parsed_figma, input_hash=input_hash, force=force
+        )
+        
+        # Wait for all to complete. The screenshot is decoded, downscaled and
+        # base64-encoded once here and shared by every pass's vision calls
+        async with shared_image(image_bytes, image_format, models=(VisionAnalyzer.MODEL,)):
+            results = await asyncio.gather(
+                pass_1_task,
+                pass_2_task,
+                pass_3_task,
+                pass_4_task,
+                pass_5_task,
+                return_exceptions=True
+            )
         
         pass_1_result, pass_2_result, pass_3_result, pass_4_result, pass_5_result = results
         
@@ -710,7 +970,8 @@ async def extract_all_passes_parallel(
         
         if errors:
             error_msg = "; ".join(errors)
-            save_extraction_status(
+            await run_blocking(
+                save_extraction_status,
                 resource_id,
                 status="failed",
                 current_pass="all_passes_parallel",
@@ -719,7 +980,8 @@ async def extract_all_passes_parallel(
             raise Exception(f"One or more passes failed: {error_msg}")
         
         # All passes succeeded
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="completed",
             current_pass="all_passes_parallel"
@@ -737,7 +999,8 @@ async def extract_all_passes_parallel(
         }
     
     except Exception as e:
-        save_extraction_status(
+        await run_blocking(
+            save_extraction_status,
             resource_id,
             status="failed",
             current_pass="all_passes_parallel",
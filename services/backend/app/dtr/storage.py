@@ -3,16 +3,54 @@ DTR Storage - S3-based storage for DTR extraction results
 Migrated from local filesystem to S3 for production use
 """
 import json
-from typing import Dict, Any, Optional
+import hashlib
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from app.core import storage as s3_storage
 from app.core import db
 
 
+def hash_pass_inputs(
+    figma_json: Optional[Dict[str, Any]] = None,
+    image_bytes: Optional[bytes] = None,
+    image_format: str = "png",
+    upstream: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Content hash of everything a pass reads
+    
+    Args:
+        figma_json: Optional Figma JSON document
+        image_bytes: Optional image data
+        image_format: Image format
+        upstream: Optional earlier pass results the pass depends on (Pass 6)
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    
+    digest.update(b"figma:")
+    if figma_json is not None:
+        digest.update(json.dumps(figma_json, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"))
+    
+    digest.update(f"|image:{image_format}:".encode("utf-8"))
+    if image_bytes is not None:
+        digest.update(image_bytes)
+    
+    if upstream is not None:
+        digest.update(b"|upstream:")
+        digest.update(json.dumps(upstream, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"))
+    
+    return digest.hexdigest()
+
+
 def save_pass_result(
     resource_id: str,
     pass_name: str,
-    data: Dict[str, Any]
+    data: Dict[str, Any],
+    input_hash: Optional[str] = None,
+    pass_version: Optional[str] = None
 ) -> str:
     """
     Save pass result to S3
@@ -21,6 +59,10 @@ def save_pass_result(
         resource_id: Resource UUID
         pass_name: Pass name (e.g., "pass_1_structure")
         data: Pass result data
+        input_hash: Optional hash_pass_inputs() digest of the pass inputs;
+                    stored next to the result so unchanged re-extractions
+                    can reuse it
+        pass_version: Pass/prompt version the result was produced with
     
     Returns:
         S3 key of saved file
@@ -44,6 +86,16 @@ def save_pass_result(
     versioned_key = s3_storage.get_dtr_pass_versioned_key(owner_id, taste_id, resource_id, pass_name, timestamp)
     s3_storage.save_json_to_s3(versioned_key, data)
     
+    # Save input fingerprint next to the result
+    if input_hash:
+        fingerprint_key = s3_storage.get_dtr_pass_fingerprint_key(owner_id, taste_id, resource_id, pass_name)
+        s3_storage.save_json_to_s3(fingerprint_key, {
+            "pass_name": pass_name,
+            "input_hash": input_hash,
+            "pass_version": pass_version,
+            "saved_at": datetime.utcnow().isoformat()
+        })
+    
     print(f"✅ Saved {pass_name} to S3: {latest_key}")
     return latest_key
 
@@ -80,6 +132,43 @@ def load_pass_result(
     return s3_storage.load_json_from_s3(key)
 
 
+def load_unchanged_pass_result(
+    resource_id: str,
+    pass_name: str,
+    input_hash: str,
+    pass_version: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Load the latest pass result if it was produced from identical inputs
+    
+    Args:
+        resource_id: Resource UUID
+        pass_name: Pass name (e.g., "pass_1_structure")
+        input_hash: hash_pass_inputs() digest of the current inputs
+        pass_version: Current pass/prompt version
+    
+    Returns:
+        Saved pass result, or None if inputs/version changed or nothing saved
+    """
+    resource = db.get_resource(resource_id)
+    if not resource:
+        return None
+    
+    owner_id = resource["owner_id"]
+    taste_id = resource["taste_id"]
+    
+    fingerprint_key = s3_storage.get_dtr_pass_fingerprint_key(owner_id, taste_id, resource_id, pass_name)
+    fingerprint = s3_storage.load_json_from_s3(fingerprint_key)
+    if not fingerprint:
+        return None
+    
+    if fingerprint.get("input_hash") != input_hash or fingerprint.get("pass_version") != pass_version:
+        return None
+    
+    key = s3_storage.get_dtr_pass_key(owner_id, taste_id, resource_id, pass_name)
+    return s3_storage.load_json_from_s3(key)
+
+
 def save_complete_dtr(
     resource_id: str,
     taste_id: str,
@@ -131,6 +220,29 @@ def load_complete_dtr(
     return load_pass_result(resource_id, "pass_6_complete_dtr", version)
 
 
+def load_complete_dtrs(resource_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Load many complete DTRs at once
+    
+    Resources are resolved with one DynamoDB batch get and the DTR files
+    are fetched from S3 concurrently.
+    
+    Args:
+        resource_ids: Resource UUIDs
+    
+    Returns:
+        {resource_id: complete DTR} for every resource that has one
+    """
+    keys = {
+        resource["resource_id"]: s3_storage.get_dtr_pass_key(
+            resource["owner_id"], resource["taste_id"], resource["resource_id"], "pass_6_complete_dtr"
+        )
+        for resource in db.get_resources(resource_ids).values()
+    }
+    loaded = s3_storage.load_jsons_from_s3(list(keys.values()))
+    return {rid: loaded[key] for rid, key in keys.items() if loaded.get(key)}
+
+
 def list_resource_files(resource_id: str) -> list[str]:
     """
     List all DTR files for a resource
@@ -179,6 +291,9 @@ def delete_resource_dtr(resource_id: str):
     for pass_name in passes:
         key = s3_storage.get_dtr_pass_key(owner_id, taste_id, resource_id, pass_name)
         s3_storage.delete_object(key)
+        
+        fingerprint_key = s3_storage.get_dtr_pass_fingerprint_key(owner_id, taste_id, resource_id, pass_name)
+        s3_storage.delete_object(fingerprint_key)
     
     # Delete extraction status
     status_key = s3_storage.get_dtr_extraction_status_key(owner_id, taste_id, resource_id)
@@ -4,7 +4,7 @@ Feedback Applier - Generates updated UI code based on user feedback
 import re
 from pathlib import Path
 from typing import List, Dict, Any, AsyncGenerator
-from app.llm.types import Message, MessageRole
+from app.llm.types import Message, MessageRole, StreamStats
 
 
 class FeedbackApplier:
@@ -87,6 +87,7 @@ class FeedbackApplier:
             
             delimiter_found = False
             buffer = ""
+            stream_stats = StreamStats(model="claude-sonnet-4.5")
             
             # Use LLM service properly with streaming support
             stream = self.llm.generate_stream(
@@ -94,6 +95,7 @@ class FeedbackApplier:
                 messages=messages,
                 max_tokens=8000,
                 temperature=0.5,
+                stream_stats=stream_stats,
             )
             
             # Stream from LLM using service API
@@ -162,6 +164,8 @@ class FeedbackApplier:
                         "chunk": buffer
                     }
             
+            print(f"🏁 Feedback stream complete ({stream_stats.summary()})")
+            
             # Assemble final code
             full_conversation = "".join(conversation_part).strip()
             full_code = "".join(code_part).strip()
@@ -3,10 +3,15 @@ Checkpoint Extractor for Progressive UI Rendering (FIXED VERSION)
 Extracts valid, compilable React code at each checkpoint marker
 with comprehensive validation and aggressive cleaning
 """
-from typing import Optional
+from dataclasses import dataclass
+from typing import List, Optional
 import re
 
 
+CHECKPOINT_DELIMITER = '//$CHECKPOINT'
+CHECKPOINT_BLOCK_START = '/*CHECKPOINT'
+
+
 def extract_at_checkpoint(buffer: str) -> Optional[str]:
     """
     Extract compilable code up to the last checkpoint marker.
@@ -26,75 +31,75 @@ def extract_at_checkpoint(buffer: str) -> Optional[str]:
     6. Validate syntax
     7. Return if valid, None otherwise
     """
-    print(f"\n   [EXTRACTOR] Starting extraction...")
-    print(f"   [EXTRACTOR] Buffer size: {len(buffer)} chars")
-    
-    # Split by checkpoint delimiter
-    parts = buffer.split('//$CHECKPOINT')
-    print(f"   [EXTRACTOR] Split by //$CHECKPOINT: {len(parts)} parts")
+    # Everything before the last //$CHECKPOINT
+    last_delimiter = buffer.rfind(CHECKPOINT_DELIMITER)
     
-    if len(parts) == 1:
+    if last_delimiter == -1:
         # No checkpoints yet - maybe Claude generated incomplete checkpoint?
         # Try to find /*CHECKPOINT marker without //$CHECKPOINT
-        if '/*CHECKPOINT' in buffer:
-            print(f"   [EXTRACTOR] ⚠️  Found /*CHECKPOINT but no //$CHECKPOINT delimiter")
-            print(f"   [EXTRACTOR] ❌ Incomplete checkpoint format - skipping")
-        else:
-            print(f"   [EXTRACTOR] ❌ No checkpoint markers found")
+        if CHECKPOINT_BLOCK_START in buffer:
+            print(f"   [EXTRACTOR] ❌ Found /*CHECKPOINT but no //$CHECKPOINT delimiter - skipping")
         return None
     
-    print(f"   [EXTRACTOR] ✅ Found {len(parts) - 1} //$CHECKPOINT markers")
-    
-    # Everything before the last //$CHECKPOINT
-    code_before = '//$CHECKPOINT'.join(parts[:-1])
-    print(f"   [EXTRACTOR] Code before last checkpoint: {len(code_before)} chars")
+    return _extract_before_delimiter(buffer[:last_delimiter])
+
+
+def _extract_before_delimiter(code_before: str, checker: Optional["CodeChecker"] = None) -> Optional[str]:
+    """
+    Build checkpoint code from everything before the last //$CHECKPOINT.
     
+    Args:
+        code_before: Stream text up to (not including) the last delimiter
+        checker: Optional CodeChecker that remembers earlier checkpoints of
+            the same stream (only the new code is scanned)
+        
+    Returns:
+        Cleaned, validated code or None
+    """
     # Find the last /*CHECKPOINT ... */ block
-    checkpoint_start = code_before.rfind('/*CHECKPOINT')
-    print(f"   [EXTRACTOR] Last /*CHECKPOINT at position: {checkpoint_start}")
-    
+    checkpoint_start = code_before.rfind(CHECKPOINT_BLOCK_START)
     if checkpoint_start == -1:
         print(f"   [EXTRACTOR] ❌ No /*CHECKPOINT comment block found")
-        print(f"   [EXTRACTOR] Last 300 chars of code_before:")
-        print(f"   {repr(code_before[-300:])}")
         return None
     
     checkpoint_end = code_before.find('*/', checkpoint_start)
-    print(f"   [EXTRACTOR] Checkpoint end */ at position: {checkpoint_end}")
-    
     if checkpoint_end == -1:
         print(f"   [EXTRACTOR] ❌ No closing */ found for checkpoint block")
         return None
     
     # Extract the completion code from inside the comment block
-    completion = code_before[checkpoint_start + 12:checkpoint_end].strip()
-    print(f"   [EXTRACTOR] ✅ Extracted completion code: {len(completion)} chars")
-    print(f"   [EXTRACTOR] Completion content:")
-    print(f"   {repr(completion[:200])}")
-    
-    # Remove the checkpoint comment block from the code
-    code_without_comment = code_before[:checkpoint_start].rstrip()
-    print(f"   [EXTRACTOR] Code without checkpoint comment: {len(code_without_comment)} chars")
+    completion = code_before[checkpoint_start + len(CHECKPOINT_BLOCK_START):checkpoint_end].strip()
     
-    # Combine: code before checkpoint + completion code
-    complete_code = code_without_comment + '\n' + completion
-    print(f"   [EXTRACTOR] Combined code (before cleaning): {len(complete_code)} chars")
+    # Combine: code before checkpoint (without the comment block) + completion code
+    complete_code = code_before[:checkpoint_start].rstrip() + '\n' + completion
     
     # CRITICAL: Aggressively clean ALL checkpoint artifacts
     cleaned_code = _aggressive_clean_checkpoints(complete_code)
-    print(f"   [EXTRACTOR] ✅ Cleaned code: {len(cleaned_code)} chars")
     
     # Validate before returning
-    if not _is_code_roughly_valid(cleaned_code):
-        print(f"   [EXTRACTOR] ❌ Validation failed - code not valid")
-        print(f"   [EXTRACTOR] Last 500 chars of invalid code:")
-        print(f"   {repr(cleaned_code[-500:])}")
+    check = checker.check(cleaned_code) if checker is not None else check_code(cleaned_code)
+    if not check.valid:
+        print(
+            f"   [EXTRACTOR] ❌ Checkpoint code invalid: {check.reason} (line {check.line}); "
+            f"last 200 chars: {cleaned_code[-200:]!r}"
+        )
         return None
     
-    print(f"   [EXTRACTOR] ✅ Validation passed")
+    print(f"   [EXTRACTOR] ✅ Checkpoint code valid ({len(cleaned_code)} chars)")
     return cleaned_code
 
 
+# Every checkpoint artifact, in one alternation (tried in this order at each
+# position): complete /*CHECKPOINT...*/ blocks, //$CHECKPOINT delimiters,
+# incomplete /*CHECKPOINT blocks with no closing */, and orphaned */ lines
+_CHECKPOINT_ARTIFACTS = re.compile(
+    r'/\*CHECKPOINT.*?\*/|//\$CHECKPOINT\s*\n?|/\*CHECKPOINT[^*]*|^[^\S\n]*\*/[^\S\n]*$',
+    re.DOTALL | re.MULTILINE
+)
+_TRAILING_WHITESPACE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+
 def _aggressive_clean_checkpoints(code: str) -> str:
     """
     Aggressively remove ALL checkpoint markers and artifacts.
@@ -112,112 +117,371 @@ def _aggressive_clean_checkpoints(code: str) -> str:
     Returns:
         Clean code without any checkpoint artifacts
     """
-    print(f"   [CLEANER] Starting aggressive cleanup...")
     original_length = len(code)
     
-    # Step 1: Remove all /*CHECKPOINT...*/  blocks (multiline, greedy)
-    code = re.sub(r'/\*CHECKPOINT.*?\*/', '', code, flags=re.DOTALL)
-    print(f"   [CLEANER] After removing /*CHECKPOINT...*/: {len(code)} chars (removed {original_length - len(code)})")
-    
-    # Step 2: Remove all //$CHECKPOINT lines
-    code = re.sub(r'//\$CHECKPOINT\s*\n?', '', code)
-    print(f"   [CLEANER] After removing //$CHECKPOINT: {len(code)} chars")
+    code = _CHECKPOINT_ARTIFACTS.sub('', code)
+    code = _TRAILING_WHITESPACE.sub('', code)
+    code = _BLANK_LINES.sub('\n\n', code).strip()
     
-    # Step 3: Handle incomplete checkpoint comments (no closing */)
-    # Pattern: /*CHECKPOINT followed by text but no */
-    code = re.sub(r'/\*CHECKPOINT[^*]*(?!\*/)', '', code)
-    print(f"   [CLEANER] After removing incomplete /*CHECKPOINT: {len(code)} chars")
+    if len(code) != original_length:
+        print(f"   [CLEANER] Removed {original_length - len(code)} chars of checkpoint artifacts/whitespace")
     
-    # Step 4: Remove any orphaned */ that might be left
-    # This is aggressive but necessary - look for */ not preceded by /*
-    # Only remove if it's on its own line or surrounded by whitespace
-    code = re.sub(r'^\s*\*/\s*$', '', code, flags=re.MULTILINE)
-    print(f"   [CLEANER] After removing orphaned */: {len(code)} chars")
-    
-    # Step 5: Clean up excessive whitespace
-    # Replace 3+ consecutive newlines with 2 newlines
-    code = re.sub(r'\n{3,}', '\n\n', code)
+    return code
+
+
+# ============================================================================
+# CODE CHECK (single-pass scanner)
+# ============================================================================
+
+@dataclass
+class CodeCheck:
+    """Result of check_code()"""
+    valid: bool
+    reason: Optional[str] = None   # First problem found (None when valid)
+    line: Optional[int] = None     # Line of that problem
+    brace_depth: int = 0           # Unclosed {, ( and [ where the scan stopped
+    paren_depth: int = 0
+    bracket_depth: int = 0
+    open_jsx_elements: int = 0
+    has_default_export: bool = False
+    has_return: bool = False
+    checkpoint_artifacts: int = 0  # Checkpoint comments left in the code
+
+
+# Next token of interest in each scanner state (everything between is skipped
+# by the regex engine, so the Python loop runs once per token, not per char)
+_JS_TOKEN = re.compile(r"//|/\*|/|[\"'`{}()\[\]<]|\bexport\s+default\s+function\b|\breturn\b")
+_TAG_TOKEN = re.compile(r"[\"'{]|/>|>")
+# Whole tags without {expression} attributes, consumed in one step
+_SIMPLE_TAG = re.compile(r"""<>|<[A-Za-z][\w.:-]*(?:\s+[\w:.-]+(?:\s*=\s*(?:"[^"]*"|'[^']*'))?)*\s*(/?)>""")
+_CLOSING_TAG = re.compile(r"</[\w.:-]*\s*>")
+_CHILDREN_TOKEN = re.compile(r"[{<]")
+_TEMPLATE_TOKEN = re.compile(r"\\[\s\S]|`|\$\{")
+_STRING = {
+    '"': re.compile(r'"(?:[^"\\\n]|\\[\s\S])*"'),
+    "'": re.compile(r"'(?:[^'\\\n]|\\[\s\S])*'"),
+}
+# /pattern/flags, with escapes and [...] classes (a "/" inside a class
+# doesn't end the literal)
+_REGEX_LITERAL = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+
+_CLOSERS = {'}': ('{', '${'), ')': ('(',), ']': ('[',)}
+# Stack tops under which the scanner reads JavaScript
+_JS_STATES = {None, '{', '(', '[', '${'}
+
+# A "<" starts JSX (rather than comparing or opening a type argument) after
+# one of these characters or keywords
+_JSX_PREV_CHARS = set("(,=?:[{}&|!;>")
+_JSX_PREV_WORDS = {"return", "yield", "default", "case", "else", "do", "in", "of"}
+# <T,>( and <T extends U>( open a generic arrow function's type parameters
+_TYPE_PARAMS_START = re.compile(r"<\s*[A-Za-z_$][\w$]*\s*(?:,|extends\b)")
+
+# A "/" starts a regex literal (rather than dividing) after an operator or
+# one of these keywords
+_REGEX_PREV_CHARS = set("(,=?:[{}&|!;<>+-*%~^")
+_REGEX_PREV_WORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+}
+
+# The scan state after a token depends on at most this much text past it
+# (type parameters must close within it, it bounds the longest lookahead)
+_SCAN_LOOKAHEAD = 64
+
+
+def _starts_expression(code: str, pos: int, chars: set, words: set) -> bool:
+    """True if the code before pos ends in one of chars or words (or nothing)"""
+    j = pos - 1
+    while j >= 0 and code[j] in ' \t\r\n':
+        j -= 1
+    if j < 0 or code[j] in chars:
+        return True
+    
+    k = j
+    while k >= 0 and (code[k].isalnum() or code[k] in '_$'):
+        k -= 1
+    return code[k + 1:j + 1] in words
+
+
+def _jsx_can_start(code: str, pos: int) -> bool:
+    """True if the "<" at pos opens a JSX element"""
+    nxt = code[pos + 1:pos + 2]
+    if not (nxt.isalpha() or nxt == '>'):
+        return False
+    return _starts_expression(code, pos, _JSX_PREV_CHARS, _JSX_PREV_WORDS)
+
+
+def _type_params_end(code: str, pos: int) -> int:
+    """End of the type parameters at pos if a "(" follows them, else -1"""
+    if not _TYPE_PARAMS_START.match(code, pos):
+        return -1
+    
+    depth = 0
+    end = min(len(code), pos + _SCAN_LOOKAHEAD)
+    for i in range(pos, end):
+        char = code[i]
+        if char == '<':
+            depth += 1
+        elif char == '>' and code[i - 1] != '=':
+            depth -= 1
+            if depth == 0:
+                return i + 1 if code[i + 1:end].lstrip()[:1] == '(' else -1
+    return -1
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Length of the longest common prefix (binary search on C-speed compares)"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class CodeChecker:
+    """
+    check_code() for successive checkpoints of one stream.
     
-    # Step 6: Remove trailing whitespace from each line
-    code = '\n'.join(line.rstrip() for line in code.split('\n'))
+    Each checkpoint repeats everything up to the previous one, so the checker
+    saves the scan state every SNAPSHOT_INTERVAL chars and the next check
+    resumes from the last state inside the prefix both codes share. Only the
+    new code and the completion are scanned again.
+    """
     
-    # Step 7: Final trim
-    code = code.strip()
+    SNAPSHOT_INTERVAL = 128
     
-    print(f"   [CLEANER] ✅ Final cleaned code: {len(code)} chars (total removed: {original_length - len(code)})")
+    def __init__(self):
+        self._code = ""
+        # (pos, stack, has_default_export, has_return, checkpoint_artifacts)
+        self._snapshots: List[tuple] = []
     
-    return code
+    def check(self, code: str) -> CodeCheck:
+        """
+        Check code, reusing the previous scan for the shared prefix
+        
+        Args:
+            code: Code to check
+            
+        Returns:
+            CodeCheck (same result as check_code(code))
+        """
+        shared = _common_prefix_length(self._code, code) - _SCAN_LOOKAHEAD
+        keep = 0
+        while keep < len(self._snapshots) and self._snapshots[keep][0] <= shared:
+            keep += 1
+        del self._snapshots[keep:]
+        
+        self._code = code
+        return _scan(code, self._snapshots[-1] if self._snapshots else None, self._snapshots)
 
 
-def _is_code_roughly_valid(code: str) -> bool:
+def check_code(code: str) -> CodeCheck:
     """
-    Validate that code is roughly syntactically valid.
+    Check that checkpoint code is roughly valid, in one pass over the text.
+    
+    Tracks bracket nesting with awareness of strings, regex literals,
+    template literals (including ${} expressions), comments and JSX (text and
+    attribute strings are not code), so a brace inside a string or an
+    apostrophe in JSX text no longer causes a false rejection.
     
     Checks:
-    - Balanced braces, parens, brackets
-    - Balanced JSX comments
-    - Has required React structure
-    - Proper ending
+    - Balanced and properly nested braces, parens, brackets, JSX elements
+    - No unterminated string, template literal or comment (incl. {/* */})
+    - Has 'export default function' and a return of JSX
+    - Ends with '}'
+    - No checkpoint markers left in comments
     
     Args:
-        code: Code to validate
+        code: Code to check
         
     Returns:
-        True if code passes basic validation checks
+        CodeCheck (valid, plus the first problem found)
     """
-    print(f"   [VALIDATOR] Starting validation...")
-    
-    # Check 1: Balanced braces
-    brace_count = code.count('{') - code.count('}')
-    print(f"   [VALIDATOR] Brace balance: {brace_count} (should be 0)")
-    if brace_count != 0:
-        print(f"   [VALIDATOR] ❌ Unbalanced braces")
-        return False
-    
-    # Check 2: Balanced parens
-    paren_count = code.count('(') - code.count(')')
-    print(f"   [VALIDATOR] Paren balance: {paren_count} (should be 0)")
-    if paren_count != 0:
-        print(f"   [VALIDATOR] ❌ Unbalanced parentheses")
-        return False
-    
-    # Check 3: Balanced brackets
-    bracket_count = code.count('[') - code.count(']')
-    print(f"   [VALIDATOR] Bracket balance: {bracket_count} (should be 0)")
-    if bracket_count != 0:
-        print(f"   [VALIDATOR] ❌ Unbalanced brackets")
-        return False
-    
-    # Check 4: Balanced JSX comments
-    jsx_comment_start = code.count('{/*')
-    jsx_comment_end = code.count('*/}')
-    print(f"   [VALIDATOR] JSX comment balance: {jsx_comment_start} vs {jsx_comment_end}")
-    if jsx_comment_start != jsx_comment_end:
-        print(f"   [VALIDATOR] ❌ Unbalanced JSX comments")
-        return False
-    
-    # Check 5: Has React structure
-    if 'export default function' not in code:
-        print(f"   [VALIDATOR] ❌ Missing 'export default function'")
-        return False
-    
-    if 'return (' not in code and 'return(' not in code:
-        print(f"   [VALIDATOR] ❌ Missing return statement")
-        return False
-    
-    # Check 6: Proper ending
-    if not code.strip().endswith('}'):
-        print(f"   [VALIDATOR] ❌ Code doesn't end with '}}'")
-        print(f"   [VALIDATOR] Last 100 chars: {repr(code[-100:])}")
-        return False
-    
-    # Check 7: No checkpoint artifacts remaining
-    if '/*CHECKPOINT' in code or '//$CHECKPOINT' in code:
-        print(f"   [VALIDATOR] ❌ Checkpoint markers still present in code")
-        return False
+    return _scan(code)
+
+
+def _scan(
+    code: str,
+    resume: Optional[tuple] = None,
+    snapshots: Optional[List[tuple]] = None
+) -> CodeCheck:
+    """
+    The check_code() scanner
     
-    print(f"   [VALIDATOR] ✅ All validation checks passed")
-    return True
+    Args:
+        code: Code to check
+        resume: Saved state to start from instead of the top of the code
+        snapshots: If given, states are appended every
+            CodeChecker.SNAPSHOT_INTERVAL chars
+    """
+    result = CodeCheck(valid=False)
+    # Open constructs: (kind, offset); kind is a bracket, '${', '`',
+    # 'tag', 'closetag' or 'jsx' (element children)
+    stack: List[tuple] = []
+    pos = 0
+    if resume is not None:
+        pos, saved_stack, result.has_default_export, result.has_return, result.checkpoint_artifacts = resume
+        stack = list(saved_stack)
+    length = len(code)
+    interval = CodeChecker.SNAPSHOT_INTERVAL
+    next_snapshot = pos + interval if snapshots is not None else length
+    js_search = _JS_TOKEN.search
+    
+    def open_tag(at: int) -> int:
+        """Push the element opened at "at"; returns where scanning resumes"""
+        tag = _SIMPLE_TAG.match(code, at)
+        if tag is None:
+            stack.append(('tag', at))
+            return at + 1
+        if not tag.group(1):
+            stack.append(('jsx', at))
+        return tag.end()
+    
+    def fail(reason: str, at: int) -> CodeCheck:
+        result.reason = reason
+        result.line = code.count('\n', 0, at) + 1
+        result.brace_depth = sum(1 for kind, _ in stack if kind in ('{', '${'))
+        result.paren_depth = sum(1 for kind, _ in stack if kind == '(')
+        result.bracket_depth = sum(1 for kind, _ in stack if kind == '[')
+        result.open_jsx_elements = sum(1 for kind, _ in stack if kind == 'jsx')
+        return result
+    
+    while pos < length:
+        if pos >= next_snapshot:
+            snapshots.append((
+                pos, tuple(stack), result.has_default_export, result.has_return,
+                result.checkpoint_artifacts
+            ))
+            next_snapshot = pos + interval
+        
+        state = stack[-1][0] if stack else None
+        
+        # JavaScript (the most common state, checked first)
+        if state in _JS_STATES:
+            match = js_search(code, pos)
+            if not match:
+                break
+            token = match.group()
+            start, pos = match.span()
+            
+            if token in ('{', '(', '['):
+                stack.append((token, start))
+            elif token in _CLOSERS:
+                if not stack or stack[-1][0] not in _CLOSERS[token]:
+                    inside = f" inside '{stack[-1][0]}'" if stack else ""
+                    return fail(f"unexpected '{token}'{inside}", start)
+                stack.pop()
+            elif token in ('"', "'"):
+                string = _STRING[token].match(code, start)
+                if not string:
+                    return fail("unterminated string", start)
+                pos = string.end()
+            elif token == '`':
+                stack.append(('`', start))
+            elif token == '/':
+                # Regex literal (its quotes and brackets aren't code); otherwise division
+                if _starts_expression(code, start, _REGEX_PREV_CHARS, _REGEX_PREV_WORDS):
+                    literal = _REGEX_LITERAL.match(code, start)
+                    if literal:
+                        pos = literal.end()
+            elif token == '//':
+                end = code.find('\n', pos)
+                if code.startswith(CHECKPOINT_DELIMITER, start):
+                    result.checkpoint_artifacts += 1
+                pos = length if end == -1 else end
+            elif token == '/*':
+                end = code.find('*/', pos)
+                if end == -1:
+                    return fail("unterminated comment", start)
+                if code.startswith(CHECKPOINT_BLOCK_START, start):
+                    result.checkpoint_artifacts += 1
+                pos = end + 2
+            elif token == '<':
+                if _jsx_can_start(code, start):
+                    params_end = _type_params_end(code, start)
+                    pos = params_end if params_end != -1 else open_tag(start)
+            elif token == 'return':
+                rest = code[pos:pos + 40].lstrip()
+                if rest[:1] in ('(', '<'):
+                    result.has_return = True
+            else:
+                result.has_default_export = True
+            continue
+        
+        # Template literal body: only `, ${ and escapes matter
+        if state == '`':
+            match = _TEMPLATE_TOKEN.search(code, pos)
+            if not match:
+                return fail("unterminated template literal", stack[-1][1])
+            token = match.group()
+            pos = match.end()
+            if token == '`':
+                stack.pop()
+            elif token == '${':
+                stack.append(('${', match.start()))
+            continue
+        
+        # Inside <Tag ...> or </Tag>: attribute strings and {expressions}
+        if state in ('tag', 'closetag'):
+            match = _TAG_TOKEN.search(code, pos)
+            if not match:
+                return fail("unterminated JSX tag", stack[-1][1])
+            token = match.group()
+            if token in ('"', "'"):
+                close = code.find(token, match.end())
+                if close == -1:
+                    return fail("unterminated JSX attribute string", match.start())
+                pos = close + 1
+            elif token == '{':
+                stack.append(('{', match.start()))
+                pos = match.end()
+            elif token == '/>' or state == 'closetag':
+                stack.pop()
+                pos = match.end()
+            else:
+                stack[-1] = ('jsx', stack[-1][1])
+                pos = match.end()
+            continue
+        
+        # JSX children: text is not code, only {expressions} and tags
+        if state == 'jsx':
+            match = _CHILDREN_TOKEN.search(code, pos)
+            if not match:
+                return fail("unclosed JSX element", stack[-1][1])
+            start = match.start()
+            pos = match.end()
+            if match.group() == '{':
+                stack.append(('{', start))
+            elif code.startswith('</', start):
+                closing = _CLOSING_TAG.match(code, start)
+                if closing:
+                    stack.pop()
+                    pos = closing.end()
+                else:
+                    stack[-1] = ('closetag', start)
+                    pos = start + 2
+            elif code[start + 1:start + 2].isalpha() or code[start + 1:start + 2] == '>':
+                pos = open_tag(start)
+            continue
+    
+    if stack:
+        kind, at = stack[-1]
+        names = {'tag': "JSX tag", 'closetag': "JSX closing tag", 'jsx': "JSX element", '`': "template literal", '${': "'${'"}
+        return fail(f"unclosed {names.get(kind, repr(kind))}", at)
+    if result.checkpoint_artifacts:
+        return fail("checkpoint markers still present", length)
+    if not result.has_default_export:
+        return fail("missing 'export default function'", length)
+    if not result.has_return:
+        return fail("missing return statement", length)
+    if not code.rstrip().endswith('}'):
+        return fail("code doesn't end with '}'", length)
+    
+    result.valid = True
+    return result
 
 
 def count_checkpoints(buffer: str) -> int:
@@ -230,7 +494,7 @@ def count_checkpoints(buffer: str) -> int:
     Returns:
         Number of checkpoints encountered
     """
-    return buffer.count('//$CHECKPOINT')
+    return buffer.count(CHECKPOINT_DELIMITER)
 
 
 def has_new_checkpoint(buffer: str, last_checkpoint_count: int) -> bool:
@@ -245,4 +509,91 @@ def has_new_checkpoint(buffer: str, last_checkpoint_count: int) -> bool:
         True if new checkpoint detected
     """
     current_count = count_checkpoints(buffer)
-    return current_count > last_checkpoint_count
\ No newline at end of file
+    return current_count > last_checkpoint_count
+
+class CheckpointScanner:
+    """
+    Incremental checkpoint detector for a growing LLM stream.
+    
+    count_checkpoints()/extract_at_checkpoint() rescan the whole buffer, which
+    is quadratic when called per chunk. The scanner only looks at newly fed
+    text (plus a small overlap for delimiters split across chunks), remembers
+    where each //$CHECKPOINT starts, and extracts a given checkpoint at most
+    once. Results match extract_at_checkpoint() on the same buffer.
+    
+    Example:
+        scanner = CheckpointScanner()
+        async for chunk in stream:
+            if scanner.feed(chunk):
+                code = scanner.extract_latest()
+        full_text = scanner.text
+    """
+    
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._length = 0
+        self._tail = ""  # Last len(delimiter) - 1 chars, for split delimiters
+        self._extracted_count = 0
+        self._checker = CodeChecker()
+        self.marker_offsets: List[int] = []
+    
+    def feed(self, chunk: str) -> int:
+        """
+        Append a chunk and scan only the new text for delimiters.
+        
+        Args:
+            chunk: Newly streamed text
+            
+        Returns:
+            Number of new //$CHECKPOINT delimiters found in this chunk
+        """
+        if not chunk:
+            return 0
+        
+        window = self._tail + chunk
+        window_start = self._length - len(self._tail)
+        found = 0
+        
+        idx = window.find(CHECKPOINT_DELIMITER)
+        while idx != -1:
+            self.marker_offsets.append(window_start + idx)
+            found += 1
+            idx = window.find(CHECKPOINT_DELIMITER, idx + len(CHECKPOINT_DELIMITER))
+        
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        self._tail = window[-(len(CHECKPOINT_DELIMITER) - 1):]
+        return found
+    
+    @property
+    def count(self) -> int:
+        """Number of checkpoints seen so far"""
+        return len(self.marker_offsets)
+    
+    @property
+    def has_pending(self) -> bool:
+        """True if a checkpoint arrived that has not been extracted yet"""
+        return self.count > self._extracted_count
+    
+    @property
+    def text(self) -> str:
+        """Full stream text so far (chunks are joined lazily)"""
+        if len(self._chunks) > 1:
+            self._chunks = [''.join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+    
+    def extract_latest(self) -> Optional[str]:
+        """
+        Extract code at the most recent checkpoint.
+        
+        Each checkpoint is only extracted once; calling again before a new
+        delimiter arrives returns None.
+        
+        Returns:
+            Cleaned, validated code or None
+        """
+        if not self.has_pending:
+            return None
+        
+        self._extracted_count = self.count
+        return _extract_before_delimiter(self.text[:self.marker_offsets[-1]], self._checker)
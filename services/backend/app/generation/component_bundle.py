@@ -0,0 +1,325 @@
+"""
+Component Bundles - Static, content-hashed component libraries
+
+The shadcn/ui library is built once at import into an immutable bundle whose
+version is a hash of its sources. Projects reference it instead of carrying
+copies of it:
+- A project's files only include the bundle components its code imports,
+  found by walking the import graph from the project's own files (tree-shake)
+- Stored flow versions keep {"name", "version", "components"} in place of
+  the component sources and get them back from the bundle on load
+"""
+import re
+import hashlib
+import posixpath
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+# Key of the bundle reference on a project ({"files", "entry", "dependencies", ...})
+BUNDLE_REF_KEY = "component_bundle"
+
+# import x from "a", import "a", export { x } from "a", import("a")
+_IMPORT_SPECIFIER = re.compile(r'''\b(?:from|import)\s*\(?\s*["']([^"'\n]+)["']''')
+
+# Extensions tried when an import omits one (same order as the bundler)
+_RESOLVE_SUFFIXES = ("", ".tsx", ".ts", ".jsx", ".js", "/index.tsx", "/index.ts")
+
+
+def find_import_specifiers(code: str) -> List[str]:
+    """
+    Module specifiers imported by a file
+
+    Args:
+        code: JS/TS source
+
+    Returns:
+        Specifiers in source order (e.g. ["react", "@/components/ui/button"])
+    """
+    return _IMPORT_SPECIFIER.findall(code)
+
+
+@dataclass(frozen=True)
+class ComponentBundle:
+    """Immutable component library plus the import graph between its files"""
+    name: str
+    version: str                                   # Content hash of the files
+    files: Mapping[str, str]                       # Path -> source
+    dependencies: Mapping[str, FrozenSet[str]] = field(repr=False)  # Path -> bundle paths it imports
+
+    @classmethod
+    def build(cls, name: str, files: Dict[str, str]) -> "ComponentBundle":
+        """
+        Hash the files and index their imports
+
+        Args:
+            name: Bundle name (e.g. "shadcn-ui")
+            files: Path -> source
+
+        Returns:
+            ComponentBundle
+        """
+        digest = hashlib.sha256()
+        for path in sorted(files):
+            digest.update(path.encode("utf-8") + b"\0" + files[path].encode("utf-8") + b"\0")
+
+        bundle = cls(
+            name=name,
+            version=digest.hexdigest()[:16],
+            files=MappingProxyType(dict(files)),
+            dependencies=MappingProxyType({})
+        )
+        dependencies = {
+            path: frozenset(bundle.imports_of(code, path)) for path, code in files.items()
+        }
+        # Frozen dataclass: the graph needs resolve(), so it is filled in after construction
+        object.__setattr__(bundle, "dependencies", MappingProxyType(dependencies))
+        return bundle
+
+    @property
+    def size(self) -> int:
+        """Total source size in bytes"""
+        return sum(len(code.encode("utf-8")) for code in self.files.values())
+
+    def resolve(self, specifier: str, importer: str = "/") -> Optional[str]:
+        """
+        Bundle path an import specifier refers to
+
+        Args:
+            specifier: "@/components/ui/button", "./button", "react", ...
+            importer: Path of the importing file (for relative specifiers)
+
+        Returns:
+            Bundle file path, or None if the import is not a bundle file
+        """
+        if specifier.startswith("@/"):
+            base = specifier[1:]
+        elif specifier.startswith("."):
+            base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier))
+        else:
+            return None
+
+        for suffix in _RESOLVE_SUFFIXES:
+            if base + suffix in self.files:
+                return base + suffix
+        return None
+
+    def imports_of(self, code: str, importer: str = "/") -> Set[str]:
+        """Bundle files a source file imports directly"""
+        resolved = (self.resolve(spec, importer) for spec in find_import_specifiers(code))
+        return {path for path in resolved if path}
+
+    def closure(self, paths: Iterable[str], exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Paths plus every bundle file they import, transitively
+
+        Args:
+            paths: Bundle paths to start from
+            exclude: Paths not to follow (files a project overrides)
+
+        Returns:
+            Sorted bundle paths
+        """
+        excluded = set(exclude)
+        needed: Set[str] = set()
+        pending = [p for p in paths if p in self.files and p not in excluded]
+        while pending:
+            path = pending.pop()
+            if path in needed:
+                continue
+            needed.add(path)
+            pending.extend(d for d in self.dependencies.get(path, ()) if d not in excluded)
+        return sorted(needed)
+
+    def owns(self, path: str, code: str) -> bool:
+        """True if a project file is an unmodified copy of this bundle's file"""
+        return self.files.get(path) == code
+
+    def tree_shake(self, files: Dict[str, str]) -> List[str]:
+        """
+        Bundle files a project needs
+
+        Roots are the project's own files (screens, App.tsx, and any bundle
+        file the project has modified); unmodified bundle copies are not roots.
+
+        Args:
+            files: Project path -> source
+
+        Returns:
+            Sorted bundle paths the project imports, directly or indirectly
+        """
+        roots: Set[str] = set()
+        overridden = []
+        for path, code in files.items():
+            if self.owns(path, code):
+                continue
+            if path in self.files:
+                overridden.append(path)
+            roots.update(self.imports_of(code, path))
+        return self.closure(roots, exclude=overridden)
+
+    def reference(self, components: Iterable[str]) -> Dict[str, Any]:
+        """Reference stored on a project in place of the component sources"""
+        return {
+            "name": self.name,
+            "version": self.version,
+            "components": sorted(components),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form (the import graph is rebuilt on load)"""
+        return {"name": self.name, "version": self.version, "files": dict(self.files)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ComponentBundle":
+        """
+        Rebuild a bundle saved with to_dict
+
+        Raises:
+            ValueError: If the files do not hash to the saved version
+        """
+        bundle = cls.build(data["name"], data["files"])
+        if bundle.version != data.get("version"):
+            raise ValueError(
+                f"Component bundle {data['name']} hash mismatch "
+                f"({data.get('version')} saved, {bundle.version} computed)"
+            )
+        return bundle
+
+
+# ============================================================================
+# BUNDLE REGISTRY
+# ============================================================================
+
+_bundles: Dict[Tuple[str, str], ComponentBundle] = {}
+
+# Loads a bundle version that is not in this process (e.g. from S3)
+BundleLoader = Callable[[str, str], Optional[ComponentBundle]]
+
+
+def register_bundle(bundle: ComponentBundle) -> ComponentBundle:
+    """Make a bundle version resolvable by reference"""
+    _bundles[(bundle.name, bundle.version)] = bundle
+    return bundle
+
+
+def get_registered_bundle(name: str, version: str) -> Optional[ComponentBundle]:
+    """Bundle version from this process (None if it was never loaded)"""
+    return _bundles.get((name, version))
+
+
+def get_default_bundle() -> ComponentBundle:
+    """The shadcn/ui bundle projects are generated against"""
+    from app.generation.shadcn_full_library import SHADCN_BUNDLE
+    return SHADCN_BUNDLE
+
+
+# ============================================================================
+# PROJECT HELPERS
+# ============================================================================
+
+def shake_project_files(
+    files: Dict[str, str],
+    bundle: Optional[ComponentBundle] = None
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """
+    Keep only the bundle components a project imports
+
+    Args:
+        files: Project path -> source (with or without bundle copies)
+        bundle: Bundle to resolve against (default: get_default_bundle())
+
+    Returns:
+        (project files plus the imported components only,
+         bundle reference for the project)
+    """
+    bundle = bundle or get_default_bundle()
+    components = bundle.tree_shake(files)
+    shaken = {path: code for path, code in files.items() if not bundle.owns(path, code)}
+    for path in components:
+        shaken[path] = bundle.files[path]
+    return shaken, bundle.reference(components)
+
+
+def missing_components(
+    files: Dict[str, str],
+    code: str,
+    path: str,
+    bundle: Optional[ComponentBundle] = None
+) -> Dict[str, str]:
+    """
+    Bundle files a new or edited file needs that the project does not have yet
+
+    Args:
+        files: Current project files
+        code: New source for path
+        path: File being written
+        bundle: Bundle to resolve against (default: get_default_bundle())
+
+    Returns:
+        Path -> source for each missing component (empty if none)
+    """
+    bundle = bundle or get_default_bundle()
+    needed = bundle.closure(bundle.imports_of(code, path), exclude=files)
+    return {p: bundle.files[p] for p in needed if p not in files}
+
+
+def pack_project(project: Dict[str, Any], bundle: Optional[ComponentBundle] = None) -> Dict[str, Any]:
+    """
+    Replace a project's bundle components with a bundle reference
+
+    Unmodified bundle copies are dropped and the components the project
+    imports are listed in project[BUNDLE_REF_KEY]. Modified copies stay.
+
+    Args:
+        project: Project dict with a "files" map
+        bundle: Bundle to pack against (default: get_default_bundle())
+
+    Returns:
+        New project dict (the input is not modified)
+    """
+    files = project.get("files")
+    if not isinstance(files, dict):
+        return project
+
+    bundle = bundle or get_default_bundle()
+    packed = dict(project)
+    packed["files"] = {path: code for path, code in files.items() if not bundle.owns(path, code)}
+    packed[BUNDLE_REF_KEY] = bundle.reference(bundle.tree_shake(files))
+    return packed
+
+
+def unpack_project(project: Dict[str, Any], loader: Optional[BundleLoader] = None) -> Dict[str, Any]:
+    """
+    Restore the component sources of a packed project
+
+    Args:
+        project: Project dict with a bundle reference
+        loader: Fetches bundle versions not registered in this process
+
+    Returns:
+        New project dict with the referenced components in "files" (files the
+        project already has win), or the input if it has no reference
+
+    Raises:
+        ValueError: If the referenced bundle version cannot be found
+    """
+    ref = project.get(BUNDLE_REF_KEY)
+    files = project.get("files")
+    if not ref or not isinstance(files, dict):
+        return project
+
+    name, version = ref["name"], ref["version"]
+    bundle = get_registered_bundle(name, version)
+    if bundle is None and loader is not None:
+        bundle = loader(name, version)
+    if bundle is None:
+        raise ValueError(f"Component bundle {name}@{version} not found")
+
+    unpacked = dict(project)
+    unpacked["files"] = {
+        **{p: bundle.files[p] for p in ref.get("components", []) if p in bundle.files},
+        **files
+    }
+    return unpacked
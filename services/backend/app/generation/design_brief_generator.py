@@ -158,6 +158,7 @@ Generate a concise, opinionated design brief for this flow. Be specific — name
         # Build multimodal message content
         # Images come first so Claude sees them as the primary style reference
         from app.llm.types import TextContent, ImageContent, Message, MessageRole
+        from app.llm.utils.images import estimate_image_tokens
         
         if reference_images:
             content_blocks = []
@@ -175,7 +176,15 @@ Generate a concise, opinionated design brief for this flow. Be specific — name
             content_blocks.append(TextContent(text="\n\n" + text_content))
             
             user_msg = Message(role=MessageRole.USER, content=content_blocks)
-            print(f"  📸 Including {len(reference_images)} reference image(s) in brief generation")
+            # Prepared reference images carry their size (see PreparedImage.to_reference)
+            image_tokens = sum(
+                estimate_image_tokens(img.get("width", 0), img.get("height", 0), model)
+                for img in reference_images
+            )
+            print(
+                f"  📸 Including {len(reference_images)} reference image(s) in brief generation"
+                + (f" (~{image_tokens:,} image tokens)" if image_tokens else "")
+            )
         else:
             user_msg = Message(role=MessageRole.USER, content=text_content)
         
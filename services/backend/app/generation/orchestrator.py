@@ -8,21 +8,23 @@ This is the core generation engine using the 10x taste system:
 4. Few-shot learning (code examples)
 """
 from typing import Dict, Any, List, Optional
+import asyncio
 import json
 import re
 
-from app.llm.types import Message, MessageRole, GenerationConfig, TextContent, ImageContent
+from app.llm.types import Message, MessageRole, GenerationConfig, TextContent, ImageContent, StreamStats
 from app.llm.config import get_config
 from app.generation.parametric import ParametricGenerator
-from app.generation.prompt_assembler import PromptAssembler
+from app.generation.prompt_assembler import PromptAssembler, SECTION_SEPARATOR
 from app.generation.validator import TasteValidator
-from app.generation.checkpoints import extract_at_checkpoint, count_checkpoints, _aggressive_clean_checkpoints
+from app.generation.checkpoints import CheckpointScanner, _aggressive_clean_checkpoints
 from app.generation.multifile_parser import (
     parse_llm_output,
     add_shadcn_components_to_files,
     ensure_default_dependencies,
     normalize_file_paths
 )
+from app.generation.component_bundle import missing_components
 
 
 class GenerationOrchestrator:
@@ -56,6 +58,8 @@ class GenerationOrchestrator:
         design_brief: Optional[str] = None,       # NEW: pre-generated flow design brief
         thinking_budget: int = 8000,               # NEW: extended thinking token budget (0 = disabled)
         reference_images: List[Dict[str, Any]] = None,  # NEW: up to 3 base64 resource images
+        prefix_cached: Optional[asyncio.Event] = None,  # Set once the shared prompt prefix is cached
+        delivered_components: Optional[Dict[str, str]] = None,  # Bundle files the client already has
     ) -> Dict[str, Any]:
         """
         Generate UI with PROGRESSIVE STREAMING and 4-layer taste constraints.
@@ -80,6 +84,12 @@ class GenerationOrchestrator:
             screen_id: Screen identifier for WebSocket messages
             screen_name: Screen name for logging
             responsive: Enable responsive design (True = fluid layouts, False = fixed dimensions)
+            prefix_cached: Event set when the provider starts responding, i.e. once the
+                shared prefix (reference images + taste context) is in the prompt cache.
+                Also set if generation fails, so waiters never hang.
+            delivered_components: Bundle components already sent to the client
+                (updated in place). Each checkpoint carries the ones its code
+                imports for the first time, so previews resolve them.
             
         Returns:
             Dict with:
@@ -101,8 +111,8 @@ class GenerationOrchestrator:
                 device_info=device_info
             )
         
-        # Build prompt with 4-layer system
-        prompt = self.prompt_assembler.assemble(
+        # Build prompt with 4-layer system (shared prefix + per-screen task)
+        shared_prefix, task_suffix = self.prompt_assembler.assemble_parts(
             task_description=task_description,
             taste_data=taste_data,
             taste_source=taste_source,
@@ -114,6 +124,7 @@ class GenerationOrchestrator:
             image_generation_mode=image_generation_mode,
             design_brief=design_brief,  # Inject flow-level design brief
         )
+        prompt = shared_prefix + SECTION_SEPARATOR + task_suffix
         
         print(f"\n{'='*70}")
         print(f"GENERATING UI - IMPROVED PIPELINE")
@@ -130,28 +141,39 @@ class GenerationOrchestrator:
         print(f"Streaming: {websocket is not None}")
         print(f"{'='*70}\n")
         
-        # Build LLM message — multimodal if reference images provided
+        # Build LLM message — multimodal if reference images provided.
+        # Stable content comes first with cache breakpoints after the images
+        # and after the shared prefix, so sibling screens reuse the cache.
+        content_blocks = []
+        shared_text = shared_prefix
         if reference_images:
-            content_blocks = []
             content_blocks.append(TextContent(
                 text=f"STYLE REFERENCE: The following {len(reference_images)} screenshot(s) are from the designer's "
                      "actual portfolio. Your code must produce UI that visually matches this aesthetic — "
                      "same color temperature, density, surface treatment, and typographic personality.\n\n"
             ))
-            for img in reference_images:
+            for i, img in enumerate(reference_images):
                 content_blocks.append(ImageContent(
                     data=img["data"],
                     media_type=img.get("media_type", "image/png"),
+                    cache_breakpoint=(i == len(reference_images) - 1),
                 ))
-            content_blocks.append(TextContent(text="\n\n" + prompt))
-            user_message = Message(role=MessageRole.USER, content=content_blocks)
-        else:
-            user_message = Message(role=MessageRole.USER, content=prompt)
+            shared_text = "\n\n" + shared_prefix
+        content_blocks.append(TextContent(text=shared_text, cache_breakpoint=True))
+        content_blocks.append(TextContent(text=SECTION_SEPARATOR + task_suffix))
+        user_message = Message(role=MessageRole.USER, content=content_blocks)
         
         # Single generation attempt - no retries
-        buffer = ""
-        last_checkpoint_count = 0
+        scanner = CheckpointScanner()
         last_sent_code = None
+        if delivered_components is None:
+            delivered_components = {}
+        component_name = (flow_context or {}).get('component_name')
+        checkpoint_path = f"/screens/{component_name}.tsx" if component_name else '/App.tsx'
+        stream_stats = StreamStats(
+            model=model,
+            on_response_start=prefix_cached.set if prefix_cached is not None else None,
+        )
         
         try:
             # Use LLM service with streaming support
@@ -162,22 +184,25 @@ class GenerationOrchestrator:
                 max_tokens=16000,
                 temperature=1.0 if thinking_budget > 0 else 0.7,
                 thinking_budget=thinking_budget,
+                stream_stats=stream_stats,
             )
             
             async for chunk in stream:
-                buffer += chunk
+                scanner.feed(chunk)
                 
                 # Stream checkpoints on first (and only) attempt
                 if websocket:
-                    current_checkpoint_count = count_checkpoints(buffer)
-                    
-                    if current_checkpoint_count > last_checkpoint_count:
+                    if scanner.has_pending:
+                        current_checkpoint_count = scanner.count
                         print(f"    🔍 Checkpoint {current_checkpoint_count} detected")
                         
                         # Extract code at this checkpoint
-                        checkpoint_code = extract_at_checkpoint(buffer)
+                        checkpoint_code = scanner.extract_latest()
                         
                         if checkpoint_code and checkpoint_code != last_sent_code:
+                            new_components = missing_components(delivered_components, checkpoint_code, checkpoint_path)
+                            delivered_components.update(new_components)
+                            
                             # Send checkpoint update to frontend
                             await websocket.send_json({
                                 "type": "ui_checkpoint",
@@ -185,16 +210,17 @@ class GenerationOrchestrator:
                                     "screen_id": screen_id,
                                     "ui_code": checkpoint_code,
                                     "checkpoint_number": current_checkpoint_count,
-                                    "is_final": False
+                                    "is_final": False,
+                                    "files": new_components
                                 }
                             })
                             
                             last_sent_code = checkpoint_code
-                            last_checkpoint_count = current_checkpoint_count
                             print(f"    ✓ Checkpoint {current_checkpoint_count} sent")
             
             # Stream complete - clean final code
-            print(f"\n    🏁 Stream complete. Processing output...")
+            print(f"\n    🏁 Stream complete ({stream_stats.summary()}). Processing output...")
+            buffer = scanner.text
             
             # Parse LLM output to support both legacy (single file) and new (multi-file) formats
             parsed_output = parse_llm_output(buffer)
@@ -292,6 +318,9 @@ class GenerationOrchestrator:
         except Exception as e:
             print(f"Error during generation: {e}")
             raise
+        finally:
+            if prefix_cached is not None:
+                prefix_cached.set()
         
         # Send final code via WebSocket
         if websocket:
@@ -317,7 +346,8 @@ class GenerationOrchestrator:
             "metadata": {
                 "model": model,
                 "taste_source": taste_source,
-                "attempts": 1
+                "attempts": 1,
+                "stream": stream_stats.to_dict(),
             }
         }
     
@@ -15,10 +15,14 @@ And produces a complete, taste-rich prompt that enforces:
 
 import os
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
 
 
+# Separator between prompt sections
+SECTION_SEPARATOR = "\n\n---\n\n"
+
+
 class PromptAssembler:
     """
     Assembles generation prompts from modular templates + DTM data
@@ -71,6 +75,47 @@ class PromptAssembler:
         """
         Assemble complete generation prompt
         
+        Same arguments as assemble_parts; returns the shared prefix and the
+        task suffix joined into one string.
+        
+        Returns:
+            Complete prompt string
+        """
+        shared_prefix, task_suffix = self.assemble_parts(
+            task_description=task_description,
+            taste_data=taste_data,
+            taste_source=taste_source,
+            device_info=device_info,
+            flow_context=flow_context,
+            mode=mode,
+            model=model,
+            responsive=responsive,
+            image_generation_mode=image_generation_mode,
+            design_brief=design_brief,
+        )
+        return shared_prefix + SECTION_SEPARATOR + task_suffix
+    
+    def assemble_parts(
+        self,
+        task_description: str,
+        taste_data: Dict[str, Any],
+        taste_source: str,
+        device_info: Dict[str, Any],
+        flow_context: Optional[Dict[str, Any]] = None,
+        mode: str = "default",
+        model: str = "claude-sonnet-4.5",
+        responsive: bool = True,
+        image_generation_mode: str = "image_url",
+        design_brief: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """
+        Assemble the generation prompt as (shared prefix, task suffix)
+        
+        Everything that is the same for every screen of a flow (rules, design
+        system, taste context, design brief) goes in the prefix, in a fixed
+        order, so it can be cached by the provider and reused across screens.
+        Only the task and output structure, which follow it, vary per screen.
+        
         Args:
             task_description: What to build
             taste_data: DTM or DTR data
@@ -83,7 +128,7 @@ class PromptAssembler:
             image_generation_mode: "ai" (fal.ai generation) or "image_url" (direct URLs)
         
         Returns:
-            Complete prompt string
+            (shared_prefix, task_suffix)
         """
         
         sections = []
@@ -138,6 +183,10 @@ class PromptAssembler:
             sections.append(f"# FLOW DESIGN BRIEF\n\nThe following creative direction was established for this entire flow. Every screen must feel like it belongs to the same cohesive design:\n\n{design_brief}")
             print("    🎨 Design brief injected")
         
+        # Everything above is identical across a flow's screens
+        shared_prefix = SECTION_SEPARATOR.join(sections)
+        sections = []
+        
         # 6. Task and constraints
         task_section = self._format_task(
             task_description,
@@ -156,7 +205,7 @@ class PromptAssembler:
             # Add parametric-specific instructions
             pass
         
-        return "\n\n---\n\n".join(sections)
+        return shared_prefix, SECTION_SEPARATOR.join(sections)
     
     def _load_template(self, template_path: str) -> str:
         """Load template file from prompts directory"""
@@ -8,11 +8,14 @@ Used when reference_mode == "redesign" to ensure the LLM cannot see any styling
 that it might accidentally copy.
 """
 
+import asyncio
 import base64
 import io
 from typing import Dict, List, Any, Optional
 import json
 
+from app.core.async_cpu import run_cpu_bound
+
 
 def extract_figma_wireframe(figma_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -252,28 +255,32 @@ async def process_redesign_references(
     
     # Process images if available
     if reference_files.get('images'):
-        print(f"  → Processing {len(reference_files['images'])} reference images...")
+        images = reference_files['images']
+        print(f"  → Processing {len(images)} reference images...")
+        print(f"    - Extracting wireframe descriptions and grayscale wireframes in parallel...")
         
-        for idx, img in enumerate(reference_files['images']):
-            print(f"    - Image {idx + 1}: Extracting wireframe description...")
-            
-            # Extract text description using vision
-            description = await extract_wireframe_description(
+        # Vision calls (network) and grayscale conversion (CPU) for every image
+        # run concurrently; results are collected in input order.
+        description_tasks = asyncio.gather(*[
+            extract_wireframe_description(
                 img['data'],
                 llm_client,
                 img.get('media_type', 'image/png')
             )
+            for img in images
+        ])
+        wireframe_tasks = asyncio.gather(*[
+            run_cpu_bound(convert_image_to_wireframe, img['data'])
+            for img in images
+        ])
+        descriptions, wireframes = await asyncio.gather(description_tasks, wireframe_tasks)
+        
+        for description, wireframe_img in zip(descriptions, wireframes):
             processed['wireframe_descriptions'].append(description)
-            
-            print(f"    - Image {idx + 1}: Converting to grayscale wireframe...")
-            
-            # Convert to wireframe image
-            wireframe_img = convert_image_to_wireframe(img['data'])
             processed['wireframe_images'].append({
                 'data': wireframe_img,
                 'media_type': 'image/png'
             })
-            
             processed['has_wireframes'] = True
     
     return processed
@@ -2,14 +2,18 @@
 Complete shadcn/ui Component Library - ALL 50+ Components
 
 Includes every shadcn component so LLM has full freedom like v0/Bolt/Lovable.
+The library is built once at import into SHADCN_BUNDLE, a content-hashed
+bundle that projects reference instead of copying (see component_bundle).
 """
 
 from typing import Dict
 
+from app.generation.component_bundle import ComponentBundle, register_bundle
 
-def get_all_shadcn_components() -> Dict[str, str]:
+
+def _build_library_files() -> Dict[str, str]:
     """
-    Returns complete shadcn/ui library - 50+ components
+    Build the complete shadcn/ui library - 50+ components
     
     Organized by category:
     - Core: Button, Input, Label, Textarea, etc.
@@ -1407,4 +1411,23 @@ CarouselItem.displayName = "CarouselItem"
 export { Carousel, CarouselItem }
 '''
     
-    return components
\ No newline at end of file
+    return components
+
+
+# Built once per process; its version changes whenever a component source does
+SHADCN_BUNDLE = register_bundle(ComponentBundle.build("shadcn-ui", _build_library_files()))
+
+
+def get_shadcn_bundle() -> ComponentBundle:
+    """The shadcn/ui library as a static, versioned bundle"""
+    return SHADCN_BUNDLE
+
+
+def get_all_shadcn_components() -> Dict[str, str]:
+    """
+    Returns complete shadcn/ui library - 50+ components
+    
+    Returns:
+        Dict of filepath -> code (a new dict over the shared bundle sources)
+    """
+    return dict(SHADCN_BUNDLE.files)
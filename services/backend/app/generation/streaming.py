@@ -3,6 +3,9 @@ Progressive UI Streaming - WebSocket Handler Integration (FIXED VERSION)
 Adds checkpoint-based progressive rendering to screen generation
 with proper checkpoint cleaning at every step
 """
+import os
+import random
+from contextvars import ContextVar
 from typing import Dict, Any
 from datetime import datetime
 from fastapi import WebSocket
@@ -10,8 +13,7 @@ from fastapi import WebSocket
 
 # Import checkpoint extractor (use the fixed version)
 from app.generation.checkpoints import (
-    extract_at_checkpoint, 
-    count_checkpoints,
+    CheckpointScanner,
     _aggressive_clean_checkpoints  # Import the aggressive cleaner
 )
 
@@ -22,9 +24,23 @@ CHECKPOINT_DETECTION_LOG = "/tmp/checkpoint_detection.log"
 WEBSOCKET_SEND_LOG = "/tmp/websocket_send.log"
 TRANSFORMATION_LOG = "/tmp/ui_stream_transformations.log"
 
+# Fraction of screen generations that write the debug logs above
+# (0 = off, 1 = every generation). Errors are always logged.
+STREAM_DEBUG_LOG_SAMPLE_RATE = float(os.getenv("STREAM_DEBUG_LOG_SAMPLE_RATE", "0"))
 
-def log_to_file(filepath: str, content: str):
-    """Append log entry with timestamp"""
+# Sampling decision for the generation running in the current task
+_debug_log_enabled: ContextVar[bool] = ContextVar("stream_debug_log_enabled", default=False)
+
+
+def should_sample_debug_logs() -> bool:
+    """Decide (once per generation) whether to write the debug logs"""
+    return STREAM_DEBUG_LOG_SAMPLE_RATE > 0 and random.random() < STREAM_DEBUG_LOG_SAMPLE_RATE
+
+
+def log_to_file(filepath: str, content: str, force: bool = False):
+    """Append log entry with timestamp (no-op unless this generation is sampled)"""
+    if not (force or _debug_log_enabled.get()):
+        return
     timestamp = datetime.now().isoformat()
     with open(filepath, 'a') as f:
         f.write(f"\n{'='*80}\n")
@@ -37,8 +53,10 @@ def log_transformation_step(step_name: str, before: str, after: str):
     """
     Log raw -> cleaned transformations.
     Uses strict separators: 5 newlines, $$$$$, 5 newlines.
-    No truncation. Single file.
+    No truncation. Single file. No-op unless this generation is sampled.
     """
+    if not _debug_log_enabled.get():
+        return
     separator = "\n" * 5 + "$$$$$" + "\n" * 5
     with open(TRANSFORMATION_LOG, "a") as f:
         f.write(separator)
@@ -70,10 +88,12 @@ async def generate_screen_ui_progressive(
     """
     screen_id = screen['screen_id']
     screen_name = screen.get('name', 'Unknown')
-    buffer = ""
+    scanner = CheckpointScanner()
     last_checkpoint_count = 0
     last_sent_code = None
     chunk_count = 0
+    debug_log = should_sample_debug_logs()
+    _debug_log_enabled.set(debug_log)
     
     # ========== INITIAL LOGGING ==========
     log_to_file(RAW_STREAM_LOG, f"""
@@ -134,12 +154,13 @@ Has Streaming Support: {hasattr(llm, 'call_claude_stream')}
             prompt_name=prompt_name,
             user_message=screen_content
         ):
-            # Accumulate tokens
+            # Accumulate tokens (only the new chunk is scanned for markers)
             chunk_count += 1
-            buffer += chunk
+            scanner.feed(chunk)
             
             # ========== PERIODIC BUFFER LOGGING ==========
-            if chunk_count % 50 == 0:  # Log every 50 chunks
+            if debug_log and chunk_count % 50 == 0:  # Log every 50 chunks
+                buffer = scanner.text
                 log_to_file(RAW_STREAM_LOG, f"""
 Chunk #{chunk_count}
 Buffer size: {len(buffer)} chars
@@ -149,9 +170,10 @@ Last 800 chars of buffer:
             # ========== END PERIODIC LOGGING ==========
             
             # Check for new checkpoint
-            current_checkpoint_count = count_checkpoints(buffer)
-            
-            if current_checkpoint_count > last_checkpoint_count:
+            if scanner.has_pending:
+                current_checkpoint_count = scanner.count
+                buffer = scanner.text
+                
                 # ========== CHECKPOINT DETECTED LOGGING ==========
                 log_to_file(CHECKPOINT_DETECTION_LOG, f"""
 🎯 NEW CHECKPOINT DETECTED!
@@ -172,7 +194,7 @@ Now calling extract_at_checkpoint()...
                 # ========== END CHECKPOINT DETECTED LOGGING ==========
                 
                 # New checkpoint detected!
-                checkpoint_code = extract_at_checkpoint(buffer)
+                checkpoint_code = scanner.extract_latest()
 
                 log_transformation_step(
                     f"checkpoint_extraction_{current_checkpoint_count}",
@@ -235,6 +257,7 @@ Code length: {len(cleaned_code)}
                     log_to_file(CHECKPOINT_DETECTION_LOG, "⚠️  Skipped sending (no code or duplicate)")
         
         # Stream complete - clean and send final code
+        buffer = scanner.text
         log_to_file(RAW_STREAM_LOG, f"""
 🏁 STREAM COMPLETE
 ================================================================================
@@ -274,10 +297,10 @@ Final buffer size: {len(buffer)} chars
         
     except Exception as e:
         error_msg = f"Error in progressive generation: {e}"
-        log_to_file(RAW_STREAM_LOG, f"❌ EXCEPTION: {error_msg}")
+        log_to_file(RAW_STREAM_LOG, f"❌ EXCEPTION: {error_msg}", force=True)
         
         import traceback
-        log_to_file(RAW_STREAM_LOG, f"Traceback:\n{traceback.format_exc()}")
+        log_to_file(RAW_STREAM_LOG, f"Traceback:\n{traceback.format_exc()}", force=True)
         
         await websocket.send_json({
             "type": "screen_error",
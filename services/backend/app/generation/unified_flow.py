@@ -7,16 +7,32 @@ Generates multi-screen flows as a SINGLE PROJECT with:
 - Screen components (/screens/*)
 - Router (App.tsx)
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import asyncio
+import os
 import re
 
+from app.generation.component_bundle import (
+    BUNDLE_REF_KEY,
+    get_default_bundle,
+    missing_components,
+    shake_project_files
+)
 from app.generation.multifile_parser import (
     ensure_default_dependencies,
     normalize_file_paths
 )
 
 
+# Model for the design brief and every screen (reference images are prepared for it)
+FLOW_GENERATION_MODEL = "claude-sonnet-4.5"
+
+# Generate the first screen alone until the provider has cached the shared
+# prompt prefix (taste context, brief, reference images), then fan out
+PROMPT_CACHE_WARMUP = os.getenv("FLOW_PROMPT_CACHE_WARMUP", "true").lower() == "true"
+PROMPT_CACHE_WARMUP_TIMEOUT = float(os.getenv("FLOW_PROMPT_CACHE_WARMUP_TIMEOUT", "90"))
+
+
 def sanitize_screen_name(name: str) -> str:
     """
     Sanitize screen name to ensure it can be used as a valid React component name.
@@ -68,28 +84,21 @@ def sanitize_screen_name(name: str) -> str:
 
 def generate_shared_components() -> Dict[str, str]:
     """
-    Generate complete shadcn/ui component library (50+ components)
+    Get the complete shadcn/ui component library (50+ components)
     
     Matches what v0/Bolt/Lovable provide - LLM has access to full library.
+    The library is a static bundle built once at import; the finished project
+    only keeps the components its screens import (see assemble_unified_project).
     
     Returns:
         Dict of filepath -> code for complete shadcn/ui library (50+ components)
     """
     
-    # Import complete library
-    from app.generation.shadcn_full_library import get_all_shadcn_components
-    files = get_all_shadcn_components()
-    
-    print(f"   ✓ Generated complete shadcn/ui library: {len(files)} files")
-    print(f"      Core: Button, Input, Label, Textarea, Checkbox, Radio, Select, Switch, Slider")
-    print(f"      Data: Card, Table, Avatar, Badge")
-    print(f"      Feedback: Alert, Progress, Skeleton, Toast")
-    print(f"      Layout: Separator, AspectRatio, ScrollArea")
-    print(f"      Navigation: Tabs, Breadcrumb, Pagination")
-    print(f"      Overlays: Dialog, Sheet, Popover, Tooltip")
-    print(f"      Interactive: Accordion, Collapsible, Dropdown, Context, Menubar, Command")
-    print(f"      Advanced: HoverCard, Toggle, Calendar, Carousel")
-    print(f"      Total: {len(files)} components available")
+    bundle = get_default_bundle()
+    files = dict(bundle.files)
+    
+    print(f"   ✓ shadcn/ui library {bundle.name}@{bundle.version}: {len(files)} files "
+          f"({bundle.size / 1024:.1f} KB, built once)")
     
     return files
 
@@ -192,8 +201,12 @@ def assemble_unified_project(
     """
     Assemble all files into a unified project structure
     
+    Only the shared components the screens and router import (directly or
+    through other components) are included; the project records which
+    bundle version they came from under "component_bundle".
+    
     Args:
-        shared_files: Shared component files
+        shared_files: Shared component files (the full library)
         screen_files: Screen component files (one per screen)
         router_code: Router code
         dependencies: npm dependencies
@@ -204,9 +217,6 @@ def assemble_unified_project(
     
     all_files = {}
     
-    # Add shared files (shadcn/ui components, utils)
-    all_files.update(shared_files)
-    
     # Add screen files
     for screen_id, files in screen_files.items():
         # Screens should only have one file each (the screen component)
@@ -219,13 +229,44 @@ def assemble_unified_project(
     # Normalize paths
     all_files = normalize_file_paths(all_files)
     
+    # Add the shared files (shadcn/ui components, utils) the project imports
+    all_files, bundle_ref = shake_project_files({**shared_files, **all_files})
+    
     # Ensure dependencies
     all_dependencies = ensure_default_dependencies(dependencies)
     
     return {
         'files': all_files,
         'entry': '/App.tsx',
-        'dependencies': all_dependencies
+        'dependencies': all_dependencies,
+        BUNDLE_REF_KEY: bundle_ref
+    }
+
+
+def summarize_prompt_cache(stream_stats: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Total prompt cache usage across a flow's screen generations
+    
+    Args:
+        stream_stats: StreamStats.to_dict() per screen (None entries are skipped)
+    
+    Returns:
+        Dict with cached/written/uncached input tokens, hit ratio and mean prefill time
+    """
+    stats = [s for s in stream_stats if s]
+    cached = sum(s.get('cached_tokens', 0) for s in stats)
+    written = sum(s.get('cache_write_tokens', 0) for s in stats)
+    uncached = sum(s.get('input_tokens', 0) for s in stats)
+    prompt_tokens = cached + written + uncached
+    prefills = [s['prefill_seconds'] for s in stats if s.get('prefill_seconds') is not None]
+    
+    return {
+        'screens': len(stats),
+        'cached_tokens': cached,
+        'cache_write_tokens': written,
+        'uncached_tokens': uncached,
+        'cache_hit_ratio': cached / prompt_tokens if prompt_tokens else 0.0,
+        'avg_prefill_seconds': sum(prefills) / len(prefills) if prefills else None,
     }
 
 
@@ -251,7 +292,10 @@ async def generate_unified_flow(
     
     Flow:
     1. Generate shared components (shadcn/ui, utils)
-    2. Generate screen components in parallel
+    2. Generate screen components in parallel (the first one warms the
+       prompt cache with the shared prefix, then the rest fan out); each
+       screen_ready is preceded by a shared_components message with only the
+       components that screen adds
     3. Generate router
     4. Assemble into unified project
     
@@ -270,9 +314,10 @@ async def generate_unified_flow(
     Returns:
         {
             'project': {
-                'files': {...},
+                'files': {...},  # screens, router and imported components only
                 'entry': '/App.tsx',
-                'dependencies': {...}
+                'dependencies': {...},
+                'component_bundle': {'name', 'version', 'components'}
             },
             'screens': [
                 {
@@ -280,7 +325,8 @@ async def generate_unified_flow(
                     'component_path': '/screens/LoginScreen.tsx',
                     'name': 'Login'
                 }
-            ]
+            ],
+            'prompt_cache': {...}  # see summarize_prompt_cache
         }
     """
     
@@ -299,6 +345,9 @@ async def generate_unified_flow(
     shared_files = generate_shared_components()
     print(f"   ✓ Generated {len(shared_files)} shared files")
     
+    # Components already sent to the client, so each screen only sends what it adds
+    delivered_components: Dict[str, str] = {}
+    
     # Step 1.5: Generate flow-level design brief (runs ONCE, all screens inherit it)
     # This is the "WHY" call — establishes creative direction before the "HOW" (code) calls
     print(f"\n🎨 Step 1.5: Generating flow design brief...")
@@ -319,7 +368,7 @@ async def generate_unified_flow(
         screens=screens,
         dtm=dtm,
         app_description=description_for_brief,
-        model='claude-sonnet-4.5',
+        model=FLOW_GENERATION_MODEL,
         reference_images=reference_images or [],
     )
     
@@ -335,6 +384,10 @@ async def generate_unified_flow(
     
     orchestrator = GenerationOrchestrator(llm, None)  # No storage needed
     
+    # Every screen shares the same prompt prefix; let the first one write it
+    # to the provider's prompt cache before the others read it
+    prefix_cached = asyncio.Event() if PROMPT_CACHE_WARMUP and len(screens) > 1 else None
+    
     async def generate_screen_component(screen: Dict[str, Any], idx: int):
         """Generate a single screen component"""
         screen_id = screen['screen_id']
@@ -397,6 +450,12 @@ async def generate_unified_flow(
         task_with_transitions += "- Create separate helper component files\n"
         task_with_transitions += "- If you need custom components, define them INLINE in the same file\n"
         
+        if prefix_cached is not None and idx > 0:
+            try:
+                await asyncio.wait_for(prefix_cached.wait(), timeout=PROMPT_CACHE_WARMUP_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"  ⚠️  Prompt cache warm-up timed out, starting {screen_name} anyway")
+        
         # Generate screen component
         # Note: We use the SCREEN_COMPONENT mode, not the standalone mode
         result = await orchestrator.generate_ui(
@@ -412,7 +471,7 @@ async def generate_unified_flow(
                 'shared_components': list(shared_files.keys())
             },
             rendering_mode='react',
-            model='claude-sonnet-4.5',
+            model=FLOW_GENERATION_MODEL,
             validate_taste=bool(dtm),
             websocket=None,  # Don't send checkpoint updates (causes too many messages)
             screen_id=screen_id,
@@ -422,6 +481,8 @@ async def generate_unified_flow(
             design_brief=design_brief,    # Flow-level creative direction
             thinking_budget=8000,          # Extended thinking for design quality
             reference_images=reference_images or [],  # Visual style reference
+            prefix_cached=prefix_cached if idx == 0 else None,
+            delivered_components=delivered_components,
         )
         
         # Extract the screen component code
@@ -485,6 +546,16 @@ async def generate_unified_flow(
         
         # Send screen_ready message to frontend for progressive rendering
         if websocket:
+            new_components = missing_components(delivered_components, screen_file, component_path)
+            if new_components:
+                delivered_components.update(new_components)
+                await websocket.send_json({
+                    'type': 'shared_components',
+                    'data': {
+                        'files': new_components,
+                        'dependencies': {'lucide-react': '^0.263.1'}
+                    }
+                })
             await websocket.send_json({
                 'type': 'screen_ready',
                 'data': {
@@ -512,12 +583,21 @@ async def generate_unified_flow(
             'screen_id': screen_id,
             'component_path': component_path,
             'name': screen_name,
-            'code': screen_file
+            'code': screen_file,
+            'stream': result.get('metadata', {}).get('stream'),
         }
     
+    async def run_screen(screen: Dict[str, Any], idx: int):
+        try:
+            return await generate_screen_component(screen, idx)
+        finally:
+            # Never leave the other screens waiting on a failed warm-up
+            if idx == 0 and prefix_cached is not None:
+                prefix_cached.set()
+    
     # Generate all screens in parallel
     screen_tasks = [
-        generate_screen_component(screen, idx)
+        run_screen(screen, idx)
         for idx, screen in enumerate(screens)
     ]
     screen_results = await asyncio.gather(*screen_tasks, return_exceptions=True)
@@ -547,6 +627,13 @@ async def generate_unified_flow(
     
     print(f"\n   ✓ Generated {len(screen_metadata)}/{len(screens)} screens successfully")
     
+    prompt_cache = summarize_prompt_cache([
+        r.get('stream') for r in screen_results if not isinstance(r, Exception)
+    ])
+    print(f"   💾 Prompt cache: {prompt_cache['cache_hit_ratio']:.0%} of input tokens from cache "
+          f"(read {prompt_cache['cached_tokens']:,}, written {prompt_cache['cache_write_tokens']:,}, "
+          f"uncached {prompt_cache['uncached_tokens']:,})")
+    
     # Step 3: Generate router
     print("\n🔀 Step 3: Generating router...")
     router_code = generate_router_code(screens, transitions, entry_screen_id)
@@ -567,9 +654,11 @@ async def generate_unified_flow(
         dependencies=all_dependencies
     )
     
+    bundle_ref = project[BUNDLE_REF_KEY]
     print(f"   ✓ Project assembled:")
     print(f"      Total files: {len(project['files'])}")
-    print(f"      - Shared components: {len(shared_files)}")
+    print(f"      - Shared components: {len(bundle_ref['components'])}/{len(shared_files)} "
+          f"(tree-shaken from {bundle_ref['name']}@{bundle_ref['version']})")
     print(f"      - Screen files: {len(screen_files)}")
     print(f"      - Router: 1")
     print(f"      Dependencies: {len(project['dependencies'])}")
@@ -580,5 +669,6 @@ async def generate_unified_flow(
     
     return {
         'project': project,
-        'screens': screen_metadata
+        'screens': screen_metadata,
+        'prompt_cache': prompt_cache
     }
\ No newline at end of file
@@ -12,19 +12,38 @@ data — no auth tokens or PII — so wildcard CORS is safe here.
 DynamoDB table: OsyleFigmaRelay-Prod
   PK:  token       (string)
   ttl: epoch secs  (number, DynamoDB auto-deletes after 10 min)
+  GSI: queue-created_at-index
+       queue       (string, "<direction>" or "<direction>#<channel>")
+       created_at  (number, epoch ms)
+
+The GSI is sparse: `queue` is only set while an item is pending and is
+removed on ACK, so "latest pending payload" is a single Query with Limit=1
+instead of a Scan over every item. Clients that pass a `channel` (e.g. a
+user or plugin session id) get their own partition; without one they share
+the per-direction queue, as before.
+
+Pollers can pass ?wait=<secs> to long-poll (the request is held until a
+payload arrives or the wait expires), or open the /…-events SSE stream on
+deployments that support streaming responses (not API Gateway/Lambda).
 
 Large payloads (>300KB) are offloaded to S3 under relay/<token>.json.
 DynamoDB stores an s3_key reference instead of payload_json in that case.
+Payloads are relayed as the stored JSON text (S3 bodies are streamed), never
+parsed and re-serialized.
 """
 import os
 import json
 import time
+import asyncio
 import boto3
+from typing import AsyncIterator, Dict, Optional
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
-from boto3.dynamodb.conditions import Attr
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
+from app.core.async_io import run_blocking
+
 router = APIRouter(prefix="/relay", tags=["relay"])
 
 REGION       = os.getenv("AWS_REGION", "us-east-1")
@@ -32,9 +51,30 @@ TABLE_NAME   = "OsyleFigmaRelay-Prod"
 S3_BUCKET    = os.getenv("S3_BUCKET", "osyle-shared-assets-prod")
 TTL_SECS     = 10 * 60       # 10 minutes
 S3_THRESHOLD = 300 * 1024    # offload to S3 above 300KB
+QUEUE_INDEX  = os.getenv("FIGMA_RELAY_QUEUE_INDEX", "queue-created_at-index")
+
+# Long-poll / SSE tuning
+MAX_WAIT_SECS      = float(os.getenv("FIGMA_RELAY_MAX_WAIT_SECS", "20"))
+POLL_INTERVAL_SECS = float(os.getenv("FIGMA_RELAY_POLL_INTERVAL_SECS", "1"))
+SSE_MAX_SECS       = float(os.getenv("FIGMA_RELAY_SSE_MAX_SECS", "300"))
+SSE_HEARTBEAT_SECS = 15.0
+# How long to stay on scans before retrying a missing or backfilling queue index
+INDEX_RETRY_SECS   = float(os.getenv("FIGMA_RELAY_INDEX_RETRY_SECS", "60"))
+S3_CHUNK_SIZE      = 64 * 1024
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin":  "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
 
 _table = None
 _s3    = None
+_queue_index_failed_at: Optional[float] = None  # monotonic time of the last index failure
+
+# Wakes same-process waiters as soon as a payload is stored (other Lambda
+# instances fall back to polling the index every POLL_INTERVAL_SECS)
+_queue_events: Dict[str, asyncio.Event] = {}
 
 
 def get_table():
@@ -57,29 +97,29 @@ def get_s3():
 
 def relay_response(data: dict, status: int = 200) -> JSONResponse:
     """Return JSON with explicit wildcard CORS — required for Figma plugin origin."""
-    return JSONResponse(
-        content=data,
-        status_code=status,
-        headers={
-            "Access-Control-Allow-Origin":  "*",
-            "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type",
-        },
-    )
+    return JSONResponse(content=data, status_code=status, headers=CORS_HEADERS)
 
 
 def ttl_epoch() -> int:
     return int(time.time()) + TTL_SECS
 
 
+def queue_key(direction: str, channel: Optional[str] = None) -> str:
+    """GSI partition for pending items of one direction (and channel)."""
+    return f"{direction}#{channel}" if channel else direction
+
+
 def store_payload(token: str, body: dict, direction: str):
     """Write relay item to DynamoDB, offloading payload to S3 if >300KB."""
     payload_json = json.dumps(body)
+    queue = queue_key(direction, body.get("channel"))
     item = {
         "token": token,
         "direction": direction,
         "acked": False,
         "ttl": ttl_epoch(),
+        "queue": queue,
+        "created_at": int(time.time() * 1000),
     }
     if len(payload_json.encode()) > S3_THRESHOLD:
         s3_key = f"relay/{token}.json"
@@ -103,6 +143,150 @@ def fetch_payload_json(item: dict) -> dict:
     return json.loads(item["payload_json"])
 
 
+def notify_queue(queue: str):
+    """Wake long-poll/SSE waiters on this process for a queue."""
+    event = _queue_events.pop(queue, None)
+    if event is not None:
+        event.set()
+
+
+# ── Pending-item lookup ───────────────────────────────────────────────────────
+
+def _latest_by_scan(direction: str, channel: Optional[str] = None) -> Optional[dict]:
+    """Legacy lookup (full scan) used until the queue index exists."""
+    items = []
+    # Filter on the queue key, not just the direction, so a channel poller
+    # never sees (or acks) another channel's payload
+    kwargs = {
+        "FilterExpression": Attr("queue").eq(queue_key(direction, channel)) & Attr("acked").eq(False)
+    }
+    while True:
+        resp = get_table().scan(**kwargs)
+        items.extend(resp.get("Items", []))
+        if "LastEvaluatedKey" not in resp:
+            break
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    if not items:
+        return None
+    return max(items, key=lambda i: (i.get("created_at", 0), i.get("ttl", 0)))
+
+
+def latest_pending(direction: str, channel: Optional[str] = None) -> Optional[dict]:
+    """Newest unacked item for a direction/channel — one Query, Limit=1."""
+    global _queue_index_failed_at
+    if _queue_index_failed_at is None or time.monotonic() - _queue_index_failed_at >= INDEX_RETRY_SECS:
+        try:
+            resp = get_table().query(
+                IndexName=QUEUE_INDEX,
+                KeyConditionExpression=Key("queue").eq(queue_key(direction, channel)),
+                ScanIndexForward=False,
+                Limit=1,
+            )
+            items = resp.get("Items", [])
+            _queue_index_failed_at = None
+            return items[0] if items else None
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ValidationException":
+                raise
+            # Index not created yet or still backfilling (see
+            # infra/scripts/create_relay_table.sh); retry it after a while
+            print(f"⚠️  Figma relay index {QUEUE_INDEX} unavailable, scanning for "
+                  f"{INDEX_RETRY_SECS:.0f}s: {e}")
+            _queue_index_failed_at = time.monotonic()
+    return _latest_by_scan(direction, channel)
+
+
+async def wait_for_pending(direction: str, channel: Optional[str], wait: float) -> Optional[dict]:
+    """
+    Return the newest pending item, holding the request up to `wait` seconds.
+
+    Args:
+        direction: "o2f" or "f2o"
+        channel: Optional per-user/session queue
+        wait: Seconds to long-poll (0 = single lookup, capped at MAX_WAIT_SECS)
+
+    Returns:
+        The DynamoDB item, or None if nothing arrived in time
+    """
+    deadline = time.monotonic() + min(max(wait, 0.0), MAX_WAIT_SECS)
+    queue = queue_key(direction, channel)
+    while True:
+        item = await run_blocking(latest_pending, direction, channel)
+        remaining = deadline - time.monotonic()
+        if item is not None or remaining <= 0:
+            return item
+        event = _queue_events.setdefault(queue, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=min(POLL_INTERVAL_SECS, remaining))
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _iter_s3_body(s3_key: str) -> AsyncIterator[bytes]:
+    obj = await run_blocking(get_s3().get_object, Bucket=S3_BUCKET, Key=s3_key)
+    body = obj["Body"]
+    chunks = body.iter_chunks(chunk_size=S3_CHUNK_SIZE)
+    try:
+        while True:
+            chunk = await run_blocking(next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        body.close()
+
+
+def payload_response(item: dict) -> Response:
+    """Relay the stored payload JSON as-is (S3 bodies are streamed, not parsed)."""
+    if "s3_key" in item:
+        return StreamingResponse(
+            _iter_s3_body(item["s3_key"]),
+            media_type="application/json",
+            headers=CORS_HEADERS,
+        )
+    return Response(
+        content=item["payload_json"],
+        media_type="application/json",
+        headers=CORS_HEADERS,
+    )
+
+
+async def _read_payload_text(item: dict) -> str:
+    if "s3_key" in item:
+        return b"".join([chunk async for chunk in _iter_s3_body(item["s3_key"])]).decode()
+    return item["payload_json"]
+
+
+def pending_events(direction: str, channel: Optional[str]) -> StreamingResponse:
+    """
+    Server-sent events for one queue: a `payload` event per new pending item,
+    comment heartbeats in between. The stream closes after SSE_MAX_SECS;
+    EventSource reconnects on its own.
+    """
+    async def events():
+        deadline = time.monotonic() + SSE_MAX_SECS
+        last_token = None
+        last_beat = time.monotonic()
+        while time.monotonic() < deadline:
+            item = await wait_for_pending(direction, channel, wait=SSE_HEARTBEAT_SECS)
+            if item is not None and item["token"] != last_token:
+                last_token = item["token"]
+                payload_text = await _read_payload_text(item)
+                yield f"event: payload\nid: {last_token}\ndata: {payload_text}\n\n"
+            elif item is not None:
+                # Same item still pending (not ACKed yet) — don't spin on it
+                await asyncio.sleep(POLL_INTERVAL_SECS)
+            if time.monotonic() - last_beat >= SSE_HEARTBEAT_SECS:
+                last_beat = time.monotonic()
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={**CORS_HEADERS, "Cache-Control": "no-cache"},
+    )
+
+
 # ── CORS preflight (Figma plugin sends OPTIONS before POST) ───────────────────
 @router.options("/{rest_of_path:path}")
 async def preflight(rest_of_path: str):
@@ -127,33 +311,39 @@ async def store_o2f_payload(request: Request):
     token = body.get("token")
     if not token:
         return relay_response({"error": "Missing token"}, 400)
-    store_payload(token, body, "o2f")
+    await run_blocking(store_payload, token, body, "o2f")
+    notify_queue(queue_key("o2f", body.get("channel")))
     return relay_response({"ok": True, "token": token})
 
 
 @router.get("/figma-payload-latest")
-async def get_payload_latest():
+async def get_payload_latest(wait: float = 0, channel: Optional[str] = None):
     """Figma plugin polls for the most recent unacked Osyle→Figma payload.
-    Returns {} (not 404) when nothing is pending — avoids console noise."""
+    Returns {} (not 404) when nothing is pending — avoids console noise.
+    ?wait=<secs> long-polls; ?channel=<id> reads a per-user queue."""
     try:
-        resp = get_table().scan(
-            FilterExpression=Attr("direction").eq("o2f") & Attr("acked").eq(False)
-        )
+        item = await wait_for_pending("o2f", channel, wait)
     except ClientError as e:
         return relay_response({"error": str(e)}, 500)
-    items = resp.get("Items", [])
-    if not items:
+    if item is None:
         return relay_response({})
-    latest = max(items, key=lambda i: i.get("ttl", 0))
-    return relay_response(fetch_payload_json(latest))
+    return payload_response(item)
+
+
+@router.get("/figma-payload-events")
+async def stream_payloads(channel: Optional[str] = None):
+    """SSE alternative to polling /figma-payload-latest."""
+    return pending_events("o2f", channel)
 
 
 @router.post("/figma-ack/{token}")
 async def ack_payload(token: str):
-    """Figma plugin ACKs receipt — marks payload as consumed."""
-    get_table().update_item(
+    """Figma plugin ACKs receipt — marks payload as consumed (and dequeues it)."""
+    await run_blocking(
+        get_table().update_item,
         Key={"token": token},
-        UpdateExpression="SET acked = :t",
+        UpdateExpression="SET acked = :t REMOVE #queue",
+        ExpressionAttributeNames={"#queue": "queue"},
         ExpressionAttributeValues={":t": True},
     )
     return relay_response({"ok": True})
@@ -162,13 +352,13 @@ async def ack_payload(token: str):
 @router.get("/figma-ack/{token}")
 async def check_ack(token: str):
     """Osyle polls to confirm Figma received the payload."""
-    resp = get_table().get_item(Key={"token": token})
+    resp = await run_blocking(get_table().get_item, Key={"token": token})
     item = resp.get("Item")
     if not item or not item.get("acked"):
         return relay_response({"error": "No ACK yet"}, 404)
-    get_table().delete_item(Key={"token": token})
+    await run_blocking(get_table().delete_item, Key={"token": token})
     if "s3_key" in item:
-        get_s3().delete_object(Bucket=S3_BUCKET, Key=item["s3_key"])
+        await run_blocking(get_s3().delete_object, Bucket=S3_BUCKET, Key=item["s3_key"])
     return relay_response({"ok": True})
 
 
@@ -184,32 +374,37 @@ async def store_import_payload(request: Request):
     token = body.get("token")
     if not token:
         return relay_response({"error": "Missing token"}, 400)
-    store_payload(token, body, "f2o")
+    await run_blocking(store_payload, token, body, "f2o")
+    notify_queue(queue_key("f2o", body.get("channel")))
     return relay_response({"ok": True, "token": token})
 
 
 @router.get("/figma-import-latest")
-async def get_import_latest():
-    """Osyle polls for the most recent unacked Figma→Osyle payload."""
+async def get_import_latest(wait: float = 0, channel: Optional[str] = None):
+    """Osyle polls for the most recent unacked Figma→Osyle payload.
+    ?wait=<secs> long-polls; ?channel=<id> reads a per-user queue."""
     try:
-        resp = get_table().scan(
-            FilterExpression=Attr("direction").eq("f2o") & Attr("acked").eq(False)
-        )
+        item = await wait_for_pending("f2o", channel, wait)
     except ClientError as e:
         return relay_response({"error": str(e)}, 500)
-    items = resp.get("Items", [])
-    if not items:
+    if item is None:
         return relay_response({"error": "No pending import"}, 404)
-    latest = max(items, key=lambda i: i.get("ttl", 0))
-    return relay_response(fetch_payload_json(latest))
+    return payload_response(item)
+
+
+@router.get("/figma-import-events")
+async def stream_imports(channel: Optional[str] = None):
+    """SSE alternative to polling /figma-import-latest."""
+    return pending_events("f2o", channel)
 
 
 @router.post("/figma-import-ack/{token}")
 async def ack_import(token: str):
     """Osyle ACKs import receipt — removes from queue."""
-    resp = get_table().get_item(Key={"token": token})
-    item = resp.get("Item", {})
-    get_table().delete_item(Key={"token": token})
+    resp = await run_blocking(
+        get_table().delete_item, Key={"token": token}, ReturnValues="ALL_OLD"
+    )
+    item = resp.get("Attributes", {})
     if "s3_key" in item:
-        get_s3().delete_object(Bucket=S3_BUCKET, Key=item["s3_key"])
-    return relay_response({"ok": True})
\ No newline at end of file
+        await run_blocking(get_s3().delete_object, Bucket=S3_BUCKET, Key=item["s3_key"])
+    return relay_response({"ok": True})
@@ -60,7 +60,7 @@ def get_llm_service() -> LLMService:
 from .types import (
     # Core types
     Message, MessageRole, TextContent, ImageContent,
-    GenerationConfig, GenerationResponse, Usage,
+    GenerationConfig, GenerationResponse, Usage, StreamStats,
     
     # Configuration types
     CacheConfig, StructuredOutputConfig, ToolConfig, ReasoningConfig,
@@ -71,8 +71,8 @@ from .types import (
 
 # Providers
 from .providers import (
-    # Provider classes
-    AnthropicProvider, GoogleProvider, OpenAIProvider,
+    # Provider classes (AnthropicProvider, GoogleProvider and OpenAIProvider
+    # are loaded on first access, see __getattr__ below)
     BaseLLMProvider, ProviderFactory,
     
     # Model info
@@ -93,6 +93,13 @@ from .utils import (
     
     # Cost tracking
     CostTracker, get_tracker, set_tracker,
+    
+    # Response cache
+    ResponseCache, get_response_cache, set_response_cache,
+    
+    # Generation scheduler
+    GenerationScheduler, RequestPriority, request_context,
+    get_scheduler, set_scheduler,
 )
 
 # Exceptions
@@ -102,6 +109,16 @@ from .exceptions import (
     ContextLengthError, TimeoutError, ToolExecutionError,
 )
 
+_LAZY_PROVIDER_EXPORTS = {"AnthropicProvider", "GoogleProvider", "OpenAIProvider"}
+
+
+def __getattr__(name):
+    if name in _LAZY_PROVIDER_EXPORTS:
+        from . import providers
+        return getattr(providers, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __version__ = "1.0.0"
 
 __all__ = [
@@ -119,6 +136,7 @@ __all__ = [
     "GenerationConfig",
     "GenerationResponse",
     "Usage",
+    "StreamStats",
     "CacheConfig",
     "StructuredOutputConfig",
     "ToolConfig",
@@ -152,6 +170,14 @@ __all__ = [
     "CostTracker",
     "get_tracker",
     "set_tracker",
+    "ResponseCache",
+    "get_response_cache",
+    "set_response_cache",
+    "GenerationScheduler",
+    "RequestPriority",
+    "request_context",
+    "get_scheduler",
+    "set_scheduler",
     
     # Exceptions
     "LLMError",
@@ -12,12 +12,14 @@ class ModelPricing:
     input_per_million: float  # $/M tokens
     output_per_million: float
     cached_input_per_million: Optional[float] = None  # For prompt caching
+    cache_write_per_million: Optional[float] = None  # Defaults to the input price
     
     def calculate_cost(
         self, 
         input_tokens: int, 
         output_tokens: int,
-        cached_tokens: int = 0
+        cached_tokens: int = 0,
+        cache_write_tokens: int = 0
     ) -> float:
         """Calculate cost for a request"""
         input_cost = (input_tokens * self.input_per_million) / 1_000_000
@@ -27,7 +29,17 @@ class ModelPricing:
         if cached_tokens > 0 and self.cached_input_per_million:
             cached_cost = (cached_tokens * self.cached_input_per_million) / 1_000_000
         
+        if cache_write_tokens > 0:
+            input_cost += (cache_write_tokens * self.cache_write_rate) / 1_000_000
+        
         return input_cost + output_cost + cached_cost
+    
+    @property
+    def cache_write_rate(self) -> float:
+        """$/M tokens for prompt cache writes"""
+        if self.cache_write_per_million is not None:
+            return self.cache_write_per_million
+        return self.input_per_million
 
 
 @dataclass
@@ -70,6 +82,7 @@ class LLMConfig:
     enable_fallbacks: bool = True
     enable_cost_tracking: bool = True
     enable_observability: bool = True
+    enable_response_cache: bool = False  # Content-addressed cache of full responses
     
     # Observability
     log_prompts: bool = False  # Set True for debugging
@@ -81,6 +94,7 @@ class LLMConfig:
         return cls(
             default_model=os.getenv("DEFAULT_LLM_MODEL", "claude-sonnet-4.5"),
             enable_caching=os.getenv("LLM_ENABLE_CACHING", "true").lower() == "true",
+            enable_response_cache=os.getenv("LLM_ENABLE_RESPONSE_CACHE", "false").lower() == "true",
             log_prompts=os.getenv("LLM_LOG_PROMPTS", "false").lower() == "true",
             log_responses=os.getenv("LLM_LOG_RESPONSES", "false").lower() == "true",
         )
@@ -89,9 +103,9 @@ class LLMConfig:
 # Model pricing registry (as of Feb 2026)
 MODEL_PRICING: Dict[str, ModelPricing] = {
     # Anthropic Claude 4.5
-    "claude-opus-4.5": ModelPricing(5.00, 25.00, 0.50),
-    "claude-sonnet-4.5": ModelPricing(3.00, 15.00, 0.30),
-    "claude-haiku-4.5": ModelPricing(1.00, 5.00, 0.10),
+    "claude-opus-4.5": ModelPricing(5.00, 25.00, 0.50, 6.25),
+    "claude-sonnet-4.5": ModelPricing(3.00, 15.00, 0.30, 3.75),
+    "claude-haiku-4.5": ModelPricing(1.00, 5.00, 0.10, 1.25),
     
     # Google Gemini 3
     "gemini-3-pro": ModelPricing(2.00, 12.00, 0.20),
@@ -2,10 +2,9 @@
 LLM Providers Package
 Multi-provider abstraction layer for Claude, Gemini, and OpenAI
 """
+import importlib
+
 from .base import BaseLLMProvider
-from .anthropic import AnthropicProvider, CLAUDE_MODELS
-from .google import GoogleProvider, GEMINI_MODELS
-from .openai import OpenAIProvider, OPENAI_MODELS
 from .registry import (
     MODEL_REGISTRY, ModelInfo,
     get_model_info, list_models,
@@ -14,6 +13,23 @@ from .registry import (
 )
 from .factory import ProviderFactory, get_factory, set_factory
 
+# Provider classes and their model tables import the provider SDKs, so they
+# are loaded on first access (see factory.get_provider_class)
+_LAZY_EXPORTS = {
+    "AnthropicProvider": ".anthropic",
+    "CLAUDE_MODELS": ".anthropic",
+    "GoogleProvider": ".google",
+    "GEMINI_MODELS": ".google",
+    "OpenAIProvider": ".openai",
+    "OPENAI_MODELS": ".openai",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     # Base
     "BaseLLMProvider",
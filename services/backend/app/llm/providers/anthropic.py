@@ -9,11 +9,15 @@ from anthropic.types import Message as AnthropicMessage
 from .base import BaseLLMProvider
 from ..types import (
     GenerationConfig, GenerationResponse, Message, MessageRole,
-    Usage, Provider, TextContent, ImageContent
+    Usage, Provider, TextContent, ImageContent, StreamStats
 )
 from ..config import get_model_pricing
 
 
+# Claude rejects requests with more cache_control blocks than this
+MAX_CACHE_BREAKPOINTS = 4
+
+
 # Claude 4.5 model registry
 CLAUDE_MODELS = {
     "claude-haiku-4.5": {
@@ -95,7 +99,18 @@ class AnthropicProvider(BaseLLMProvider):
         return pricing.calculate_cost(
             usage.input_tokens,
             usage.output_tokens,
-            usage.cached_tokens
+            usage.cached_tokens,
+            usage.cache_write_tokens
+        )
+    
+    @staticmethod
+    def _extract_usage(usage: Any) -> Usage:
+        """Convert Claude usage (input_tokens already excludes cache reads/writes)"""
+        return Usage(
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cached_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
         )
     
     def _prepare_messages(
@@ -106,17 +121,32 @@ class AnthropicProvider(BaseLLMProvider):
         """
         Convert messages to Claude format
         
+        Blocks flagged with cache_breakpoint get cache_control, as does the
+        system prompt when cache_config is enabled. Claude accepts at most
+        MAX_CACHE_BREAKPOINTS per request; extra ones are dropped from the
+        front, since later breakpoints cover the longer prefixes.
+        
         Returns:
             (system_prompt, messages_list)
         """
         system_prompt = None
         claude_messages = []
+        breakpoints: List[Dict[str, Any]] = []
+        cache_system = bool(config.cache_config and config.cache_config.enabled)
+        
+        def mark(block: Dict[str, Any]) -> Dict[str, Any]:
+            block["cache_control"] = {"type": "ephemeral"}
+            breakpoints.append(block)
+            return block
         
         for msg in messages:
             if msg.role == MessageRole.SYSTEM:
                 # Extract system prompt
                 if isinstance(msg.content, str):
-                    system_prompt = msg.content
+                    if cache_system:
+                        system_prompt = [mark({"type": "text", "text": msg.content})]
+                    else:
+                        system_prompt = msg.content
                 else:
                     # System content with caching
                     system_blocks = []
@@ -124,8 +154,8 @@ class AnthropicProvider(BaseLLMProvider):
                         if isinstance(block, TextContent):
                             text_block = {"type": "text", "text": block.text}
                             # Apply cache control if enabled
-                            if config.cache_config and config.cache_config.enabled:
-                                text_block["cache_control"] = {"type": "ephemeral"}
+                            if cache_system or block.cache_breakpoint:
+                                mark(text_block)
                             system_blocks.append(text_block)
                     system_prompt = system_blocks
             else:
@@ -137,22 +167,30 @@ class AnthropicProvider(BaseLLMProvider):
                 else:
                     for block in msg.content:
                         if isinstance(block, TextContent):
-                            content_blocks.append({"type": "text", "text": block.text})
+                            content_block = {"type": "text", "text": block.text}
                         elif isinstance(block, ImageContent):
-                            content_blocks.append({
+                            content_block = {
                                 "type": "image",
                                 "source": {
                                     "type": "base64",
                                     "media_type": block.media_type,
                                     "data": block.data
                                 }
-                            })
+                            }
+                        else:
+                            continue
+                        if block.cache_breakpoint:
+                            mark(content_block)
+                        content_blocks.append(content_block)
                 
                 claude_messages.append({
                     "role": msg.role.value,
                     "content": content_blocks
                 })
         
+        for block in breakpoints[:-MAX_CACHE_BREAKPOINTS]:
+            del block["cache_control"]
+        
         return system_prompt, claude_messages
     
     def _build_request_kwargs(
@@ -238,11 +276,7 @@ class AnthropicProvider(BaseLLMProvider):
                     text_content += block.text
             
             # Extract usage
-            usage = Usage(
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens,
-                cached_tokens=getattr(response.usage, "cache_read_input_tokens", 0),
-            )
+            usage = self._extract_usage(response.usage)
             
             # Extract structured output if applicable
             structured_output = None
@@ -283,6 +317,7 @@ class AnthropicProvider(BaseLLMProvider):
         self,
         messages: List[Message],
         config: GenerationConfig,
+        stats: Optional[StreamStats] = None,
     ) -> AsyncGenerator[str, None]:
         """Stream completion from Claude"""
         try:
@@ -298,8 +333,18 @@ class AnthropicProvider(BaseLLMProvider):
             
             # Stream response
             async with self.async_client.messages.stream(**request_kwargs) as stream:
-                async for text_chunk in stream.text_stream:
-                    yield text_chunk
+                async for event in stream:
+                    if event.type == "text":
+                        yield event.text
+                    elif event.type == "message_start" and stats is not None:
+                        # The prompt (and any cache write) is processed by now
+                        stats.mark_response_started()
+                
+                # Final message carries the authoritative token counts
+                if stats is not None:
+                    final_message = await stream.get_final_message()
+                    stats.usage = self._extract_usage(final_message.usage)
+                    stats.finish_reason = final_message.stop_reason
             
         except Exception as e:
             raise self._handle_provider_error(e)
@@ -333,11 +378,7 @@ class AnthropicProvider(BaseLLMProvider):
                     text_content += block.text
             
             # Extract usage
-            usage = Usage(
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens,
-                cached_tokens=getattr(response.usage, "cache_read_input_tokens", 0),
-            )
+            usage = self._extract_usage(response.usage)
             
             # Extract structured output if applicable
             structured_output = None
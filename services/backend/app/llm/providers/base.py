@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 from typing import AsyncGenerator, Optional, Dict, Any
 from ..types import (
     GenerationConfig, GenerationResponse, Message, 
-    UserMessage, Usage, Provider
+    UserMessage, Usage, Provider, StreamStats
 )
 from ..exceptions import ProviderError
 
@@ -78,6 +78,7 @@ class BaseLLMProvider(ABC):
         self,
         messages: list[Message],
         config: GenerationConfig,
+        stats: Optional[StreamStats] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Stream completion from messages
@@ -85,6 +86,8 @@ class BaseLLMProvider(ABC):
         Args:
             messages: List of conversation messages
             config: Generation configuration
+            stats: Optional record; usage and finish_reason are filled in
+                once the provider reports them at the end of the stream
             
         Yields:
             Text chunks as they arrive
@@ -1,17 +1,43 @@
 """
 Provider factory for creating appropriate LLM provider instances
 """
-from typing import Optional, Dict
+import importlib
+from typing import Optional, Dict, Type
 from .base import BaseLLMProvider
-from .anthropic import AnthropicProvider
-from .google import GoogleProvider
-from .openai import OpenAIProvider
 from .registry import MODEL_REGISTRY, get_model_info
 from ..types import Provider
 from ..config import get_config
 from ..exceptions import ModelNotFoundError
 
 
+# Provider modules import their SDKs (anthropic, google.generativeai, openai),
+# which dominate cold-start time, so each is imported when first needed
+PROVIDER_CLASSES: Dict[Provider, tuple] = {
+    Provider.ANTHROPIC: (".anthropic", "AnthropicProvider"),
+    Provider.GOOGLE: (".google", "GoogleProvider"),
+    Provider.OPENAI: (".openai", "OpenAIProvider"),
+}
+
+
+def get_provider_class(provider: Provider) -> Type[BaseLLMProvider]:
+    """
+    Import and return the provider class for a provider type
+    
+    Args:
+        provider: Provider enum value
+        
+    Returns:
+        Provider class (its SDK is imported on the first call)
+        
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    if provider not in PROVIDER_CLASSES:
+        raise ValueError(f"Unknown provider: {provider}")
+    module_name, class_name = PROVIDER_CLASSES[provider]
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
 class ProviderFactory:
     """
     Factory for creating and caching LLM provider instances
@@ -76,7 +102,7 @@ class ProviderFactory:
                     "ANTHROPIC_API_KEY required for Claude models. "
                     "Set in environment or pass to ProviderFactory."
                 )
-            provider = AnthropicProvider(self.anthropic_api_key)
+            provider = get_provider_class(provider_type)(self.anthropic_api_key)
         
         elif provider_type == Provider.GOOGLE:
             if not self.google_api_key:
@@ -84,7 +110,7 @@ class ProviderFactory:
                     "GOOGLE_API_KEY required for Gemini models. "
                     "Set in environment or pass to ProviderFactory."
                 )
-            provider = GoogleProvider(self.google_api_key)
+            provider = get_provider_class(provider_type)(self.google_api_key)
         
         elif provider_type == Provider.OPENAI:
             if not self.openai_api_key:
@@ -92,7 +118,7 @@ class ProviderFactory:
                     "OPENAI_API_KEY required for OpenAI models. "
                     "Set in environment or pass to ProviderFactory."
                 )
-            provider = OpenAIProvider(self.openai_api_key)
+            provider = get_provider_class(provider_type)(self.openai_api_key)
         
         else:
             raise ValueError(f"Unknown provider: {provider_type}")
@@ -121,15 +147,15 @@ class ProviderFactory:
         if provider == Provider.ANTHROPIC:
             if not self.anthropic_api_key:
                 raise ValueError("ANTHROPIC_API_KEY required")
-            instance = AnthropicProvider(self.anthropic_api_key)
+            instance = get_provider_class(provider)(self.anthropic_api_key)
         elif provider == Provider.GOOGLE:
             if not self.google_api_key:
                 raise ValueError("GOOGLE_API_KEY required")
-            instance = GoogleProvider(self.google_api_key)
+            instance = get_provider_class(provider)(self.google_api_key)
         elif provider == Provider.OPENAI:
             if not self.openai_api_key:
                 raise ValueError("OPENAI_API_KEY required")
-            instance = OpenAIProvider(self.openai_api_key)
+            instance = get_provider_class(provider)(self.openai_api_key)
         else:
             raise ValueError(f"Unknown provider: {provider}")
         
@@ -8,7 +8,7 @@ import google.generativeai as genai
 from .base import BaseLLMProvider
 from ..types import (
     GenerationConfig, GenerationResponse, Message, MessageRole,
-    Usage, Provider, TextContent, ImageContent
+    Usage, Provider, TextContent, ImageContent, StreamStats
 )
 from ..config import get_model_pricing
 
@@ -154,6 +154,23 @@ class GoogleProvider(BaseLLMProvider):
         
         return gen_config
     
+    @staticmethod
+    def _extract_usage(usage_metadata: Any) -> Usage:
+        """
+        Convert Gemini usage metadata to our Usage
+        
+        Gemini counts cached tokens inside prompt_token_count; they are split
+        out so input_tokens is only the uncached part (as with Claude).
+        """
+        if usage_metadata is None:
+            return Usage()
+        cached_tokens = getattr(usage_metadata, 'cached_content_token_count', 0) or 0
+        return Usage(
+            input_tokens=(getattr(usage_metadata, 'prompt_token_count', 0) or 0) - cached_tokens,
+            output_tokens=getattr(usage_metadata, 'candidates_token_count', 0) or 0,
+            cached_tokens=cached_tokens,
+        )
+    
     def _prepare_messages(
         self,
         messages: List[Message],
@@ -250,11 +267,7 @@ class GoogleProvider(BaseLLMProvider):
             
             # Extract usage (Gemini provides token counts)
             usage_metadata = getattr(response, 'usage_metadata', None)
-            usage = Usage(
-                input_tokens=getattr(usage_metadata, 'prompt_token_count', 0) if usage_metadata else 0,
-                output_tokens=getattr(usage_metadata, 'candidates_token_count', 0) if usage_metadata else 0,
-                cached_tokens=getattr(usage_metadata, 'cached_content_token_count', 0) if usage_metadata else 0,
-            )
+            usage = self._extract_usage(usage_metadata)
             
             # Extract structured output if applicable
             structured_output = None
@@ -322,6 +335,7 @@ class GoogleProvider(BaseLLMProvider):
         self,
         messages: List[Message],
         config: GenerationConfig,
+        stats: Optional[StreamStats] = None,
     ) -> AsyncGenerator[str, None]:
         """Stream completion from Gemini"""
         try:
@@ -356,9 +370,23 @@ class GoogleProvider(BaseLLMProvider):
                 stream=True
             )
             
+            usage_metadata = None
             async for chunk in response:
+                if stats is not None:
+                    stats.mark_response_started()
                 if hasattr(chunk, 'text') and chunk.text:
                     yield chunk.text
+                
+                # Usage counts are cumulative; the last chunk has the totals
+                if getattr(chunk, 'usage_metadata', None):
+                    usage_metadata = chunk.usage_metadata
+                if stats is not None and getattr(chunk, 'candidates', None):
+                    finish_reason = getattr(chunk.candidates[0], 'finish_reason', None)
+                    if finish_reason:
+                        stats.finish_reason = getattr(finish_reason, 'name', str(finish_reason))
+            
+            if stats is not None and usage_metadata is not None:
+                stats.usage = self._extract_usage(usage_metadata)
             
         except Exception as e:
             raise self._handle_provider_error(e)
@@ -403,11 +431,7 @@ class GoogleProvider(BaseLLMProvider):
             
             # Extract usage
             usage_metadata = getattr(response, 'usage_metadata', None)
-            usage = Usage(
-                input_tokens=getattr(usage_metadata, 'prompt_token_count', 0) if usage_metadata else 0,
-                output_tokens=getattr(usage_metadata, 'candidates_token_count', 0) if usage_metadata else 0,
-                cached_tokens=getattr(usage_metadata, 'cached_content_token_count', 0) if usage_metadata else 0,
-            )
+            usage = self._extract_usage(usage_metadata)
             
             # Extract structured output if applicable
             structured_output = None
@@ -8,7 +8,7 @@ from openai import OpenAI, AsyncOpenAI
 from .base import BaseLLMProvider
 from ..types import (
     GenerationConfig, GenerationResponse, Message, MessageRole,
-    Usage, Provider, TextContent, ImageContent
+    Usage, Provider, TextContent, ImageContent, StreamStats
 )
 from ..config import get_model_pricing
 
@@ -169,6 +169,24 @@ class OpenAIProvider(BaseLLMProvider):
         
         return openai_messages
     
+    @staticmethod
+    def _extract_usage(usage: Any) -> Usage:
+        """
+        Convert OpenAI usage to our Usage
+        
+        OpenAI counts cached tokens inside prompt_tokens; they are split out
+        so input_tokens is only the uncached part (as with Claude).
+        """
+        prompt_details = getattr(usage, "prompt_tokens_details", None)
+        completion_details = getattr(usage, "completion_tokens_details", None)
+        cached_tokens = getattr(prompt_details, "cached_tokens", 0) or 0
+        return Usage(
+            input_tokens=usage.prompt_tokens - cached_tokens,
+            output_tokens=usage.completion_tokens,
+            cached_tokens=cached_tokens,
+            reasoning_tokens=getattr(completion_details, "reasoning_tokens", 0) or 0,
+        )
+    
     def _build_request_kwargs(
         self,
         messages: List[Dict[str, Any]],
@@ -246,12 +264,7 @@ class OpenAIProvider(BaseLLMProvider):
             text_content = message.content or ""
             
             # Extract usage
-            usage = Usage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                cached_tokens=getattr(response.usage, "prompt_tokens_details", {}).get("cached_tokens", 0),
-                reasoning_tokens=getattr(response.usage, "completion_tokens_details", {}).get("reasoning_tokens", 0),
-            )
+            usage = self._extract_usage(response.usage)
             
             # Extract structured output if applicable
             structured_output = None
@@ -292,6 +305,7 @@ class OpenAIProvider(BaseLLMProvider):
         self,
         messages: List[Message],
         config: GenerationConfig,
+        stats: Optional[StreamStats] = None,
     ) -> AsyncGenerator[str, None]:
         """Stream completion from OpenAI"""
         try:
@@ -303,13 +317,24 @@ class OpenAIProvider(BaseLLMProvider):
             # Build request
             request_kwargs = self._build_request_kwargs(openai_messages, config)
             request_kwargs["stream"] = True
+            # Ask for a final usage chunk (it arrives with an empty choices list)
+            request_kwargs["stream_options"] = {"include_usage": True}
             
             # Stream response
             stream = await self.async_client.chat.completions.create(**request_kwargs)
             
             async for chunk in stream:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                if stats is not None:
+                    stats.mark_response_started()
+                if chunk.choices:
+                    choice = chunk.choices[0]
+                    if choice.delta.content:
+                        yield choice.delta.content
+                    if stats is not None and choice.finish_reason:
+                        stats.finish_reason = choice.finish_reason
+                
+                if stats is not None and getattr(chunk, "usage", None):
+                    stats.usage = self._extract_usage(chunk.usage)
             
         except Exception as e:
             raise self._handle_provider_error(e)
@@ -337,12 +362,7 @@ class OpenAIProvider(BaseLLMProvider):
             text_content = message.content or ""
             
             # Extract usage
-            usage = Usage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                cached_tokens=getattr(response.usage, "prompt_tokens_details", {}).get("cached_tokens", 0),
-                reasoning_tokens=getattr(response.usage, "completion_tokens_details", {}).get("reasoning_tokens", 0),
-            )
+            usage = self._extract_usage(response.usage)
             
             # Extract structured output if applicable
             structured_output = None
@@ -3,15 +3,19 @@ High-level LLM service API
 Main interface for applications to interact with LLMs
 """
 from typing import Optional, List, AsyncGenerator, Dict, Any
+import asyncio
 import logging
+import time
 
 from .types import (
     GenerationConfig, GenerationResponse, Message, MessageRole,
     TextContent, ImageContent, CacheConfig, StructuredOutputConfig,
-    ToolConfig, ReasoningConfig
+    ToolConfig, ReasoningConfig, StreamStats
 )
 from .providers import ProviderFactory, get_recommended_models
 from .utils import RetryConfig, with_retry, with_retry_stream, get_tracker
+from .utils.cache import ResponseCache, make_cache_key, get_response_cache
+from .utils.scheduler import GenerationScheduler, get_scheduler
 from .config import get_config
 from .exceptions import ModelNotFoundError
 
@@ -27,6 +31,8 @@ class LLMService:
     - Retry logic with exponential backoff
     - Cost tracking
     - Prompt caching support
+    - Opt-in response caching (identical requests skip the provider)
+    - Per-provider/model admission control (priority + fair queuing)
     - Structured outputs
     - Tool use
     - Reasoning models
@@ -60,6 +66,9 @@ class LLMService:
         enable_cost_tracking: bool = True,
         enable_retries: bool = True,
         retry_config: Optional[RetryConfig] = None,
+        enable_response_cache: Optional[bool] = None,
+        response_cache: Optional[ResponseCache] = None,
+        scheduler: Optional[GenerationScheduler] = None,
     ):
         """
         Initialize LLM service
@@ -71,6 +80,11 @@ class LLMService:
             enable_cost_tracking: Whether to track costs
             enable_retries: Whether to retry failed requests
             retry_config: Custom retry configuration
+            enable_response_cache: Serve identical requests from the response
+                cache (defaults to LLM_ENABLE_RESPONSE_CACHE)
+            response_cache: Cache instance to use (defaults to the global cache)
+            scheduler: Admission scheduler (defaults to the global scheduler,
+                shared by every LLMService in the process)
         """
         self.factory = ProviderFactory(
             anthropic_api_key=anthropic_api_key,
@@ -87,6 +101,15 @@ class LLMService:
             self.cost_tracker = get_tracker()
         else:
             self.cost_tracker = None
+        
+        if enable_response_cache is None:
+            enable_response_cache = self.config.enable_response_cache
+        if enable_response_cache:
+            self.response_cache = response_cache or get_response_cache()
+        else:
+            self.response_cache = None
+        
+        self.scheduler = scheduler or get_scheduler()
     
     async def generate(
         self,
@@ -98,6 +121,8 @@ class LLMService:
         structured_output_schema: Optional[Dict[str, Any]] = None,
         tools: Optional[List[Dict[str, Any]]] = None,
         reasoning_effort: Optional[str] = None,  # "low", "medium", "high"
+        use_cache: bool = True,
+        cache_ttl: Optional[int] = None,
         **kwargs
     ) -> GenerationResponse:
         """
@@ -112,6 +137,8 @@ class LLMService:
             structured_output_schema: Optional JSON schema for structured output
             tools: Optional list of tools for function calling
             reasoning_effort: For o-series models: "low", "medium", or "high"
+            use_cache: Set False to bypass the response cache for this call
+            cache_ttl: Override the response cache TTL (seconds) for this entry
             **kwargs: Additional provider-specific parameters
             
         Returns:
@@ -151,23 +178,41 @@ class LLMService:
                 effort=reasoning_effort
             )
         
+        # Serve byte-identical requests from the response cache
+        cache_key = None
+        if self.response_cache is not None and use_cache:
+            cache_key = make_cache_key(messages, config)
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                if self.cost_tracker:
+                    self.cost_tracker.track_cache_hit(cached)
+                logger.debug(f"Response cache hit: {cache_key[:12]} ({model})")
+                return cached
+            if self.cost_tracker:
+                self.cost_tracker.track_cache_miss()
+        
         # Get provider
         provider = self.factory.get_provider_for_model(model)
+        provider_name = provider.provider_name.value
+        
+        # Each attempt waits for a scheduler slot, so retry backoff doesn't hold one
+        async def _scheduled_generate():
+            async with self.scheduler.slot(provider_name, model):
+                return await provider.generate(messages, config)
         
         # Generate with retry if enabled
         if self.enable_retries:
-            @with_retry(self.retry_config)
-            async def _generate():
-                return await provider.generate(messages, config)
-            
-            response = await _generate()
+            response = await with_retry(self.retry_config)(_scheduled_generate)()
         else:
-            response = await provider.generate(messages, config)
+            response = await _scheduled_generate()
         
         # Track cost if enabled
         if self.cost_tracker:
             self.cost_tracker.track_request(response)
         
+        if cache_key is not None:
+            await asyncio.to_thread(self.response_cache.put, cache_key, response, cache_ttl)
+        
         # Log if configured
         if self.config.log_prompts:
             logger.debug(f"Prompt: {messages}")
@@ -184,11 +229,15 @@ class LLMService:
         temperature: float = 1.0,
         enable_caching: bool = False,
         thinking_budget: int = 0,  # NEW: extended thinking token budget (0 = disabled)
+        stream_stats: Optional[StreamStats] = None,
         **kwargs
     ) -> AsyncGenerator[str, None]:
         """
         Stream completion from messages
         
+        Completed streams are tracked in the cost tracker with their usage,
+        time to first token and output tokens/second.
+        
         Args:
             model: Model to use
             messages: List of conversation messages
@@ -196,6 +245,7 @@ class LLMService:
             temperature: Sampling temperature
             enable_caching: Enable prompt caching
             thinking_budget: If > 0, enable extended thinking with this token budget
+            stream_stats: Optional StreamStats to fill in (read it once the stream is exhausted)
             **kwargs: Additional parameters
             
         Yields:
@@ -222,19 +272,38 @@ class LLMService:
         
         # Get provider
         provider = self.factory.get_provider_for_model(model)
+        provider_name = provider.provider_name.value
+        
+        stats = stream_stats if stream_stats is not None else StreamStats(model=model)
+        stats.model = model
+        stats.queued_at = time.perf_counter()
+        
+        # The scheduler slot is held until the stream finishes (or is closed)
+        async def _scheduled_stream():
+            async with self.scheduler.slot(provider_name, model):
+                # A retry restarts the clock; slot waits show up in queue_seconds
+                stats.started_at = time.perf_counter()
+                stats.response_started_at = None
+                stats.first_token_at = None
+                stats.chunks = 0
+                async for chunk in provider.generate_stream(messages, config, stats):
+                    if stats.first_token_at is None:
+                        stats.first_token_at = time.perf_counter()
+                    stats.chunks += 1
+                    yield chunk
+                stats.finished_at = time.perf_counter()
+                stats.completed = True
         
         # Stream with retry if enabled (using stream-specific retry decorator)
         if self.enable_retries:
-            @with_retry_stream(self.retry_config)
-            async def _stream():
-                async for chunk in provider.generate_stream(messages, config):
-                    yield chunk
-            
-            async for chunk in _stream():
+            async for chunk in with_retry_stream(self.retry_config)(_scheduled_stream)():
                 yield chunk
         else:
-            async for chunk in provider.generate_stream(messages, config):
+            async for chunk in _scheduled_stream():
                 yield chunk
+        
+        if stats.completed and self.cost_tracker:
+            self.cost_tracker.track_stream(stats)
     
     def generate_sync(
         self,
@@ -324,6 +393,16 @@ class LLMService:
             return {"error": "Cost tracking not enabled"}
         return self.cost_tracker.get_stats()
     
+    def get_stream_stats(self) -> dict:
+        """Get time-to-first-token and throughput per model for streamed requests"""
+        if not self.cost_tracker:
+            return {}
+        return self.cost_tracker.get_stream_stats()
+    
+    def get_scheduler_stats(self) -> dict:
+        """Get queue depth and wait-time metrics per provider/model lane"""
+        return self.scheduler.get_stats()
+    
     def print_cost_summary(self):
         """Print cost tracking summary"""
         if not self.cost_tracker:
@@ -4,6 +4,7 @@ Core type definitions for LLM infrastructure
 from typing import Dict, Any, List, Optional, Union, Literal, TypedDict, Callable
 from dataclasses import dataclass, field
 from enum import Enum
+import time
 
 
 class Provider(str, Enum):
@@ -26,12 +27,14 @@ class ImageContent:
     data: str  # Base64 encoded
     media_type: str = "image/png"
     detail: Optional[Literal["low", "medium", "high"]] = None  # For Gemini
+    cache_breakpoint: bool = False  # End a cacheable prompt prefix after this block
 
 
 @dataclass
 class TextContent:
     """Text content block"""
     text: str
+    cache_breakpoint: bool = False  # End a cacheable prompt prefix after this block
 
 
 @dataclass
@@ -100,15 +103,33 @@ class GenerationConfig:
 
 @dataclass
 class Usage:
-    """Token usage information"""
+    """
+    Token usage information
+    
+    Prompt tokens are split three ways: input_tokens are processed from
+    scratch, cached_tokens are read from the prompt cache and
+    cache_write_tokens are written to it (Anthropic only).
+    """
     input_tokens: int = 0
     output_tokens: int = 0
     cached_tokens: int = 0
     reasoning_tokens: int = 0  # For o-series models
+    cache_write_tokens: int = 0
     
     @property
     def total_tokens(self) -> int:
         return self.input_tokens + self.output_tokens
+    
+    @property
+    def prompt_tokens(self) -> int:
+        """All prompt tokens, cached or not"""
+        return self.input_tokens + self.cached_tokens + self.cache_write_tokens
+    
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Fraction of prompt tokens served from the prompt cache"""
+        prompt_tokens = self.prompt_tokens
+        return self.cached_tokens / prompt_tokens if prompt_tokens else 0.0
 
 
 @dataclass
@@ -121,6 +142,109 @@ class GenerationResponse:
     structured_output: Optional[Dict[str, Any]] = None
     tool_calls: Optional[List[Dict[str, Any]]] = None
     raw_response: Optional[Any] = None  # For debugging
+    from_cache: bool = False  # Served from the response cache (no provider call)
+
+
+@dataclass
+class StreamStats:
+    """
+    Usage and timing for one streamed generation
+
+    Providers fill in usage and finish_reason when the stream ends; the
+    service fills in the timestamps (time.perf_counter values).
+    """
+    model: str
+    usage: Usage = field(default_factory=Usage)
+    finish_reason: Optional[str] = None
+    queued_at: Optional[float] = None  # Stream requested (before the scheduler slot)
+    started_at: Optional[float] = None  # Request sent to the provider
+    response_started_at: Optional[float] = None  # Provider began responding (prompt processed)
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    chunks: int = 0
+    completed: bool = False  # False if the stream failed or was closed early
+    on_response_start: Optional[Callable[[], None]] = field(default=None, repr=False)
+
+    def mark_response_started(self) -> None:
+        """Record that the response began (providers call this before any text)"""
+        if self.response_started_at is None:
+            self.response_started_at = time.perf_counter()
+            if self.on_response_start is not None:
+                self.on_response_start()
+
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        """Time spent waiting for a scheduler slot"""
+        if self.queued_at is None or self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    @property
+    def prefill_seconds(self) -> Optional[float]:
+        """Provider request to response start (shrinks with prompt cache hits)"""
+        if self.started_at is None or self.response_started_at is None:
+            return None
+        return self.response_started_at - self.started_at
+
+    @property
+    def ttft_seconds(self) -> Optional[float]:
+        """Time to first token, measured from the provider request"""
+        if self.started_at is None or self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        """Provider request to last token"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def generation_seconds(self) -> Optional[float]:
+        """First to last token (the decode phase)"""
+        if self.first_token_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.first_token_at
+
+    @property
+    def output_tokens_per_second(self) -> Optional[float]:
+        """Decode throughput (output tokens over the decode phase)"""
+        seconds = self.generation_seconds
+        if not seconds or not self.usage.output_tokens:
+            return None
+        return self.usage.output_tokens / seconds
+
+    def summary(self) -> str:
+        """One-line human-readable timing summary for logs"""
+        ttft = self.ttft_seconds
+        tps = self.output_tokens_per_second
+        return (
+            f"TTFT {ttft:.2f}s, " if ttft is not None else "TTFT n/a, "
+        ) + (
+            f"{self.usage.output_tokens:,} output tokens"
+            + (f" @ {tps:.0f} tok/s" if tps else "")
+            + f", {self.usage.cache_hit_ratio:.0%} of input from cache"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-friendly dict"""
+        return {
+            "model": self.model,
+            "input_tokens": self.usage.input_tokens,
+            "output_tokens": self.usage.output_tokens,
+            "cached_tokens": self.usage.cached_tokens,
+            "cache_write_tokens": self.usage.cache_write_tokens,
+            "cache_hit_ratio": self.usage.cache_hit_ratio,
+            "finish_reason": self.finish_reason,
+            "queue_seconds": self.queue_seconds,
+            "prefill_seconds": self.prefill_seconds,
+            "ttft_seconds": self.ttft_seconds,
+            "duration_seconds": self.duration_seconds,
+            "output_tokens_per_second": self.output_tokens_per_second,
+            "chunks": self.chunks,
+            "completed": self.completed,
+        }
 
 
 @dataclass
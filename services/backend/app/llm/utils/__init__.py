@@ -2,7 +2,22 @@
 Utility modules for LLM infrastructure
 """
 from .retry import RetryConfig, with_retry, with_retry_sync, with_retry_stream, retry_with_config
-from .cost import CostTracker, RequestCost, get_tracker, set_tracker
+from .cost import CostTracker, RequestCost, UsageAggregate, StreamAggregate, get_tracker, set_tracker
+from .ledger import CostLedger, ledger_from_env
+from .cache import (
+    ResponseCache, DiskCacheBackend, S3CacheBackend,
+    make_cache_key, get_response_cache, set_response_cache
+)
+from .scheduler import (
+    GenerationScheduler, SchedulerLane, TokenBucket, RequestPriority,
+    request_context, get_request_priority, get_request_tenant,
+    get_scheduler, set_scheduler
+)
+from .images import (
+    PreparedImage, ImageProfile, ImageUsage, IMAGE_PROFILES, BILLING_PROFILES,
+    prepare_image, shared_image, get_prepared_image, get_image_profile,
+    estimate_image_tokens, track_image_usage
+)
 
 __all__ = [
     # Retry
@@ -15,6 +30,42 @@ __all__ = [
     # Cost tracking
     "CostTracker",
     "RequestCost",
+    "UsageAggregate",
+    "StreamAggregate",
+    "CostLedger",
+    "ledger_from_env",
     "get_tracker",
     "set_tracker",
+    
+    # Response cache
+    "ResponseCache",
+    "DiskCacheBackend",
+    "S3CacheBackend",
+    "make_cache_key",
+    "get_response_cache",
+    "set_response_cache",
+    
+    # Generation scheduler
+    "GenerationScheduler",
+    "SchedulerLane",
+    "TokenBucket",
+    "RequestPriority",
+    "request_context",
+    "get_request_priority",
+    "get_request_tenant",
+    "get_scheduler",
+    "set_scheduler",
+    
+    # Prepared images
+    "PreparedImage",
+    "ImageProfile",
+    "ImageUsage",
+    "IMAGE_PROFILES",
+    "BILLING_PROFILES",
+    "prepare_image",
+    "shared_image",
+    "get_prepared_image",
+    "get_image_profile",
+    "estimate_image_tokens",
+    "track_image_usage",
 ]
\ No newline at end of file
@@ -0,0 +1,361 @@
+"""
+Content-addressed response cache for LLM requests
+
+Responses are keyed by a canonical SHA-256 of everything that can change the
+model's output (model, messages, images, generation config). Lookups hit an
+in-process LRU first and fall back to an optional persistent tier (local disk
+or S3), so re-running identical requests - e.g. re-extracting an unchanged
+resource - costs nothing and returns in milliseconds.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..types import GenerationConfig, GenerationResponse, ImageContent, Message, Usage
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the key layout or stored payload format changes
+CACHE_KEY_VERSION = 1
+
+# Config fields that affect transport only, never the generated content
+_NON_SEMANTIC_CONFIG_FIELDS = ("stream", "timeout")
+
+# Content block fields that are prompt-cache hints, never the generated content
+_NON_SEMANTIC_BLOCK_FIELDS = ("cache_breakpoint",)
+
+
+# ============================================================================
+# KEYING
+# ============================================================================
+
+def _canonicalize(value: Any) -> Any:
+    """Convert messages/config into plain JSON-serializable structures"""
+    if isinstance(value, ImageContent):
+        # Hash image payloads instead of embedding megabytes of base64
+        return {
+            "type": "image",
+            "sha256": hashlib.sha256(value.data.encode("utf-8")).hexdigest(),
+            "media_type": value.media_type,
+            "detail": value.detail,
+        }
+    if is_dataclass(value) and not isinstance(value, type):
+        return {
+            "type": type(value).__name__,
+            **{
+                k: _canonicalize(v) for k, v in value.__dict__.items()
+                if k not in _NON_SEMANTIC_BLOCK_FIELDS
+            },
+        }
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    return value
+
+
+def make_cache_key(messages: List[Message], config: GenerationConfig) -> str:
+    """
+    Build a content-addressed key for a generation request
+
+    Args:
+        messages: Conversation messages (images are hashed, not embedded)
+        config: Generation config; transport-only fields are ignored
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    config_data = _canonicalize(config)
+    for field_name in _NON_SEMANTIC_CONFIG_FIELDS:
+        config_data.pop(field_name, None)
+
+    payload = {
+        "v": CACHE_KEY_VERSION,
+        "model": config.model,
+        "messages": _canonicalize(messages),
+        "config": config_data,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+# ============================================================================
+# SERIALIZATION
+# ============================================================================
+
+def _response_to_dict(response: GenerationResponse) -> Dict[str, Any]:
+    """Serialize a response (raw provider payload is dropped)"""
+    return {
+        "text": response.text,
+        "usage": asdict(response.usage),
+        "model": response.model,
+        "finish_reason": response.finish_reason,
+        "structured_output": response.structured_output,
+        "tool_calls": response.tool_calls,
+    }
+
+
+def _response_from_dict(data: Dict[str, Any]) -> GenerationResponse:
+    """Rebuild a response from its serialized form"""
+    return GenerationResponse(
+        text=data["text"],
+        usage=Usage(**data.get("usage", {})),
+        model=data["model"],
+        finish_reason=data.get("finish_reason"),
+        structured_output=data.get("structured_output"),
+        tool_calls=data.get("tool_calls"),
+        from_cache=True,
+    )
+
+
+# ============================================================================
+# PERSISTENT TIERS
+# ============================================================================
+
+class DiskCacheBackend:
+    """Stores one JSON file per key under a local directory"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        # Two-level fan-out keeps directories small
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        tmp_path.replace(path)
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        if path.exists():
+            path.unlink()
+
+
+class S3CacheBackend:
+    """Stores one JSON object per key under an S3 prefix"""
+
+    def __init__(self, bucket: str, prefix: str = "llm-cache"):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix.rstrip("/")
+        self.client = boto3.client("s3", region_name=os.getenv("AWS_REGION", "us-east-1"))
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key[:2]}/{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return json.loads(obj["Body"].read())
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=json.dumps(entry).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+class ResponseCache:
+    """Two-tier (memory LRU + optional persistent backend) response cache"""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        default_ttl: Optional[int] = 7 * 24 * 3600,
+        backend: Optional[Any] = None,
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            max_entries: Maximum entries kept in the in-memory LRU
+            default_ttl: Entry lifetime in seconds (None = never expires)
+            backend: Optional persistent tier with get/put/delete (disk or S3)
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.backend = backend
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_expired(entry: Dict[str, Any]) -> bool:
+        expires_at = entry.get("expires_at")
+        return expires_at is not None and expires_at < time.time()
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[GenerationResponse]:
+        """
+        Look up a cached response (blocking if the persistent tier is used)
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            Cached GenerationResponse or None on miss/expiry
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_expired(entry):
+                    del self._memory[key]
+                    entry = None
+                else:
+                    self._memory.move_to_end(key)
+
+        if entry is None and self.backend is not None:
+            try:
+                entry = self.backend.get(key)
+            except Exception as e:
+                logger.warning(f"Response cache read failed for {key[:12]}: {e}")
+                entry = None
+
+            if entry is not None:
+                if self._is_expired(entry):
+                    try:
+                        self.backend.delete(key)
+                    except Exception:
+                        pass
+                    entry = None
+                else:
+                    self._remember(key, entry)
+
+        if entry is None:
+            return None
+        return _response_from_dict(entry["response"])
+
+    def put(
+        self,
+        key: str,
+        response: GenerationResponse,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """
+        Store a response in both tiers
+
+        Args:
+            key: Key from make_cache_key
+            response: Response to store
+            ttl: Override for default_ttl (seconds)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = {
+            "created_at": time.time(),
+            "expires_at": time.time() + ttl if ttl else None,
+            "response": _response_to_dict(response),
+        }
+        self._remember(key, entry)
+
+        if self.backend is not None:
+            try:
+                self.backend.put(key, entry)
+            except Exception as e:
+                logger.warning(f"Response cache write failed for {key[:12]}: {e}")
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key from both tiers"""
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.backend is not None:
+            try:
+                self.backend.delete(key)
+            except Exception as e:
+                logger.warning(f"Response cache delete failed for {key[:12]}: {e}")
+
+    def clear_memory(self) -> None:
+        """Empty the in-memory tier (persistent entries are kept)"""
+        with self._lock:
+            self._memory.clear()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """
+        Build a cache from environment variables
+
+        LLM_RESPONSE_CACHE_BACKEND: "memory" (default), "disk" or "s3"
+        LLM_RESPONSE_CACHE_DIR: Directory for the disk tier
+        LLM_RESPONSE_CACHE_S3_PREFIX: Key prefix for the S3 tier (bucket from S3_BUCKET)
+        LLM_RESPONSE_CACHE_MAX_ENTRIES: In-memory LRU size
+        LLM_RESPONSE_CACHE_TTL: Entry lifetime in seconds (0 = never expires)
+        """
+        backend_name = os.getenv("LLM_RESPONSE_CACHE_BACKEND", "memory").lower()
+        backend = None
+
+        if backend_name == "disk":
+            backend = DiskCacheBackend(
+                Path(os.getenv("LLM_RESPONSE_CACHE_DIR", "/tmp/osyle-llm-cache"))
+            )
+        elif backend_name == "s3":
+            backend = S3CacheBackend(
+                bucket=os.getenv("S3_BUCKET", "osyle-shared-assets"),
+                prefix=os.getenv("LLM_RESPONSE_CACHE_S3_PREFIX", "llm-cache"),
+            )
+
+        ttl = int(os.getenv("LLM_RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))
+        return cls(
+            max_entries=int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "512")),
+            default_ttl=ttl or None,
+            backend=backend,
+        )
+
+
+# Global response cache
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get global response cache (built from env on first use)"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache.from_env()
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]):
+    """Set global response cache"""
+    global _response_cache
+    _response_cache = cache
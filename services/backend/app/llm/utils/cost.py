@@ -1,14 +1,18 @@
 """
 Cost tracking utilities for LLM usage monitoring
 """
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Union
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
 import json
+import threading
 from pathlib import Path
 
-from ..types import Usage, GenerationResponse
+from ..types import Usage, GenerationResponse, StreamStats
 from ..config import get_model_pricing
+from .ledger import CostLedger, ledger_from_env
+from .scheduler import get_request_tenant, get_request_endpoint
 
 
 @dataclass
@@ -31,6 +35,7 @@ class RequestCost:
                 "input_tokens": self.usage.input_tokens,
                 "output_tokens": self.usage.output_tokens,
                 "cached_tokens": self.usage.cached_tokens,
+                "cache_write_tokens": self.usage.cache_write_tokens,
                 "total_tokens": self.usage.total_tokens,
             },
             "costs": {
@@ -42,27 +47,136 @@ class RequestCost:
         }
 
 
+@dataclass
+class UsageAggregate:
+    """Running totals for one model/user/endpoint (constant memory)"""
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+    total_tokens: int = 0
+    total_cost: float = 0.0
+    
+    def add(self, usage: Usage, cost: float):
+        """Fold one request into the totals"""
+        self.requests += 1
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        self.cached_tokens += usage.cached_tokens
+        self.cache_write_tokens += usage.cache_write_tokens
+        self.total_tokens += usage.total_tokens
+        self.total_cost += cost
+    
+    def to_dict(self) -> dict:
+        """Convert to the per-model stats shape used by get_stats"""
+        prompt_tokens = self.input_tokens + self.cached_tokens + self.cache_write_tokens
+        return {
+            "requests": self.requests,
+            "total_cost": self.total_cost,
+            "total_tokens": self.total_tokens,
+            "avg_cost_per_request": self.total_cost / self.requests if self.requests else 0.0,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "cache_hit_ratio": self.cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+        }
+
+
+@dataclass
+class StreamAggregate:
+    """Running latency/throughput totals for streamed generations of one model"""
+    streams: int = 0
+    ttft_total: float = 0.0
+    ttft_max: float = 0.0
+    generation_seconds: float = 0.0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+    input_tokens: int = 0
+    
+    def add(self, ttft: Optional[float], generation_seconds: Optional[float], usage: Usage):
+        """Fold one completed stream into the totals"""
+        self.streams += 1
+        if ttft is not None:
+            self.ttft_total += ttft
+            self.ttft_max = max(self.ttft_max, ttft)
+        if generation_seconds:
+            self.generation_seconds += generation_seconds
+            self.output_tokens += usage.output_tokens
+        self.input_tokens += usage.input_tokens
+        self.cached_tokens += usage.cached_tokens
+        self.cache_write_tokens += usage.cache_write_tokens
+    
+    def to_dict(self) -> dict:
+        """Convert to the per-model streaming stats shape used by get_stats"""
+        prompt_tokens = self.input_tokens + self.cached_tokens + self.cache_write_tokens
+        return {
+            "streams": self.streams,
+            "avg_ttft_seconds": self.ttft_total / self.streams if self.streams else 0.0,
+            "max_ttft_seconds": self.ttft_max,
+            "output_tokens_per_second": (
+                self.output_tokens / self.generation_seconds if self.generation_seconds else 0.0
+            ),
+            "cache_hit_ratio": self.cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+        }
+
+
 class CostTracker:
     """Track LLM usage costs"""
     
-    def __init__(self, save_path: Optional[Path] = None):
+    def __init__(
+        self,
+        save_path: Optional[Union[str, Path]] = None,
+        recent_limit: int = 100,
+        ledger: Optional[CostLedger] = None
+    ):
         """
         Initialize cost tracker
         
+        Only running aggregates and the last recent_limit requests are kept
+        in memory. Individual requests are appended to a JSONL ledger by a
+        background thread when save_path (or ledger) is set.
+        
         Args:
-            save_path: Optional path to save cost records
+            save_path: Optional path of the JSONL cost ledger
+            recent_limit: Number of recent RequestCost records kept for inspection
+            ledger: Ledger instance to use instead of building one from save_path
         """
-        self.requests: List[RequestCost] = []
-        self.save_path = save_path
-        self._total_cost = 0.0
-        self._costs_by_model: Dict[str, float] = {}
+        self.save_path = Path(save_path) if save_path else None
+        self.ledger = ledger or (CostLedger(self.save_path) if self.save_path else None)
+        if self.ledger is not None and self.save_path is None:
+            self.save_path = self.ledger.path
+        
+        self.recent: Deque[RequestCost] = deque(maxlen=recent_limit)
+        self._totals = UsageAggregate()
+        self._by_model: Dict[str, UsageAggregate] = {}
+        self._by_user: Dict[str, UsageAggregate] = {}
+        self._by_endpoint: Dict[str, UsageAggregate] = {}
+        self._streams_by_model: Dict[str, StreamAggregate] = {}
+        self._lock = threading.Lock()
+        
+        # Response cache counters
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_saved_cost = 0.0
     
-    def track_request(self, response: GenerationResponse) -> RequestCost:
+    def track_request(
+        self,
+        response: GenerationResponse,
+        user_id: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        stream_timing: Optional[Dict[str, Optional[float]]] = None
+    ) -> RequestCost:
         """
         Track cost for a generation response
         
         Args:
             response: Generation response to track
+            user_id: User to attribute the cost to (defaults to the request context)
+            endpoint: Feature/action to attribute the cost to (defaults to the request context)
+            stream_timing: Extra ledger fields for streamed requests (see track_stream)
             
         Returns:
             RequestCost object
@@ -76,6 +190,10 @@ class CostTracker:
             
             if response.usage.cached_tokens > 0 and pricing.cached_input_per_million:
                 cached_cost = (response.usage.cached_tokens * pricing.cached_input_per_million) / 1_000_000
+            
+            # Cache writes are billed as (premium) input
+            if response.usage.cache_write_tokens > 0:
+                input_cost += (response.usage.cache_write_tokens * pricing.cache_write_rate) / 1_000_000
         else:
             input_cost = output_cost = cached_cost = 0.0
         
@@ -91,60 +209,158 @@ class CostTracker:
             total_cost=total_cost
         )
         
-        self.requests.append(cost_record)
-        self._total_cost += total_cost
-        self._costs_by_model[response.model] = self._costs_by_model.get(response.model, 0.0) + total_cost
+        user_id = user_id or get_request_tenant()
+        endpoint = endpoint or get_request_endpoint() or "unknown"
+        self._accumulate(cost_record, user_id, endpoint)
         
-        # Save if path configured
-        if self.save_path:
-            self._save()
+        # Append to the ledger (queued; written by the ledger thread)
+        if self.ledger is not None:
+            record = {
+                "type": "request",
+                "ts": cost_record.timestamp.timestamp(),
+                "model": cost_record.model,
+                "user": user_id,
+                "endpoint": endpoint,
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
+                "cached_tokens": response.usage.cached_tokens,
+                "cache_write_tokens": response.usage.cache_write_tokens,
+                "cost": total_cost,
+            }
+            if stream_timing:
+                record.update(stream_timing)
+            self.ledger.append(record)
         
         return cost_record
     
+    def track_stream(
+        self,
+        stats: StreamStats,
+        user_id: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> RequestCost:
+        """
+        Track cost and latency for a finished streamed generation
+        
+        Args:
+            stats: Stream record filled in by the provider and LLMService
+            user_id: User to attribute the cost to (defaults to the request context)
+            endpoint: Feature/action to attribute the cost to (defaults to the request context)
+            
+        Returns:
+            RequestCost object
+        """
+        ttft = stats.ttft_seconds
+        generation_seconds = stats.generation_seconds
+        with self._lock:
+            aggregate = self._streams_by_model.get(stats.model)
+            if aggregate is None:
+                aggregate = self._streams_by_model[stats.model] = StreamAggregate()
+            aggregate.add(ttft, generation_seconds, stats.usage)
+        
+        response = GenerationResponse(
+            text="",
+            usage=stats.usage,
+            model=stats.model,
+            finish_reason=stats.finish_reason,
+        )
+        return self.track_request(
+            response,
+            user_id=user_id,
+            endpoint=endpoint,
+            stream_timing={"ttft": ttft, "gen_s": generation_seconds},
+        )
+    
+    def _accumulate(self, cost_record: RequestCost, user_id: str, endpoint: str):
+        """Fold a request into the running aggregates"""
+        usage, cost = cost_record.usage, cost_record.total_cost
+        with self._lock:
+            self.recent.append(cost_record)
+            self._totals.add(usage, cost)
+            for groups, key in (
+                (self._by_model, cost_record.model),
+                (self._by_user, user_id),
+                (self._by_endpoint, endpoint),
+            ):
+                aggregate = groups.get(key)
+                if aggregate is None:
+                    aggregate = groups[key] = UsageAggregate()
+                aggregate.add(usage, cost)
+    
+    def track_cache_hit(self, response: GenerationResponse) -> float:
+        """
+        Record a response served from the response cache
+        
+        The request costs nothing; the cost of the original call is
+        counted as savings instead.
+        
+        Args:
+            response: Cached generation response
+            
+        Returns:
+            Cost that was avoided
+        """
+        pricing = get_model_pricing(response.model)
+        saved = 0.0
+        if pricing:
+            saved = pricing.calculate_cost(
+                response.usage.input_tokens,
+                response.usage.output_tokens,
+                response.usage.cached_tokens,
+                response.usage.cache_write_tokens
+            )
+        
+        self.cache_hits += 1
+        self._cache_saved_cost += saved
+        return saved
+    
+    def track_cache_miss(self):
+        """Record a response cache lookup that fell through to the provider"""
+        self.cache_misses += 1
+    
+    def get_cache_stats(self) -> dict:
+        """Get response cache hit/miss statistics"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "saved_cost": self._cache_saved_cost,
+        }
+    
     @property
     def total_cost(self) -> float:
         """Get total cost across all requests"""
-        return self._total_cost
+        return self._totals.total_cost
     
     def get_costs_by_model(self) -> Dict[str, float]:
         """Get costs grouped by model"""
-        return self._costs_by_model.copy()
+        return {model: agg.total_cost for model, agg in self._by_model.items()}
     
     def get_total_tokens(self) -> int:
         """Get total tokens used"""
-        return sum(r.usage.total_tokens for r in self.requests)
+        return self._totals.total_tokens
+    
+    def get_stream_stats(self) -> Dict[str, dict]:
+        """Get time-to-first-token and throughput per model for streamed requests"""
+        with self._lock:
+            return {model: agg.to_dict() for model, agg in self._streams_by_model.items()}
     
     def get_stats(self) -> dict:
         """Get comprehensive statistics"""
-        if not self.requests:
+        with self._lock:
+            totals = self._totals.to_dict()
             return {
-                "total_cost": 0.0,
-                "total_requests": 0,
-                "total_tokens": 0,
-                "by_model": {}
+                "total_cost": totals["total_cost"],
+                "total_requests": totals["requests"],
+                "total_tokens": totals["total_tokens"],
+                "avg_cost_per_request": totals["avg_cost_per_request"],
+                "by_model": {k: v.to_dict() for k, v in self._by_model.items()},
+                "by_user": {k: v.to_dict() for k, v in self._by_user.items()},
+                "by_endpoint": {k: v.to_dict() for k, v in self._by_endpoint.items()},
+                "streaming": {k: v.to_dict() for k, v in self._streams_by_model.items()},
+                "response_cache": self.get_cache_stats()
             }
-        
-        # Calculate stats by model
-        model_stats = {}
-        for model in self._costs_by_model.keys():
-            model_requests = [r for r in self.requests if r.model == model]
-            model_stats[model] = {
-                "requests": len(model_requests),
-                "total_cost": self._costs_by_model[model],
-                "total_tokens": sum(r.usage.total_tokens for r in model_requests),
-                "avg_cost_per_request": self._costs_by_model[model] / len(model_requests),
-                "input_tokens": sum(r.usage.input_tokens for r in model_requests),
-                "output_tokens": sum(r.usage.output_tokens for r in model_requests),
-                "cached_tokens": sum(r.usage.cached_tokens for r in model_requests),
-            }
-        
-        return {
-            "total_cost": self._total_cost,
-            "total_requests": len(self.requests),
-            "total_tokens": self.get_total_tokens(),
-            "avg_cost_per_request": self._total_cost / len(self.requests),
-            "by_model": model_stats
-        }
     
     def print_summary(self):
         """Print cost summary"""
@@ -157,6 +373,12 @@ class CostTracker:
         print(f"Total Requests: {stats['total_requests']}")
         print(f"Total Tokens: {stats['total_tokens']:,}")
         print(f"Avg Cost/Request: ${stats['avg_cost_per_request']:.4f}")
+        
+        cache_stats = stats['response_cache']
+        if cache_stats['hits'] or cache_stats['misses']:
+            print(f"Response Cache: {cache_stats['hits']} hits / "
+                  f"{cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.0%}), saved ${cache_stats['saved_cost']:.4f}")
         print("\nBy Model:")
         print("-"*60)
         
@@ -168,35 +390,88 @@ class CostTracker:
             print(f"  Tokens: {model_stats['total_tokens']:,} "
                   f"(Input: {model_stats['input_tokens']:,}, "
                   f"Output: {model_stats['output_tokens']:,}, "
-                  f"Cached: {model_stats['cached_tokens']:,})")
-        
-        print("="*60 + "\n")
-    
-    def _save(self):
-        """Save cost records to file"""
-        if not self.save_path:
-            return
+                  f"Cached: {model_stats['cached_tokens']:,}, "
+                  f"Cache writes: {model_stats['cache_write_tokens']:,})")
+            print(f"  Prompt cache hit ratio: {model_stats['cache_hit_ratio']:.0%}")
         
-        self.save_path.parent.mkdir(parents=True, exist_ok=True)
+        if stats['streaming']:
+            print("\nStreaming:")
+            print("-"*60)
+            for model, stream_stats in stats['streaming'].items():
+                print(f"  {model}: {stream_stats['streams']} streams, "
+                      f"TTFT avg {stream_stats['avg_ttft_seconds']:.2f}s "
+                      f"(max {stream_stats['max_ttft_seconds']:.2f}s), "
+                      f"{stream_stats['output_tokens_per_second']:.0f} tok/s, "
+                      f"{stream_stats['cache_hit_ratio']:.0%} cache hits")
         
-        data = {
-            "total_cost": self._total_cost,
-            "requests": [r.to_dict() for r in self.requests]
-        }
+        if stats['by_endpoint']:
+            print("\nBy Endpoint:")
+            print("-"*60)
+            for endpoint, endpoint_stats in stats['by_endpoint'].items():
+                print(f"  {endpoint}: {endpoint_stats['requests']} requests, "
+                      f"${endpoint_stats['total_cost']:.4f}")
         
-        with open(self.save_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        print("="*60 + "\n")
+    
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until every tracked request is written to the ledger"""
+        if self.ledger is None:
+            return True
+        return self.ledger.flush(timeout)
     
     def load(self):
-        """Load cost records from file"""
+        """
+        Rebuild aggregates by streaming the ledger from disk
+        
+        Also reads the legacy single-JSON-document format written by older
+        versions ({"total_cost": ..., "requests": [...]}).
+        """
         if not self.save_path or not self.save_path.exists():
             return
         
+        self.flush()
         with open(self.save_path, 'r') as f:
-            data = json.load(f)
+            first_line = f.readline().strip()
+        
+        if first_line == "{":
+            self._load_legacy()
+            return
         
-        self._total_cost = data.get("total_cost", 0.0)
+        for record in self.ledger.iter_records("request"):
+            usage = Usage(
+                input_tokens=record.get("input_tokens", 0),
+                output_tokens=record.get("output_tokens", 0),
+                cached_tokens=record.get("cached_tokens", 0),
+                cache_write_tokens=record.get("cache_write_tokens", 0),
+            )
+            cost = record.get("cost", 0.0)
+            cost_record = RequestCost(
+                timestamp=datetime.fromtimestamp(record.get("ts", 0)),
+                model=record.get("model", "unknown"),
+                usage=usage,
+                input_cost=0.0,
+                output_cost=0.0,
+                cached_cost=0.0,
+                total_cost=cost
+            )
+            self._accumulate(cost_record, record.get("user") or "anonymous", record.get("endpoint") or "unknown")
+            
+            # Streamed requests also carry their timing
+            if "ttft" in record:
+                aggregate = self._streams_by_model.get(cost_record.model)
+                if aggregate is None:
+                    aggregate = self._streams_by_model[cost_record.model] = StreamAggregate()
+                aggregate.add(record.get("ttft"), record.get("gen_s"), usage)
+    
+    def _load_legacy(self):
+        """
+        Load the old indented-JSON format (one document with every request)
+        and convert the file to JSONL so later appends keep it readable
+        """
+        with open(self.save_path, 'r') as f:
+            data = json.load(f)
         
+        lines = []
         for req_data in data.get("requests", []):
             usage = Usage(
                 input_tokens=req_data["usage"]["input_tokens"],
@@ -213,20 +488,39 @@ class CostTracker:
                 cached_cost=req_data["costs"]["cached"],
                 total_cost=req_data["costs"]["total"]
             )
-            
-            self.requests.append(cost_record)
-            
-            model = cost_record.model
-            self._costs_by_model[model] = self._costs_by_model.get(model, 0.0) + cost_record.total_cost
+            self._accumulate(cost_record, "anonymous", "unknown")
+            lines.append(json.dumps({
+                "type": "request",
+                "ts": cost_record.timestamp.timestamp(),
+                "model": cost_record.model,
+                "user": "anonymous",
+                "endpoint": "unknown",
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "cached_tokens": usage.cached_tokens,
+                "cost": cost_record.total_cost,
+            }, separators=(",", ":")) + "\n")
+        
+        tmp_path = self.save_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            f.write("".join(lines))
+        tmp_path.replace(self.save_path)
     
     def reset(self):
         """Reset all tracking data"""
-        self.requests.clear()
-        self._total_cost = 0.0
-        self._costs_by_model.clear()
+        with self._lock:
+            self.recent.clear()
+            self._totals = UsageAggregate()
+            self._by_model.clear()
+            self._by_user.clear()
+            self._by_endpoint.clear()
+            self._streams_by_model.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_saved_cost = 0.0
         
-        if self.save_path and self.save_path.exists():
-            self.save_path.unlink()
+        if self.ledger is not None:
+            self.ledger.truncate()
 
 
 # Global cost tracker
@@ -234,10 +528,10 @@ _tracker: Optional[CostTracker] = None
 
 
 def get_tracker() -> CostTracker:
-    """Get global cost tracker"""
+    """Get global cost tracker (ledger from LLM_COST_LEDGER_PATH if set)"""
     global _tracker
     if _tracker is None:
-        _tracker = CostTracker()
+        _tracker = CostTracker(ledger=ledger_from_env())
     return _tracker
 
 
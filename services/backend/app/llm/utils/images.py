@@ -0,0 +1,468 @@
+"""
+Prepared images for vision requests
+
+A screenshot is decoded, downscaled and base64-encoded once per resource and
+the same immutable PreparedImage is reused by every vision call that sends it
+(the five parallel DTR passes plus Pass 6), instead of each call holding its
+own multi-MB base64 copy of the upload.
+
+Preparation is provider-aware: the image is resized to the size that is
+cheapest for the target model without losing detail it would otherwise see
+(see IMAGE_PROFILES), re-encoded in whichever format comes out smallest
+without losing quality, and its token cost is estimated before the request
+is sent.
+
+Callers that run several vision calls on one image wrap them in shared_image();
+code inside the block calls get_prepared_image() with the original bytes and
+gets the shared object back. Outside a block, get_prepared_image() prepares
+the image on the spot, so vision helpers also work standalone.
+"""
+import io
+import os
+import math
+import base64
+import asyncio
+import contextlib
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..types import ImageContent, Provider
+from ..providers.registry import get_model_info
+
+
+# ============================================================================
+# PROVIDER PROFILES
+# ============================================================================
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """Resize limits for images sent to (or billed by) a provider"""
+    max_dimension: int                    # Longest edge
+    max_pixels: Optional[int] = None      # Total pixel budget
+    max_short_side: Optional[int] = None  # Shortest edge
+
+
+# How each provider resizes an upload before its model sees and bills it
+BILLING_PROFILES: Dict[Provider, ImageProfile] = {
+    # Long edge 1568px and ~1.15 megapixels (~1,600 tokens)
+    Provider.ANTHROPIC: ImageProfile(max_dimension=1568, max_pixels=1_150_000),
+    # High detail: fit in 2048x2048, then shortest side down to 768px
+    Provider.OPENAI: ImageProfile(max_dimension=2048, max_short_side=768),
+    # Scaled down past 3072px, then billed per 768x768 tile
+    Provider.GOOGLE: ImageProfile(max_dimension=3072),
+}
+
+# What we resize to before sending. Anthropic and OpenAI bill for the size
+# they resize to, so we match them. Gemini bills every 768px tile up to
+# 3072px: a 2880x1800 screenshot is 12 tiles (3,096 tokens) as uploaded.
+# A long edge of two tiles (1536px) brings it to 4 tiles (1,032 tokens) at
+# the same detail DTR passes used before provider-aware sizing (1568px).
+IMAGE_PROFILES: Dict[Provider, ImageProfile] = {
+    Provider.ANTHROPIC: BILLING_PROFILES[Provider.ANTHROPIC],
+    Provider.OPENAI: BILLING_PROFILES[Provider.OPENAI],
+    Provider.GOOGLE: ImageProfile(max_dimension=1536),
+}
+
+# Used when the model is unknown: the tightest profile, safe for every provider
+DEFAULT_PROFILE = IMAGE_PROFILES[Provider.ANTHROPIC]
+
+# Optional hard cap on the longest edge for every provider (unset = no cap)
+IMAGE_MAX_DIMENSION = int(os.getenv("LLM_IMAGE_MAX_DIMENSION", "0")) or None
+
+JPEG_QUALITY = 90
+WEBP_QUALITY = 90
+
+# Formats every provider accepts (others are always re-encoded)
+_SENDABLE_MEDIA_TYPES = {"image/png", "image/jpeg", "image/webp"}
+
+
+def _provider_for(model: Optional[str]) -> Optional[Provider]:
+    info = get_model_info(model) if model else None
+    return info.provider if info else None
+
+
+def get_image_profile(model: Optional[str] = None) -> ImageProfile:
+    """
+    Get the resize profile for a model (from its provider in the model registry)
+
+    Args:
+        model: Model name (e.g. "gemini-2.5-flash"); None for the default
+
+    Returns:
+        ImageProfile, capped by LLM_IMAGE_MAX_DIMENSION when set
+    """
+    profile = IMAGE_PROFILES.get(_provider_for(model), DEFAULT_PROFILE)
+    if IMAGE_MAX_DIMENSION and IMAGE_MAX_DIMENSION < profile.max_dimension:
+        profile = ImageProfile(
+            max_dimension=IMAGE_MAX_DIMENSION,
+            max_pixels=profile.max_pixels,
+            max_short_side=profile.max_short_side
+        )
+    return profile
+
+
+def fit_dimensions(width: int, height: int, profile: ImageProfile) -> Tuple[int, int]:
+    """
+    Size an image is scaled to under a profile (never upscaled)
+
+    Args:
+        width: Width in pixels
+        height: Height in pixels
+        profile: Provider profile
+
+    Returns:
+        (width, height) after scaling
+    """
+    if width <= 0 or height <= 0:
+        return width, height
+
+    scale = min(1.0, profile.max_dimension / max(width, height))
+    if profile.max_pixels:
+        scale = min(scale, math.sqrt(profile.max_pixels / (width * height)))
+    if profile.max_short_side:
+        scale = min(scale, profile.max_short_side / min(width, height))
+
+    if scale >= 1.0:
+        return width, height
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def estimate_image_tokens(width: int, height: int, model: Optional[str] = None) -> int:
+    """
+    Estimate the input tokens a model bills for an image
+
+    Applies the provider's own resize (BILLING_PROFILES) first, so it also
+    answers "what would the original upload have cost".
+
+    Args:
+        width: Width in pixels
+        height: Height in pixels
+        model: Model name (None estimates with Anthropic's formula)
+
+    Returns:
+        Estimated image tokens (0 for unknown dimensions)
+    """
+    if width <= 0 or height <= 0:
+        return 0
+
+    provider = _provider_for(model)
+    width, height = fit_dimensions(width, height, BILLING_PROFILES.get(provider, DEFAULT_PROFILE))
+
+    if provider == Provider.OPENAI:
+        # 85 base + 170 per 512px tile
+        return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+    if provider == Provider.GOOGLE:
+        # 258 per 768px tile; small images are a single tile
+        if width <= 384 and height <= 384:
+            return 258
+        return 258 * math.ceil(width / 768) * math.ceil(height / 768)
+    return math.ceil(width * height / 750)
+
+
+# ============================================================================
+# PREPARED IMAGE
+# ============================================================================
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """Image ready to send: base64 payload plus what was done to produce it"""
+    data: str                 # Base64 encoded (shared by reference, never copied)
+    media_type: str
+    width: int
+    height: int
+    original_bytes: int       # Size of the upload
+    encoded_bytes: int        # Size of the bytes behind data
+    resized: bool = False
+    estimated_tokens: int = 0  # For the model it was prepared for
+    original_tokens: int = 0   # Same model, for the upload as-is (as the provider bills it)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.encoded_bytes
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.estimated_tokens
+
+    def to_content(self, detail: Optional[str] = None) -> ImageContent:
+        """Build a message content block (references data, no re-encoding)"""
+        return ImageContent(data=self.data, media_type=self.media_type, detail=detail)
+
+    def to_reference(self) -> Dict[str, Any]:
+        """Reference-image dict as passed to generation (data, media_type, size)"""
+        return {
+            "data": self.data,
+            "media_type": self.media_type,
+            "width": self.width,
+            "height": self.height,
+        }
+
+
+def _media_type(image_format: str) -> str:
+    image_format = (image_format or "png").lower()
+    return f"image/{'jpeg' if image_format == 'jpg' else image_format}"
+
+
+def _encode_candidates(image: Any, lossless: bool) -> List[Tuple[str, bytes]]:
+    """
+    Encode an image in every format that keeps its quality
+
+    Lossless sources (PNG, WebP) stay lossless - UI screenshots are mostly
+    flat color and text, which lossy codecs smear. JPEG sources are already
+    lossy and are re-encoded lossy at high quality.
+    """
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    if lossless:
+        options = [
+            ("image/png", {"format": "PNG", "optimize": True}),
+            ("image/webp", {"format": "WEBP", "lossless": True}),
+        ]
+    else:
+        options = [("image/webp", {"format": "WEBP", "quality": WEBP_QUALITY})]
+        if not has_alpha:
+            options.append(("image/jpeg", {"format": "JPEG", "quality": JPEG_QUALITY, "optimize": True}))
+
+    candidates = []
+    for media_type, save_kwargs in options:
+        try:
+            source = image
+            if save_kwargs["format"] == "JPEG" and image.mode not in ("RGB", "L"):
+                source = image.convert("RGB")
+            elif image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+                source = image.convert("RGBA" if has_alpha else "RGB")
+            buffer = io.BytesIO()
+            source.save(buffer, **save_kwargs)
+            candidates.append((media_type, buffer.getvalue()))
+        except Exception as e:
+            print(f"⚠️  Could not encode image as {media_type}: {e}")
+    return candidates
+
+
+def prepare_image(
+    image_bytes: bytes,
+    image_format: str = "png",
+    model: Optional[str] = None,
+    max_dimension: Optional[int] = None
+) -> PreparedImage:
+    """
+    Decode, downscale, re-encode and base64-encode an image once
+
+    The image is resized to the model's provider profile and sent in the
+    smallest quality-preserving encoding (the upload itself when nothing
+    beats it). The media type follows the actual bytes, not the file name.
+
+    Args:
+        image_bytes: Original image data
+        image_format: Image format (png, jpeg, webp) - used if PIL can't tell
+        model: Model the image will be sent to (None for the default profile)
+        max_dimension: Optional extra cap on the longest edge
+
+    Returns:
+        PreparedImage
+    """
+    profile = get_image_profile(model)
+    if max_dimension and max_dimension < profile.max_dimension:
+        profile = ImageProfile(max_dimension, profile.max_pixels, profile.max_short_side)
+
+    media_type = _media_type(image_format)
+    payload = image_bytes
+    width = height = original_width = original_height = 0
+    resized = False
+
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            original_width, original_height = width, height = image.size
+            if image.format:
+                media_type = Image.MIME.get(image.format, media_type)
+
+            # PIL can't tell lossy WebP from lossless; treating it as lossless
+            # never loses quality (the upload wins when it is smaller)
+            lossless = media_type != "image/jpeg"
+            target = fit_dimensions(width, height, profile)
+            if target != (width, height):
+                image = image.resize(target, Image.LANCZOS)
+                width, height = target
+                resized = True
+                candidates = []
+            else:
+                image.load()
+                candidates = [(media_type, image_bytes)] if media_type in _SENDABLE_MEDIA_TYPES else []
+
+            candidates.extend(_encode_candidates(image, lossless))
+            if candidates:
+                media_type, payload = min(candidates, key=lambda c: len(c[1]))
+    except Exception as e:
+        # Unreadable by PIL: send the upload unchanged, as before
+        print(f"⚠️  Could not decode image for preparation, sending original: {e}")
+
+    return PreparedImage(
+        data=base64.b64encode(payload).decode("utf-8"),
+        media_type=media_type,
+        width=width,
+        height=height,
+        original_bytes=len(image_bytes),
+        encoded_bytes=len(payload),
+        resized=resized,
+        estimated_tokens=estimate_image_tokens(width, height, model),
+        original_tokens=estimate_image_tokens(original_width, original_height, model)
+    )
+
+
+# ============================================================================
+# IMAGE USAGE METRICS
+# ============================================================================
+
+@dataclass
+class ImageUsage:
+    """Running totals of what the prepared images sent in a block saved"""
+    images: int = 0
+    original_bytes: int = 0
+    sent_bytes: int = 0
+    original_tokens: int = 0
+    estimated_tokens: int = 0
+
+    def record(self, image: PreparedImage) -> None:
+        self.images += 1
+        self.original_bytes += image.original_bytes
+        self.sent_bytes += image.encoded_bytes
+        self.original_tokens += image.original_tokens
+        self.estimated_tokens += image.estimated_tokens
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "images": self.images,
+            "original_bytes": self.original_bytes,
+            "sent_bytes": self.sent_bytes,
+            "bytes_saved": self.original_bytes - self.sent_bytes,
+            "estimated_tokens": self.estimated_tokens,
+            "tokens_saved": self.original_tokens - self.estimated_tokens,
+        }
+
+
+_image_usage: ContextVar[Optional[ImageUsage]] = ContextVar("llm_image_usage", default=None)
+
+
+@contextlib.contextmanager
+def track_image_usage() -> Iterator[ImageUsage]:
+    """
+    Total the images sent by vision calls made inside the block
+
+    Used per DTR pass so pass metrics record the bytes and tokens saved.
+
+    Yields:
+        ImageUsage filled in as get_prepared_image() hands out images
+    """
+    usage = ImageUsage()
+    token = _image_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _image_usage.reset(token)
+
+
+# ============================================================================
+# SHARED IMAGE CONTEXT
+# ============================================================================
+
+# (original bytes, prepared images by profile) for the vision calls in the
+# current block. The original is matched by identity, so a different upload
+# never gets them.
+_shared_image: ContextVar[Optional[Tuple[bytes, Dict[ImageProfile, PreparedImage]]]] = ContextVar(
+    "llm_shared_image", default=None
+)
+
+
+def _prepare_for_models(
+    image_bytes: bytes,
+    image_format: str,
+    models: Sequence[Optional[str]],
+    prepared: Dict[ImageProfile, PreparedImage]
+) -> List[PreparedImage]:
+    # Models whose providers resize alike share one prepared image
+    added = []
+    for model in models:
+        key = get_image_profile(model)
+        if key not in prepared:
+            prepared[key] = prepare_image(image_bytes, image_format, model=model)
+            added.append(prepared[key])
+    return added
+
+
+@contextlib.asynccontextmanager
+async def shared_image(
+    image_bytes: Optional[bytes],
+    image_format: str = "png",
+    models: Sequence[Optional[str]] = (None,)
+) -> AsyncIterator[None]:
+    """
+    Prepare an image once for every vision call made inside the block
+
+    Tasks started inside the block (asyncio.gather, create_task) inherit it.
+    Nested blocks for the same bytes reuse the outer preparations.
+
+    Args:
+        image_bytes: Original image data (None makes this a no-op)
+        image_format: Image format (png, jpeg, webp)
+        models: Models the image will be sent to, prepared up front (others
+                are prepared on first use)
+    """
+    if not image_bytes:
+        yield
+        return
+
+    current = _shared_image.get()
+    if current is not None and current[0] is image_bytes:
+        prepared = current[1]
+        token = None
+    else:
+        prepared = {}
+        token = _shared_image.set((image_bytes, prepared))
+
+    try:
+        # Decoding, resizing and encoding is CPU work - keep it off the event loop
+        added = await asyncio.to_thread(_prepare_for_models, image_bytes, image_format, models, prepared)
+        for image in added:
+            if image.bytes_saved > 0:
+                print(
+                    f"🖼️  Prepared image {image.width}x{image.height} {image.media_type} "
+                    f"({image.original_bytes:,} → {image.encoded_bytes:,} bytes, "
+                    f"~{image.estimated_tokens:,} tokens)"
+                )
+        yield
+    finally:
+        if token is not None:
+            _shared_image.reset(token)
+
+
+def get_prepared_image(
+    image_bytes: bytes,
+    image_format: str = "png",
+    model: Optional[str] = None
+) -> PreparedImage:
+    """
+    Get the shared PreparedImage for these bytes and model, or prepare one now
+
+    Args:
+        image_bytes: Original image data
+        image_format: Image format (png, jpeg, webp)
+        model: Model the image will be sent to
+
+    Returns:
+        PreparedImage (also recorded in the current track_image_usage block)
+    """
+    current = _shared_image.get()
+    if current is not None and current[0] is image_bytes:
+        key = get_image_profile(model)
+        image = current[1].get(key)
+        if image is None:
+            image = current[1][key] = prepare_image(image_bytes, image_format, model=model)
+    else:
+        image = prepare_image(image_bytes, image_format, model=model)
+
+    usage = _image_usage.get()
+    if usage is not None:
+        usage.record(image)
+    return image
@@ -0,0 +1,237 @@
+"""
+Append-only cost ledger for LLM usage
+
+Records are appended as compact JSON lines by a background writer thread, so
+tracking a request costs one queue put on the hot path. Every
+rollup_interval seconds the writer also appends a rollup line with the
+aggregates for that window, so dashboards can read rollups without scanning
+every request.
+
+Line formats:
+    {"type":"request","ts":...,"model":...,"user":...,"endpoint":...,
+     "input_tokens":...,"output_tokens":...,"cached_tokens":...,"cost":...}
+    (streamed requests add "ttft" and "gen_s", both in seconds)
+    {"type":"rollup","ts":...,"window_start":...,"requests":...,"cost":...,
+     "by_model":{model: {"requests":...,"cost":...,"tokens":...}}}
+"""
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class CostLedger:
+    """Buffered JSONL writer with periodic rollups"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        flush_interval: float = 2.0,
+        max_batch: int = 256,
+        rollup_interval: float = 300.0,
+    ):
+        """
+        Initialize ledger (the writer thread starts on the first append)
+
+        Args:
+            path: JSONL file to append to (created if missing)
+            flush_interval: Maximum seconds a record waits before hitting disk
+            max_batch: Records written per file append
+            rollup_interval: Seconds between rollup lines (0 = no rollups)
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.rollup_interval = rollup_interval
+
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._flushed = threading.Condition()
+        self._enqueued = 0
+        self._written = 0
+        self._closed = False
+
+        # Rollup window (touched only by the writer thread)
+        self._window_start = time.time()
+        self._window: Dict[str, Any] = self._empty_window()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Queue a record for writing (non-blocking)"""
+        if self._closed:
+            return
+        self._ensure_started()
+        with self._flushed:
+            self._enqueued += 1
+        self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Block until everything appended so far is on disk
+
+        Returns:
+            True if flushed within the timeout
+        """
+        if self._thread is None:
+            return True
+        target = self._enqueued
+        self._queue.put({"type": "_flush"})
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._written >= target, timeout=timeout)
+
+    def close(self) -> None:
+        """Flush and stop the writer thread"""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def truncate(self) -> None:
+        """Flush, then delete the ledger file"""
+        self.flush()
+        if self.path.exists():
+            self.path.unlink()
+
+    def iter_records(self, record_type: Optional[str] = "request") -> Iterator[Dict[str, Any]]:
+        """
+        Stream records back from disk (constant memory)
+
+        Args:
+            record_type: "request", "rollup", or None for every line
+
+        Yields:
+            Parsed records, oldest first (unparseable lines are skipped)
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record_type is None or record.get("type") == record_type:
+                    yield record
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(
+                    target=self._run, name="osyle-cost-ledger", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    @staticmethod
+    def _empty_window() -> Dict[str, Any]:
+        return {"requests": 0, "cost": 0.0, "by_model": {}}
+
+    def _add_to_window(self, record: Dict[str, Any]) -> None:
+        window = self._window
+        tokens = record.get("input_tokens", 0) + record.get("output_tokens", 0)
+        window["requests"] += 1
+        window["cost"] += record.get("cost", 0.0)
+        model = window["by_model"].setdefault(
+            record.get("model", "unknown"), {"requests": 0, "cost": 0.0, "tokens": 0}
+        )
+        model["requests"] += 1
+        model["cost"] += record.get("cost", 0.0)
+        model["tokens"] += tokens
+
+    def _take_rollup(self, now: float) -> Optional[Dict[str, Any]]:
+        if not self.rollup_interval or now - self._window_start < self.rollup_interval:
+            return None
+        rollup = None
+        if self._window["requests"]:
+            rollup = {"type": "rollup", "ts": now, "window_start": self._window_start, **self._window}
+        self._window = self._empty_window()
+        self._window_start = now
+        return rollup
+
+    def _write(self, lines: list) -> None:
+        try:
+            with open(self.path, "a") as f:
+                f.write("".join(lines))
+        except OSError as e:
+            logger.warning(f"Cost ledger write failed ({len(lines)} records dropped): {e}")
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            lines = []
+            written = 0
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = {"type": "_flush"}
+
+            # Drain whatever else is queued, up to one batch
+            while True:
+                if item is None:
+                    stopping = True
+                elif item.get("type") != "_flush":
+                    self._add_to_window(item)
+                    lines.append(json.dumps(item, separators=(",", ":")) + "\n")
+                    written += 1
+                if stopping or len(lines) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            rollup = self._take_rollup(time.time())
+            if rollup:
+                lines.append(json.dumps(rollup, separators=(",", ":")) + "\n")
+
+            if lines:
+                self._write(lines)
+            if written:
+                with self._flushed:
+                    self._written += written
+                    self._flushed.notify_all()
+            elif item is not None and item.get("type") == "_flush":
+                with self._flushed:
+                    self._flushed.notify_all()
+
+
+def ledger_from_env() -> Optional[CostLedger]:
+    """
+    Build a ledger from LLM_COST_LEDGER_PATH (None when unset)
+
+    LLM_COST_LEDGER_FLUSH_INTERVAL: Seconds between flushes (default 2)
+    LLM_COST_LEDGER_ROLLUP_INTERVAL: Seconds between rollup lines (default 300)
+    """
+    path = os.getenv("LLM_COST_LEDGER_PATH")
+    if not path:
+        return None
+    return CostLedger(
+        path,
+        flush_interval=float(os.getenv("LLM_COST_LEDGER_FLUSH_INTERVAL", "2")),
+        rollup_interval=float(os.getenv("LLM_COST_LEDGER_ROLLUP_INTERVAL", "300")),
+    )
@@ -0,0 +1,549 @@
+"""
+Generation scheduler for LLM requests
+
+Bounds how many requests run at once per provider/model lane (concurrency
+limit + optional requests-per-minute token bucket), so a large flow cannot
+flood a provider and trip rate limits for everyone on the worker.
+
+Waiting requests are served:
+- by priority (interactive iterate requests before bulk flow generation),
+- round-robin between users within a priority (fair queuing), and
+- with aging, so bulk work that has waited too long is not starved.
+
+The priority and user of a request come from the calling context (see
+request_context), so generation code does not need to thread them through.
+"""
+import os
+import re
+import time
+import asyncio
+import contextlib
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+
+# ============================================================================
+# REQUEST CONTEXT
+# ============================================================================
+
+class RequestPriority(IntEnum):
+    """Scheduling priority (lower value is served first)"""
+    INTERACTIVE = 0  # A user is waiting on this edit (iterate, variations, copy)
+    DEFAULT = 1
+    BULK = 2         # Flow generation, DTR/DTM builds
+
+
+DEFAULT_TENANT = "anonymous"
+
+_request_priority: ContextVar[RequestPriority] = ContextVar(
+    "llm_request_priority", default=RequestPriority.DEFAULT
+)
+_request_tenant: ContextVar[str] = ContextVar("llm_request_tenant", default=DEFAULT_TENANT)
+_request_endpoint: ContextVar[Optional[str]] = ContextVar("llm_request_endpoint", default=None)
+
+
+@contextlib.contextmanager
+def request_context(
+    user_id: Optional[str] = None,
+    priority: Optional[RequestPriority] = None,
+    endpoint: Optional[str] = None
+) -> Iterator[None]:
+    """
+    Tag every LLM request made inside the block with a user and priority
+
+    Tasks started inside the block (asyncio.gather, create_task) inherit it.
+
+    Args:
+        user_id: User the requests are made for (the fair-queuing key)
+        priority: Scheduling priority for the requests
+        endpoint: Feature/action the requests belong to (for cost attribution)
+    """
+    tenant_token = _request_tenant.set(user_id) if user_id else None
+    priority_token = _request_priority.set(priority) if priority is not None else None
+    endpoint_token = _request_endpoint.set(endpoint) if endpoint else None
+    try:
+        yield
+    finally:
+        if endpoint_token is not None:
+            _request_endpoint.reset(endpoint_token)
+        if priority_token is not None:
+            _request_priority.reset(priority_token)
+        if tenant_token is not None:
+            _request_tenant.reset(tenant_token)
+
+
+def get_request_priority() -> RequestPriority:
+    """Priority of the request running in the current context"""
+    return _request_priority.get()
+
+
+def get_request_tenant() -> str:
+    """User of the request running in the current context"""
+    return _request_tenant.get()
+
+
+def get_request_endpoint() -> Optional[str]:
+    """Feature/action of the request running in the current context"""
+    return _request_endpoint.get()
+
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+class TokenBucket:
+    """Requests-per-minute limiter with a burst allowance"""
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        """
+        Initialize token bucket
+
+        Args:
+            requests_per_minute: Sustained request rate
+            burst: Requests that may start back to back after an idle period
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self._last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available"""
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def time_until_available(self) -> float:
+        """Seconds until the next token is available"""
+        self._refill()
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+# ============================================================================
+# LANE
+# ============================================================================
+
+class _Waiter:
+    __slots__ = ("future", "tenant", "priority", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future, tenant: str, priority: RequestPriority):
+        self.future = future
+        self.tenant = tenant
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+
+
+class SchedulerLane:
+    """
+    Admission control for one provider/model
+
+    Queue state (waiters, wake-up timer, in-flight count) belongs to the event
+    loop that is running when a request arrives. When a later request comes in
+    on a different loop, e.g. the next Lambda invocation after the previous
+    loop was closed, that state is dropped and the lane starts fresh; metrics
+    carry over.
+    """
+
+    # Recent waits kept for percentile metrics
+    WAIT_SAMPLE_SIZE = 1024
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        requests_per_minute: float = 0,
+        aging_seconds: float = 30.0
+    ):
+        """
+        Initialize lane
+
+        Args:
+            name: Lane name ("provider:model")
+            max_concurrency: Maximum requests in flight
+            requests_per_minute: Start-rate limit (0 = unlimited)
+            aging_seconds: Waiters older than this are served first regardless of priority
+        """
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.aging_seconds = aging_seconds
+        self.bucket = (
+            TokenBucket(requests_per_minute, burst=self.max_concurrency)
+            if requests_per_minute > 0 else None
+        )
+
+        # priority -> tenant -> FIFO of waiters; tenant order is the round-robin order
+        self._queues: Dict[RequestPriority, "OrderedDict[str, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in RequestPriority
+        }
+        self._waiting = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self.in_flight = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Bumped on every loop change so slots from the old loop are not released twice
+        self._epoch = 0
+
+        # Metrics
+        self.total_admitted = 0
+        self.total_cancelled = 0
+        self.loop_resets = 0
+        self.admitted_by_priority = {priority.name.lower(): 0 for priority in RequestPriority}
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=self.WAIT_SAMPLE_SIZE)
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    async def acquire(
+        self,
+        priority: Optional[RequestPriority] = None,
+        tenant: Optional[str] = None
+    ) -> float:
+        """
+        Wait for a slot in this lane
+
+        Args:
+            priority: Defaults to the current request context's priority
+            tenant: Defaults to the current request context's user
+
+        Returns:
+            Seconds spent waiting
+        """
+        priority = get_request_priority() if priority is None else priority
+        tenant = tenant or get_request_tenant()
+        self._bind_loop(asyncio.get_running_loop())
+
+        # Fast path: nothing queued and capacity available
+        if (
+            self._waiting == 0
+            and self.in_flight < self.max_concurrency
+            and (self.bucket is None or self.bucket.try_acquire())
+        ):
+            self.in_flight += 1
+            self._record_admission(priority, 0.0)
+            return 0.0
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), tenant, priority)
+        self._queues[priority].setdefault(tenant, deque()).append(waiter)
+        self._waiting += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._waiting)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted just as the caller was cancelled - hand it back
+                self.release()
+            else:
+                self._waiting -= 1
+                self.total_cancelled += 1
+            raise
+
+        return time.monotonic() - waiter.enqueued_at
+
+    def release(self) -> None:
+        """Return a slot and admit the next waiter"""
+        self.in_flight = max(0, self.in_flight - 1)
+        self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        priority: Optional[RequestPriority] = None,
+        tenant: Optional[str] = None
+    ) -> AsyncIterator[float]:
+        """Hold a slot for the duration of the block (yields the wait time)"""
+        waited = await self.acquire(priority, tenant)
+        epoch = self._epoch
+        try:
+            yield waited
+        finally:
+            if self._epoch == epoch:
+                self.release()
+
+    def _bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Drop queue state left behind by a previous event loop"""
+        if loop is self._loop:
+            return
+
+        if self._loop is not None:
+            if self._wakeup is not None and not self._loop.is_closed():
+                self._wakeup.cancel()
+            for tenants in self._queues.values():
+                tenants.clear()
+            self._waiting = 0
+            self._wakeup = None
+            self.in_flight = 0
+            self._epoch += 1
+            self.loop_resets += 1
+        self._loop = loop
+
+    def _record_admission(self, priority: RequestPriority, waited: float) -> None:
+        self.total_admitted += 1
+        self.admitted_by_priority[priority.name.lower()] += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self._recent_waits.append(waited)
+
+    # ------------------------------------------------------------------
+    # Queueing
+    # ------------------------------------------------------------------
+
+    def _head(self, tenants: "OrderedDict[str, Deque[_Waiter]]", tenant: str) -> Optional[_Waiter]:
+        """First live waiter of a tenant (drops cancelled waiters)"""
+        queue = tenants[tenant]
+        while queue and queue[0].future.done():
+            queue.popleft()
+        if not queue:
+            del tenants[tenant]
+            return None
+        return queue[0]
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Pick the next waiter: aged waiters first, then priority, then round-robin"""
+        now = time.monotonic()
+        oldest_aged: Optional[_Waiter] = None
+        first_by_priority: Optional[_Waiter] = None
+
+        for priority in RequestPriority:
+            tenants = self._queues[priority]
+            for tenant in list(tenants.keys()):
+                head = self._head(tenants, tenant)
+                if head is None:
+                    continue
+                if first_by_priority is None:
+                    first_by_priority = head
+                if now - head.enqueued_at >= self.aging_seconds and (
+                    oldest_aged is None or head.enqueued_at < oldest_aged.enqueued_at
+                ):
+                    oldest_aged = head
+
+        return oldest_aged or first_by_priority
+
+    def _pop(self, waiter: _Waiter) -> None:
+        tenants = self._queues[waiter.priority]
+        queue = tenants[waiter.tenant]
+        queue.popleft()
+        if queue:
+            # Tenant goes to the back of the round-robin
+            tenants.move_to_end(waiter.tenant)
+        else:
+            del tenants[waiter.tenant]
+        self._waiting -= 1
+
+    def _dispatch(self) -> None:
+        """Admit waiters while there is capacity"""
+        while self.in_flight < self.max_concurrency:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+
+            if self.bucket is not None and not self.bucket.try_acquire():
+                self._schedule_wakeup(self.bucket.time_until_available())
+                return
+
+            self._pop(waiter)
+            self.in_flight += 1
+            self._record_admission(waiter.priority, time.monotonic() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        if self._wakeup is not None and not self._wakeup.cancelled():
+            return
+
+        def _wake():
+            self._wakeup = None
+            self._dispatch()
+
+        self._wakeup = asyncio.get_running_loop().call_later(max(delay, 0.001), _wake)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Live waiters per priority"""
+        return {
+            priority.name.lower(): sum(
+                sum(1 for w in queue if not w.future.done()) for queue in tenants.values()
+            )
+            for priority, tenants in self._queues.items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count and wait-time statistics"""
+        waits = sorted(self._recent_waits)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": self.requests_per_minute or None,
+            "in_flight": self.in_flight,
+            "queue_depth": self._waiting,
+            "queue_depth_by_priority": self.queue_depth(),
+            "waiting_users": len({
+                tenant for tenants in self._queues.values() for tenant in tenants
+            }),
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.total_admitted,
+            "admitted_by_priority": dict(self.admitted_by_priority),
+            "cancelled": self.total_cancelled,
+            "loop_resets": self.loop_resets,
+            "wait_seconds": {
+                "mean": self.total_wait / self.total_admitted if self.total_admitted else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": self.max_wait,
+            },
+        }
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+def _env_key(value: str) -> str:
+    return re.sub(r"[^A-Z0-9]", "_", value.upper())
+
+
+class GenerationScheduler:
+    """Registry of per-provider/model lanes"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        default_max_concurrency: int = 8,
+        default_requests_per_minute: float = 0,
+        aging_seconds: float = 30.0,
+        limits: Optional[Dict[str, Dict[str, float]]] = None
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            enabled: When False, slot() admits everything immediately
+            default_max_concurrency: Concurrency limit for lanes without an override
+            default_requests_per_minute: RPM limit for lanes without an override (0 = unlimited)
+            aging_seconds: Wait after which any request is served ahead of higher priorities
+            limits: Overrides keyed by "provider" or "provider:model", e.g.
+                {"anthropic": {"max_concurrency": 6, "requests_per_minute": 50}}
+        """
+        self.enabled = enabled
+        self.default_max_concurrency = default_max_concurrency
+        self.default_requests_per_minute = default_requests_per_minute
+        self.aging_seconds = aging_seconds
+        self.limits = limits or {}
+        self._lanes: Dict[str, SchedulerLane] = {}
+
+    def _limit(self, provider: str, model: str, field: str, default: float) -> float:
+        for key in (f"{provider}:{model}", provider):
+            if field in self.limits.get(key, {}):
+                return self.limits[key][field]
+
+        # Environment overrides, most specific first
+        env_name = "LLM_SCHEDULER_" + field.upper()
+        for var in (
+            f"{env_name}_{_env_key(provider)}_{_env_key(model)}",
+            f"{env_name}_{_env_key(provider)}",
+        ):
+            if os.getenv(var):
+                return float(os.getenv(var))
+        return default
+
+    def lane(self, provider: str, model: str) -> SchedulerLane:
+        """Get (or create) the lane for a provider/model"""
+        name = f"{provider}:{model}"
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane = SchedulerLane(
+                name=name,
+                max_concurrency=int(self._limit(provider, model, "max_concurrency", self.default_max_concurrency)),
+                requests_per_minute=self._limit(provider, model, "requests_per_minute", self.default_requests_per_minute),
+                aging_seconds=self.aging_seconds,
+            )
+            self._lanes[name] = lane
+        return lane
+
+    @contextlib.asynccontextmanager
+    async def slot(self, provider: str, model: str) -> AsyncIterator[float]:
+        """
+        Hold a slot in the provider/model lane for the duration of the block
+
+        Priority and user come from the current request context.
+
+        Yields:
+            Seconds spent waiting for the slot
+        """
+        if not self.enabled:
+            yield 0.0
+            return
+        async with self.lane(provider, model).slot() as waited:
+            yield waited
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-lane metrics"""
+        return {
+            "enabled": self.enabled,
+            "lanes": {name: lane.get_stats() for name, lane in self._lanes.items()},
+        }
+
+    def lane_names(self) -> List[str]:
+        return list(self._lanes.keys())
+
+    @classmethod
+    def from_env(cls) -> "GenerationScheduler":
+        """
+        Build a scheduler from environment variables
+
+        LLM_SCHEDULER_ENABLED: "true" (default) or "false"
+        LLM_SCHEDULER_MAX_CONCURRENCY: Default in-flight limit per lane (8)
+        LLM_SCHEDULER_REQUESTS_PER_MINUTE: Default RPM per lane (0 = unlimited)
+        LLM_SCHEDULER_AGING_SECONDS: Starvation guard for low-priority work (30)
+
+        Per-lane overrides append the provider and optionally the model, e.g.
+        LLM_SCHEDULER_MAX_CONCURRENCY_ANTHROPIC=6 or
+        LLM_SCHEDULER_REQUESTS_PER_MINUTE_ANTHROPIC_CLAUDE_SONNET_4_5=50
+        """
+        return cls(
+            enabled=os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() == "true",
+            default_max_concurrency=int(os.getenv("LLM_SCHEDULER_MAX_CONCURRENCY", "8")),
+            default_requests_per_minute=float(os.getenv("LLM_SCHEDULER_REQUESTS_PER_MINUTE", "0")),
+            aging_seconds=float(os.getenv("LLM_SCHEDULER_AGING_SECONDS", "30")),
+        )
+
+
+# Global scheduler
+_scheduler: Optional[GenerationScheduler] = None
+
+
+def get_scheduler() -> GenerationScheduler:
+    """Get global generation scheduler (built from env on first use)"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = GenerationScheduler.from_env()
+    return _scheduler
+
+
+def set_scheduler(scheduler: Optional[GenerationScheduler]):
+    """Set global generation scheduler"""
+    global _scheduler
+    _scheduler = scheduler
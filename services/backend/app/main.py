@@ -12,6 +12,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Heavy dependencies load on first use when LAZY_INIT is on (see app.core.lazy)
+from app.core.lazy import is_lazy_init, warm_up
+
 # Import routers
 from app.routers import tastes, projects
 from app.routers import dtm
@@ -57,6 +60,11 @@ async def shutdown_event():
         print(f"Error closing scraper: {e}")
     """
 
+    from app.core.async_io import shutdown_io_executor
+    from app.core.async_cpu import shutdown_cpu_executor
+    shutdown_io_executor(wait=False)
+    shutdown_cpu_executor(wait=False)
+
 # Get ALLOWED_ORIGINS from environment
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*")
 if ALLOWED_ORIGINS != "*":
@@ -74,6 +82,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination cursor for list endpoints
 )
 
 # AWS Cognito configuration from environment
@@ -169,6 +178,18 @@ async def health():
     """Health check endpoint"""
     return {"status": "healthy", "service": "osyle-api"}
 
+@app.get("/api/metrics/llm-scheduler")
+async def llm_scheduler_metrics(user: dict = Depends(verify_token)):
+    """LLM scheduler metrics: in-flight, queue depth and wait times per provider/model"""
+    from app.llm.utils.scheduler import get_scheduler
+    return get_scheduler().get_stats()
+
+@app.get("/api/metrics/llm-streaming")
+async def llm_streaming_metrics(user: dict = Depends(verify_token)):
+    """Streamed generation metrics: time to first token, tokens/s and prompt cache hit ratio per model"""
+    from app.llm.utils.cost import get_tracker
+    return get_tracker().get_stream_stats()
+
 @app.get("/api/protected")
 async def protected_route(user: dict = Depends(verify_token)):
     """Protected endpoint - requires valid JWT"""
@@ -199,6 +220,12 @@ app.include_router(relay_router.router)
 app.include_router(shares.router)
 # app.include_router(mobbin_router)  # DISABLED: Uses Playwright
 
+# Eager mode: load providers, PIL and AWS handles now rather than
+# on the first request that needs them
+if not is_lazy_init():
+    _warm_up_ms = warm_up()
+    print(f"Eager init: {', '.join(f'{name} {ms:.0f}ms' for name, ms in _warm_up_ms.items())}")
+
 
 # Create Mangum handler for HTTP events
 mangum_handler = Mangum(app)
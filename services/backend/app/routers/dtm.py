@@ -26,7 +26,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from typing import Optional
 from pydantic import BaseModel
 from app.core.auth import get_current_user
-from app.core import db
+from app.core import async_db
+from app.core.async_io import run_blocking
 from app.dtm import storage as dtm_storage
 
 router = APIRouter(prefix="/api/dtm", tags=["dtm"])
@@ -58,7 +59,7 @@ async def get_dtm_status(
     Get DTM status for a taste.
     Fast — does not call any LLM; reads DB metadata and optionally S3.
     """
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         raise HTTPException(status_code=404, detail="Taste not found")
 
@@ -74,12 +75,12 @@ async def get_dtm_status(
     if not has_dtm:
         return DTMStatusResponse(exists=False, resource_count=0, needs_rebuild=needs_rebuild)
 
-    dtm = dtm_storage.load_dtm(taste_id)
+    dtm = await run_blocking(dtm_storage.load_dtm, taste_id)
 
     if not dtm:
         # DB says yes but file is gone — fix the inconsistency
         metadata["has_dtm"] = False
-        db.update_taste(taste_id, metadata=metadata)
+        await async_db.update_taste(taste_id, metadata=metadata)
         return DTMStatusResponse(exists=False, resource_count=0, needs_rebuild=needs_rebuild)
 
     return DTMStatusResponse(
@@ -100,21 +101,21 @@ async def delete_dtm(
     Delete DTM for a taste.
     Fast — no LLM calls.
     """
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         raise HTTPException(status_code=404, detail="Taste not found")
 
     if taste.get("owner_id") != user["user_id"]:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    dtm_storage.delete_dtm(taste_id)
+    await run_blocking(dtm_storage.delete_dtm, taste_id)
 
     try:
         metadata = taste.get("metadata", {})
         metadata["has_dtm"] = False
         metadata.pop("dtm_resource_count", None)
         metadata.pop("dtm_last_updated", None)
-        db.update_taste(taste_id, metadata=metadata)
+        await async_db.update_taste(taste_id, metadata=metadata)
     except Exception as e:
         print(f"Warning: Failed to update database after DTM delete: {e}")
 
@@ -129,13 +130,13 @@ async def get_dtm_data(
     Get full DTM data for a taste.
     Used by Taste Studio to render the taste profile visualization.
     """
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         raise HTTPException(status_code=404, detail="Taste not found")
     if taste.get("owner_id") != user["user_id"]:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    dtm = dtm_storage.load_dtm(taste_id)
+    dtm = await run_blocking(dtm_storage.load_dtm, taste_id)
     if not dtm:
         raise HTTPException(status_code=404, detail="DTM not found. Build the taste model first.")
 
@@ -1,10 +1,11 @@
 """
 Projects API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Request, Query, Response
 from typing import List, Optional
 from app.core.auth import get_current_user
-from app.core import db, storage
+from app.core import db, storage, async_db, async_storage
+from app.core.async_io import run_blocking
 from app.core.models import (
     ProjectCreate,
     ProjectOut,
@@ -73,7 +74,7 @@ async def create_project(
     screen_defs = json.loads(screen_definitions_str) if screen_definitions_str else []
     
     # Ensure user exists in database
-    db.ensure_user(
+    await async_db.ensure_user(
         user_id=user["user_id"],
         email=user["email"],
         name=user.get("name"),
@@ -82,7 +83,7 @@ async def create_project(
     
     # Validate taste ownership if provided
     if selected_taste_id:
-        taste = db.get_taste(selected_taste_id)
+        taste = await async_db.get_taste(selected_taste_id)
         if not taste:
             raise HTTPException(status_code=404, detail="Selected taste not found")
         if taste.get("owner_id") != user["user_id"]:
@@ -98,7 +99,7 @@ async def create_project(
         
         # Validate each resource
         for resource_id in resource_ids:
-            resource = db.get_resource(resource_id)
+            resource = await async_db.get_resource(resource_id)
             if not resource:
                 raise HTTPException(
                     status_code=404, 
@@ -136,11 +137,10 @@ async def create_project(
                     
                     try:
                         content = await figma_file.read()
-                        storage.s3_client.put_object(
-                            Bucket=storage.S3_BUCKET,
-                            Key=s3_key,
-                            Body=content,
-                            ContentType='application/json'
+                        await async_storage.put_object_bytes(
+                            s3_key,
+                            content,
+                            'application/json'
                         )
                     except Exception as e:
                         raise HTTPException(
@@ -172,11 +172,10 @@ async def create_project(
                     
                     try:
                         content = await image_file.read()
-                        storage.s3_client.put_object(
-                            Bucket=storage.S3_BUCKET,
-                            Key=s3_key,
-                            Body=content,
-                            ContentType=image_file.content_type
+                        await async_storage.put_object_bytes(
+                            s3_key,
+                            content,
+                            image_file.content_type
                         )
                     except Exception as e:
                         raise HTTPException(
@@ -221,11 +220,10 @@ async def create_project(
             # Upload to S3
             try:
                 content = await image_file.read()
-                storage.s3_client.put_object(
-                    Bucket=storage.S3_BUCKET,
-                    Key=s3_key,
-                    Body=content,
-                    ContentType=image_file.content_type
+                await async_storage.put_object_bytes(
+                    s3_key,
+                    content,
+                    image_file.content_type
                 )
                 inspiration_keys.append(s3_key)
             except Exception as e:
@@ -235,7 +233,7 @@ async def create_project(
                 )
     
     # Create project with explicit project_id
-    project = db.create_project(
+    project = await async_db.create_project(
         owner_id=user["user_id"],
         name=name,
         task_description=task_description,
@@ -256,12 +254,31 @@ async def create_project(
 
 
 @router.get("/", response_model=List[ProjectOut])
-async def list_projects(user: dict = Depends(get_current_user)):
+async def list_projects(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=db.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: dict = Depends(get_current_user)
+):
     """
     List all projects for the authenticated user
+    
+    - **limit**: Optional page size; when set, only one page is returned and
+      the cursor for the next page is sent in the X-Next-Cursor header
+    - **cursor**: Cursor from a previous page's X-Next-Cursor header
     """
-    projects = db.list_projects_for_owner(user["user_id"])
-    return projects
+    if limit is None:
+        projects = await async_db.list_projects_for_owner(user["user_id"])
+        return await async_storage.resolve_projects_flow_graphs(projects)
+    
+    try:
+        page = await async_db.list_projects_for_owner_page(user["user_id"], limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if page["next_cursor"]:
+        response.headers[db.NEXT_CURSOR_HEADER] = page["next_cursor"]
+    return await async_storage.resolve_projects_flow_graphs(page["items"])
 
 
 @router.get("/{project_id}", response_model=ProjectOut)
@@ -272,7 +289,7 @@ async def get_project(
     """
     Get a specific project by ID
     """
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -280,7 +297,7 @@ async def get_project(
     if project.get("owner_id") != user["user_id"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    return project
+    return await async_storage.resolve_project_flow_graph(project)
 
 
 @router.patch("/{project_id}", response_model=ProjectOut)
@@ -293,7 +310,7 @@ async def update_project(
     Update a project
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -303,7 +320,7 @@ async def update_project(
     # Validate taste ownership if being updated
     if payload.selected_taste_id is not None:
         if payload.selected_taste_id:  # Not empty string
-            taste = db.get_taste(payload.selected_taste_id)
+            taste = await async_db.get_taste(payload.selected_taste_id)
             if not taste:
                 raise HTTPException(status_code=404, detail="Selected taste not found")
             if taste.get("owner_id") != user["user_id"]:
@@ -323,7 +340,7 @@ async def update_project(
             
             # Validate each resource
             for resource_id in payload.selected_resource_ids:
-                resource = db.get_resource(resource_id)
+                resource = await async_db.get_resource(resource_id)
                 if not resource:
                     raise HTTPException(
                         status_code=404, 
@@ -341,7 +358,7 @@ async def update_project(
                     )
     
     # Update project
-    updated = db.update_project(
+    updated = await async_db.update_project(
         project_id=project_id,
         name=payload.name,
         task_description=payload.task_description,
@@ -351,7 +368,7 @@ async def update_project(
         image_generation_mode=payload.image_generation_mode
     )
     
-    return updated
+    return await async_storage.resolve_project_flow_graph(updated)
 
 
 @router.patch("/{project_id}/flow-graph")
@@ -364,20 +381,35 @@ async def update_project_flow_graph(
     Update project's flow_graph (including display_title and display_description)
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     if project.get("owner_id") != user["user_id"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Update flow_graph in database
-    updated = db.update_project_flow_graph(project_id, flow_graph)
+    flow_ref = project.get("flow_ref")
+    if not flow_ref:
+        # Project still embeds its graph (legacy or mid-generation)
+        updated = await async_db.update_project_flow_graph(project_id, flow_graph)
+        return {
+            "status": "success",
+            "message": "Flow graph updated successfully",
+            "flow_graph": updated.get("flow_graph")
+        }
+    
+    # Rewrite the current version's manifest in place; unchanged code is
+    # already stored, so display edits only write the manifest
+    version = int(flow_ref["version"])
+    flow_ref = await async_storage.put_project_flow(
+        user["user_id"], project_id, flow_graph, version=version, base_version=version
+    )
+    await async_db.update_project_flow_ref(project_id, flow_ref)
     
     return {
         "status": "success",
         "message": "Flow graph updated successfully",
-        "flow_graph": updated.get("flow_graph")
+        "flow_graph": flow_graph
     }
 
 
@@ -390,7 +422,7 @@ async def delete_project(
     Delete a project and all its output files
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -399,17 +431,17 @@ async def delete_project(
     
     # Delete output files from S3
     if project.get("outputs"):
-        storage.delete_project_outputs(
+        await async_storage.delete_project_outputs(
             owner_id=user["user_id"],
             project_id=project_id,
             output_keys=project["outputs"]
         )
     
     # Delete project from DB
-    db.delete_project(project_id)
+    await async_db.delete_project(project_id)
 
     # Clean up any share inbox records pointing to this project
-    db.delete_shares_for_project(project_id)
+    await async_db.delete_shares_for_project(project_id)
 
     return {"message": "Project deleted successfully"}
 
@@ -432,7 +464,7 @@ async def add_project_output(
     Returns a presigned PUT URL for direct upload to S3
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -481,7 +513,7 @@ async def confirm_output_upload(
     Call this after successfully uploading a file using the presigned URL
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -496,13 +528,13 @@ async def confirm_output_upload(
     )
     
     # Verify the file exists in S3
-    if not storage.check_object_exists(output_key):
+    if not await async_storage.check_object_exists(output_key):
         raise HTTPException(status_code=404, detail="File not found in S3. Upload may have failed.")
     
     # Add to project's outputs list
-    updated = db.add_project_output(project_id, output_key)
+    updated = await async_db.add_project_output(project_id, output_key)
     
-    return updated
+    return await async_storage.resolve_project_flow_graph(updated)
 
 
 @router.get("/{project_id}/outputs/{filename}/download", response_model=dict)
@@ -515,7 +547,7 @@ async def get_output_download_url(
     Get a presigned GET URL for downloading a project output file
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -560,7 +592,7 @@ async def get_inspiration_images(
     Returns list of objects with: { key, url, filename }
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -598,7 +630,7 @@ async def add_inspiration_images(
     - **inspiration_images**: List of image files to add (max 5 total per project)
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -640,11 +672,10 @@ async def add_inspiration_images(
         # Upload to S3
         try:
             content = await image_file.read()
-            storage.s3_client.put_object(
-                Bucket=storage.S3_BUCKET,
-                Key=s3_key,
-                Body=content,
-                ContentType=image_file.content_type
+            await async_storage.put_object_bytes(
+                s3_key,
+                content,
+                image_file.content_type
             )
             new_keys.append(s3_key)
         except Exception as e:
@@ -656,7 +687,8 @@ async def add_inspiration_images(
     # Update project with new image keys
     updated_keys = current_images + new_keys
     
-    response = db.projects_table.update_item(
+    response = await run_blocking(
+        db.projects_table.update_item,
         Key={"project_id": project_id},
         UpdateExpression="SET inspiration_image_keys = :keys, updated_at = :updated",
         ExpressionAttributeValues={
@@ -666,7 +698,7 @@ async def add_inspiration_images(
         ReturnValues="ALL_NEW"
     )
     
-    return response.get("Attributes", {})
+    return await async_storage.resolve_project_flow_graph(response.get("Attributes", {}))
 
 
 # ============================================================================
@@ -688,7 +720,7 @@ async def get_conversation(
         List of message objects: [{"id": str, "type": "user"|"ai", "content": str, "timestamp": str, "screen": str}, ...]
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -700,7 +732,7 @@ async def get_conversation(
         version = project.get("metadata", {}).get("flow_version", 1)
     
     # Load conversation from S3
-    conversation = storage.get_project_conversation(
+    conversation = await async_storage.get_project_conversation(
         user["user_id"],
         project_id,
         version
@@ -728,7 +760,7 @@ async def save_conversation(
         }
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -746,7 +778,7 @@ async def save_conversation(
     
     # Save to S3
     try:
-        storage.put_project_conversation(
+        await async_storage.put_project_conversation(
             user["user_id"],
             project_id,
             conversation,
@@ -776,7 +808,7 @@ async def delete_project_version(
     NOTE: Cannot delete the current version. Version numbers are not renumbered.
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -787,7 +819,7 @@ async def delete_project_version(
     metadata_version = project.get("metadata", {}).get("flow_version", 1)
     
     # Also get the actual highest version from S3
-    available_versions = storage.list_project_flow_versions(
+    available_versions = await async_storage.list_project_flow_versions(
         user["user_id"],
         project_id
     )
@@ -807,9 +839,8 @@ async def delete_project_version(
             detail=f"Cannot delete the current version ({current_version}). Revert to a different version first."
         )
     
-    # Check if version exists by verifying S3 file
-    flow_key = f"projects/{user['user_id']}/{project_id}/flow_v{version}.json"
-    if not storage.check_object_exists(flow_key):
+    # Check if version exists in S3
+    if version not in available_versions:
         raise HTTPException(
             status_code=404, 
             detail=f"Version {version} does not exist"
@@ -817,7 +848,7 @@ async def delete_project_version(
     
     # Delete from S3
     try:
-        success = storage.delete_project_flow_version(
+        success = await async_storage.delete_project_flow_version(
             user["user_id"],
             project_id,
             version
@@ -850,7 +881,7 @@ async def list_project_versions(
     Returns list of version numbers that exist in S3
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -858,7 +889,7 @@ async def list_project_versions(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Get list of versions from S3
-    versions = storage.list_project_flow_versions(
+    versions = await async_storage.list_project_flow_versions(
         user["user_id"],
         project_id
     )
@@ -886,7 +917,7 @@ async def save_screen_mutations(
     Mutations are style overrides applied by the user in the visual editor.
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -897,20 +928,23 @@ async def save_screen_mutations(
     mutations = mutations_data.get("mutations", [])
     
     # Delete existing mutations for this screen
-    deleted_count = db.delete_design_mutations_for_screen(project_id, screen_id)
+    deleted_count = await async_db.delete_design_mutations_for_screen(project_id, screen_id)
     
-    # Create new mutations
-    saved_count = 0
-    for mutation in mutations:
-        db.create_design_mutation(
-            project_id=project_id,
-            screen_id=screen_id,
-            mutation_type="style_override",
-            element_path=mutation.get("elementPath", ""),
-            element_index=mutation.get("elementIndex", 0),
-            mutation_data=mutation.get("styles", {})
-        )
-        saved_count += 1
+    # Create new mutations (batched writes)
+    created = await async_db.create_design_mutations(
+        project_id,
+        screen_id,
+        [
+            {
+                "mutation_type": "style_override",
+                "element_path": mutation.get("elementPath", ""),
+                "element_index": mutation.get("elementIndex", 0),
+                "mutation_data": mutation.get("styles", {})
+            }
+            for mutation in mutations
+        ]
+    )
+    saved_count = len(created)
     
     return {
         "success": True,
@@ -922,15 +956,21 @@ async def save_screen_mutations(
 async def get_screen_mutations(
     project_id: str,
     screen_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=db.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     user: dict = Depends(get_current_user)
 ):
     """
     Get all design mutations for a screen
     
     Returns all style overrides that the user has applied to this screen.
+    
+    - **limit**: Optional page size; when set, only one page is returned
+      and "nextCursor" points at the next one
+    - **cursor**: "nextCursor" from a previous page
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -938,7 +978,18 @@ async def get_screen_mutations(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Get mutations from database
-    mutations_db = db.get_design_mutations_for_screen(project_id, screen_id)
+    next_cursor = None
+    if limit is None:
+        mutations_db = await async_db.get_design_mutations_for_screen(project_id, screen_id)
+    else:
+        try:
+            page = await async_db.get_design_mutations_for_screen_page(
+                project_id, screen_id, limit, cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        mutations_db = page["items"]
+        next_cursor = page["next_cursor"]
     
     # Transform to frontend format
     mutations = [
@@ -955,7 +1006,8 @@ async def get_screen_mutations(
     ]
     
     return {
-        "mutations": mutations
+        "mutations": mutations,
+        "nextCursor": next_cursor
     }
 
 
@@ -971,7 +1023,7 @@ async def clear_screen_mutations(
     Deletes all style overrides, returning the screen to its AI-generated original state.
     """
     # Check ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -979,7 +1031,7 @@ async def clear_screen_mutations(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Delete all mutations for this screen
-    deleted_count = db.delete_design_mutations_for_screen(project_id, screen_id)
+    deleted_count = await async_db.delete_design_mutations_for_screen(project_id, screen_id)
     
     return {
         "success": True,
@@ -1004,7 +1056,7 @@ async def get_project_flow(
     user_id = user.get("user_id")
     
     try:
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
         
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
@@ -1013,7 +1065,7 @@ async def get_project_flow(
             raise HTTPException(status_code=403, detail="Not authorized")
         
         # Get list of versions
-        versions = storage.list_project_flow_versions(user_id, project_id)
+        versions = await async_storage.list_project_flow_versions(user_id, project_id)
         
         if not versions:
             raise HTTPException(status_code=404, detail="No flow versions found")
@@ -1028,7 +1080,7 @@ async def get_project_flow(
             )
         
         # Load flow from S3
-        flow_graph = storage.get_project_flow(user_id, project_id, target_version)
+        flow_graph = await async_storage.get_project_flow(user_id, project_id, target_version)
         
         if not flow_graph:
             raise HTTPException(status_code=404, detail="Flow data not found")
@@ -1056,7 +1108,7 @@ async def get_project_flow_versions(
     user_id = user.get("user_id")
     
     try:
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
         
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
@@ -1065,7 +1117,7 @@ async def get_project_flow_versions(
             raise HTTPException(status_code=403, detail="Not authorized")
         
         # Get list of versions
-        versions = storage.list_project_flow_versions(user_id, project_id)
+        versions = await async_storage.list_project_flow_versions(user_id, project_id)
         
         current_version = max(versions) if versions else 0
         
@@ -1097,7 +1149,7 @@ async def revert_project_flow_version(
     user_id = user.get("user_id")
     
     try:
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
         
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
@@ -1106,7 +1158,7 @@ async def revert_project_flow_version(
             raise HTTPException(status_code=403, detail="Not authorized")
         
         # Get list of versions
-        versions = storage.list_project_flow_versions(user_id, project_id)
+        versions = await async_storage.list_project_flow_versions(user_id, project_id)
         
         if not versions:
             raise HTTPException(status_code=404, detail="No flow versions found")
@@ -1117,27 +1169,28 @@ async def revert_project_flow_version(
                 detail=f"Version {version} not found"
             )
         
-        # Load the old version
-        old_flow_graph = storage.get_project_flow(user_id, project_id, version)
-        
-        if not old_flow_graph:
-            raise HTTPException(status_code=404, detail="Flow data not found")
-        
         # Create new version number (max + 1)
         new_version = max(versions) + 1
         
-        # Save as new version
-        storage.put_project_flow(user_id, project_id, old_flow_graph, new_version)
+        # Save as new version (copies the manifest only, screen code is shared).
+        # The graph isn't rebuilt here: clients load it with GET /flow if needed
+        try:
+            flow_ref = await async_storage.copy_project_flow_version(user_id, project_id, version, new_version)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Flow data not found")
         
-        # Update project's flow_graph in database
-        db.update_project_flow_graph(project_id, old_flow_graph)
+        # Point the project at the new version
+        await async_db.update_project_flow_ref(project_id, flow_ref)
+        metadata = project.get("metadata", {})
+        metadata["flow_version"] = new_version
+        await async_db.update_project(project_id, metadata=metadata)
         
         return {
             "status": "success",
             "message": f"Reverted to version {version} as new version {new_version}",
             "old_version": version,
             "new_version": new_version,
-            "flow_graph": old_flow_graph
+            "flow_ref": flow_ref
         }
         
     except HTTPException:
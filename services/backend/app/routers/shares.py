@@ -7,14 +7,17 @@ Flow:
   GET  /api/shares/sent           — list shares sent by the current user
   DELETE /api/shares/{share_id}   — delete a share record (sender or recipient)
   GET  /api/users/                — list all users for the share dropdown
+
+The list endpoints accept optional ?limit=&cursor= query params; when limit is
+set a single page is returned and the next cursor is sent in X-Next-Cursor.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, Response
+from typing import List, Optional, Dict, Any
 import uuid
 
 from app.core.auth import get_current_user
-from app.core import db, storage
+from app.core import db, storage, async_db, async_storage
 
 router = APIRouter(tags=["shares"])
 
@@ -23,13 +26,32 @@ router = APIRouter(tags=["shares"])
 # USER LISTING  (needed for the share-to dropdown)
 # ============================================================================
 
+async def _list_page(response: Response, fetch_page, *args, limit: int, cursor: Optional[str]) -> List[Dict[str, Any]]:
+    """Fetch one page via an async_db *_page function and set X-Next-Cursor."""
+    try:
+        page = await fetch_page(*args, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page["next_cursor"]:
+        response.headers[db.NEXT_CURSOR_HEADER] = page["next_cursor"]
+    return page["items"]
+
+
 @router.get("/api/users/", response_model=List[dict])
-async def list_users(user: dict = Depends(get_current_user)):
+async def list_users(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=db.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: dict = Depends(get_current_user),
+):
     """
     Return minimal user info for everyone in the system.
     Used to populate the recipient dropdown when sharing a project.
     """
-    users = db.list_all_users()
+    if limit is None:
+        users = await async_db.list_all_users()
+    else:
+        users = await _list_page(response, async_db.list_users_page, limit=limit, cursor=cursor)
     # Exclude the requesting user so you can't share with yourself
     return [
         {
@@ -78,14 +100,14 @@ async def create_share(
         raise HTTPException(status_code=400, detail="Cannot share a project with yourself")
 
     # Verify project ownership
-    project = db.get_project(project_id)
+    project = await async_db.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     if project.get("owner_id") != user["user_id"]:
         raise HTTPException(status_code=403, detail="Access denied")
 
     # Verify recipient exists
-    recipient = db.get_user(recipient_id)
+    recipient = await async_db.get_user(recipient_id)
     if not recipient:
         raise HTTPException(status_code=404, detail="Recipient user not found")
 
@@ -112,18 +134,17 @@ async def create_share(
         filename = f"screenshot_{idx}.{ext}"
         key = storage.get_share_screenshot_key(user["user_id"], share_id, filename)
         content = await img.read()
-        storage.s3_client.put_object(
-            Bucket=storage.S3_BUCKET,
-            Key=key,
-            Body=content,
-            ContentType=img.content_type,
+        await async_storage.put_object_bytes(
+            key,
+            content,
+            img.content_type
         )
         screenshot_keys.append(key)
 
     # ------------------------------------------------------------------
     # Deep-copy the project record into the recipient's account
     # ------------------------------------------------------------------
-    new_project = db.create_project(
+    new_project = await async_db.create_project(
         owner_id=recipient_id,
         name=project.get("name", "Shared Project"),
         task_description=project.get("task_description", ""),
@@ -145,19 +166,26 @@ async def create_share(
         project_id=new_project_id,
     )
 
-    # Copy the flow_graph reference into the new project row
+    # Copy the flow_graph into the new project row (embedded graphs only;
+    # stored versions are re-pointed below once their files are copied)
     flow_graph = project.get("flow_graph")
     if flow_graph:
-        db.update_project_flow_graph(new_project_id, flow_graph)
+        await async_db.update_project_flow_graph(new_project_id, flow_graph)
 
-    # Deep-copy S3 files (flow_vN.json, conversation_vN.json, etc.)
+    # Deep-copy S3 files (flow manifests and blobs, conversation_vN.json, etc.)
     try:
-        storage.copy_project_flow_for_recipient(
+        await async_storage.copy_project_flow_for_recipient(
             sender_id=user["user_id"],
             recipient_id=recipient_id,
             original_project_id=project_id,
             new_project_id=new_project_id,
         )
+        flow_ref = project.get("flow_ref")
+        if flow_ref and not flow_graph:
+            await async_db.update_project_flow_ref(
+                new_project_id,
+                storage.make_flow_ref(recipient_id, new_project_id, int(flow_ref["version"])),
+            )
     except Exception as e:
         # Don't fail the whole share if S3 copy fails — project record exists
         print(f"⚠️  S3 copy warning for share {share_id}: {e}")
@@ -165,7 +193,7 @@ async def create_share(
     # ------------------------------------------------------------------
     # Persist share metadata
     # ------------------------------------------------------------------
-    share = db.create_project_share(
+    share = await async_db.create_project_share(
         share_id=share_id,
         project_id=new_project_id,   # Points to the COPY in recipient's account
         sender_id=user["user_id"],
@@ -174,7 +202,7 @@ async def create_share(
         screenshot_keys=screenshot_keys,
     )
 
-    sender = db.get_user(user["user_id"]) or {}
+    sender = await async_db.get_user(user["user_id"]) or {}
 
     return {
         "share_id": share["share_id"],
@@ -186,23 +214,39 @@ async def create_share(
 
 
 @router.get("/api/shares/inbox")
-async def list_inbox(user: dict = Depends(get_current_user)):
+async def list_inbox(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=db.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: dict = Depends(get_current_user),
+):
     """
     List all project shares sent TO the current user.
     Returns shares enriched with sender info and the copied project data.
     """
-    shares = db.list_shares_for_recipient(user["user_id"])
+    if limit is None:
+        shares = await async_db.list_shares_for_recipient(user["user_id"])
+    else:
+        shares = await _list_page(
+            response, async_db.list_shares_for_recipient_page, user["user_id"],
+            limit=limit, cursor=cursor,
+        )
+
+    # The copied project lives under original_project_id in the share record
+    project_ids = [share.get("project_id") or share.get("original_project_id") for share in shares]
+
+    # Batch-read senders and projects instead of two reads per share
+    senders = await async_db.get_users([share["sender_id"] for share in shares])
+    projects = await async_db.get_projects(project_ids)
+    await async_storage.resolve_projects_flow_graphs(list(projects.values()))
 
     result = []
-    for share in shares:
+    for share, project_id in zip(shares, project_ids):
         # Enrich with sender info
-        sender = db.get_user(share["sender_id"]) or {}
-
-        # The copied project lives under original_project_id in the share record
-        project_id = share.get("project_id") or share.get("original_project_id")
+        sender = senders.get(share["sender_id"], {})
 
         # Enrich with project info (the copy in recipient's account)
-        project = db.get_project(project_id) if project_id else None
+        project = projects.get(project_id) if project_id else None
 
         # Generate presigned URLs for screenshots
         screenshot_urls = []
@@ -238,15 +282,29 @@ async def list_inbox(user: dict = Depends(get_current_user)):
 
 
 @router.get("/api/shares/sent")
-async def list_sent(user: dict = Depends(get_current_user)):
+async def list_sent(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=db.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: dict = Depends(get_current_user),
+):
     """List all shares sent BY the current user."""
-    shares = db.list_shares_sent_by(user["user_id"])
+    if limit is None:
+        shares = await async_db.list_shares_sent_by(user["user_id"])
+    else:
+        shares = await _list_page(
+            response, async_db.list_shares_sent_by_page, user["user_id"],
+            limit=limit, cursor=cursor,
+        )
+
+    sent_project_ids = [share.get("project_id") or share.get("original_project_id") for share in shares]
+    recipients = await async_db.get_users([share["recipient_id"] for share in shares])
+    projects = await async_db.get_projects(sent_project_ids)
 
     result = []
-    for share in shares:
-        recipient = db.get_user(share["recipient_id"]) or {}
-        sent_project_id = share.get("project_id") or share.get("original_project_id")
-        project = db.get_project(sent_project_id) if sent_project_id else None
+    for share, sent_project_id in zip(shares, sent_project_ids):
+        recipient = recipients.get(share["recipient_id"], {})
+        project = projects.get(sent_project_id) if sent_project_id else None
 
         result.append({
             "share_id": share["share_id"],
@@ -275,12 +333,12 @@ async def delete_share(share_id: str, user: dict = Depends(get_current_user)):
     Delete a share record.  Only the sender or recipient may delete.
     Does NOT delete the copied project — that remains in the recipient's account.
     """
-    share = db.get_share(share_id)
+    share = await async_db.get_share(share_id)
     if not share:
         raise HTTPException(status_code=404, detail="Share not found")
 
     if user["user_id"] not in (share["sender_id"], share["recipient_id"]):
         raise HTTPException(status_code=403, detail="Access denied")
 
-    db.delete_share(share_id)
+    await async_db.delete_share(share_id)
     return {"message": "Share deleted"}
\ No newline at end of file
@@ -1,11 +1,13 @@
 """
 Tastes and Resources API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+import asyncio
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from app.core.auth import get_current_user
-from app.core import db, storage
+from app.core import db, storage, async_db, async_storage
+from app.core.async_io import run_blocking
 from app.dtr import storage as dtr_storage
 from app.core.models import (
     TasteCreate,
@@ -38,7 +40,7 @@ async def create_taste(
     - **metadata**: Optional metadata dictionary
     """
     # Ensure user exists in database
-    db.ensure_user(
+    await async_db.ensure_user(
         user_id=user["user_id"],
         email=user["email"],
         name=user.get("name"),
@@ -46,7 +48,7 @@ async def create_taste(
     )
     
     # Create taste
-    taste = db.create_taste(
+    taste = await async_db.create_taste(
         owner_id=user["user_id"],
         name=payload.name,
         metadata=payload.metadata
@@ -63,12 +65,14 @@ async def list_tastes(user: dict = Depends(get_current_user)):
     """
     List all tastes for the authenticated user
     """
-    tastes = db.list_tastes_for_owner(user["user_id"])
+    tastes = await async_db.list_tastes_for_owner(user["user_id"])
     
-    # Add resource counts
-    for taste in tastes:
-        resources = db.list_resources_for_taste(taste["taste_id"])
-        taste["resource_count"] = len(resources)
+    # Add resource counts (COUNT queries, run concurrently)
+    counts = await asyncio.gather(*[
+        async_db.count_resources_for_taste(taste["taste_id"]) for taste in tastes
+    ])
+    for taste, count in zip(tastes, counts):
+        taste["resource_count"] = count
     
     return tastes
 
@@ -81,7 +85,7 @@ async def get_taste(
     """
     Get a specific taste by ID
     """
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     
     if not taste:
         raise HTTPException(status_code=404, detail="Taste not found")
@@ -90,8 +94,7 @@ async def get_taste(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Add resource count
-    resources = db.list_resources_for_taste(taste_id)
-    taste["resource_count"] = len(resources)
+    taste["resource_count"] = await async_db.count_resources_for_taste(taste_id)
     
     return taste
 
@@ -106,7 +109,7 @@ async def update_taste(
     Update a taste
     """
     # Check ownership
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         raise HTTPException(status_code=404, detail="Taste not found")
     
@@ -114,15 +117,14 @@ async def update_taste(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Update taste
-    updated = db.update_taste(
+    updated = await async_db.update_taste(
         taste_id=taste_id,
         name=payload.name,
         metadata=payload.metadata
     )
     
     # Add resource count
-    resources = db.list_resources_for_taste(taste_id)
-    updated["resource_count"] = len(resources)
+    updated["resource_count"] = await async_db.count_resources_for_taste(taste_id)
     
     return updated
 
@@ -136,7 +138,7 @@ async def delete_taste(
     Delete a taste and all its resources
     """
     # Check ownership
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         raise HTTPException(status_code=404, detail="Taste not found")
     
@@ -144,24 +146,25 @@ async def delete_taste(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Delete all resources in this taste
-    resources = db.list_resources_for_taste(taste_id)
+    resources = await async_db.list_resources_for_taste(taste_id)
     for resource in resources:
         # Delete S3 files
-        storage.delete_resource_files(
+        await async_storage.delete_resource_files(
             owner_id=user["user_id"],
             taste_id=taste_id,
             resource_id=resource["resource_id"]
         )
         # Delete DTR outputs
         try:
-            dtr_storage.delete_resource_dtr(resource["resource_id"])
+            await run_blocking(dtr_storage.delete_resource_dtr, resource["resource_id"])
         except Exception as e:
             print(f"Warning: Failed to delete DTR for resource {resource['resource_id']}: {e}")
-        # Delete resource from DB
-        db.delete_resource(resource["resource_id"])
+    
+    # Delete resources from DB in batches
+    await async_db.delete_resources(taste_id, [r["resource_id"] for r in resources])
     
     # Delete taste
-    db.delete_taste(taste_id)
+    await async_db.delete_taste(taste_id)
     
     return {"message": "Taste deleted successfully"}
 
@@ -182,7 +185,7 @@ async def create_resource(
     Returns the resource object and presigned PUT URLs for uploading files
     """
     # Check taste ownership
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         raise HTTPException(status_code=404, detail="Taste not found")
     
@@ -195,7 +198,7 @@ async def create_resource(
     image_key = storage.get_image_key(user["user_id"], taste_id, resource_id)
     
     # Create resource in database with the SAME resource_id
-    resource = db.create_resource(
+    resource = await async_db.create_resource(
         resource_id=resource_id,  # ✅ PASS THE ID HERE
         taste_id=taste_id,
         owner_id=user["user_id"],
@@ -224,21 +227,37 @@ async def create_resource(
 @router.get("/{taste_id}/resources", response_model=List[ResourceOut])
 async def list_resources(
     taste_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=db.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     user: dict = Depends(get_current_user)
 ):
     """
     List all resources in a taste
+    
+    - **limit**: Optional page size; when set, only one page is returned and
+      the cursor for the next page is sent in the X-Next-Cursor header
+    - **cursor**: Cursor from a previous page's X-Next-Cursor header
     """
     # Check taste ownership
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         raise HTTPException(status_code=404, detail="Taste not found")
     
     if taste.get("owner_id") != user["user_id"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    resources = db.list_resources_for_taste(taste_id)
-    return resources
+    if limit is None:
+        return await async_db.list_resources_for_taste(taste_id)
+    
+    try:
+        page = await async_db.list_resources_for_taste_page(taste_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if page["next_cursor"]:
+        response.headers[db.NEXT_CURSOR_HEADER] = page["next_cursor"]
+    return page["items"]
 
 
 @router.get("/{taste_id}/resources/{resource_id}", response_model=ResourceOut)
@@ -253,7 +272,7 @@ async def get_resource(
     
     - **include_download_urls**: If true, include presigned GET URLs for files
     """
-    resource = db.get_resource(resource_id)
+    resource = await async_db.get_resource(resource_id)
     
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
@@ -291,7 +310,7 @@ async def update_resource(
     Use this endpoint to mark files as uploaded (has_figma, has_image)
     """
     # Check ownership
-    resource = db.get_resource(resource_id)
+    resource = await async_db.get_resource(resource_id)
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
     
@@ -302,7 +321,7 @@ async def update_resource(
         raise HTTPException(status_code=400, detail="Resource does not belong to this taste")
     
     # Update resource
-    updated = db.update_resource(
+    updated = await async_db.update_resource(
         resource_id=resource_id,
         name=payload.name,
         has_figma=payload.has_figma,
@@ -324,7 +343,7 @@ async def delete_resource(
     Sets needs_dtm_rebuild flag instead of triggering immediate rebuild
     """
     # Check ownership
-    resource = db.get_resource(resource_id)
+    resource = await async_db.get_resource(resource_id)
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
     
@@ -335,7 +354,7 @@ async def delete_resource(
         raise HTTPException(status_code=400, detail="Resource does not belong to this taste")
     
     # Delete S3 files
-    storage.delete_resource_files(
+    await async_storage.delete_resource_files(
         owner_id=user["user_id"],
         taste_id=taste_id,
         resource_id=resource_id
@@ -343,16 +362,16 @@ async def delete_resource(
     
     # Delete DTR outputs
     try:
-        dtr_storage.delete_resource_dtr(resource_id)
+        await run_blocking(dtr_storage.delete_resource_dtr, resource_id)
     except Exception as e:
         print(f"Warning: Failed to delete DTR for resource {resource_id}: {e}")
     
     # Delete resource from DB
-    db.delete_resource(resource_id)
+    await async_db.delete_resource(resource_id)
     print(f"✓ Deleted resource {resource_id} from database")
     
     # Set needs_dtm_rebuild flag on taste (if it has or had DTM)
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if taste:
         metadata = taste.get("metadata", {})
         has_dtm = metadata.get("has_dtm")
@@ -364,11 +383,11 @@ async def delete_resource(
         if has_dtm:
             metadata["needs_dtm_rebuild"] = True
             metadata["last_deleted_at"] = datetime.utcnow().isoformat()
-            db.update_taste(taste_id, metadata=metadata)
+            await async_db.update_taste(taste_id, metadata=metadata)
             print(f"✓ Marked taste {taste_id} as needing DTM rebuild (needs_dtm_rebuild=True)")
             
             # Verify the update
-            updated_taste = db.get_taste(taste_id)
+            updated_taste = await async_db.get_taste(taste_id)
             updated_metadata = updated_taste.get("metadata", {})
             print(f"✓ Verification: needs_dtm_rebuild={updated_metadata.get('needs_dtm_rebuild')}")
         else:
@@ -392,7 +411,7 @@ async def get_resource_dtr(
     Get full DTR data (all passes) for a resource.
     Used by Taste Studio to display per-resource design taste representation.
     """
-    resource = db.get_resource(resource_id)
+    resource = await async_db.get_resource(resource_id)
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
     if resource.get("owner_id") != user["user_id"]:
@@ -409,13 +428,17 @@ async def get_resource_dtr(
         "pass_6_complete_dtr",
     ]
 
-    passes = {}
-    for pass_name in pass_names:
-        data = dtr_storage.load_pass_result(resource_id, pass_name)
-        if data:
-            passes[pass_name] = data
+    # Fetch all pass outputs and the status object concurrently
+    *pass_results, status = await asyncio.gather(
+        *[run_blocking(dtr_storage.load_pass_result, resource_id, pass_name) for pass_name in pass_names],
+        run_blocking(dtr_storage.load_extraction_status, resource_id),
+    )
 
-    status = dtr_storage.load_extraction_status(resource_id)
+    passes = {
+        pass_name: data
+        for pass_name, data in zip(pass_names, pass_results)
+        if data
+    }
 
     return {
         "resource_id": resource_id,
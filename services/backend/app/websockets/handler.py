@@ -3,6 +3,8 @@ WebSocket Handler for Long-Running LLM Operations - V3
 Updated to use NEW DTR/DTM system (S3-based, Pass 6/7)
 Supports default taste-driven generation (Phase 1 focus)
 """
+import asyncio
+import os
 import json
 import base64
 import re
@@ -10,15 +12,18 @@ from decimal import Decimal
 from fastapi import WebSocket, WebSocketDisconnect
 from typing import Dict, Any, List, Optional
 
-from app.llm import get_llm_service
+from app.llm import get_llm_service, RequestPriority, request_context
 from app.llm.types import Message, MessageRole
-from app.core import db, storage
+from app.llm.utils.images import prepare_image, shared_image
+from app.core import db, storage, async_db, async_storage
+from app.core.async_io import run_blocking
 from app.core.db import convert_decimals  # Import for Decimal conversion
 
 # Generation imports
+from app.generation.component_bundle import BUNDLE_REF_KEY, get_default_bundle, missing_components
 from app.generation.orchestrator import GenerationOrchestrator
 from app.generation.parametric import ParametricGenerator
-from app.generation.unified_flow import generate_unified_flow  # NEW: Unified flow generation
+from app.generation.unified_flow import generate_unified_flow, FLOW_GENERATION_MODEL  # NEW: Unified flow generation
 
 # NEW DTM/DTR imports (S3-based system)
 from app.dtm import builder as dtm_builder
@@ -39,6 +44,10 @@ from app.feedback.variation import VariationGenerator
 # Copy generation imports
 from app.copygen import generate_copy_response, extract_final_copy
 
+# Screens edited in parallel by one iterate-ui request
+ITERATE_UI_MAX_CONCURRENCY = int(os.getenv("ITERATE_UI_MAX_CONCURRENCY", "4"))
+
+
 async def send_progress(websocket: WebSocket, stage: str, message: str, data: Dict[str, Any] = None):
     """Send progress update to client"""
     await websocket.send_json({
@@ -109,6 +118,7 @@ async def handle_build_dtr(websocket: WebSocket, data: Dict[str, Any], user_id:
         # Extract parameters
         resource_id = data.get("resource_id")
         taste_id = data.get("taste_id")
+        force = bool(data.get("force", False))  # Re-run passes even if inputs are unchanged
         
         if not resource_id:
             await send_error(websocket, "resource_id is required")
@@ -120,7 +130,7 @@ async def handle_build_dtr(websocket: WebSocket, data: Dict[str, Any], user_id:
         
         # Get resource from database
         await send_progress(websocket, "init", "Loading resource...")
-        resource = db.get_resource(resource_id)
+        resource = await async_db.get_resource(resource_id)
         
         if not resource:
             await send_error(websocket, f"Resource {resource_id} not found")
@@ -152,11 +162,7 @@ async def handle_build_dtr(websocket: WebSocket, data: Dict[str, Any], user_id:
             if figma_key:
                 try:
                     print(f"Downloading Figma JSON from S3: {figma_key}")
-                    figma_obj = storage.s3_client.get_object(
-                        Bucket=storage.S3_BUCKET,
-                        Key=figma_key
-                    )
-                    figma_content = figma_obj['Body'].read()
+                    figma_content = await async_storage.get_object_bytes(figma_key)
                     figma_json = json.loads(figma_content)
                     print(f"✅ Downloaded Figma JSON ({len(figma_content)} bytes)")
                 except Exception as e:
@@ -168,11 +174,7 @@ async def handle_build_dtr(websocket: WebSocket, data: Dict[str, Any], user_id:
             if image_key:
                 try:
                     print(f"Downloading image from S3: {image_key}")
-                    image_obj = storage.s3_client.get_object(
-                        Bucket=storage.S3_BUCKET,
-                        Key=image_key
-                    )
-                    image_bytes = image_obj['Body'].read()
+                    image_bytes = await async_storage.get_object_bytes(image_key)
                     
                     # Detect format
                     if image_key.endswith('.jpg') or image_key.endswith('.jpeg'):
@@ -201,106 +203,125 @@ async def handle_build_dtr(websocket: WebSocket, data: Dict[str, Any], user_id:
         
         # Run Passes 1-4 in parallel (they're independent)
         from app.dtr import extract_pass_1_only, extract_pass_2_only, extract_pass_3_only, extract_pass_4_only, extract_pass_5_only
-        import asyncio
+        from app.dtr.passes import Pass6Personality
+        from app.dtr.extractors.vision import VisionAnalyzer
+        from app.dtr.storage import hash_pass_inputs
         
         print(f"Starting Passes 1-5 extraction in parallel for resource {resource_id}")
         
-        # Run all five passes concurrently
-        pass_1_task = extract_pass_1_only(
-            resource_id=resource_id,
-            taste_id=taste_id,
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format,
-            progress_callback=progress_callback
-        )
+        # Hash the inputs once; passes whose inputs are unchanged reuse their saved result
+        input_hash = await asyncio.to_thread(hash_pass_inputs, figma_json, image_bytes, image_format)
+        
+        # Prepare the screenshot once per provider (resized, smallest encoding,
+        # base64) for every vision call in Passes 1-6 instead of once per call
+        async with shared_image(image_bytes, image_format, models=(VisionAnalyzer.MODEL, Pass6Personality.MODEL)):
+            # Run all five passes concurrently
+            pass_1_task = extract_pass_1_only(
+                resource_id=resource_id,
+                taste_id=taste_id,
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                progress_callback=progress_callback,
+                input_hash=input_hash,
+                force=force
+            )
         
-        pass_2_task = extract_pass_2_only(
-            resource_id=resource_id,
-            taste_id=taste_id,
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format,
-            progress_callback=progress_callback
-        )
+            pass_2_task = extract_pass_2_only(
+                resource_id=resource_id,
+                taste_id=taste_id,
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                progress_callback=progress_callback,
+                input_hash=input_hash,
+                force=force
+            )
         
-        pass_3_task = extract_pass_3_only(
-            resource_id=resource_id,
-            taste_id=taste_id,
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format,
-            progress_callback=progress_callback
-        )
+            pass_3_task = extract_pass_3_only(
+                resource_id=resource_id,
+                taste_id=taste_id,
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                progress_callback=progress_callback,
+                input_hash=input_hash,
+                force=force
+            )
         
-        pass_4_task = extract_pass_4_only(
-            resource_id=resource_id,
-            taste_id=taste_id,
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format,
-            progress_callback=progress_callback
-        )
+            pass_4_task = extract_pass_4_only(
+                resource_id=resource_id,
+                taste_id=taste_id,
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                progress_callback=progress_callback,
+                input_hash=input_hash,
+                force=force
+            )
         
-        pass_5_task = extract_pass_5_only(
-            resource_id=resource_id,
-            taste_id=taste_id,
-            figma_json=figma_json,
-            image_bytes=image_bytes,
-            image_format=image_format,
-            progress_callback=progress_callback
-        )
+            pass_5_task = extract_pass_5_only(
+                resource_id=resource_id,
+                taste_id=taste_id,
+                figma_json=figma_json,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                progress_callback=progress_callback,
+                input_hash=input_hash,
+                force=force
+            )
         
-        # Wait for all five to complete
-        pass_1_result, pass_2_result, pass_3_result, pass_4_result, pass_5_result = await asyncio.gather(
-            pass_1_task, 
-            pass_2_task,
-            pass_3_task,
-            pass_4_task,
-            pass_5_task
-        )
+            # Wait for all five to complete
+            pass_1_result, pass_2_result, pass_3_result, pass_4_result, pass_5_result = await asyncio.gather(
+                pass_1_task, 
+                pass_2_task,
+                pass_3_task,
+                pass_4_task,
+                pass_5_task
+            )
         
-        print(f"✅ Pass 1 extraction completed!")
-        print(f"   Authority: {pass_1_result.get('authority')}")
-        print(f"   Confidence: {pass_1_result.get('confidence')}")
-        print(f"   Layout type: {pass_1_result.get('layout', {}).get('type')}")
-        
-        print(f"✅ Pass 2 extraction completed!")
-        print(f"   Authority: {pass_2_result.get('authority')}")
-        print(f"   Confidence: {pass_2_result.get('confidence')}")
-        print(f"   Colors found: {len(pass_2_result.get('colors', {}).get('exact_palette', []))}")
-        
-        print(f"✅ Pass 3 extraction completed!")
-        print(f"   Authority: {pass_3_result.get('authority')}")
-        print(f"   Confidence: {pass_3_result.get('confidence')}")
-        print(f"   Families found: {len(pass_3_result.get('families', []))}")
-        
-        print(f"✅ Pass 4 extraction completed!")
-        print(f"   Authority: {pass_4_result.get('authority')}")
-        print(f"   Confidence: {pass_4_result.get('confidence')}")
-        print(f"   Has images: {pass_4_result.get('has_images')}")
-        print(f"   Image density: {pass_4_result.get('image_density')}")
-        print(f"   Placements found: {len(pass_4_result.get('placements', []))}")
-        
-        print(f"✅ Pass 5 extraction completed!")
-        print(f"   Authority: {pass_5_result.get('authority')}")
-        print(f"   Confidence: {pass_5_result.get('confidence')}")
-        print(f"   Components found: {pass_5_result.get('total_components')}")
-        print(f"   Variants found: {pass_5_result.get('total_variants')}")
-        
-        # NOW run Pass 6 (personality synthesis) - depends on Pass 1-5
-        print(f"🎨 Starting Pass 6: Personality synthesis...")
-        await send_progress(websocket, "pass-6", "Synthesizing complete DTR...")
-        
-        from app.dtr import extract_pass_6_only
-        
-        pass_6_result = await extract_pass_6_only(
-            resource_id=resource_id,
-            taste_id=taste_id,
-            image_bytes=image_bytes,
-            image_format=image_format,
-            progress_callback=progress_callback
-        )
+            print(f"✅ Pass 1 extraction completed!")
+            print(f"   Authority: {pass_1_result.get('authority')}")
+            print(f"   Confidence: {pass_1_result.get('confidence')}")
+            print(f"   Layout type: {pass_1_result.get('layout', {}).get('type')}")
+        
+            print(f"✅ Pass 2 extraction completed!")
+            print(f"   Authority: {pass_2_result.get('authority')}")
+            print(f"   Confidence: {pass_2_result.get('confidence')}")
+            print(f"   Colors found: {len(pass_2_result.get('colors', {}).get('exact_palette', []))}")
+        
+            print(f"✅ Pass 3 extraction completed!")
+            print(f"   Authority: {pass_3_result.get('authority')}")
+            print(f"   Confidence: {pass_3_result.get('confidence')}")
+            print(f"   Families found: {len(pass_3_result.get('families', []))}")
+        
+            print(f"✅ Pass 4 extraction completed!")
+            print(f"   Authority: {pass_4_result.get('authority')}")
+            print(f"   Confidence: {pass_4_result.get('confidence')}")
+            print(f"   Has images: {pass_4_result.get('has_images')}")
+            print(f"   Image density: {pass_4_result.get('image_density')}")
+            print(f"   Placements found: {len(pass_4_result.get('placements', []))}")
+        
+            print(f"✅ Pass 5 extraction completed!")
+            print(f"   Authority: {pass_5_result.get('authority')}")
+            print(f"   Confidence: {pass_5_result.get('confidence')}")
+            print(f"   Components found: {pass_5_result.get('total_components')}")
+            print(f"   Variants found: {pass_5_result.get('total_variants')}")
+        
+            # NOW run Pass 6 (personality synthesis) - depends on Pass 1-5
+            print(f"🎨 Starting Pass 6: Personality synthesis...")
+            await send_progress(websocket, "pass-6", "Synthesizing complete DTR...")
+        
+            from app.dtr import extract_pass_6_only
+        
+            pass_6_result = await extract_pass_6_only(
+                resource_id=resource_id,
+                taste_id=taste_id,
+                image_bytes=image_bytes,
+                image_format=image_format,
+                progress_callback=progress_callback,
+                force=force
+            )
         
         print(f"✅ Pass 6 extraction completed!")
         print(f"   Authority: {pass_6_result.get('authority')}")
@@ -314,12 +335,12 @@ async def handle_build_dtr(websocket: WebSocket, data: Dict[str, Any], user_id:
         # ====================================================================
         print(f"📝 Updating database: Setting has_dtr = True for resource {resource_id}")
         try:
-            resource = db.get_resource(resource_id)
+            resource = await async_db.get_resource(resource_id)
             if resource:
                 metadata = resource.get("metadata", {})
                 metadata["has_dtr"] = True
                 # Update only the metadata field (don't use return value)
-                db.update_resource(resource_id=resource_id, metadata=metadata)
+                await async_db.update_resource(resource_id=resource_id, metadata=metadata)
                 print(f"✅ Database updated: has_dtr = True")
             else:
                 print(f"⚠️  Warning: Resource {resource_id} not found in database")
@@ -335,7 +356,7 @@ async def handle_build_dtr(websocket: WebSocket, data: Dict[str, Any], user_id:
         print(f"🔄 Invalidating global DTM for taste {taste_id}...")
         try:
             from app.dtm import storage as dtm_storage
-            dtm_storage.invalidate_global_dtm(taste_id)
+            await run_blocking(dtm_storage.invalidate_global_dtm, taste_id, resource_id)
             print(f"✅ Global DTM invalidated")
         except Exception as e:
             print(f"⚠️  Warning: Failed to invalidate DTM: {e}")
@@ -401,7 +422,7 @@ async def build_dtm_for_taste(
     """
     
     # Count resources with DTRs (DB is now source of truth)
-    resources = db.list_resources_for_taste(taste_id)
+    resources = await async_db.list_resources_for_taste(taste_id)
     resource_ids = [
         r["resource_id"] 
         for r in resources 
@@ -437,7 +458,8 @@ async def build_dtm_for_taste(
             taste_id=taste_id,
             resource_ids=resource_ids,
             llm=llm,
-            priority_mode=False  # Use all resources equally
+            priority_mode=False,  # Use all resources equally
+            incremental=True  # Only process resources added/changed since the last build
         )
         
         await send_progress(
@@ -451,14 +473,14 @@ async def build_dtm_for_taste(
         # ====================================================================
         print(f"📝 Updating database: Setting has_dtm = True for taste {taste_id}")
         try:
-            taste = db.get_taste(taste_id)
+            taste = await async_db.get_taste(taste_id)
             if taste:
                 metadata = taste.get("metadata", {})
                 metadata["has_dtm"] = True
                 metadata["dtm_resource_count"] = len(resource_ids)
                 metadata["dtm_last_updated"] = dtm.created_at
                 metadata["needs_dtm_rebuild"] = False  # Clear rebuild flag
-                db.update_taste(taste_id, metadata=metadata)
+                await async_db.update_taste(taste_id, metadata=metadata)
                 print(f"✅ Database updated: has_dtm = True, needs_dtm_rebuild = False")
             else:
                 print(f"⚠️  Warning: Taste {taste_id} not found in database")
@@ -513,7 +535,7 @@ async def handle_generate_ui(websocket: WebSocket, data: Dict[str, Any], user_id
         
         # Get project
         await send_progress(websocket, "init", "Loading project...")
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
         
         if not project:
             await send_error(websocket, "Project not found")
@@ -631,7 +653,7 @@ async def handle_generate_flow(websocket: WebSocket, data: Dict[str, Any], user_
         # ============================================================================
         
         await send_progress(websocket, "init", "Loading project...")
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
         
         if not project:
             await send_error(websocket, "Project not found")
@@ -711,11 +733,9 @@ async def handle_generate_flow(websocket: WebSocket, data: Dict[str, Any], user_
         reference_images = []
         if selected_taste_id:
             try:
-                import base64
                 import random
-                from app.core.storage import get_resource_image
                 
-                all_resources = db.list_resources_for_taste(selected_taste_id)
+                all_resources = await async_db.list_resources_for_taste(selected_taste_id)
                 # Prefer selected resources; fall back to all resources
                 candidate_ids = (
                     selected_resource_ids
@@ -725,15 +745,22 @@ async def handle_generate_flow(websocket: WebSocket, data: Dict[str, Any], user_
                 # Pick up to 3 at random so we don't always bias toward the first resource
                 sample_ids = random.sample(candidate_ids, min(3, len(candidate_ids)))
                 
-                for resource_id in sample_ids:
-                    img_bytes = get_resource_image(user_id, selected_taste_id, resource_id)
-                    if img_bytes:
-                        reference_images.append({
-                            "data": base64.b64encode(img_bytes).decode("utf-8"),
-                            "media_type": "image/png",
-                        })
+                sampled_images = await asyncio.gather(*[
+                    async_storage.get_resource_image(user_id, selected_taste_id, resource_id)
+                    for resource_id in sample_ids
+                ])
+                # Resize/re-encode for the generation model off the event loop
+                prepared_images = await asyncio.gather(*[
+                    asyncio.to_thread(prepare_image, img_bytes, "png", FLOW_GENERATION_MODEL)
+                    for img_bytes in sampled_images if img_bytes
+                ])
+                reference_images = [image.to_reference() for image in prepared_images]
                 
-                print(f"  📸 Loaded {len(reference_images)}/{len(sample_ids)} reference images for style transfer")
+                print(
+                    f"  📸 Loaded {len(reference_images)}/{len(sample_ids)} reference images for style transfer "
+                    f"({sum(i.bytes_saved for i in prepared_images):,} bytes saved, "
+                    f"~{sum(i.estimated_tokens for i in prepared_images):,} image tokens)"
+                )
             except Exception as e:
                 print(f"  ⚠️  Could not load reference images (non-fatal): {e}")
 
@@ -804,21 +831,23 @@ async def handle_generate_flow(websocket: WebSocket, data: Dict[str, Any], user_
         # This allows screens to render progressively as they complete
         # ============================================================================
         
-        print("\n📦 Generating and sending shared components...")
-        from app.generation.unified_flow import generate_shared_components
-        shared_files = generate_shared_components()
+        # The library is a static bundle: only its reference goes out now.
+        # Components follow with the first ui_checkpoint (or the shared_components
+        # before screen_ready) whose code imports them
+        print("\n📦 Sending shared component bundle...")
+        component_bundle = get_default_bundle()
         
-        # Send shared components to frontend
         await websocket.send_json({
             "type": "shared_components",
             "data": {
-                "files": shared_files,
+                "files": {},
                 "dependencies": {
                     "lucide-react": "^0.263.1"
-                }
+                },
+                "bundle": component_bundle.reference(component_bundle.files)
             }
         })
-        print(f"  ✓ Sent {len(shared_files)} shared component files to frontend")
+        print(f"  ✓ Sent bundle {component_bundle.name}@{component_bundle.version} to frontend")
         
         # ============================================================================
         # STEP 4: Generate Unified Flow (Single Project, Multiple Screens)
@@ -854,9 +883,10 @@ async def handle_generate_flow(websocket: WebSocket, data: Dict[str, Any], user_
             "layout_positions": flow_architecture.get("layout_positions", {}),
             "layout_algorithm": flow_architecture.get("layout_algorithm", "hierarchical"),
             "project": {
-                "files": dict(shared_files),  # shared components already generated
+                "files": {},  # screens as they complete (components are referenced, see pack_flow_graph)
                 "entry": "/App.tsx",
-                "dependencies": {"lucide-react": "^0.263.1"}
+                "dependencies": {"lucide-react": "^0.263.1"},
+                BUNDLE_REF_KEY: component_bundle.reference([])
             },
             "status": "generating",
         }
@@ -878,9 +908,9 @@ async def handle_generate_flow(websocket: WebSocket, data: Dict[str, Any], user_
             
             # Persist to DB after every screen update
             try:
-                db.update_project_flow_graph(
+                await async_db.update_project_flow_graph(
                     project_id=project_id,
-                    flow_graph=convert_floats_to_decimals(live_flow_graph)
+                    flow_graph=convert_floats_to_decimals(await async_storage.pack_flow_graph(live_flow_graph))
                 )
                 completed = sum(1 for s in live_flow_graph["screens"] if not s.get("ui_loading"))
                 total = len(live_flow_graph["screens"])
@@ -933,43 +963,40 @@ async def handle_generate_flow(websocket: WebSocket, data: Dict[str, Any], user_
         
         # Get next version number
         try:
-            version = db.get_next_flow_version(project_id)
+            version = await async_db.get_next_flow_version(project_id)
         except Exception as e:
             # Fallback if function doesn't exist yet
             print(f"  ⚠️  get_next_flow_version not available: {e}")
-            project = db.get_project(project_id)
+            project = await async_db.get_project(project_id)
             metadata = project.get("metadata", {})
             version = metadata.get("flow_version", 0) + 1
         
         print(f"\n💾 Saving flow (version {version})...")
         
-        # CRITICAL: Convert floats to Decimals for DynamoDB
-        flow_graph_for_db = convert_floats_to_decimals(flow_graph)
-        
-        # Save to DynamoDB
-        db.update_project_flow_graph(
-            project_id=project_id,
-            flow_graph=flow_graph_for_db
-        )
+        # Save to S3 as a versioned manifest + screen blobs; DynamoDB only
+        # keeps a pointer so the project item stays small
+        try:
+            flow_ref = await async_storage.save_flow_version(user_id, project_id, flow_graph, version)
+            await async_db.update_project_flow_ref(project_id, flow_ref)
+        except Exception as e:
+            print(f"  ⚠️  Could not save to S3 ({e}), storing flow_graph on the project")
+            # CRITICAL: Convert floats to Decimals for DynamoDB
+            await async_db.update_project_flow_graph(
+                project_id=project_id,
+                flow_graph=convert_floats_to_decimals(await async_storage.pack_flow_graph(flow_graph))
+            )
         
         # Update version number and status
         try:
-            db.update_project_flow_version(project_id, version)
+            await async_db.update_project_flow_version(project_id, version)
         except Exception as e:
             # Fallback if function doesn't exist yet
             print(f"  ⚠️  update_project_flow_version not available: {e}")
-            db.update_project(
+            await async_db.update_project(
                 project_id=project_id,
                 metadata={"flow_version": version, "status": "completed"}
             )
         
-        # Save to S3 for version history
-        try:
-            storage.save_flow_version(user_id, project_id, flow_graph, version)
-        except Exception as e:
-            print(f"  ⚠️  Could not save to S3: {e}")
-            # Continue anyway - DynamoDB save is primary
-        
         print(f"\n✅ Flow generation complete!")
         print(f"  Version: {version}")
         print(f"{'='*80}\n")
@@ -997,9 +1024,9 @@ async def handle_generate_flow(websocket: WebSocket, data: Dict[str, Any], user_
         try:
             if 'live_flow_graph' in locals():
                 live_flow_graph["status"] = f"error: {str(e)[:200]}"
-                db.update_project_flow_graph(
+                await async_db.update_project_flow_graph(
                     project_id=project_id,
-                    flow_graph=convert_floats_to_decimals(live_flow_graph)
+                    flow_graph=convert_floats_to_decimals(await async_storage.pack_flow_graph(live_flow_graph))
                 )
                 print(f"  💾 Saved partial flow_graph to DB after error")
         except Exception as save_err:
@@ -1265,13 +1292,38 @@ When creating task_description for each screen, reference the specific copy that
             ],
             "transitions": []
         }
+
+
+def _merge_duplicate_screen_edits(screens_to_edit: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapse router entries that target the same screen into one edit
+    
+    Edits run concurrently from the same starting code, so two entries for
+    one screen would overwrite each other. Their feedback and annotations
+    are combined instead (first occurrence keeps its position).
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for screen_edit in screens_to_edit:
+        screen_id = screen_edit["screen_id"]
+        if screen_id not in merged:
+            merged[screen_id] = dict(screen_edit)
+            continue
+        existing = merged[screen_id]
+        existing["contextualized_feedback"] = (
+            f"{existing.get('contextualized_feedback', '')}\n\n{screen_edit.get('contextualized_feedback', '')}"
+        ).strip()
+        existing["annotations"] = existing.get("annotations", []) + screen_edit.get("annotations", [])
+    return list(merged.values())
+
+
 async def handle_iterate_ui(websocket: WebSocket, data: Dict[str, Any], user_id: str):
     """
     Handle iterate-ui WebSocket request
     
     Flow:
     1. Route feedback to determine which screens need editing
-    2. For each screen, apply feedback and generate updated code
+    2. Apply feedback to those screens concurrently (ITERATE_UI_MAX_CONCURRENCY)
+       and merge the new code into the flow graph in routing order
     3. Save new version
     4. Send completion message
     """
@@ -1292,14 +1344,15 @@ async def handle_iterate_ui(websocket: WebSocket, data: Dict[str, Any], user_id:
         
         # Get project
         await send_progress(websocket, "init", "Loading project...")
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
         
         if not project:
             await send_error(websocket, "Project not found")
             return
         
-        # Get current flow graph and ensure Decimals are converted
-        flow_graph = convert_decimals(project.get("flow_graph", {}))
+        # Get current flow graph (loaded from its stored version) and ensure Decimals are converted
+        await async_storage.resolve_project_flow_graph(project)
+        flow_graph = convert_decimals(project.get("flow_graph") or {})
         if not flow_graph or not flow_graph.get("screens"):
             await send_error(websocket, "No flow graph found. Generate initial design first.")
             return
@@ -1389,7 +1442,7 @@ async def handle_iterate_ui(websocket: WebSocket, data: Dict[str, Any], user_id:
         
         if taste_id:
             try:
-                dtm = storage.get_taste_dtm(user_id, taste_id) 
+                dtm = await async_storage.get_taste_dtm(user_id, taste_id) 
             except:
                 print("Warning: Could not load DTM, will use minimal defaults")
         
@@ -1409,10 +1462,21 @@ async def handle_iterate_ui(websocket: WebSocket, data: Dict[str, Any], user_id:
             "screen": {"width": 1440, "height": 900}
         })
         
-        # Step 2: Apply feedback to each screen
-        updated_screens = []
+        # Step 2: Apply feedback to every screen concurrently (bounded).
+        # Stream messages from different screens interleave; each is tagged
+        # with its screen_id. Results are merged afterwards in routing order.
+        screen_edits = _merge_duplicate_screen_edits(screens_to_edit)
+        semaphore = asyncio.Semaphore(ITERATE_UI_MAX_CONCURRENCY)
+        project_files = flow_graph.get("project", {}).get("files", {})
+        # Screens compute concurrently, but messages go to the client one at
+        # a time so each frame is written whole and in order
+        send_lock = asyncio.Lock()
+        
+        async def send_screen_message(message: Dict[str, Any]) -> None:
+            async with send_lock:
+                await websocket.send_json(message)
         
-        for idx, screen_edit in enumerate(screens_to_edit):
+        async def iterate_screen(idx: int, screen_edit: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             screen_id = screen_edit["screen_id"]
             screen_name = screen_edit.get("screen_name", "Untitled")  # Router should include this
             contextualized_feedback = screen_edit["contextualized_feedback"]
@@ -1423,34 +1487,21 @@ async def handle_iterate_ui(websocket: WebSocket, data: Dict[str, Any], user_id:
             
             if not screen:
                 print(f"Warning: Screen {screen_id} not found in flow graph")
-                continue
+                return None
             
             # Update screen_name from flow graph if not set
             if screen_name == "Untitled":
                 screen_name = screen.get("name", "Untitled")
             
-            # Notify start of screen iteration
-            await websocket.send_json({
-                "type": "screen_iteration_start",
-                "data": {
-                    "screen_id": screen_id,
-                    "screen_name": screen_name,
-                    "current_index": idx + 1,
-                    "total_screens": len(screens_to_edit)
-                }
-            })
-            
             # Get current code
-
             component_path = screen.get("component_path", f"/screens/{screen.get('name', 'Screen').replace(' ', '').replace('-', '')}Screen.tsx")
-            project_files = flow_graph.get("project", {}).get("files", {})
             current_code = strip_code_fences(
                 project_files.get(component_path, "") or screen.get("ui_code", "")
             )
-
+            
             if not current_code:
                 print(f"Warning: Screen {screen_id} has no code (checked {component_path} and ui_code)")
-                continue
+                return None
             
             # Build flow context
             flow_context = {
@@ -1467,97 +1518,132 @@ async def handle_iterate_ui(websocket: WebSocket, data: Dict[str, Any], user_id:
                 ]
             }
             
-            # Log applier input
-            dtm_summary = {
-                "spacing_quantum": dtm.get("designer_systems", {}).get("spacing", {}).get("default"),
-                "common_sizes": dtm.get("designer_systems", {}).get("typography", {}).get("common_sizes", []),
-                "color_palette_count": len(dtm.get("designer_systems", {}).get("color_system", {}).get("common_palette", []))
-            }
-            
-            # Apply feedback and stream updates
-            conversation_chunks = []
-            code_chunks = []
-            delimiter_detected = False
-            
-            async for chunk_data in applier.apply_feedback(
-                current_code=current_code,
-                contextualized_feedback=contextualized_feedback,
-                dtm=dtm,
-                flow_context=flow_context,
-                device_info=device_info,
-                annotations=screen_annotations,
-                image_generation_mode=image_generation_mode,
-            ):
-                chunk_type = chunk_data.get("type")
+            async with semaphore:
+                # Notify start of screen iteration
+                await send_screen_message({
+                    "type": "screen_iteration_start",
+                    "data": {
+                        "screen_id": screen_id,
+                        "screen_name": screen_name,
+                        "current_index": idx + 1,
+                        "total_screens": len(screen_edits)
+                    }
+                })
                 
-                if chunk_type == "conversation":
-                    # Stream conversation chunk to frontend
-                    chunk_text = chunk_data.get("chunk", "")
-                    conversation_chunks.append(chunk_text)
-                    
-                    await websocket.send_json({
-                        "type": "screen_conversation_chunk",
-                        "data": {
-                            "screen_id": screen_id,
-                            "chunk": chunk_text
-                        }
-                    })
+                try:
+                    result = None
+                    async for chunk_data in applier.apply_feedback(
+                        current_code=current_code,
+                        contextualized_feedback=contextualized_feedback,
+                        dtm=dtm,
+                        flow_context=flow_context,
+                        device_info=device_info,
+                        annotations=screen_annotations,
+                        image_generation_mode=image_generation_mode,
+                    ):
+                        chunk_type = chunk_data.get("type")
+                        
+                        if chunk_type == "conversation":
+                            # Stream conversation chunk to frontend
+                            await send_screen_message({
+                                "type": "screen_conversation_chunk",
+                                "data": {
+                                    "screen_id": screen_id,
+                                    "chunk": chunk_data.get("chunk", "")
+                                }
+                            })
+                        
+                        elif chunk_type == "delimiter_detected":
+                            # Delimiter found, notify frontend to show "generating" state
+                            await send_screen_message({
+                                "type": "screen_generating",
+                                "data": {
+                                    "screen_id": screen_id,
+                                    "screen_name": screen_name,
+                                    "message": "Generating updated code..."
+                                }
+                            })
+                        
+                        elif chunk_type == "complete":
+                            # Final complete response (code chunks are not streamed to the frontend)
+                            full_conversation = chunk_data.get("conversation", "")
+                            full_code = chunk_data.get("code", "")
+                            
+                            # AI image generation: replace GENERATE: placeholders with fal.ai URLs
+                            if image_generation_mode == "ai" and full_code:
+                                try:
+                                    from app.generation.image_generation import get_image_service
+                                    image_service = get_image_service()
+                                    full_code, _ = await run_blocking(
+                                        image_service.replace_placeholders_with_images, full_code
+                                    )
+                                except Exception as img_err:
+                                    print(f"⚠️  Image generation failed for feedback: {img_err}")
+                            
+                            # Send updated screen to frontend (merged into the flow graph later),
+                            # with any shared components the new code imports for the first time
+                            await send_screen_message({
+                                "type": "screen_updated",
+                                "data": {
+                                    "screen_id": screen_id,
+                                    "component_path": component_path,
+                                    "ui_code": full_code,
+                                    "conversation": full_conversation,
+                                    "files": missing_components(project_files, full_code, component_path)
+                                }
+                            })
+                            
+                            result = {
+                                "screen_id": screen_id,
+                                "screen_name": screen_name,
+                                "component_path": component_path,
+                                "code": full_code,
+                            }
+                    return result
                 
-                elif chunk_type == "delimiter_detected":
-                    # Delimiter found, notify frontend to show "generating" state
-                    delimiter_detected = True
-                    
-                    await websocket.send_json({
-                        "type": "screen_generating",
+                except Exception as e:
+                    # One failing screen must not abort the others
+                    print(f"✗ Iteration failed for screen {screen_name} ({screen_id}): {e}")
+                    await send_screen_message({
+                        "type": "screen_iteration_error",
                         "data": {
                             "screen_id": screen_id,
                             "screen_name": screen_name,
-                            "message": "Generating updated code..."
+                            "error": str(e)
                         }
                     })
-                
-                elif chunk_type == "code":
-                    # Accumulate code chunks (don't send to frontend yet)
-                    code_chunks.append(chunk_data.get("chunk", ""))
-                
-                elif chunk_type == "complete":
-                    # Final complete response
-                    full_conversation = chunk_data.get("conversation", "")
-                    full_code = chunk_data.get("code", "")
-
-                    # AI image generation: replace GENERATE: placeholders with fal.ai URLs
-                    if image_generation_mode == "ai" and full_code:
-                        try:
-                            from app.generation.image_generation import get_image_service
-                            image_service = get_image_service()
-                            full_code, _ = image_service.replace_placeholders_with_images(full_code)
-                        except Exception as img_err:
-                            print(f"⚠️  Image generation failed for feedback: {img_err}")
-                    
-                    # Update screen in flow graph - NEW format: write to project.files
-                    if "project" not in flow_graph:
-                        flow_graph["project"] = {"files": {}, "entry": "/App.tsx", "dependencies": {}}
-                    if "files" not in flow_graph["project"]:
-                        flow_graph["project"]["files"] = {}
-                    flow_graph["project"]["files"][component_path] = full_code
-                    # Also keep ui_code on screen for backward compatibility
-                    screen["ui_code"] = full_code
-                    
-                    # Send updated screen to frontend
-                    await websocket.send_json({
-                        "type": "screen_updated",
-                        "data": {
-                            "screen_id": screen_id,
-                            "component_path": component_path,
-                            "ui_code": full_code,
-                            "conversation": full_conversation
-                        }
-                    })
-                    
-                    updated_screens.append({
-                        "screen_id": screen_id,
-                        "screen_name": screen_name
-                    })
+                    return {"screen_id": screen_id, "screen_name": screen_name, "error": str(e)}
+        
+        results = await asyncio.gather(*(
+            iterate_screen(idx, screen_edit) for idx, screen_edit in enumerate(screen_edits)
+        ))
+        
+        # Merge in routing order so the saved flow graph doesn't depend on
+        # which screen finished first
+        updated_screens = []
+        failed_screens = []
+        for result in results:
+            if result is None:
+                continue
+            if "error" in result:
+                failed_screens.append(result)
+                continue
+            
+            # Update screen in flow graph - NEW format: write to project.files
+            if "project" not in flow_graph:
+                flow_graph["project"] = {"files": {}, "entry": "/App.tsx", "dependencies": {}}
+            if "files" not in flow_graph["project"]:
+                flow_graph["project"]["files"] = {}
+            flow_graph["project"]["files"][result["component_path"]] = result["code"]
+            # Also keep ui_code on screen for backward compatibility
+            for screen in flow_graph["screens"]:
+                if screen["screen_id"] == result["screen_id"]:
+                    screen["ui_code"] = result["code"]
+            
+            updated_screens.append({
+                "screen_id": result["screen_id"],
+                "screen_name": result["screen_name"]
+            })
         
         # Step 3: Generate final summary
         await send_progress(websocket, "summarizing", "Finalizing changes...")
@@ -1573,26 +1659,28 @@ async def handle_iterate_ui(websocket: WebSocket, data: Dict[str, Any], user_id:
         else:
             summary = f"Updated {len(screen_names)} screens: {', '.join(screen_names[:-1])}, and {screen_names[-1]}."
         
-        # Step 4: Save new version
-        await send_progress(websocket, "saving", "Saving new version...")
-        
-        new_version = current_version + 1
-        
-        # ✅ FIX: Save to S3 FIRST (before converting to Decimals)
-        # S3 requires regular Python types (float/int) for JSON serialization
-        storage.put_project_flow(user_id, project_id, flow_graph, version=new_version)
-        
-        # Update metadata
-        metadata = project.get("metadata", {})
-        metadata["flow_version"] = new_version
-        db.update_project(project_id, metadata=metadata)
-        
-        # ✅ FIX: THEN convert to Decimals for DynamoDB
-        # DynamoDB requires Decimal type for numbers
-        flow_graph_for_db = convert_floats_to_decimals(flow_graph)
+        if failed_screens:
+            failed_names = ", ".join(s["screen_name"] for s in failed_screens)
+            summary += f" Could not update: {failed_names}."
         
-        # Update DynamoDB with Decimal version
-        db.update_project_flow_graph(project_id, flow_graph_for_db)
+        # Step 4: Save new version (nothing changed if every screen failed)
+        new_version = current_version
+        if updated_screens:
+            await send_progress(websocket, "saving", "Saving new version...")
+            
+            new_version = current_version + 1
+            
+            # Save to S3 (needs plain Python types). Only the edited screens' code
+            # is new, everything else is shared with the previous version.
+            flow_ref = await async_storage.put_project_flow(user_id, project_id, flow_graph, version=new_version)
+            
+            # Update metadata
+            metadata = project.get("metadata", {})
+            metadata["flow_version"] = new_version
+            await async_db.update_project(project_id, metadata=metadata)
+            
+            # DynamoDB only keeps a pointer to the new version
+            await async_db.update_project_flow_ref(project_id, flow_ref)
         
         # Step 5: Send completion
         await websocket.send_json({
@@ -1600,6 +1688,7 @@ async def handle_iterate_ui(websocket: WebSocket, data: Dict[str, Any], user_id:
             "data": {
                 "summary": summary,
                 "screens_updated": [s["screen_id"] for s in updated_screens],
+                "screens_failed": [s["screen_id"] for s in failed_screens],
                 "new_version": new_version
             }
         })
@@ -1656,7 +1745,7 @@ async def handle_generate_variation(websocket: WebSocket, data: Dict[str, Any],
 
         # Load project
         await send_progress(websocket, "init", "Loading project...")
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
 
         if not project:
             await send_error(websocket, "Project not found")
@@ -1672,7 +1761,8 @@ async def handle_generate_variation(websocket: WebSocket, data: Dict[str, Any],
         selected_resource_ids = project.get("selected_resource_ids", [])
 
         # Load current flow graph
-        flow_graph = convert_decimals(project.get("flow_graph", {}))
+        await async_storage.resolve_project_flow_graph(project)
+        flow_graph = convert_decimals(project.get("flow_graph") or {})
         if not flow_graph or not flow_graph.get("screens"):
             await send_error(websocket, "No flow graph found. Generate initial design first.")
             return
@@ -1793,17 +1883,18 @@ async def handle_generate_variation(websocket: WebSocket, data: Dict[str, Any],
         if "files" not in flow_graph["project"]:
             flow_graph["project"]["files"] = {}
 
+        # Shared components the variation imports for the first time
+        new_components = missing_components(flow_graph["project"]["files"], full_code, component_path)
         flow_graph["project"]["files"][component_path] = full_code
         screen["ui_code"] = full_code  # backward compat
 
-        # Save to S3 first (needs plain Python types), then DynamoDB (needs Decimals)
-        from app.core import storage as _storage
-        _storage.put_project_flow(user_id, project_id, flow_graph, version=new_version)
+        # Save to S3 (needs plain Python types), then point DynamoDB at it
+        flow_ref = await async_storage.put_project_flow(user_id, project_id, flow_graph, version=new_version)
 
         metadata = project.get("metadata", {})
         metadata["flow_version"] = new_version
-        db.update_project(project_id, metadata=metadata)
-        db.update_project_flow_graph(project_id, convert_floats_to_decimals(flow_graph))
+        await async_db.update_project(project_id, metadata=metadata)
+        await async_db.update_project_flow_ref(project_id, flow_ref)
 
         # Send updated screen to frontend
         await websocket.send_json({
@@ -1813,6 +1904,7 @@ async def handle_generate_variation(websocket: WebSocket, data: Dict[str, Any],
                 "component_path": component_path,
                 "ui_code": full_code,
                 "conversation": full_conversation,
+                "files": new_components,
             },
         })
 
@@ -1862,7 +1954,7 @@ async def handle_copy_message(websocket: WebSocket, data: Dict[str, Any], user_i
             return
         
         # Load project
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
         if not project:
             await send_error(websocket, "Project not found")
             return
@@ -1927,7 +2019,7 @@ async def handle_finalize_copy(websocket: WebSocket, data: Dict[str, Any], user_
             return
         
         # Load project
-        project = db.get_project(project_id)
+        project = await async_db.get_project(project_id)
         if not project:
             await send_error(websocket, "Project not found")
             return
@@ -1953,7 +2045,7 @@ async def handle_finalize_copy(websocket: WebSocket, data: Dict[str, Any], user_
         metadata = project.get("metadata", {})
         metadata["generated_copy"] = final_copy
         metadata["copy_conversation"] = conversation_history
-        db.update_project(project_id, metadata=metadata)
+        await async_db.update_project(project_id, metadata=metadata)
         
         # Send response
         await websocket.send_json({
@@ -1989,8 +2081,8 @@ async def handle_get_or_build_dtm(websocket: WebSocket, data: Dict[str, Any], us
 
     Server emits:
         progress  -> { type: "progress", stage: "dtm_building", message: "..." }
-        complete  -> { type: "complete", result: { status, mode, hash, was_cached,
-                                                    build_time_ms, resource_ids, dtm } }
+        complete  -> { type: "complete", result: { status, mode, hash, was_cached, reused_from,
+                                                    provisional, build_time_ms, resource_ids, dtm } }
         error     -> { type: "error", error: "..." }
     """
     taste_id = data.get("taste_id")
@@ -2006,7 +2098,7 @@ async def handle_get_or_build_dtm(websocket: WebSocket, data: Dict[str, Any], us
         return
 
     # Validate taste ownership
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         await send_error(websocket, "Taste not found")
         return
@@ -2016,7 +2108,7 @@ async def handle_get_or_build_dtm(websocket: WebSocket, data: Dict[str, Any], us
         return
 
     # Validate all resources belong to this taste
-    resources = db.list_resources_for_taste(taste_id)
+    resources = await async_db.list_resources_for_taste(taste_id)
     taste_resource_ids = {r["resource_id"] for r in resources}
     for rid in resource_ids:
         if rid not in taste_resource_ids:
@@ -2025,7 +2117,7 @@ async def handle_get_or_build_dtm(websocket: WebSocket, data: Dict[str, Any], us
 
     # Validate all resources have DTRs
     for rid in resource_ids:
-        resource = db.get_resource(rid)
+        resource = await async_db.get_resource(rid)
         if not resource:
             await send_error(websocket, f"Resource {rid} not found")
             return
@@ -2036,10 +2128,13 @@ async def handle_get_or_build_dtm(websocket: WebSocket, data: Dict[str, Any], us
     try:
         await send_progress(websocket, "dtm_building", f"Building taste model from {len(resource_ids)} resource(s)...")
 
+        # On Lambda the loop closes once this returns, so a background refresh
+        # would be cancelled: synthesize a near-match subset here instead
         result = await dtm_builder.get_or_build_dtm(
             taste_id=taste_id,
             resource_ids=resource_ids,
-            mode=mode
+            mode=mode,
+            refresh_in_background=not dtm_builder.ON_LAMBDA
         )
 
         dtm_model = result["dtm"]
@@ -2050,6 +2145,8 @@ async def handle_get_or_build_dtm(websocket: WebSocket, data: Dict[str, Any], us
             "mode": result["mode"],
             "hash": result.get("hash"),
             "was_cached": result["was_cached"],
+            "reused_from": result.get("reused_from"),
+            "provisional": result.get("provisional", False),
             "build_time_ms": result["build_time_ms"],
             "resource_ids": result["resource_ids"],
             "dtm": dtm_dict,
@@ -2099,7 +2196,7 @@ async def handle_rebuild_dtm(websocket: WebSocket, data: Dict[str, Any], user_id
         return
 
     # Validate ownership
-    taste = db.get_taste(taste_id)
+    taste = await async_db.get_taste(taste_id)
     if not taste:
         await send_error(websocket, "Taste not found")
         return
@@ -2109,7 +2206,7 @@ async def handle_rebuild_dtm(websocket: WebSocket, data: Dict[str, Any], user_id
         return
 
     # Get all resources with DTRs
-    resources = db.list_resources_for_taste(taste_id)
+    resources = await async_db.list_resources_for_taste(taste_id)
     resource_ids = [
         r["resource_id"]
         for r in resources
@@ -2124,8 +2221,10 @@ async def handle_rebuild_dtm(websocket: WebSocket, data: Dict[str, Any], user_id
         return
 
     # Validate all DTRs exist on disk/S3
-    for rid in resource_ids:
-        dtr = dtr_storage.load_complete_dtr(rid)
+    dtrs = await asyncio.gather(*[
+        run_blocking(dtr_storage.load_complete_dtr, rid) for rid in resource_ids
+    ])
+    for rid, dtr in zip(resource_ids, dtrs):
         if not dtr:
             await send_error(websocket, f"No DTR found for resource {rid}")
             return
@@ -2149,11 +2248,12 @@ async def handle_rebuild_dtm(websocket: WebSocket, data: Dict[str, Any], user_id
             taste_id=taste_id,
             resource_ids=resource_ids,
             llm=llm,
-            priority_mode=False
+            priority_mode=False,
+            incremental=True
         )
 
         # Persist the rebuilt DTM
-        dtm_storage_mod.save_dtm(taste_id, dtm, resource_ids)
+        await run_blocking(dtm_storage_mod.save_dtm, taste_id, dtm, resource_ids)
 
         # Update database metadata
         metadata = taste.get("metadata", {})
@@ -2162,7 +2262,7 @@ async def handle_rebuild_dtm(websocket: WebSocket, data: Dict[str, Any], user_id
         metadata["dtm_last_updated"] = datetime.utcnow().isoformat()
         metadata["needs_dtm_rebuild"] = False
         metadata.pop("last_deleted_at", None)
-        db.update_taste(taste_id, metadata=metadata)
+        await async_db.update_taste(taste_id, metadata=metadata)
 
         duration = time.time() - start_time
         confidence = dtm.generation_guidance.confidence_by_domain.get("overall", 0.75)
@@ -2183,6 +2283,21 @@ async def handle_rebuild_dtm(websocket: WebSocket, data: Dict[str, Any], user_id
         await send_error(websocket, f"DTM rebuild failed: {str(e)}")
 
 
+# LLM scheduling priority per action: a user waiting on an edit is served
+# before bulk generation queued on the same provider/model
+ACTION_PRIORITIES = {
+    "iterate-ui": RequestPriority.INTERACTIVE,
+    "generate-variation": RequestPriority.INTERACTIVE,
+    "copy-message": RequestPriority.INTERACTIVE,
+    "finalize-copy": RequestPriority.INTERACTIVE,
+    "generate-ui": RequestPriority.DEFAULT,
+    "generate-flow": RequestPriority.BULK,
+    "build-dtr": RequestPriority.BULK,
+    "get-or-build-dtm": RequestPriority.BULK,
+    "rebuild-dtm": RequestPriority.BULK,
+}
+
+
 async def handle_websocket(websocket: WebSocket, user_id: str):
     """Main WebSocket handler"""
     await websocket.accept()
@@ -2194,26 +2309,8 @@ async def handle_websocket(websocket: WebSocket, user_id: str):
             action = message.get("action")
             data = message.get("data", {})
             
-            if action == "build-dtr":
-                await handle_build_dtr(websocket, data, user_id)
-            elif action == "generate-ui":
-                await handle_generate_ui(websocket, data, user_id)
-            elif action == "generate-flow":
-                await handle_generate_flow(websocket, data, user_id)
-            elif action == "iterate-ui":
-                await handle_iterate_ui(websocket, data, user_id)
-            elif action == "generate-variation":
-                await handle_generate_variation(websocket, data, user_id)
-            elif action == "copy-message":
-                await handle_copy_message(websocket, data, user_id)
-            elif action == "finalize-copy":
-                await handle_finalize_copy(websocket, data, user_id)
-            elif action == "get-or-build-dtm":
-                await handle_get_or_build_dtm(websocket, data, user_id)
-            elif action == "rebuild-dtm":
-                await handle_rebuild_dtm(websocket, data, user_id)
-            else:
-                await send_error(websocket, f"Unknown action: {action}")
+            with request_context(user_id=user_id, priority=ACTION_PRIORITIES.get(action), endpoint=action):
+                await dispatch_action(websocket, action, data, user_id)
                 
     except WebSocketDisconnect:
         print(f"WebSocket disconnected for user: {user_id}")
@@ -2222,4 +2319,28 @@ async def handle_websocket(websocket: WebSocket, user_id: str):
         try:
             await send_error(websocket, str(e))
         except:
-            pass
\ No newline at end of file
+            pass
+
+
+async def dispatch_action(websocket: WebSocket, action: str, data: Dict[str, Any], user_id: str):
+    """Route a WebSocket action to its handler"""
+    if action == "build-dtr":
+        await handle_build_dtr(websocket, data, user_id)
+    elif action == "generate-ui":
+        await handle_generate_ui(websocket, data, user_id)
+    elif action == "generate-flow":
+        await handle_generate_flow(websocket, data, user_id)
+    elif action == "iterate-ui":
+        await handle_iterate_ui(websocket, data, user_id)
+    elif action == "generate-variation":
+        await handle_generate_variation(websocket, data, user_id)
+    elif action == "copy-message":
+        await handle_copy_message(websocket, data, user_id)
+    elif action == "finalize-copy":
+        await handle_finalize_copy(websocket, data, user_id)
+    elif action == "get-or-build-dtm":
+        await handle_get_or_build_dtm(websocket, data, user_id)
+    elif action == "rebuild-dtm":
+        await handle_rebuild_dtm(websocket, data, user_id)
+    else:
+        await send_error(websocket, f"Unknown action: {action}")
@@ -4,11 +4,20 @@ Handles $connect, $disconnect, and $default routes
 """
 import asyncio
 import boto3
+import functools
 import json
 import jwt
 import os
 from typing import Dict, Any
 
+from app.core.async_io import run_blocking
+
+
+@functools.lru_cache(maxsize=8)
+def get_apigw_management_client(endpoint_url: str):
+    """API Gateway management client for an endpoint, reused by warm invocations"""
+    return boto3.client("apigatewaymanagementapi", endpoint_url=endpoint_url)
+
 
 def get_jwks():
     """Fetch JSON Web Key Set from Cognito"""
@@ -114,10 +123,7 @@ def handle_websocket_event(event: Dict[str, Any], context: Any) -> Dict[str, Any
         return {"statusCode": 400, "body": "Missing connectionId"}
 
     endpoint_url = f"https://{domain_name}/{stage}"
-    apigw_management = boto3.client(
-        "apigatewaymanagementapi",
-        endpoint_url=endpoint_url
-    )
+    apigw_management = get_apigw_management_client(endpoint_url)
 
     if route_key == "$connect":
         return handle_connect(event, request_context, connection_id)
@@ -202,8 +208,11 @@ class LambdaWebSocketAdapter:
         self.connection_id = connection_id
 
     async def send_json(self, data: Dict[str, Any]):
+        # post_to_connection is a blocking HTTP call; run it off the event loop
+        # so concurrent handlers (e.g. multi-screen iterate-ui) keep streaming
         try:
-            self.apigw_management.post_to_connection(
+            await run_blocking(
+                self.apigw_management.post_to_connection,
                 ConnectionId=self.connection_id,
                 Data=json.dumps(data)
             )
@@ -254,28 +263,22 @@ def handle_message(
         # Import the shared handlers (imported here to avoid circular imports at
         # module load time and to keep Lambda cold-start overhead minimal)
         from app.websockets import handler as ws_handler
+        from app.llm import request_context
 
         async def run():
-            if action == "build-dtr":
-                await ws_handler.handle_build_dtr(adapter, data, user_id)
-            elif action == "generate-ui":
-                await ws_handler.handle_generate_ui(adapter, data, user_id)
-            elif action == "generate-flow":
-                await ws_handler.handle_generate_flow(adapter, data, user_id)
-            elif action == "iterate-ui":
-                await ws_handler.handle_iterate_ui(adapter, data, user_id)
-            elif action == "generate-variation":
-                await ws_handler.handle_generate_variation(adapter, data, user_id)
-            elif action == "copy-message":
-                await ws_handler.handle_copy_message(adapter, data, user_id)
-            elif action == "finalize-copy":
-                await ws_handler.handle_finalize_copy(adapter, data, user_id)
-            elif action == "get-or-build-dtm":
-                await ws_handler.handle_get_or_build_dtm(adapter, data, user_id)
-            elif action == "rebuild-dtm":
-                await ws_handler.handle_rebuild_dtm(adapter, data, user_id)
-            else:
-                send_error(apigw_management, connection_id, f"Unknown action: {action}")
+            # Same dispatch and LLM scheduling context (priority, per-user
+            # fairness, cost attribution) as the FastAPI websocket path
+            with request_context(
+                user_id=user_id,
+                priority=ws_handler.ACTION_PRIORITIES.get(action),
+                endpoint=action
+            ):
+                await ws_handler.dispatch_action(adapter, action, data, user_id)
+
+            # Near-match subset DTMs are refreshed in the background; give the
+            # ones this invocation started a bounded wait before the loop closes
+            from app.dtm import builder as dtm_builder
+            await dtm_builder.wait_for_subset_refreshes()
 
         # Use an explicit loop instead of asyncio.run() so the container isn't
         # poisoned for subsequent requests. asyncio.run() destroys the loop on
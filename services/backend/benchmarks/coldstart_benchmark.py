@@ -0,0 +1,262 @@
+"""
+Cold-Start Benchmark
+Measures what a fresh Lambda container pays before and during its first request
+
+Usage:
+    python benchmarks/coldstart_benchmark.py                  # lazy vs eager, 3 runs
+    python benchmarks/coldstart_benchmark.py --modes lazy --runs 5
+    python benchmarks/coldstart_benchmark.py --route "GET /api/tastes" --route "import app.generation.image_generation"
+
+Every sample runs in a fresh interpreter with LAZY_INIT set per mode
+(see app.core.lazy) and reports medians across runs:
+- Import time of app.main, and the slowest modules under it (python -X importtime)
+- Per route: first call through app.main.handler (cold) and a second call (warm)
+- First-use cost of each dependency lazy mode defers
+
+Routes are "METHOD /path" (HTTP API event through Mangum), "WS $connect" /
+"WS $disconnect" (websocket event), or "import module" (what a module loaded
+on first use costs on top of app.main). None of them reach AWS or an LLM:
+protected routes answer 401/403 without a token.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_ROUTES = [
+    "GET /api/health",
+    "GET /api/metrics/llm-scheduler",
+    "GET /api/projects",
+    "GET /api/tastes",
+    "WS $connect",
+    "WS $disconnect",
+]
+
+MODES = {"lazy": "true", "eager": "false"}
+
+# Child processes print their result on a line starting with this marker
+RESULT_MARKER = "COLDSTART_RESULT "
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+# ============================================================================
+# CHILD PROCESS (one fresh interpreter per sample)
+# ============================================================================
+
+def _http_event(method: str, path: str) -> Dict[str, Any]:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "localhost", "origin": "http://localhost"},
+        "requestContext": {
+            "accountId": "000000000000",
+            "apiId": "coldstart",
+            "domainName": "localhost",
+            "requestId": "coldstart",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "",
+            "timeEpoch": 0,
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "coldstart-benchmark",
+            },
+        },
+        "isBase64Encoded": False,
+    }
+
+
+def _websocket_event(route_key: str) -> Dict[str, Any]:
+    return {
+        "requestContext": {
+            "routeKey": route_key,
+            "connectionId": "coldstart",
+            "domainName": "localhost",
+            "stage": "coldstart",
+        },
+        "queryStringParameters": {},
+    }
+
+
+def _call_route(route: str) -> str:
+    """Invoke one route the way Lambda would; returns a short status"""
+    import importlib
+
+    kind, _, target = route.partition(" ")
+    if kind == "import":
+        importlib.import_module(target)
+        return "imported"
+
+    from app.main import handler
+
+    if kind == "WS":
+        event = _websocket_event(target)
+    else:
+        event = _http_event(kind.upper(), target)
+    response = handler(event, None)
+    return str(response.get("statusCode", "?"))
+
+
+def _timed(fn, *args) -> Dict[str, Any]:
+    start = time.perf_counter()
+    status = fn(*args)
+    return {"ms": (time.perf_counter() - start) * 1000, "status": status}
+
+
+def run_child(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Measure one sample in this (fresh) interpreter"""
+    start = time.perf_counter()
+    import app.main  # noqa: F401
+    result: Dict[str, Any] = {"import_ms": (time.perf_counter() - start) * 1000}
+
+    if task["kind"] == "route":
+        result["cold"] = _timed(_call_route, task["route"])
+        result["warm"] = _timed(_call_route, task["route"])
+    elif task["kind"] == "deferred":
+        from app.core.lazy import WARM_UP_STEPS, warm_up
+        result["steps"] = warm_up(list(WARM_UP_STEPS))
+    return result
+
+
+# ============================================================================
+# PARENT
+# ============================================================================
+
+def _child_env(mode: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["LAZY_INIT"] = MODES[mode]
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")]))
+    env["PYTHONWARNINGS"] = "ignore"
+    # app.main refuses to import without these; nothing here talks to Cognito
+    env.setdefault("AWS_REGION", "us-east-1")
+    env.setdefault("AWS_DEFAULT_REGION", env["AWS_REGION"])
+    env.setdefault("USER_POOL_ID", "coldstart-benchmark")
+    return env
+
+
+def spawn(mode: str, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Run run_child in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", json.dumps(task)],
+        env=_child_env(mode), cwd=BACKEND_DIR, capture_output=True, text=True, timeout=300
+    )
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    print(f"⚠️  {mode} sample {task} failed:\n{completed.stderr[-2000:]}")
+    return None
+
+
+def import_profile(mode: str, module: str = "app.main") -> Dict[str, int]:
+    """Cumulative import time (us) per module from python -X importtime"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_child_env(mode), cwd=BACKEND_DIR, capture_output=True, text=True, timeout=300
+    )
+    cumulative: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def _median(values: List[float]) -> float:
+    return statistics.median(values) if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument("--route", action="append", dest="routes",
+                        help="Route to measure (repeatable; default: a representative set)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(RESULT_MARKER + json.dumps(run_child(json.loads(args.child))))
+        return 0
+
+    routes = args.routes or DEFAULT_ROUTES
+    modes = args.modes
+
+    print("=" * 78)
+    print(f"COLD-START BENCHMARK - modes={', '.join(modes)}, runs={args.runs}, routes={len(routes)}")
+    print("=" * 78)
+
+    # Import time per module (median over runs)
+    profiles = {mode: [import_profile(mode) for _ in range(args.runs)] for mode in modes}
+    medians = {
+        mode: {
+            name: _median([p.get(name, 0) for p in runs]) / 1000
+            for name in set().union(*runs)
+        }
+        for mode, runs in profiles.items()
+    }
+    ranked = sorted(
+        (name for name in set().union(*medians.values()) if name != "app.main"),
+        key=lambda name: -max(medians[mode].get(name, 0) for mode in modes)
+    )[:args.top]
+
+    print(f"\nImport time (cumulative ms, median of {args.runs})\n")
+    print(f"{'module':<46}" + "".join(f"{mode:>12}" for mode in modes))
+    print("-" * 78)
+    print(f"{'app.main (total)':<46}" + "".join(f"{medians[mode].get('app.main', 0):>12.0f}" for mode in modes))
+    for name in ranked:
+        cells = "".join(
+            f"{medians[mode][name]:>12.0f}" if name in medians[mode] else f"{'-':>12}" for mode in modes
+        )
+        print(f"{name[:46]:<46}{cells}")
+
+    # Per-route cold and warm calls, each in a fresh interpreter
+    print(f"\nPer route (ms, median of {args.runs}; cold = import app.main + first call)\n")
+    header = f"{'route':<34}"
+    for mode in modes:
+        header += f"{mode + ' cold':>11}{'1st call':>10}{'warm':>7}"
+    print(header)
+    print("-" * 78)
+    for route in routes:
+        row = f"{route[:34]:<34}"
+        status = ""
+        for mode in modes:
+            samples = [s for s in (spawn(mode, {"kind": "route", "route": route}) for _ in range(args.runs)) if s]
+            first = _median([s["cold"]["ms"] for s in samples])
+            cold = _median([s["import_ms"] + s["cold"]["ms"] for s in samples])
+            warm = _median([s["warm"]["ms"] for s in samples])
+            status = samples[-1]["cold"]["status"] if samples else "failed"
+            row += f"{cold:>11.0f}{first:>10.0f}{warm:>7.1f}"
+        print(f"{row}  {status}")
+
+    # What lazy mode defers, paid by the first request that needs it
+    if "lazy" in modes:
+        samples = [s for s in (spawn("lazy", {"kind": "deferred"}) for _ in range(args.runs)) if s]
+        steps = samples[0]["steps"] if samples else {}
+        print(f"\nFirst use of deferred dependencies in lazy mode (ms, median of {args.runs})\n")
+        print(f"{'dependency':<46}{'first use':>12}")
+        print("-" * 78)
+        for name in steps:
+            print(f"{name:<46}{_median([s['steps'].get(name, 0) for s in samples]):>12.0f}")
+
+    print("=" * 78)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Palette Extraction Benchmark
+Compares sklearn k-means against the NumPy median-cut quantizer used by Pass 2
+
+Usage:
+    python benchmarks/palette_benchmark.py --images path/to/screenshots
+    python benchmarks/palette_benchmark.py            # synthetic UI-like corpus
+
+Reports per-image timings and palette agreement: for every median-cut color,
+the RGB distance to the closest k-means color (and the reverse), averaged.
+"""
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.dtr.extractors.algorithmic import k_means_color_clustering, median_cut_palette  # noqa: E402
+
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+
+# Palette colors closer than this (RGB Euclidean) count as "matched"
+MATCH_THRESHOLD = 24.0
+
+
+def load_corpus(images_dir: str) -> List[Tuple[str, bytes]]:
+    """Load every image file in a directory"""
+    corpus = []
+    for path in sorted(Path(images_dir).iterdir()):
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            corpus.append((path.name, path.read_bytes()))
+    return corpus
+
+
+def synthetic_corpus(count: int = 8, size: Tuple[int, int] = (1440, 900)) -> List[Tuple[str, bytes]]:
+    """Generate flat UI-like screenshots (panels, cards, buttons, text bars)"""
+    rng = np.random.default_rng(7)
+    corpus = []
+
+    for i in range(count):
+        base = tuple(int(v) for v in rng.integers(0, 256, 3))
+        accent = tuple(int(v) for v in rng.integers(0, 256, 3))
+        surface = tuple(int(min(255, v + 18)) for v in base)
+        text = (240, 240, 240) if sum(base) < 384 else (20, 20, 28)
+
+        image = Image.new("RGB", size, base)
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([0, 0, 260, size[1]], fill=surface)
+        for row in range(3):
+            for col in range(3):
+                x0 = 300 + col * 370
+                y0 = 80 + row * 270
+                draw.rounded_rectangle([x0, y0, x0 + 340, y0 + 240], radius=16, fill=surface)
+                draw.rectangle([x0 + 20, y0 + 24, x0 + 220, y0 + 40], fill=text)
+                draw.rounded_rectangle([x0 + 20, y0 + 180, x0 + 140, y0 + 220], radius=8, fill=accent)
+        noise = rng.normal(0, 2.0, (size[1], size[0], 3))
+        pixels = np.clip(np.asarray(image, dtype=np.float64) + noise, 0, 255).astype(np.uint8)
+
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="PNG")
+        corpus.append((f"synthetic_{i}.png", buffer.getvalue()))
+
+    return corpus
+
+
+def _hex_to_rgb(hex_color: str) -> np.ndarray:
+    return np.array([int(hex_color[i:i + 2], 16) for i in (1, 3, 5)], dtype=np.float64)
+
+
+def palette_distance(a: List[str], b: List[str]) -> Tuple[float, float]:
+    """
+    Symmetric nearest-color distance between two palettes
+
+    Returns:
+        (mean nearest distance, fraction of colors matched within MATCH_THRESHOLD)
+    """
+    if not a or not b:
+        return float("nan"), 0.0
+
+    pa = np.stack([_hex_to_rgb(c) for c in a])
+    pb = np.stack([_hex_to_rgb(c) for c in b])
+    dist = np.linalg.norm(pa[:, None, :] - pb[None, :, :], axis=2)
+    nearest = np.concatenate([dist.min(axis=1), dist.min(axis=0)])
+    return float(nearest.mean()), float((nearest <= MATCH_THRESHOLD).mean())
+
+
+def time_call(fn, image_bytes: bytes, n_colors: int, repeats: int) -> Tuple[float, List[str]]:
+    """Median wall time (ms) over repeats, plus the last result"""
+    timings = []
+    result: List[str] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(image_bytes, n_colors=n_colors)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="Directory of UI screenshots (default: synthetic corpus)")
+    parser.add_argument("--n-colors", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.images) if args.images else synthetic_corpus()
+    if not corpus:
+        print(f"No images found in {args.images}")
+        return 1
+
+    # Import cost matters on Lambda cold start
+    start = time.perf_counter()
+    import sklearn.cluster  # noqa: F401
+    sklearn_import_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 78)
+    print(f"PALETTE BENCHMARK - {len(corpus)} images, n_colors={args.n_colors}, repeats={args.repeats}")
+    print("=" * 78)
+    print(f"sklearn.cluster import: {sklearn_import_ms:.0f} ms (median-cut needs none)\n")
+    print(f"{'image':<28} {'kmeans ms':>10} {'median ms':>10} {'speedup':>8} {'mean dist':>10} {'matched':>8}")
+    print("-" * 78)
+
+    kmeans_times, median_times, distances, matches = [], [], [], []
+    for name, image_bytes in corpus:
+        kmeans_ms, kmeans_palette = time_call(k_means_color_clustering, image_bytes, args.n_colors, args.repeats)
+        median_ms, median_palette = time_call(median_cut_palette, image_bytes, args.n_colors, args.repeats)
+        distance, matched = palette_distance(median_palette, kmeans_palette)
+
+        # Determinism check: identical input must give an identical palette
+        assert median_cut_palette(image_bytes, n_colors=args.n_colors) == median_palette
+
+        kmeans_times.append(kmeans_ms)
+        median_times.append(median_ms)
+        distances.append(distance)
+        matches.append(matched)
+        print(f"{name[:28]:<28} {kmeans_ms:>10.1f} {median_ms:>10.1f} "
+              f"{kmeans_ms / median_ms:>7.1f}x {distance:>10.1f} {matched:>7.0%}")
+
+    print("-" * 78)
+    print(f"{'median':<28} {statistics.median(kmeans_times):>10.1f} {statistics.median(median_times):>10.1f} "
+          f"{statistics.median(kmeans_times) / statistics.median(median_times):>7.1f}x "
+          f"{statistics.median(distances):>10.1f} {statistics.median(matches):>7.0%}")
+    print("=" * 78)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -407,15 +407,23 @@ export default function Editor() {
         version,
       )
 
+      // Revert only copies the manifest. The version being viewed is already
+      // loaded; otherwise fetch the new copy
+      const revertedGraph =
+        viewingVersion === version && flowGraph
+          ? flowGraph
+          : (await api.llm.getFlow(project.project_id, result.new_version))
+              .flow_graph
+
       setFlowGraph({
-        ...result.flow_graph,
+        ...revertedGraph,
         project: flowGraph?.project ||
-          result.flow_graph.project || {
+          revertedGraph.project || {
             files: {},
             entry: '/App.tsx',
             dependencies: {},
           },
-        screens: result.flow_graph.screens.map(
+        screens: revertedGraph.screens.map(
           (s): FlowScreen => ({
             ...s,
             component_path: (s.component_path ||
@@ -443,7 +451,7 @@ export default function Editor() {
       }
 
       // ✅ FIX: Update localStorage with the new flow_graph and version
-      project.flow_graph = result.flow_graph
+      project.flow_graph = revertedGraph
       if (!project.metadata) {
         project.metadata = {}
       }
@@ -832,9 +840,29 @@ export default function Editor() {
 
           console.log('✅ Shared components added to project')
         },
-        onUICheckpoint: (screenId, uiCode, checkpointNumber) => {
+        onUICheckpoint: (screenId, uiCode, checkpointNumber, files) => {
           console.log(`📍 Checkpoint ${checkpointNumber} for ${screenId}`)
 
+          // Components this checkpoint imports for the first time. They are
+          // sent only once, so merge them even if the checkpoint is rejected
+          if (Object.keys(files).length > 0) {
+            setFlowGraph(prev =>
+              prev
+                ? {
+                    ...prev,
+                    project: {
+                      ...(prev.project || {}),
+                      files: { ...(prev.project?.files || {}), ...files },
+                      entry: prev.project?.entry || '/App.tsx',
+                      dependencies: prev.project?.dependencies || {
+                        'lucide-react': '^0.263.1',
+                      },
+                    },
+                  }
+                : prev,
+            )
+          }
+
           // Safety fallback: if overlay is still up (design_brief_ready never fired,
           // e.g. slim prompts disabled), dismiss it now that screens are streaming in
           setGenerationStage(prev =>
@@ -1347,7 +1375,11 @@ export default function Editor() {
                   .replace(/\n?```$/, '')
                   .trim()
                 const updatedFiles = componentPath
-                  ? { ...prev.project.files, [componentPath]: cleanCode }
+                  ? {
+                      ...prev.project.files,
+                      ...(d.files || {}),
+                      [componentPath]: cleanCode,
+                    }
                   : prev.project.files
                 return {
                   ...prev,
@@ -1443,10 +1475,12 @@ export default function Editor() {
     setIsIterating(true)
     setIterationStatus('Analyzing your feedback...')
 
-    // Track the current AI message being built
-    let currentAIMessageId = (Date.now() + 1).toString()
-    let currentAIContent = ''
-    let currentScreenName = ''
+    // Screens are edited concurrently and their chunks interleave, so the
+    // AI message being built is tracked per screen_id
+    const screenMessages: Record<
+      string,
+      { id: string; content: string; screenName: string }
+    > = {}
 
     try {
       await iterateUIWebSocket(
@@ -1484,30 +1518,36 @@ export default function Editor() {
             )
 
             // Start a new AI message for this screen
-            currentAIMessageId = `${Date.now()}-${data.screen_id}`
-            currentAIContent = ''
-            currentScreenName = data.screen_name
+            screenMessages[data.screen_id] = {
+              id: `${Date.now()}-${data.screen_id}`,
+              content: '',
+              screenName: data.screen_name,
+            }
           },
 
           onScreenConversationChunk: (data: {
             screen_id: string
             chunk: string
           }) => {
-            // Stream conversation text from AI
-            currentAIContent += data.chunk
+            // Stream conversation text from AI into this screen's message
+            const screenMessage = (screenMessages[data.screen_id] ??= {
+              id: `${Date.now()}-${data.screen_id}`,
+              content: '',
+              screenName: '',
+            })
+            screenMessage.content += data.chunk
+            const { id, content, screenName } = screenMessage
 
             // Update or add AI message
             setConversationMessages(prev => {
-              const existingIndex = prev.findIndex(
-                m => m.id === currentAIMessageId,
-              )
+              const existingIndex = prev.findIndex(m => m.id === id)
 
               if (existingIndex >= 0) {
                 // Update existing message
                 const updated = [...prev]
                 updated[existingIndex] = {
                   ...updated[existingIndex],
-                  content: currentAIContent,
+                  content,
                 }
                 return updated
               } else {
@@ -1515,11 +1555,11 @@ export default function Editor() {
                 return [
                   ...prev,
                   {
-                    id: currentAIMessageId,
+                    id,
                     type: 'ai' as const,
-                    content: currentAIContent,
+                    content,
                     timestamp: new Date(),
-                    screen: currentScreenName,
+                    screen: screenName,
                   },
                 ]
               }
@@ -1541,6 +1581,7 @@ export default function Editor() {
             ui_code: string
             component_path?: string
             conversation?: string
+            files?: Record<string, string>
           }) => {
             console.log('Screen updated:', data.screen_id)
 
@@ -1566,6 +1607,7 @@ export default function Editor() {
               const updatedFiles = componentPath
                 ? {
                     ...prevFlow.project.files,
+                    ...(data.files || {}),
                     [componentPath]: cleanCode,
                   }
                 : prevFlow.project.files
@@ -1579,17 +1621,70 @@ export default function Editor() {
               }
             })
 
-            setCurrentIteratingScreenId(null)
+            // Other screens may still be in progress
+            setCurrentIteratingScreenId(prev =>
+              prev === data.screen_id ? null : prev,
+            )
+          },
+
+          onScreenIterationError: (data: {
+            screen_id: string
+            screen_name: string
+            error: string
+          }) => {
+            console.error('Screen iteration error:', data)
+
+            // Show the failure on this screen's message; the rest of the
+            // batch keeps going
+            const screenMessage = screenMessages[data.screen_id]
+            const errorText = `Could not update ${data.screen_name}: ${data.error}`
+
+            setConversationMessages(prev => {
+              const existingIndex = screenMessage
+                ? prev.findIndex(m => m.id === screenMessage.id)
+                : -1
+
+              if (existingIndex >= 0) {
+                const updated = [...prev]
+                const existing = updated[existingIndex]
+                updated[existingIndex] = {
+                  ...existing,
+                  content: existing.content
+                    ? `${existing.content}\n\n${errorText}`
+                    : errorText,
+                }
+                return updated
+              }
+              return [
+                ...prev,
+                {
+                  id: screenMessage?.id ?? `${Date.now()}-${data.screen_id}`,
+                  type: 'ai' as const,
+                  content: errorText,
+                  timestamp: new Date(),
+                  screen: data.screen_name,
+                },
+              ]
+            })
+
+            setCurrentIteratingScreenId(prev =>
+              prev === data.screen_id ? null : prev,
+            )
           },
 
           onIterationComplete: (data: {
             summary: string
             screens_updated: string[]
+            screens_failed?: string[]
             new_version: number
           }) => {
             console.log('Iteration complete:', data)
 
-            // Add final summary message
+            if (data.screens_failed && data.screens_failed.length > 0) {
+              console.warn('Screens that failed to update:', data.screens_failed)
+            }
+
+            // Add final summary message (it names any screens that failed)
             const summaryMsg: Message = {
               id: `${Date.now()}-summary`,
               type: 'ai' as const,
@@ -954,14 +954,14 @@ export const llmAPI = {
     message: string
     old_version: number
     new_version: number
-    flow_graph: FlowGraph
+    flow_ref: { version: number; manifest_key: string }
   }> => {
     return apiRequest<{
       status: string
       message: string
       old_version: number
       new_version: number
-      flow_graph: FlowGraph
+      flow_ref: { version: number; manifest_key: string }
     }>(`/api/projects/${projectId}/flow/revert?version=${version}`, {
       method: 'POST',
     })
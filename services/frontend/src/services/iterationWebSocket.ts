@@ -61,6 +61,16 @@ export interface IterationCallbacks {
     ui_code: string
     component_path?: string
     conversation?: string
+    // Shared components the new code imports that the project lacked
+    files?: Record<string, string>
+  }) => void
+
+  // A single screen failed; the other screens are still applied
+  // eslint-disable-next-line no-unused-vars
+  onScreenIterationError?: (data: {
+    screen_id: string
+    screen_name: string
+    error: string
   }) => void
 
   // Completion phase
@@ -68,6 +78,7 @@ export interface IterationCallbacks {
   onIterationComplete?: (data: {
     summary: string
     screens_updated: string[]
+    screens_failed?: string[]
     new_version: number
   }) => void
 
@@ -179,6 +190,15 @@ export function iterateUIWebSocket(
                     ui_code: string
                     component_path?: string
                     conversation?: string
+                    files?: Record<string, string>
+                  }
+                }
+              | {
+                  type: 'screen_iteration_error'
+                  data: {
+                    screen_id: string
+                    screen_name: string
+                    error: string
                   }
                 }
               | {
@@ -186,6 +206,7 @@ export function iterateUIWebSocket(
                   data: {
                     summary: string
                     screens_updated: string[]
+                    screens_failed?: string[]
                     new_version: number
                   }
                 }
@@ -224,6 +245,8 @@ export function iterateUIWebSocket(
               callbacks.onScreenGenerating?.(message.data)
             } else if (message.type === 'screen_updated') {
               callbacks.onScreenUpdated?.(message.data)
+            } else if (message.type === 'screen_iteration_error') {
+              callbacks.onScreenIterationError?.(message.data)
             } else if (message.type === 'iteration_complete') {
               callbacks.onIterationComplete?.(message.data)
             } else if (message.type === 'conversation_response') {
@@ -37,6 +37,8 @@ export interface VariationCallbacks {
     ui_code: string
     component_path?: string
     conversation?: string
+    // Shared components the new code imports that the project lacked
+    files?: Record<string, string>
   }) => void
 
   // eslint-disable-next-line no-unused-vars
@@ -137,6 +139,7 @@ export function generateVariationWebSocket(
                   ui_code: string
                   component_path?: string
                   conversation?: string
+                  files?: Record<string, string>
                 },
               )
             } else if (type === 'complete') {
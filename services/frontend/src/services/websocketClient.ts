@@ -321,6 +321,8 @@ export interface FlowGenerationCallbacks {
     uiCode: string,
     // eslint-disable-next-line no-unused-vars
     checkpointNumber: number,
+    // eslint-disable-next-line no-unused-vars
+    files: Record<string, string>,
   ) => void
   onScreenReady?: (
     // eslint-disable-next-line no-unused-vars
@@ -412,6 +414,7 @@ export function generateFlowWebSocket(
                     screen_id: string
                     ui_code: string
                     checkpoint_number: number
+                    files?: Record<string, string>
                   }
                 }
               | {
@@ -476,6 +479,7 @@ export function generateFlowWebSocket(
                 message.data.screen_id,
                 message.data.ui_code,
                 message.data.checkpoint_number,
+                message.data.files || {},
               )
 
               console.log('✅ callbacks.onUICheckpoint completed')